@@ -0,0 +1,54 @@
+"""
+Backtesting Module
+
+Replays historical candles from the market_data hypertable or CSV/Parquet
+files as MarketDataSnapshots and backtests strategies against a
+VirtualPortfolio with simulated fills. ParameterOptimizer runs parameter
+sweeps and walk-forward optimization across processes over a shared-memory
+candle store.
+
+Author: Backtesting Team
+Date: 2025-11-22
+"""
+
+from .backtester import BacktestConfig, Backtester, BacktestResult, BacktestTrade
+from .candle_store import SharedCandleSpec, SharedCandleStore
+from .optimizer import (
+    ParameterOptimizer,
+    TrialResult,
+    WalkForwardResult,
+    WalkForwardWindow,
+    grid_configs,
+    random_configs,
+)
+from .replay import (
+    PYARROW_AVAILABLE,
+    CandleBatch,
+    CSVCandleSource,
+    DatabaseCandleSource,
+    MarketReplay,
+    ParquetCandleSource,
+    interleave,
+)
+
+__all__ = [
+    "Backtester",
+    "BacktestConfig",
+    "BacktestResult",
+    "BacktestTrade",
+    "CandleBatch",
+    "CSVCandleSource",
+    "ParquetCandleSource",
+    "DatabaseCandleSource",
+    "MarketReplay",
+    "interleave",
+    "PYARROW_AVAILABLE",
+    "SharedCandleStore",
+    "SharedCandleSpec",
+    "ParameterOptimizer",
+    "TrialResult",
+    "WalkForwardResult",
+    "WalkForwardWindow",
+    "grid_configs",
+    "random_configs",
+]
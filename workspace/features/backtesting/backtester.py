@@ -0,0 +1,443 @@
+"""
+Historical Backtester
+
+Drives a BaseStrategy over replayed market data and executes its signals
+against a VirtualPortfolio with simulated fills.
+
+Fill model:
+- A signal generated on a bar's close fills at the next bar's open of the
+  same symbol, with slippage against the order and the taker fee
+- Stop-loss / take-profit levels from the signal are checked against each
+  later bar's low/high; a stop that gaps is filled at the open, and when
+  both levels are inside one bar the stop is assumed to hit first
+- Positions still open at the end of the data are closed at the last close
+
+Equity is marked to market on every bar and sampled once per
+equity_interval (daily by default, matching RiskMetricsCalculator's
+periods), so the result stays small however long the replay is.
+
+Author: Backtesting Team
+Date: 2025-11-22
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Tuple
+
+from workspace.features.market_data import OHLCV, MarketDataSnapshot, Timeframe
+from workspace.features.paper_trading import VirtualPortfolio
+from workspace.features.risk_manager import RiskMetrics, RiskMetricsCalculator
+from workspace.features.strategy import BaseStrategy, StrategySignal
+from workspace.features.trading_loop import TradingDecision
+
+from .replay import CandleBatch, MarketReplay
+
+logger = logging.getLogger(__name__)
+
+_QUANTITY = Decimal("0.00000001")
+_ZERO = Decimal("0")
+_ONE = Decimal("1")
+
+
+@dataclass
+class BacktestConfig:
+    """
+    Backtest settings
+
+    Attributes:
+        initial_balance: Starting balance in USDT
+        timeframe: Timeframe the strategy runs on
+        base_timeframe: Timeframe of the replayed candles
+        taker_fee_pct: Fee per fill (default: 0.1%, as PaperTradingExecutor)
+        slippage_pct: Price slippage per market fill
+        min_confidence: Signals below this confidence are ignored
+        allow_short: Open shorts on SELL signals (otherwise SELL only exits)
+        equity_interval: Equity curve sampling interval
+        trade_start: Bars before this only warm up indicators (None: trade
+            from the first bar)
+        indicator_config: StreamingIndicatorEngine keyword arguments
+    """
+
+    initial_balance: Decimal = Decimal("10000")
+    timeframe: Timeframe = Timeframe.M3
+    base_timeframe: Timeframe = Timeframe.M1
+    taker_fee_pct: Decimal = Decimal("0.001")
+    slippage_pct: Decimal = Decimal("0.0005")
+    min_confidence: Decimal = Decimal("0.6")
+    allow_short: bool = True
+    equity_interval: timedelta = timedelta(days=1)
+    trade_start: Optional[datetime] = None
+    indicator_config: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BacktestTrade:
+    """Round-trip trade; pnl is net of entry and exit fees"""
+
+    symbol: str
+    side: str  # 'long' or 'short'
+    quantity: Decimal
+    entry_price: Decimal
+    exit_price: Decimal
+    entry_time: datetime
+    exit_time: datetime
+    pnl: Decimal
+    fees: Decimal
+    exit_reason: str  # 'signal', 'stop_loss', 'take_profit' or 'end_of_data'
+
+
+@dataclass
+class BacktestResult:
+    """
+    Outcome of a backtest run
+
+    Attributes:
+        strategy_name: Strategy that was tested
+        symbols: Symbols replayed
+        start: First traded bar time
+        end: Last bar close time
+        candles: Base candles replayed
+        bars: Snapshots replayed (warmup included)
+        initial_balance: Starting balance
+        final_equity: Equity after closing all positions
+        trades: Closed round-trip trades
+        equity_curve: (time, equity) samples
+        metrics: Risk and performance metrics of the sampled equity curve
+        elapsed_seconds: Wall-clock run time
+    """
+
+    strategy_name: str
+    symbols: List[str]
+    start: Optional[datetime]
+    end: Optional[datetime]
+    candles: int
+    bars: int
+    initial_balance: Decimal
+    final_equity: Decimal
+    trades: List[BacktestTrade]
+    equity_curve: List[Tuple[datetime, Decimal]]
+    metrics: RiskMetrics
+    elapsed_seconds: float
+
+    @property
+    def total_return_pct(self) -> float:
+        """Total return in percent"""
+        return float((self.final_equity / self.initial_balance - 1) * 100)
+
+    @property
+    def candles_per_second(self) -> float:
+        """Replay throughput"""
+        return self.candles / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def speedup(self) -> float:
+        """Simulated time per wall-clock time"""
+        if self.start is None or self.end is None or not self.elapsed_seconds:
+            return 0.0
+        return (self.end - self.start).total_seconds() / self.elapsed_seconds
+
+
+@dataclass
+class _OpenTrade:
+    """Backtester bookkeeping for an open position"""
+
+    side: str
+    entry_time: datetime
+    entry_price: Decimal
+    stop_loss: Optional[Decimal]
+    take_profit: Optional[Decimal]
+
+
+class Backtester:
+    """
+    Historical strategy backtester
+
+    Attributes:
+        strategy: Strategy under test
+        config: Backtest settings
+        portfolio: Virtual portfolio the fills are booked on
+
+    Example:
+        ```python
+        backtester = Backtester(MeanReversionStrategy())
+        result = backtester.run(CSVCandleSource("btc_1m.csv", "BTC/USDT:USDT"))
+        print(result.total_return_pct, result.metrics.sharpe_ratio)
+        ```
+    """
+
+    def __init__(
+        self,
+        strategy: BaseStrategy,
+        config: Optional[BacktestConfig] = None,
+    ):
+        """
+        Initialize backtester
+
+        Args:
+            strategy: Strategy under test
+            config: Backtest settings (defaults if None)
+        """
+        self.strategy = strategy
+        self.config = config or BacktestConfig()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard portfolio, replay and result state"""
+        config = self.config
+        self.replay = MarketReplay(
+            config.timeframe, config.base_timeframe, config.indicator_config
+        )
+        self.portfolio = VirtualPortfolio(config.initial_balance)
+        self.trades: List[BacktestTrade] = []
+        self.equity_curve: List[Tuple[datetime, Decimal]] = []
+
+        self._open: Dict[str, _OpenTrade] = {}
+        self._pending: Dict[str, StrategySignal] = {}
+        self._prices: Dict[str, Decimal] = {}
+        self._start: Optional[datetime] = None
+        self._clock: Optional[datetime] = None
+        self._next_sample: Optional[datetime] = None
+
+    def run(self, source: Iterable[CandleBatch]) -> BacktestResult:
+        """
+        Backtest over a candle stream
+
+        Args:
+            source: Timestamp-ordered candle batches (CSVCandleSource,
+                ParquetCandleSource, interleave(...), ...)
+
+        Returns:
+            BacktestResult
+        """
+        self.reset()
+        started = time.perf_counter()
+        for snapshot in self.replay.replay(source):
+            self.process(snapshot)
+        return self._finish(started)
+
+    async def run_async(self, source: AsyncIterable[CandleBatch]) -> BacktestResult:
+        """
+        Backtest over an asynchronous candle stream (DatabaseCandleSource)
+
+        Args:
+            source: Timestamp-ordered candle batches
+
+        Returns:
+            BacktestResult
+        """
+        self.reset()
+        started = time.perf_counter()
+        async for snapshot in self.replay.replay_async(source):
+            self.process(snapshot)
+        return self._finish(started)
+
+    def process(self, snapshot: MarketDataSnapshot) -> None:
+        """
+        Simulate one closed bar: fills, exits, marking and the strategy
+
+        Args:
+            snapshot: Closed-bar snapshot (bars in time order)
+        """
+        candle = snapshot.ohlcv
+        trade_start = self.config.trade_start
+        if trade_start is not None and candle.timestamp < trade_start:
+            return  # Warmup: the replay has already advanced the indicators
+
+        symbol = snapshot.symbol
+        if self._clock is None:
+            self._start = candle.timestamp
+        if candle.timestamp != self._clock:
+            # Every symbol of the previous bar is marked: sample equity
+            if self._next_sample is None or candle.timestamp >= self._next_sample:
+                self._sample_equity(candle.timestamp)
+            self._clock = candle.timestamp
+
+        signal = self._pending.pop(symbol, None)
+        if signal is not None:
+            self._execute(signal, candle.open, candle.timestamp)
+        if symbol in self._open:
+            self._check_exits(symbol, candle)
+        self._prices[symbol] = candle.close
+
+        signal = self.strategy.analyze(snapshot)
+        if (
+            signal.decision != TradingDecision.HOLD
+            and signal.confidence >= self.config.min_confidence
+        ):
+            self._pending[symbol] = signal
+
+    def equity(self) -> Decimal:
+        """Cash plus open positions marked at the last close"""
+        equity = self.portfolio.balance
+        for symbol, position in self.portfolio.positions.items():
+            value = position["quantity"] * self._prices[symbol]
+            equity += value if position["side"] == "long" else -value
+        return equity
+
+    def _execute(self, signal: StrategySignal, price: Decimal, at: datetime) -> None:
+        """Fill a pending signal at the bar open"""
+        symbol = signal.symbol
+        current = self._open.get(symbol)
+        decision = signal.decision
+
+        if current is not None:
+            if decision == TradingDecision.CLOSE or (
+                (decision == TradingDecision.BUY) == (current.side == "short")
+            ):
+                self._close(
+                    symbol, self._slip(price, current.side == "short"), at, "signal"
+                )
+            else:
+                return  # Already positioned that way
+
+        if decision == TradingDecision.BUY:
+            self._open_position(signal, "long", price, at)
+        elif decision == TradingDecision.SELL and self.config.allow_short:
+            self._open_position(signal, "short", price, at)
+
+    def _open_position(
+        self, signal: StrategySignal, side: str, price: Decimal, at: datetime
+    ) -> None:
+        fill_price = self._slip(price, side == "long")
+        fee_rate = self.config.taker_fee_pct
+        equity = self.equity()
+        quantity = equity * signal.size_pct / fill_price
+        # Longs are paid from cash, fees included
+        quantity = min(
+            quantity, self.portfolio.balance / (fill_price * (_ONE + fee_rate))
+        )
+        quantity = quantity.quantize(_QUANTITY)
+        if quantity <= 0:
+            return
+
+        fees = quantity * fill_price * fee_rate
+        self.portfolio.open_position(
+            signal.symbol, side, quantity, fill_price, fees, timestamp=at
+        )
+        direction = _ONE if side == "long" else -_ONE
+        self._open[signal.symbol] = _OpenTrade(
+            side=side,
+            entry_time=at,
+            entry_price=fill_price,
+            stop_loss=(
+                fill_price * (_ONE - direction * signal.stop_loss_pct)
+                if signal.stop_loss_pct
+                else None
+            ),
+            take_profit=(
+                fill_price * (_ONE + direction * signal.take_profit_pct)
+                if signal.take_profit_pct
+                else None
+            ),
+        )
+
+    def _check_exits(self, symbol: str, candle: OHLCV) -> None:
+        """Stop-loss / take-profit against the bar range"""
+        trade = self._open[symbol]
+        long = trade.side == "long"
+        stop, target = trade.stop_loss, trade.take_profit
+
+        if stop is not None and (candle.low <= stop if long else candle.high >= stop):
+            # Stops are market orders: gaps fill at the open, with slippage
+            price = min(candle.open, stop) if long else max(candle.open, stop)
+            self._close(
+                symbol, self._slip(price, not long), candle.timestamp, "stop_loss"
+            )
+        elif target is not None and (
+            candle.high >= target if long else candle.low <= target
+        ):
+            price = max(candle.open, target) if long else min(candle.open, target)
+            self._close(symbol, price, candle.timestamp, "take_profit")
+
+    def _close(self, symbol: str, price: Decimal, at: datetime, reason: str) -> None:
+        position = self.portfolio.positions[symbol]
+        quantity = position["quantity"]
+        entry_fees = position["total_fees"]
+        fees = quantity * price * self.config.taker_fee_pct
+        pnl = self.portfolio.close_position(symbol, price, fees, timestamp=at)
+
+        trade = self._open.pop(symbol)
+        self.trades.append(
+            BacktestTrade(
+                symbol=symbol,
+                side=trade.side,
+                quantity=quantity,
+                entry_price=trade.entry_price,
+                exit_price=price,
+                entry_time=trade.entry_time,
+                exit_time=at,
+                pnl=pnl - entry_fees,
+                fees=entry_fees + fees,
+                exit_reason=reason,
+            )
+        )
+
+    def _slip(self, price: Decimal, buy: bool) -> Decimal:
+        """Fill price after slippage against the order"""
+        slippage = self.config.slippage_pct
+        return price * (_ONE + slippage if buy else _ONE - slippage)
+
+    def _sample_equity(self, at: datetime) -> None:
+        self.equity_curve.append((at, self.equity()))
+        interval = self.config.equity_interval
+        start = self._start or at
+        elapsed = (at - start) // interval
+        self._next_sample = start + (elapsed + 1) * interval
+
+    def _finish(self, started: float) -> BacktestResult:
+        """Close remaining positions and compute metrics"""
+        end = None
+        if self._clock is not None:
+            end = self._clock + self.replay.bar_duration
+            for symbol in list(self._open):
+                self._close(symbol, self._prices[symbol], end, "end_of_data")
+            self.equity_curve.append((end, self.equity()))
+        self._pending.clear()
+
+        equity = [value for _, value in self.equity_curve]
+        returns = [
+            float(current / previous - 1)
+            for previous, current in zip(equity, equity[1:])
+            if previous
+        ]
+        wins = [trade.pnl for trade in self.trades if trade.pnl > 0]
+        losses = [trade.pnl for trade in self.trades if trade.pnl < 0]
+        metrics = RiskMetricsCalculator().calculate_all_metrics(
+            returns=returns,
+            equity_curve=equity,
+            initial_balance=self.config.initial_balance,
+            winning_trades=len(wins),
+            losing_trades=len(losses),
+            total_wins=sum(wins, _ZERO),
+            total_losses=abs(sum(losses, _ZERO)),
+            largest_win=max(wins, default=_ZERO),
+            largest_loss=min(losses, default=_ZERO),
+        )
+
+        result = BacktestResult(
+            strategy_name=self.strategy.get_name(),
+            symbols=self.replay.symbols,
+            start=self._start,
+            end=end,
+            candles=self.replay.candles,
+            bars=self.replay.bars,
+            initial_balance=self.config.initial_balance,
+            final_equity=equity[-1] if equity else self.config.initial_balance,
+            trades=self.trades,
+            equity_curve=self.equity_curve,
+            metrics=metrics,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            f"Backtest {result.strategy_name}: {result.bars} bars, "
+            f"{len(result.trades)} trades, return {result.total_return_pct:.2f}% "
+            f"in {result.elapsed_seconds:.1f}s"
+        )
+        return result
+
+
+# Export
+__all__ = ["Backtester", "BacktestConfig", "BacktestResult", "BacktestTrade"]
@@ -0,0 +1,226 @@
+"""
+Shared Candle Store
+
+Columnar candle history in POSIX shared memory. The optimizer loads a
+dataset once in the parent process; worker processes attach to the same
+pages by name and replay zero-copy views of it, so a task carries only its
+parameters instead of a pickled copy of the candles.
+
+Author: Backtesting Team
+Date: 2025-11-23
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from workspace.features.market_data.ohlcv_buffer import from_micros, to_micros
+
+from .replay import CandleBatch
+
+logger = logging.getLogger(__name__)
+
+# Column name -> dtype; symbols are stored as int32 codes into the spec's
+# symbol list
+_COLUMN_DTYPES: Dict[str, np.dtype] = {
+    "symbol": np.dtype(np.int32),
+    "timestamp": np.dtype(np.int64),
+    "open": np.dtype(np.float64),
+    "high": np.dtype(np.float64),
+    "low": np.dtype(np.float64),
+    "close": np.dtype(np.float64),
+    "volume": np.dtype(np.float64),
+}
+
+
+@dataclass(frozen=True)
+class SharedCandleSpec:
+    """Picklable handle to a SharedCandleStore (segment names and layout)"""
+
+    segments: Tuple[Tuple[str, str], ...]  # (column, shared memory name)
+    length: int
+    symbols: Tuple[str, ...]
+
+
+class SharedCandleStore:
+    """
+    Timestamp-ordered candle columns in shared memory
+
+    Attributes:
+        spec: Handle for attaching from other processes
+        symbols: Symbols in the store
+        owner: True in the process that created (and must unlink) the store
+
+    Example:
+        ```python
+        with SharedCandleStore.from_batches(CSVCandleSource("btc_1m.csv", "BTC/USDT:USDT")) as store:
+            # In a worker: SharedCandleStore.attach(store.spec)
+            for batch in store.batches(start, end):
+                ...
+        ```
+    """
+
+    def __init__(
+        self,
+        spec: SharedCandleSpec,
+        segments: Dict[str, shared_memory.SharedMemory],
+        owner: bool,
+    ):
+        self.spec = spec
+        self.symbols = list(spec.symbols)
+        self.owner = owner
+        self._segments = segments
+        self._symbol_names = np.array(spec.symbols, dtype=object)
+        self._columns: Dict[str, np.ndarray] = {
+            column: np.ndarray(
+                (spec.length,), dtype=_COLUMN_DTYPES[column], buffer=segment.buf
+            )
+            for column, segment in segments.items()
+        }
+
+    @classmethod
+    def from_batches(cls, batches: Iterable[CandleBatch]) -> "SharedCandleStore":
+        """
+        Load a timestamp-ordered candle stream into shared memory
+
+        The stream is buffered once in process memory while its length is
+        unknown, then copied into the shared segments.
+
+        Args:
+            batches: CandleBatch stream (any replay source)
+
+        Returns:
+            Owning SharedCandleStore
+        """
+        codes: Dict[str, int] = {}
+        chunks: List[CandleBatch] = []
+        for batch in batches:
+            if not len(batch):
+                continue
+            symbol_codes = np.fromiter(
+                (codes.setdefault(symbol, len(codes)) for symbol in batch.symbol),
+                np.int32,
+                len(batch),
+            )
+            chunks.append(CandleBatch(symbol_codes, *batch[1:]))
+
+        length = sum(len(chunk) for chunk in chunks)
+        store = cls._create(length, tuple(codes))
+        offset = 0
+        for chunk in chunks:
+            for column, values in zip(CandleBatch._fields, chunk):
+                store._columns[column][offset : offset + len(chunk)] = values
+            offset += len(chunk)
+        chunks.clear()
+
+        logger.info(
+            f"Shared candle store: {length} candles, {len(codes)} symbols, "
+            f"{store.nbytes / 1e6:.1f} MB"
+        )
+        return store
+
+    @classmethod
+    def attach(cls, spec: SharedCandleSpec) -> "SharedCandleStore":
+        """Attach to a store created by another process"""
+        segments = {
+            column: shared_memory.SharedMemory(name=name)
+            for column, name in spec.segments
+        }
+        return cls(spec, segments, owner=False)
+
+    @classmethod
+    def _create(cls, length: int, symbols: Tuple[str, ...]) -> "SharedCandleStore":
+        segments = {
+            column: shared_memory.SharedMemory(
+                create=True, size=max(1, length * dtype.itemsize)
+            )
+            for column, dtype in _COLUMN_DTYPES.items()
+        }
+        spec = SharedCandleSpec(
+            segments=tuple((column, seg.name) for column, seg in segments.items()),
+            length=length,
+            symbols=symbols,
+        )
+        return cls(spec, segments, owner=True)
+
+    def __len__(self) -> int:
+        return self.spec.length
+
+    @property
+    def nbytes(self) -> int:
+        """Shared memory used by the columns"""
+        return sum(column.nbytes for column in self._columns.values())
+
+    @property
+    def start(self) -> Optional[datetime]:
+        """First candle time"""
+        if not len(self):
+            return None
+        return from_micros(int(self._columns["timestamp"][0]), None)
+
+    @property
+    def end(self) -> Optional[datetime]:
+        """Last candle time"""
+        if not len(self):
+            return None
+        return from_micros(int(self._columns["timestamp"][-1]), None)
+
+    def batches(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_size: int = 100_000,
+    ) -> Iterator[CandleBatch]:
+        """
+        Replay a time window as CandleBatch views
+
+        Args:
+            start: First candle time (inclusive, None for the beginning)
+            end: Last candle time (exclusive, None for the end)
+            chunk_size: Rows per batch
+
+        Yields:
+            CandleBatch whose price columns are views into shared memory
+        """
+        timestamps = self._columns["timestamp"]
+        low = 0 if start is None else int(np.searchsorted(timestamps, to_micros(start)))
+        high = (
+            len(self)
+            if end is None
+            else int(np.searchsorted(timestamps, to_micros(end)))
+        )
+        columns = self._columns
+        for offset in range(low, high, chunk_size):
+            rows = slice(offset, min(offset + chunk_size, high))
+            yield CandleBatch(
+                self._symbol_names[columns["symbol"][rows]],
+                timestamps[rows],
+                columns["open"][rows],
+                columns["high"][rows],
+                columns["low"][rows],
+                columns["close"][rows],
+                columns["volume"][rows],
+            )
+
+    def close(self) -> None:
+        """Detach from the shared segments; the owner also frees them"""
+        self._columns.clear()
+        for segment in self._segments.values():
+            segment.close()
+            if self.owner:
+                segment.unlink()
+        self._segments.clear()
+
+    def __enter__(self) -> "SharedCandleStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Export
+__all__ = ["SharedCandleStore", "SharedCandleSpec"]
@@ -0,0 +1,580 @@
+"""
+Strategy Parameter Optimizer
+
+Grid / random parameter sweeps and walk-forward optimization over
+historical backtests, spread across CPU cores with a ProcessPoolExecutor.
+
+Scaling:
+- Candles live in a SharedCandleStore; each worker attaches to it once in
+  its initializer, so a task is just a parameter dict and a time window
+- Workers return compact TrialResults (metrics and Kelly sizing, no equity
+  curves or trade lists), keeping result traffic independent of run length
+- Every trial of a sweep (and every training trial of every walk-forward
+  window) is submitted at once so the pool stays saturated
+
+Parameters are routed by name: StreamingIndicatorEngine arguments
+(rsi_period, bb_std_dev, ...) configure the replayed indicators,
+BacktestConfig fields (min_confidence, allow_short, ...) configure the
+backtest, and every parameter is also passed in the strategy config.
+
+Author: Backtesting Team
+Date: 2025-11-23
+"""
+
+import itertools
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Type
+
+from workspace.features.risk_manager import (
+    KellyPositionSizer,
+    RiskMetrics,
+    TradeResult,
+)
+from workspace.features.strategy import BaseStrategy
+
+from .backtester import BacktestConfig, Backtester, BacktestResult, BacktestTrade
+from .candle_store import SharedCandleSpec, SharedCandleStore
+
+logger = logging.getLogger(__name__)
+
+# StreamingIndicatorEngine keyword arguments
+INDICATOR_PARAMETERS = (
+    "rsi_period",
+    "macd_fast",
+    "macd_slow",
+    "macd_signal",
+    "ema_fast_period",
+    "ema_slow_period",
+    "bb_period",
+    "bb_std_dev",
+)
+
+_BACKTEST_PARAMETERS = {
+    f.name for f in fields(BacktestConfig) if f.name != "indicator_config"
+}
+
+# Parameter set; a time window is (replay start, trade start, end)
+Params = Dict[str, Any]
+Window = Tuple[Optional[datetime], Optional[datetime], Optional[datetime]]
+
+
+def grid_configs(space: Mapping[str, Sequence[Any]]) -> List[Params]:
+    """
+    Every combination of a parameter grid
+
+    Args:
+        space: Parameter name -> candidate values
+
+    Returns:
+        Parameter dicts in itertools.product order
+    """
+    names = list(space)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(space[name] for name in names))
+    ]
+
+
+def random_configs(
+    space: Mapping[str, Any], samples: int, seed: Optional[int] = None
+) -> List[Params]:
+    """
+    Random samples of a parameter space
+
+    Lists are sampled as choices; (low, high) tuples are sampled uniformly,
+    as integers when both bounds are integers.
+
+    Args:
+        space: Parameter name -> choices or (low, high) range
+        samples: Number of parameter dicts
+        seed: Random seed for reproducible searches
+
+    Returns:
+        Parameter dicts
+    """
+    rng = random.Random(seed)
+
+    def draw(values: Any) -> Any:
+        if isinstance(values, tuple) and len(values) == 2:
+            low, high = values
+            if isinstance(low, int) and isinstance(high, int):
+                return rng.randint(low, high)
+            return rng.uniform(float(low), float(high))
+        return rng.choice(list(values))
+
+    return [
+        {name: draw(values) for name, values in space.items()} for _ in range(samples)
+    ]
+
+
+def split_params(
+    params: Params, base: BacktestConfig
+) -> Tuple[Dict[str, Any], BacktestConfig]:
+    """
+    Route a parameter dict to the strategy config and the BacktestConfig
+
+    Args:
+        params: Parameter dict from a search space
+        base: BacktestConfig the overrides apply to
+
+    Returns:
+        (strategy config, backtest config)
+    """
+    indicator_config = dict(base.indicator_config)
+    overrides: Dict[str, Any] = {}
+    for name, value in params.items():
+        if name in INDICATOR_PARAMETERS:
+            indicator_config[name] = (
+                Decimal(str(value)) if name == "bb_std_dev" else int(value)
+            )
+        elif name in _BACKTEST_PARAMETERS:
+            default = getattr(base, name)
+            overrides[name] = (
+                Decimal(str(value)) if isinstance(default, Decimal) else value
+            )
+    return dict(params), replace(base, indicator_config=indicator_config, **overrides)
+
+
+@dataclass
+class TrialResult:
+    """
+    Outcome of one backtest run in a sweep
+
+    Attributes:
+        params: Parameters tested
+        score: Objective value (-inf when the run had too few trades)
+        metrics: RiskMetricsCalculator metrics of the run
+        trades: Round-trip trade count
+        final_equity: Equity at the end of the run
+        kelly_fraction: KellyPositionSizer.recommend_kelly_fraction for the
+            run's trades
+        kelly_size_pct: Kelly position size as a fraction of equity
+        start: First traded bar
+        end: End of the run
+        candles: Candles replayed
+        elapsed_seconds: Worker run time
+    """
+
+    params: Params
+    score: float
+    metrics: RiskMetrics
+    trades: int
+    final_equity: Decimal
+    kelly_fraction: float
+    kelly_size_pct: float
+    start: Optional[datetime]
+    end: Optional[datetime]
+    candles: int
+    elapsed_seconds: float
+
+
+@dataclass
+class WalkForwardWindow:
+    """In-sample optimization and out-of-sample check for one window"""
+
+    train_start: datetime
+    train_end: datetime
+    test_end: datetime
+    best: TrialResult  # Best in-sample trial
+    test: TrialResult  # Best parameters on the following test period
+
+
+@dataclass
+class WalkForwardResult:
+    """
+    Walk-forward optimization outcome
+
+    Attributes:
+        windows: Windows in time order
+        trials: In-sample trials run across all windows
+        elapsed_seconds: Wall-clock run time
+    """
+
+    windows: List[WalkForwardWindow] = field(default_factory=list)
+    trials: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def out_of_sample_return_pct(self) -> float:
+        """Compounded return of the test periods in percent"""
+        growth = 1.0
+        for window in self.windows:
+            growth *= 1 + window.test.metrics.total_return_pct
+        return (growth - 1) * 100
+
+    @property
+    def efficiency(self) -> float:
+        """Mean test score / mean in-sample score (walk-forward efficiency)"""
+        scores = [
+            (w.best.score, w.test.score)
+            for w in self.windows
+            if math.isfinite(w.best.score) and math.isfinite(w.test.score)
+        ]
+        if not scores:
+            return 0.0
+        train = sum(s[0] for s in scores) / len(scores)
+        test = sum(s[1] for s in scores) / len(scores)
+        return test / train if train else 0.0
+
+
+# ============================================================================
+# Worker process
+# ============================================================================
+
+
+@dataclass
+class _WorkerState:
+    store: SharedCandleStore
+    strategy_cls: Type[BaseStrategy]
+    config: BacktestConfig
+    objective: str
+    maximize: bool
+    min_trades: int
+
+
+_worker: Optional[_WorkerState] = None
+
+
+def _init_worker(
+    spec: SharedCandleSpec,
+    strategy_cls: Type[BaseStrategy],
+    config: BacktestConfig,
+    objective: str,
+    maximize: bool,
+    min_trades: int,
+) -> None:
+    """Pool initializer: attach to the shared candles once per process"""
+    global _worker
+    _worker = _WorkerState(
+        SharedCandleStore.attach(spec),
+        strategy_cls,
+        config,
+        objective,
+        maximize,
+        min_trades,
+    )
+
+
+def _run_trial(task: Tuple[Params, Window]) -> TrialResult:
+    """Backtest one parameter set over one window (in a worker)"""
+    params, (replay_start, trade_start, end) = task
+    state = _worker
+    if state is None:
+        raise RuntimeError("Optimizer worker not initialized")
+    strategy_config, config = split_params(params, state.config)
+    config = replace(config, trade_start=trade_start)
+
+    backtester = Backtester(state.strategy_cls(config=strategy_config), config)
+    result = backtester.run(state.store.batches(replay_start, end))
+    return _summarize(params, result, state)
+
+
+def _summarize(
+    params: Params, result: BacktestResult, state: _WorkerState
+) -> TrialResult:
+    metrics = result.metrics
+    trades = result.trades
+    kelly_fraction, kelly_size = _kelly_sizing(trades)
+
+    score = float(getattr(metrics, state.objective))
+    if not state.maximize:
+        score = -score
+    if len(trades) < state.min_trades or math.isnan(score):
+        score = -math.inf
+
+    return TrialResult(
+        params=params,
+        score=score,
+        metrics=metrics,
+        trades=len(trades),
+        final_equity=result.final_equity,
+        kelly_fraction=kelly_fraction,
+        kelly_size_pct=kelly_size,
+        start=result.start,
+        end=result.end,
+        candles=result.candles,
+        elapsed_seconds=result.elapsed_seconds,
+    )
+
+
+def _kelly_sizing(trades: List[BacktestTrade]) -> Tuple[float, float]:
+    """Kelly fraction and position size recommended by a run's trades"""
+    if not trades:
+        return 0.0, 0.0
+    history = [
+        TradeResult(
+            symbol=trade.symbol,
+            entry_price=trade.entry_price,
+            exit_price=trade.exit_price,
+            quantity=trade.quantity,
+            pnl=trade.pnl,
+            is_win=trade.pnl > 0,
+            timestamp=trade.exit_time,
+        )
+        for trade in trades
+    ]
+    fraction = KellyPositionSizer().recommend_kelly_fraction(history)
+    sizing = KellyPositionSizer(
+        max_kelly_fraction=fraction
+    ).calculate_from_trade_history(history, Decimal("1"), lookback_days=None)
+    return fraction, float(sizing.recommended_size_chf)
+
+
+# ============================================================================
+# Optimizer
+# ============================================================================
+
+
+class ParameterOptimizer:
+    """
+    Parallel parameter search for a strategy
+
+    Attributes:
+        strategy_cls: Strategy class, constructed as strategy_cls(config=params)
+        store: Shared candle history
+        config: Base BacktestConfig the parameters override
+        objective: RiskMetrics attribute to optimize (e.g. 'sharpe_ratio')
+        maximize: Maximize the objective (False for e.g. 'max_drawdown_pct')
+        min_trades: Runs with fewer trades score -inf
+        max_workers: Worker processes
+
+    Example:
+        ```python
+        with SharedCandleStore.from_batches(CSVCandleSource(path, "BTC/USDT:USDT")) as store:
+            with ParameterOptimizer(MeanReversionStrategy, store) as optimizer:
+                results = optimizer.grid_search(
+                    {"rsi_oversold": [20, 25, 30], "rsi_overbought": [70, 75, 80]}
+                )
+        best = results[0].params
+        ```
+    """
+
+    def __init__(
+        self,
+        strategy_cls: Type[BaseStrategy],
+        store: SharedCandleStore,
+        config: Optional[BacktestConfig] = None,
+        objective: str = "sharpe_ratio",
+        maximize: bool = True,
+        min_trades: int = 1,
+        max_workers: Optional[int] = None,
+        mp_context: Optional[Any] = None,
+    ):
+        """
+        Initialize optimizer
+
+        Args:
+            strategy_cls: Strategy class (must be importable by workers)
+            store: Shared candle history
+            config: Base BacktestConfig (defaults if None)
+            objective: RiskMetrics attribute to optimize
+            maximize: Maximize (True) or minimize (False) the objective
+            min_trades: Minimum trades for a run to be scored
+            max_workers: Worker processes (default: CPU count)
+            mp_context: multiprocessing context for the pool
+
+        Raises:
+            ValueError: If objective is not a RiskMetrics field
+        """
+        if objective not in RiskMetrics.__dataclass_fields__:
+            raise ValueError(f"Unknown objective: {objective}")
+        self.strategy_cls = strategy_cls
+        self.store = store
+        self.config = config or BacktestConfig()
+        self.objective = objective
+        self.maximize = maximize
+        self.min_trades = min_trades
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.mp_context = mp_context
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Worker pool (started on first use, reused across searches)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self.mp_context,
+                initializer=_init_worker,
+                initargs=(
+                    self.store.spec,
+                    self.strategy_cls,
+                    self.config,
+                    self.objective,
+                    self.maximize,
+                    self.min_trades,
+                ),
+            )
+        return self._executor
+
+    def evaluate(
+        self,
+        configs: Sequence[Params],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        warmup: timedelta = timedelta(0),
+    ) -> List[TrialResult]:
+        """
+        Backtest parameter sets in parallel
+
+        Args:
+            configs: Parameter dicts
+            start: First traded bar (None for the start of the data)
+            end: End of the runs (exclusive, None for the end of the data)
+            warmup: History replayed before start to warm up indicators
+
+        Returns:
+            TrialResults, best score first
+        """
+        window = self._window(start, end, warmup)
+        results = self._map([(dict(params), window) for params in configs])
+        return sorted(results, key=lambda r: r.score, reverse=True)
+
+    def grid_search(
+        self, space: Mapping[str, Sequence[Any]], **kwargs: Any
+    ) -> List[TrialResult]:
+        """Evaluate every combination of a parameter grid (see evaluate)"""
+        return self.evaluate(grid_configs(space), **kwargs)
+
+    def random_search(
+        self,
+        space: Mapping[str, Any],
+        samples: int,
+        seed: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[TrialResult]:
+        """Evaluate random samples of a parameter space (see evaluate)"""
+        return self.evaluate(random_configs(space, samples, seed), **kwargs)
+
+    def walk_forward(
+        self,
+        configs: Sequence[Params],
+        train_period: timedelta,
+        test_period: timedelta,
+        warmup: timedelta = timedelta(hours=3),
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> WalkForwardResult:
+        """
+        Walk-forward optimization
+
+        Rolls a train_period + test_period window forward by test_period.
+        In each window every config is backtested in-sample, and the best one
+        is then run on the following test period.
+
+        Args:
+            configs: Candidate parameter dicts
+            train_period: In-sample period length
+            test_period: Out-of-sample period length (and window step)
+            warmup: History replayed before each period for the indicators
+            start: First training bar (None for the start of the data)
+            end: End of the last test period (None for the end of the data)
+
+        Returns:
+            WalkForwardResult
+        """
+        started = time.perf_counter()
+        first = start or self.store.start
+        last = end or self.store.end
+        result = WalkForwardResult()
+        if first is None or last is None:
+            return result
+
+        periods = []
+        train_start = first
+        while train_start + train_period + test_period <= last:
+            train_end = train_start + train_period
+            periods.append((train_start, train_end, train_end + test_period))
+            train_start += test_period
+
+        # All in-sample trials of all windows in one submission
+        tasks = [
+            (dict(params), self._window(train_start, train_end, warmup))
+            for train_start, train_end, _ in periods
+            for params in configs
+        ]
+        trials = self._map(tasks)
+        result.trials = len(trials)
+
+        best_trials = []
+        for index in range(len(periods)):
+            window_trials = trials[index * len(configs) : (index + 1) * len(configs)]
+            best_trials.append(max(window_trials, key=lambda r: r.score))
+
+        tests = self._map(
+            [
+                (best.params, self._window(train_end, test_end, warmup))
+                for best, (_, train_end, test_end) in zip(best_trials, periods)
+            ]
+        )
+        for (train_start, train_end, test_end), best, test in zip(
+            periods, best_trials, tests
+        ):
+            result.windows.append(
+                WalkForwardWindow(train_start, train_end, test_end, best, test)
+            )
+
+        result.elapsed_seconds = time.perf_counter() - started
+        logger.info(
+            f"Walk-forward: {len(periods)} windows, {result.trials} trials, "
+            f"out-of-sample return {result.out_of_sample_return_pct:.2f}% "
+            f"in {result.elapsed_seconds:.1f}s"
+        )
+        return result
+
+    def close(self) -> None:
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "ParameterOptimizer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _window(
+        self,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        warmup: timedelta,
+    ) -> Window:
+        if start is None:
+            return None, None, end
+        return start - warmup, start, end
+
+    def _map(self, tasks: List[Tuple[Params, Window]]) -> List[TrialResult]:
+        """Run tasks on the pool, results in task order"""
+        if not tasks:
+            return []
+        # A few chunks per worker balances load while amortizing IPC
+        chunksize = max(1, len(tasks) // (self.max_workers * 4))
+        started = time.perf_counter()
+        results = list(self.executor.map(_run_trial, tasks, chunksize=chunksize))
+        logger.info(
+            f"Ran {len(tasks)} backtests on {self.max_workers} workers "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        return results
+
+
+# Export
+__all__ = [
+    "ParameterOptimizer",
+    "TrialResult",
+    "WalkForwardResult",
+    "WalkForwardWindow",
+    "grid_configs",
+    "random_configs",
+    "split_params",
+    "INDICATOR_PARAMETERS",
+]
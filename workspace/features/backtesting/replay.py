@@ -0,0 +1,666 @@
+"""
+Market Data Replay
+
+Streams historical candles from the market_data hypertable or from CSV /
+Parquet files and turns them into the MarketDataSnapshots strategies see in
+live trading, as fast as the data can be read.
+
+Candles travel as columnar CandleBatch chunks (numpy arrays, timestamps in
+microseconds since epoch like the market_data table). MarketReplay resamples
+each chunk to the strategy timeframe with vectorized reductions, carrying only
+the unfinished bar into the next chunk, and feeds every closed bar through a
+StreamingIndicatorEngine. Memory per symbol is bounded by the indicator
+periods and the 24h ticker window, never by the length of the dataset.
+
+Author: Backtesting Team
+Date: 2025-11-22
+"""
+
+import heapq
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from workspace.features.market_data import (
+    OHLCV,
+    MarketDataSnapshot,
+    StreamingIndicatorEngine,
+    Ticker,
+    Timeframe,
+)
+from workspace.features.market_data.candle_aggregator import TIMEFRAME_SECONDS
+from workspace.features.market_data.ohlcv_buffer import (
+    float_to_decimal,
+    from_micros,
+    to_micros,
+)
+
+try:
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# Multipliers from integer epoch timestamps to microseconds
+_UNIT_MICROS = {"s": 1_000_000, "ms": 1_000, "us": 1}
+
+_DAY_SECONDS = 24 * 60 * 60
+_PCT = Decimal("0.0001")
+_ZERO = Decimal("0")
+
+
+class CandleBatch(NamedTuple):
+    """
+    Columnar chunk of candles
+
+    Batches of a stream are in timestamp order: every row of a batch is at or
+    after every row of the batches before it.
+
+    Attributes:
+        symbol: Trading pair per row (object array)
+        timestamp: Candle open time, microseconds since epoch (int64)
+        open: Open prices (float64)
+        high: High prices (float64)
+        low: Low prices (float64)
+        close: Close prices (float64)
+        volume: Base volumes (float64)
+    """
+
+    symbol: np.ndarray
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def take(self, rows: Union[slice, np.ndarray]) -> "CandleBatch":
+        """Subset of rows"""
+        return CandleBatch(*(column[rows] for column in self))
+
+
+def concat_batches(batches: Sequence[CandleBatch]) -> CandleBatch:
+    """Concatenate batches column by column"""
+    if len(batches) == 1:
+        return batches[0]
+    return CandleBatch(*(np.concatenate(columns) for columns in zip(*batches)))
+
+
+def _frame_to_batch(
+    frame: pd.DataFrame, symbol: Optional[str], timestamp_unit: str
+) -> CandleBatch:
+    """Convert a candle DataFrame chunk to a CandleBatch"""
+    timestamps = frame["timestamp"]
+    if pd.api.types.is_numeric_dtype(timestamps):
+        micros = timestamps.to_numpy(dtype=np.int64) * _UNIT_MICROS[timestamp_unit]
+    else:
+        micros = (
+            pd.to_datetime(timestamps, utc=True)
+            .dt.tz_convert(None)
+            .to_numpy(dtype="datetime64[us]")
+            .astype(np.int64)
+        )
+
+    if "symbol" in frame.columns:
+        symbols = frame["symbol"].to_numpy(dtype=object)
+    elif symbol is not None:
+        symbols = np.full(len(frame), symbol, dtype=object)
+    else:
+        raise ValueError("Candle data has no symbol column and no symbol was given")
+
+    return CandleBatch(
+        symbols,
+        micros,
+        *(frame[name].to_numpy(dtype=np.float64) for name in _COLUMNS[1:]),
+    )
+
+
+class CSVCandleSource:
+    """
+    Candles from a CSV file, read in fixed-size chunks
+
+    Expects timestamp, open, high, low, close and volume columns, plus a
+    symbol column unless the file holds a single symbol. Timestamps are ISO
+    strings or integer epoch times in timestamp_unit. Rows must be sorted by
+    timestamp.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        symbol: Optional[str] = None,
+        timestamp_unit: str = "ms",
+        chunk_size: int = 100_000,
+    ):
+        """
+        Initialize CSV candle source
+
+        Args:
+            path: CSV file path
+            symbol: Symbol for files without a symbol column
+            timestamp_unit: Unit of integer timestamps ('s', 'ms' or 'us')
+            chunk_size: Rows per batch
+        """
+        self.path = Path(path)
+        self.symbol = symbol
+        self.timestamp_unit = timestamp_unit
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[CandleBatch]:
+        with pd.read_csv(self.path, chunksize=self.chunk_size) as reader:
+            for frame in reader:
+                yield _frame_to_batch(frame, self.symbol, self.timestamp_unit)
+
+
+class ParquetCandleSource:
+    """
+    Candles from a Parquet file, read one record batch at a time
+
+    Same column layout as CSVCandleSource. Requires pyarrow.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        symbol: Optional[str] = None,
+        timestamp_unit: str = "ms",
+        chunk_size: int = 100_000,
+    ):
+        """
+        Initialize Parquet candle source
+
+        Args:
+            path: Parquet file path
+            symbol: Symbol for files without a symbol column
+            timestamp_unit: Unit of integer timestamps ('s', 'ms' or 'us')
+            chunk_size: Rows per batch
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError(
+                "pyarrow is required for Parquet replay. "
+                "Install with: pip install pyarrow"
+            )
+        self.path = Path(path)
+        self.symbol = symbol
+        self.timestamp_unit = timestamp_unit
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[CandleBatch]:
+        parquet = pq.ParquetFile(self.path)
+        names = set(parquet.schema_arrow.names)
+        columns = [name for name in ("symbol",) + _COLUMNS if name in names]
+        for record_batch in parquet.iter_batches(
+            batch_size=self.chunk_size, columns=columns
+        ):
+            yield _frame_to_batch(
+                record_batch.to_pandas(), self.symbol, self.timestamp_unit
+            )
+
+
+class DatabaseCandleSource:
+    """
+    Candles from the market_data hypertable
+
+    Pages through (timestamp, symbol) with keyset pagination so each query is
+    an index range scan and only one page is held in memory.
+    """
+
+    def __init__(
+        self,
+        pool: Any,
+        symbols: Sequence[str],
+        timeframe: Timeframe = Timeframe.M1,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        page_size: int = 50_000,
+    ):
+        """
+        Initialize database candle source
+
+        Args:
+            pool: asyncpg connection pool
+            symbols: Symbols to replay (stored format, e.g. 'BTC/USDT:USDT')
+            timeframe: Stored candle timeframe
+            start: First candle time (inclusive, None for all history)
+            end: Last candle time (exclusive, None for all history)
+            page_size: Rows per query
+        """
+        self.pool = pool
+        self.symbols = list(symbols)
+        self.timeframe = Timeframe(timeframe)
+        self.start = start
+        self.end = end
+        self.page_size = page_size
+
+    async def __aiter__(self) -> AsyncIterable[CandleBatch]:
+        cursor: Tuple[int, str] = (
+            to_micros(self.start) if self.start is not None else -(2**62),
+            "",
+        )
+        end = to_micros(self.end) if self.end is not None else 2**62
+
+        while True:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT symbol, timestamp, open, high, low, close, volume
+                    FROM market_data
+                    WHERE symbol = ANY($1) AND timeframe = $2
+                      AND (timestamp, symbol) > ($3, $4) AND timestamp < $5
+                    ORDER BY timestamp, symbol
+                    LIMIT $6
+                    """,
+                    self.symbols,
+                    self.timeframe.value,
+                    cursor[0],
+                    cursor[1],
+                    end,
+                    self.page_size,
+                )
+            if not rows:
+                return
+
+            count = len(rows)
+            yield CandleBatch(
+                np.array([row["symbol"] for row in rows], dtype=object),
+                np.fromiter((row["timestamp"] for row in rows), np.int64, count),
+                *(
+                    np.fromiter((float(row[name]) for row in rows), np.float64, count)
+                    for name in _COLUMNS[1:]
+                ),
+            )
+            if count < self.page_size:
+                return
+            cursor = (rows[-1]["timestamp"], rows[-1]["symbol"])
+
+
+def interleave(sources: Iterable[Iterable[CandleBatch]]) -> Iterator[CandleBatch]:
+    """
+    Merge timestamp-ordered candle streams (e.g. one file per symbol)
+
+    Holds one batch per stream and emits, round by round, every buffered row
+    up to the earliest batch end, so the output is a single timestamp-ordered
+    stream.
+    """
+    streams = [iter(source) for source in sources]
+    heads: Dict[int, CandleBatch] = {}
+
+    def refill(index: int) -> None:
+        for batch in streams[index]:
+            if len(batch):
+                heads[index] = batch
+                return
+        heads.pop(index, None)
+
+    for index in range(len(streams)):
+        refill(index)
+
+    while heads:
+        cutoff = min(int(batch.timestamp[-1]) for batch in heads.values())
+        parts = []
+        for index, batch in list(heads.items()):
+            split = int(np.searchsorted(batch.timestamp, cutoff, side="right"))
+            if split:
+                parts.append(batch.take(slice(0, split)))
+            if split == len(batch):
+                refill(index)
+            else:
+                heads[index] = batch.take(slice(split, None))
+
+        merged = concat_batches(parts)
+        yield merged.take(np.argsort(merged.timestamp, kind="stable"))
+
+
+class _SymbolReplay:
+    """Resampling carry, indicator state and 24h ticker window for one symbol"""
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframe: str,
+        step: int,
+        indicator_config: Dict[str, Any],
+    ):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.step = step
+        self.engine = StreamingIndicatorEngine(symbol, timeframe, **indicator_config)
+        self.pending: Optional[CandleBatch] = None  # Rows of unfinished bars
+
+        # Rolling 24h window: (open, volume, quote volume) per bar, running
+        # volume sums and monotonic (index, price) deques for high and low
+        self.window = max(1, _DAY_SECONDS * 1_000_000 // step)
+        self.bars: Deque[Tuple[float, float, float]] = deque()
+        self.highs: Deque[Tuple[int, float]] = deque()
+        self.lows: Deque[Tuple[int, float]] = deque()
+        self.volume_24h = 0.0
+        self.quote_volume_24h = 0.0
+        self.index = 0
+
+    def add(self, rows: CandleBatch) -> None:
+        if self.pending is None:
+            self.pending = rows
+        else:
+            self.pending = concat_batches([self.pending, rows])
+
+    def closed_bars(self, end: int) -> List[Tuple]:
+        """
+        Resample the pending rows of bars that close at or before end
+
+        Args:
+            end: Bar boundary, microseconds since epoch
+
+        Returns:
+            (timestamp, symbol, open, high, low, close, volume) per bar
+        """
+        pending = self.pending
+        if pending is None:
+            return []
+        count = int(np.searchsorted(pending.timestamp, end))
+        if count == 0:
+            return []
+
+        timestamps = pending.timestamp[:count]
+        buckets = timestamps - timestamps % self.step
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], count] - 1
+        bars = list(
+            zip(
+                buckets[starts].tolist(),
+                [self.symbol] * len(starts),
+                pending.open[starts].tolist(),
+                np.maximum.reduceat(pending.high[:count], starts).tolist(),
+                np.minimum.reduceat(pending.low[:count], starts).tolist(),
+                pending.close[ends].tolist(),
+                np.add.reduceat(pending.volume[:count], starts).tolist(),
+            )
+        )
+        # Copy the (small) remainder so the consumed chunk can be freed
+        self.pending = (
+            CandleBatch(*(column[count:].copy() for column in pending))
+            if count < len(pending)
+            else None
+        )
+        return bars
+
+    def snapshot(
+        self,
+        timestamp: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> MarketDataSnapshot:
+        """Advance indicators and the 24h ticker window by one closed bar"""
+        candle = OHLCV.model_construct(
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+            timestamp=from_micros(timestamp, None),
+            open=float_to_decimal(open_),
+            high=float_to_decimal(high),
+            low=float_to_decimal(low),
+            close=float_to_decimal(close),
+            volume=float_to_decimal(volume),
+            quote_volume=None,
+            trades_count=None,
+        )
+        self.engine.update(candle)
+        self.engine.close_bar()
+        indicators = self.engine.indicators()
+
+        self._roll(open_, high, low, close, volume)
+        closed_at = from_micros(timestamp + self.step, None)
+        open_24h = float_to_decimal(self.bars[0][0])
+        change = candle.close - open_24h
+        ticker = Ticker.model_construct(
+            symbol=self.symbol,
+            timestamp=closed_at,
+            bid=candle.close,
+            ask=candle.close,
+            last=candle.close,
+            high_24h=float_to_decimal(self.highs[0][1]),
+            low_24h=float_to_decimal(self.lows[0][1]),
+            volume_24h=float_to_decimal(max(self.volume_24h, 0.0)),
+            quote_volume_24h=float_to_decimal(max(self.quote_volume_24h, 0.0)),
+            change_24h=change,
+            change_24h_pct=(
+                (change / open_24h * 100).quantize(_PCT) if open_24h else _ZERO
+            ),
+        )
+
+        return MarketDataSnapshot.model_construct(
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+            timestamp=closed_at,
+            ohlcv=candle,
+            ticker=ticker,
+            rsi=indicators["rsi"],
+            macd=indicators["macd"],
+            ema_fast=indicators["ema_fast"],
+            ema_slow=indicators["ema_slow"],
+            bollinger=indicators["bollinger"],
+            additional_data={},
+        )
+
+    def _roll(
+        self, open_: float, high: float, low: float, close: float, volume: float
+    ) -> None:
+        """Push a bar into the 24h window and expire the oldest"""
+        index = self.index
+        self.index += 1
+        quote_volume = volume * close
+        self.bars.append((open_, volume, quote_volume))
+        self.volume_24h += volume
+        self.quote_volume_24h += quote_volume
+        if len(self.bars) > self.window:
+            _, old_volume, old_quote_volume = self.bars.popleft()
+            self.volume_24h -= old_volume
+            self.quote_volume_24h -= old_quote_volume
+
+        oldest = index - self.window
+        highs, lows = self.highs, self.lows
+        while highs and highs[-1][1] <= high:
+            highs.pop()
+        highs.append((index, high))
+        if highs[0][0] <= oldest:
+            highs.popleft()
+        while lows and lows[-1][1] >= low:
+            lows.pop()
+        lows.append((index, low))
+        if lows[0][0] <= oldest:
+            lows.popleft()
+
+
+class MarketReplay:
+    """
+    Replays candle batches as closed-bar MarketDataSnapshots
+
+    Resamples base candles (1m by default) to the strategy timeframe and
+    emits a snapshot per closed bar, ordered by (bar time, symbol) across
+    all symbols. A bar closes once the stream has moved past its end.
+
+    Attributes:
+        timeframe: Snapshot timeframe
+        base_timeframe: Timeframe of the replayed candles
+        candles: Base candles consumed
+        bars: Snapshots emitted
+
+    Example:
+        ```python
+        replay = MarketReplay(Timeframe.M3)
+        for snapshot in replay.replay(CSVCandleSource("btc_1m.csv", "BTC/USDT:USDT")):
+            signal = strategy.analyze(snapshot)
+        ```
+    """
+
+    def __init__(
+        self,
+        timeframe: Timeframe = Timeframe.M3,
+        base_timeframe: Timeframe = Timeframe.M1,
+        indicator_config: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize market replay
+
+        Args:
+            timeframe: Snapshot timeframe
+            base_timeframe: Timeframe of the replayed candles
+            indicator_config: StreamingIndicatorEngine keyword arguments
+                (rsi_period, bb_period, ...)
+
+        Raises:
+            ValueError: If timeframe is not a multiple of base_timeframe
+        """
+        self.timeframe = Timeframe(timeframe).value
+        self.base_timeframe = Timeframe(base_timeframe).value
+        seconds = TIMEFRAME_SECONDS[self.timeframe]
+        base_seconds = TIMEFRAME_SECONDS[self.base_timeframe]
+        if seconds < base_seconds or seconds % base_seconds:
+            raise ValueError(
+                f"Cannot replay {self.timeframe} from {self.base_timeframe} candles"
+            )
+        self._step = seconds * 1_000_000
+        self._base_step = base_seconds * 1_000_000
+        self.indicator_config = dict(indicator_config or {})
+
+        self._symbols: Dict[str, _SymbolReplay] = {}
+        self._last_timestamp: Optional[int] = None
+        self.candles = 0
+        self.bars = 0
+
+    @property
+    def bar_duration(self) -> timedelta:
+        """Length of one snapshot bar"""
+        return timedelta(microseconds=self._step)
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols seen so far"""
+        return list(self._symbols)
+
+    def feed(self, batch: CandleBatch) -> List[MarketDataSnapshot]:
+        """
+        Consume a candle batch
+
+        Args:
+            batch: Next batch of the timestamp-ordered stream
+
+        Returns:
+            Snapshots of the bars this batch closed
+        """
+        if not len(batch):
+            return []
+        self.candles += len(batch)
+
+        symbols = batch.symbol
+        if (symbols[0] == symbols).all():
+            self._state(symbols[0]).add(batch)
+        else:
+            order = np.argsort(symbols, kind="stable")
+            grouped = symbols[order]
+            starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+            for start, stop in zip(starts, np.r_[starts[1:], len(order)]):
+                self._state(grouped[start]).add(batch.take(order[start:stop]))
+
+        # Rows at the last timestamp may continue in the next batch
+        self._last_timestamp = int(batch.timestamp.max())
+        return self._close_bars(self._last_timestamp)
+
+    def finish(self) -> List[MarketDataSnapshot]:
+        """
+        End of stream: close every bar whose last base candle was seen
+
+        Returns:
+            Snapshots of the remaining closed bars (a trailing partial bar
+            is dropped)
+        """
+        if self._last_timestamp is None:
+            return []
+        return self._close_bars(self._last_timestamp + self._base_step)
+
+    def replay(self, batches: Iterable[CandleBatch]) -> Iterator[MarketDataSnapshot]:
+        """Snapshots for a whole candle stream"""
+        for batch in batches:
+            yield from self.feed(batch)
+        yield from self.finish()
+
+    async def replay_async(
+        self, batches: AsyncIterable[CandleBatch]
+    ) -> AsyncIterator[MarketDataSnapshot]:
+        """Snapshots for an asynchronous candle stream (e.g. the database)"""
+        async for batch in batches:
+            for snapshot in self.feed(batch):
+                yield snapshot
+        for snapshot in self.finish():
+            yield snapshot
+
+    def _state(self, symbol: str) -> _SymbolReplay:
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = _SymbolReplay(
+                symbol, self.timeframe, self._step, self.indicator_config
+            )
+            self._symbols[symbol] = state
+        return state
+
+    def _close_bars(self, watermark: int) -> List[MarketDataSnapshot]:
+        """Snapshots of all bars complete below watermark, in (time, symbol) order"""
+        end = watermark - watermark % self._step
+        per_symbol = [
+            bars
+            for bars in (state.closed_bars(end) for state in self._symbols.values())
+            if bars
+        ]
+        if not per_symbol:
+            return []
+
+        snapshots = []
+        for timestamp, symbol, *prices in heapq.merge(*per_symbol):
+            snapshots.append(self._symbols[symbol].snapshot(timestamp, *prices))
+        self.bars += len(snapshots)
+        return snapshots
+
+
+# Export
+__all__ = [
+    "CandleBatch",
+    "CSVCandleSource",
+    "ParquetCandleSource",
+    "DatabaseCandleSource",
+    "MarketReplay",
+    "interleave",
+    "concat_batches",
+    "PYARROW_AVAILABLE",
+]
@@ -3,15 +3,25 @@ Redis Caching Service
 
 Provides caching layer for market data and LLM responses with Redis backend.
 
+In Redis mode a bounded in-process LRU/TTL cache (L1) sits in front of
+Redis (L2): hot keys are served from process memory without a network
+round trip or JSON decode. Writes and deletes are published on a Redis
+pub/sub channel so other worker processes drop their L1 copies.
+
 Author: Trading System Implementation Team & Infrastructure Specialist
 Date: 2025-10-28
 """
 
+import asyncio
+import fnmatch
 import json
 import logging
 import hashlib
+import time
+import uuid
+from collections import OrderedDict
 from decimal import Decimal
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 
 # Optional redis import (only needed for production)
 try:
@@ -24,6 +34,89 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+def _normalize(value: Any) -> Any:
+    """Value as a Redis round trip returns it (JSON types, Decimal -> str)"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return json.loads(json.dumps(value, default=str))
+
+
+def _glob_pattern(pattern: str) -> str:
+    """Glob for clear(); a pattern without glob characters is a key prefix"""
+    if any(char in pattern for char in "*?["):
+        return pattern
+    return pattern + "*"
+
+
+class _LocalCache:
+    """Bounded in-process LRU cache with per-entry expiry (monotonic clock)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return _MISSING
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: str) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def pop_matching(self, pattern: str) -> int:
+        """Drop keys matching a Redis-style glob pattern"""
+        keys = [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> int:
+        count = len(self._entries)
+        self._entries.clear()
+        return count
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_percent": (self.hits / total * 100) if total > 0 else 0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
 
 class CacheService:
     """
@@ -34,7 +127,9 @@ class CacheService:
     - LLM responses (signals, reasoning)
     - Exchange data (balances, positions)
 
-    Uses Redis for distributed caching with in-memory fallback.
+    Uses Redis for distributed caching with in-memory fallback. In Redis
+    mode, reads are served from a local L1 cache first; values returned
+    from L1 are shared between callers and must be treated as read-only.
     """
 
     def __init__(
@@ -45,6 +140,9 @@ class CacheService:
         redis_db: int = 0,
         default_ttl_seconds: int = 300,
         enabled: bool = True,
+        l1_max_entries: int = 10_000,
+        l1_ttl_seconds: float = 30.0,
+        invalidation_channel: str = INVALIDATION_CHANNEL,
     ):
         """
         Initialize cache service
@@ -56,6 +154,11 @@ class CacheService:
             redis_db: Redis database number
             default_ttl_seconds: Default TTL for cached entries
             enabled: Whether caching is enabled
+            l1_max_entries: Capacity of the in-process L1 cache in Redis
+                mode, least recently used keys are evicted (0 disables L1)
+            l1_ttl_seconds: Upper bound on L1 entry lifetime, bounding
+                staleness if an invalidation message is lost
+            invalidation_channel: Redis pub/sub channel for L1 invalidation
         """
         self.use_redis = use_redis
         self.redis_host = redis_host
@@ -63,6 +166,16 @@ class CacheService:
         self.redis_db = redis_db
         self.default_ttl_seconds = default_ttl_seconds
         self.enabled = enabled
+        self.l1_ttl_seconds = l1_ttl_seconds
+        self.invalidation_channel = invalidation_channel
+        self.instance_id = uuid.uuid4().hex
+
+        # L1: in-process cache in front of Redis
+        self._l1: Optional[_LocalCache] = (
+            _LocalCache(l1_max_entries) if use_redis and l1_max_entries > 0 else None
+        )
+        self._l2_stats = {"hits": 0, "misses": 0, "errors": 0}
+        self._listener_task: Optional[asyncio.Task] = None
 
         # In-memory fallback cache
         self._cache: dict[str, Any] = {}
@@ -84,6 +197,13 @@ class CacheService:
         )
         logger.info(f"Cache Service initialized ({storage_mode} mode)")
 
+    async def _redis(self):
+        """Redis manager, starting the invalidation listener on first use"""
+        redis = await get_redis()
+        if self._l1 is not None and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._invalidation_loop())
+        return redis
+
     async def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache
@@ -97,22 +217,42 @@ class CacheService:
         if not self.enabled:
             return None
 
+        # L1: in-process, no round trip or decode
+        if self._l1 is not None:
+            value = self._l1.get(key)
+            if value is not _MISSING:
+                self.stats["hits"] += 1
+                return value
+
         # Try Redis first
         if self.use_redis:
             try:
-                redis = await get_redis()
-                value = await redis.get(key)
+                redis = await self._redis()
+                if self._l1 is not None:
+                    value, remaining = await redis.get_with_ttl(key)
+                else:
+                    value, remaining = await redis.get(key), None
 
                 if value is not None:
                     self.stats["hits"] += 1
+                    self._l2_stats["hits"] += 1
+                    if self._l1 is not None:
+                        # Never keep the copy past the Redis entry's expiry
+                        l1_ttl = self.l1_ttl_seconds
+                        if remaining is not None:
+                            l1_ttl = min(remaining, l1_ttl)
+                        if l1_ttl > 0:
+                            self._l1.set(key, value, l1_ttl)
                     logger.debug(f"Cache hit (Redis): {key}")
                     return value
                 else:
                     self.stats["misses"] += 1
+                    self._l2_stats["misses"] += 1
                     logger.debug(f"Cache miss (Redis): {key}")
                     return None
 
             except Exception as e:
+                self._l2_stats["errors"] += 1
                 logger.warning(f"Redis error, falling back to memory: {e}")
                 # Fall through to in-memory fallback
 
@@ -141,18 +281,23 @@ class CacheService:
 
         ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds
 
+        if self._l1 is not None:
+            self._l1.set(key, _normalize(value), min(ttl, self.l1_ttl_seconds))
+
         # Try Redis first
         if self.use_redis:
             try:
-                redis = await get_redis()
+                redis = await self._redis()
                 success = await redis.set(key, value, ttl_seconds=ttl)
 
                 if success:
                     self.stats["sets"] += 1
+                    await self._publish_invalidation(redis, key=key)
                     logger.debug(f"Cache set (Redis): {key} (TTL: {ttl}s)")
                     return True
 
             except Exception as e:
+                self._l2_stats["errors"] += 1
                 logger.warning(f"Redis error, falling back to memory: {e}")
                 # Fall through to in-memory fallback
 
@@ -173,13 +318,26 @@ class CacheService:
             return False
 
         try:
+            deleted = self._l1.pop(key) if self._l1 is not None else False
+
+            if self.use_redis:
+                try:
+                    redis = await self._redis()
+                    deleted = await redis.delete(key) or deleted
+                    await self._publish_invalidation(redis, key=key)
+                except Exception as e:
+                    self._l2_stats["errors"] += 1
+                    logger.warning(f"Redis error, deleting from memory only: {e}")
+
             if key in self._cache:
                 del self._cache[key]
                 if key in self._ttl:
                     del self._ttl[key]
+                deleted = True
+
+            if deleted:
                 self.stats["deletes"] += 1
-                return True
-            return False
+            return deleted
 
         except Exception as e:
             logger.error(f"Cache delete error for key '{key}': {e}", exc_info=True)
@@ -203,7 +361,8 @@ class CacheService:
         Clear cache entries
 
         Args:
-            pattern: Optional pattern to match keys (e.g., "market_data:*")
+            pattern: Optional Redis-style glob (e.g., "market_data:*"); a
+                pattern without glob characters is treated as a key prefix
 
         Returns:
             Number of keys deleted
@@ -212,20 +371,36 @@ class CacheService:
             return 0
 
         try:
-            if pattern is None:
-                # Clear all
-                count = len(self._cache)
-                self._cache.clear()
-                self._ttl.clear()
-                return count
+            pattern = _glob_pattern(pattern or "*")
+            if self._l1 is not None:
+                if pattern == "*":
+                    self._l1.clear()
+                else:
+                    self._l1.pop_matching(pattern)
+
+            # Fallback memory tier, matched with the same glob semantics
+            if pattern == "*":
+                keys_to_delete = list(self._cache)
             else:
-                # Clear by pattern (simple prefix match)
                 keys_to_delete = [
-                    k for k in self._cache.keys() if k.startswith(pattern.rstrip("*"))
+                    k for k in self._cache if fnmatch.fnmatchcase(k, pattern)
                 ]
-                for key in keys_to_delete:
-                    await self.delete(key)
-                return len(keys_to_delete)
+            for key in keys_to_delete:
+                del self._cache[key]
+                self._ttl.pop(key, None)
+            self.stats["deletes"] += len(keys_to_delete)
+
+            if self.use_redis:
+                try:
+                    redis = await self._redis()
+                    count = await redis.clear(pattern)
+                    await self._publish_invalidation(redis, pattern=pattern)
+                    return int(count)
+                except Exception as e:
+                    self._l2_stats["errors"] += 1
+                    logger.warning(f"Redis error, clearing memory only: {e}")
+
+            return len(keys_to_delete)
 
         except Exception as e:
             logger.error(f"Cache clear error: {e}", exc_info=True)
@@ -250,8 +425,96 @@ class CacheService:
             "hit_rate_percent": hit_rate,  # Also provide as float
             "cache_size": len(self._cache),
             "enabled": self.enabled,
+            "backend": (
+                "redis"
+                if self.use_redis and self.enabled
+                else "memory" if self.enabled else "disabled"
+            ),
+            "tiers": {
+                "l1": self._l1.stats() if self._l1 is not None else None,
+                "l2": self._l2_stats_snapshot() if self.use_redis else None,
+            },
         }
 
+    def _l2_stats_snapshot(self) -> dict[str, Any]:
+        total = self._l2_stats["hits"] + self._l2_stats["misses"]
+        return {
+            **self._l2_stats,
+            "hit_rate_percent": (
+                (self._l2_stats["hits"] / total * 100) if total > 0 else 0
+            ),
+        }
+
+    # ========================================================================
+    # L1 Invalidation (Redis pub/sub)
+    # ========================================================================
+
+    async def _publish_invalidation(
+        self, redis, key: Optional[str] = None, pattern: Optional[str] = None
+    ) -> None:
+        """Tell other processes to drop their L1 copies"""
+        if self._l1 is None:
+            return
+        message = {"origin": self.instance_id, "key": key, "pattern": pattern}
+        await redis.publish(self.invalidation_channel, message)
+
+    def _apply_invalidation(self, data: Any) -> None:
+        """Drop L1 entries named by an invalidation message"""
+        if self._l1 is None:
+            return
+        message = json.loads(data)
+        if message.get("origin") == self.instance_id:
+            return
+
+        if message.get("key") is not None:
+            dropped = int(self._l1.pop(message["key"]))
+        elif message.get("pattern") in (None, "*"):
+            dropped = self._l1.clear()
+        else:
+            dropped = self._l1.pop_matching(message["pattern"])
+        self._l1.invalidations += dropped
+
+    async def _invalidation_loop(self) -> None:
+        """Apply invalidations from other processes, resubscribing on errors"""
+        retry_delay = 1.0
+        resubscribing = False
+        while True:
+            pubsub = None
+            try:
+                redis = await get_redis()
+                pubsub = await redis.subscribe(self.invalidation_channel)
+                if resubscribing and self._l1 is not None:
+                    # Writes missed while unsubscribed may have left stale entries
+                    self._l1.clear()
+                retry_delay = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error: {e}")
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+            resubscribing = True
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 30.0)
+
+    async def close(self) -> None:
+        """Stop the L1 invalidation listener"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
     @staticmethod
     def generate_key(*args: Any, prefix: str = "") -> str:
         """
@@ -8,11 +8,30 @@ Author: Decision Engine Implementation Team
 Date: 2025-10-28
 """
 
+from .decision_cache import SemanticDecisionCache
 from .llm_engine import LLMDecisionEngine, LLMProvider
-from .prompt_builder import PromptBuilder
+from .prompt_builder import PromptBuilder, PromptLayout
+from .request_control import LLMRateLimiter, RequestCoalescer, TokenBucket
+from .tokenizer import (
+    CharRatioTokenizer,
+    TiktokenTokenizer,
+    Tokenizer,
+    WhitespaceTokenizer,
+    get_tokenizer,
+)
 
 __all__ = [
+    "CharRatioTokenizer",
     "LLMDecisionEngine",
     "LLMProvider",
+    "LLMRateLimiter",
     "PromptBuilder",
+    "PromptLayout",
+    "RequestCoalescer",
+    "SemanticDecisionCache",
+    "TiktokenTokenizer",
+    "TokenBucket",
+    "Tokenizer",
+    "WhitespaceTokenizer",
+    "get_tokenizer",
 ]
@@ -0,0 +1,326 @@
+"""
+Semantic Decision Cache
+
+Per-symbol cache of LLM decisions keyed on a normalized market-state feature
+vector instead of an exact hash. A cached decision is reused when the
+symbol's current state lies within configurable tolerances of a recent
+state the LLM already decided on, so in quiet markets only the symbols
+that actually moved need to be prompted.
+
+Features (each divided by its tolerance, so 1.0 = one tolerance step):
+- log price (tolerance: relative price change)
+- RSI value (tolerance: RSI points)
+- MACD line and histogram as a fraction of price
+- Fast/slow EMA spread as a fraction of price
+- Position of price within the Bollinger Bands (%B)
+
+A lookup is a vectorized nearest-neighbour scan over the symbol's live
+entries using the Chebyshev (max-abs) distance; it hits only if every
+feature is within its tolerance. Entries expire after ttl_seconds and
+each bucket holds at most max_entries_per_symbol states, so the scan is
+bounded. Missing indicators only match entries that are missing them too.
+
+Usage:
+    cache = SemanticDecisionCache(ttl_seconds=600)
+    payload = cache.lookup("BTCUSDT", snapshot)
+    if payload is None:
+        cache.store("BTCUSDT", snapshot, payload=serialized_signal)
+
+Author: Decision Engine Implementation Team
+Date: 2025-11-14
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from workspace.features.market_data import MarketDataSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SemanticCacheConfig:
+    """Tolerances and limits for the semantic decision cache"""
+
+    ttl_seconds: float = 600.0
+    price_tolerance_pct: float = 0.002  # 0.2% price move
+    rsi_tolerance: float = 2.5  # RSI points
+    macd_tolerance_pct: float = 0.0002  # MACD as fraction of price
+    ema_spread_tolerance_pct: float = 0.0005  # EMA spread as fraction of price
+    bollinger_tolerance: float = 0.1  # %B (0 = lower band, 1 = upper band)
+    max_entries_per_symbol: int = 32
+
+
+class _Bucket:
+    """Live entries for one (symbol, context) pair"""
+
+    def __init__(self, dimensions: int):
+        self.features: np.ndarray = np.empty((0, dimensions), dtype=np.float64)
+        self.expires_at: np.ndarray = np.empty(0, dtype=np.float64)
+        self.payloads: List[Dict[str, Any]] = []
+
+    def prune(self, now: float) -> int:
+        """Drop expired entries, returning how many were removed"""
+        live = self.expires_at > now
+        removed = len(self.payloads) - int(live.sum())
+        if removed:
+            self.features = self.features[live]
+            self.expires_at = self.expires_at[live]
+            self.payloads = [p for p, keep in zip(self.payloads, live) if keep]
+        return removed
+
+
+class SemanticDecisionCache:
+    """
+    Nearest-neighbour cache of per-symbol LLM decisions
+
+    Payloads are opaque JSON-compatible dicts (the engine stores serialized
+    signals); a hit returns a copy of the nearest entry's payload.
+
+    Attributes:
+        config: Cache tolerances and limits
+    """
+
+    # Number of features in the state vector
+    DIMENSIONS = 6
+
+    def __init__(
+        self,
+        ttl_seconds: float = 600.0,
+        price_tolerance_pct: float = 0.002,
+        rsi_tolerance: float = 2.5,
+        macd_tolerance_pct: float = 0.0002,
+        ema_spread_tolerance_pct: float = 0.0005,
+        bollinger_tolerance: float = 0.1,
+        max_entries_per_symbol: int = 32,
+    ):
+        """
+        Initialize semantic decision cache
+
+        Args:
+            ttl_seconds: Lifetime of a cached decision (default: 600)
+            price_tolerance_pct: Max relative price change (default: 0.002)
+            rsi_tolerance: Max RSI difference in points (default: 2.5)
+            macd_tolerance_pct: Max MACD line/histogram difference as a
+                fraction of price (default: 0.0002)
+            ema_spread_tolerance_pct: Max EMA fast/slow spread difference as
+                a fraction of price (default: 0.0005)
+            bollinger_tolerance: Max %B difference (default: 0.1)
+            max_entries_per_symbol: States kept per symbol (default: 32)
+        """
+        if ttl_seconds <= 0:
+            raise ValueError(f"ttl_seconds must be positive, got {ttl_seconds}")
+        if max_entries_per_symbol < 1:
+            raise ValueError(
+                f"max_entries_per_symbol must be >= 1, got {max_entries_per_symbol}"
+            )
+
+        self.config = SemanticCacheConfig(
+            ttl_seconds=ttl_seconds,
+            price_tolerance_pct=price_tolerance_pct,
+            rsi_tolerance=rsi_tolerance,
+            macd_tolerance_pct=macd_tolerance_pct,
+            ema_spread_tolerance_pct=ema_spread_tolerance_pct,
+            bollinger_tolerance=bollinger_tolerance,
+            max_entries_per_symbol=max_entries_per_symbol,
+        )
+        # log(1 + x) so the price tolerance is a relative move
+        self._scale = np.array(
+            [
+                math.log1p(price_tolerance_pct),
+                rsi_tolerance,
+                macd_tolerance_pct,
+                macd_tolerance_pct,
+                ema_spread_tolerance_pct,
+                bollinger_tolerance,
+            ],
+            dtype=np.float64,
+        )
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._expired = 0
+        self._evicted = 0
+
+    def features(self, snapshot: MarketDataSnapshot) -> Optional[np.ndarray]:
+        """
+        Build the normalized feature vector for a snapshot
+
+        Args:
+            snapshot: Market data snapshot
+
+        Returns:
+            Feature vector (NaN for missing indicators), or None if the
+            snapshot has no usable price
+        """
+        price = float(snapshot.ticker.last) if snapshot.ticker else 0.0
+        if price <= 0:
+            return None
+
+        raw = np.full(self.DIMENSIONS, np.nan, dtype=np.float64)
+        raw[0] = math.log(price)
+
+        if snapshot.rsi is not None:
+            raw[1] = float(snapshot.rsi.value)
+        if snapshot.macd is not None:
+            raw[2] = float(snapshot.macd.macd_line) / price
+            raw[3] = float(snapshot.macd.histogram) / price
+        if snapshot.ema_fast is not None and snapshot.ema_slow is not None:
+            raw[4] = (
+                float(snapshot.ema_fast.value) - float(snapshot.ema_slow.value)
+            ) / price
+        if snapshot.bollinger is not None:
+            width = float(snapshot.bollinger.upper_band) - float(
+                snapshot.bollinger.lower_band
+            )
+            if width > 0:
+                raw[5] = (price - float(snapshot.bollinger.lower_band)) / width
+
+        return raw / self._scale
+
+    def lookup(
+        self,
+        symbol: str,
+        snapshot: MarketDataSnapshot,
+        context: str = "",
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the nearest live decision within tolerance
+
+        Args:
+            symbol: Trading pair
+            snapshot: Current market data snapshot for the symbol
+            context: Extra exact-match key (e.g. model and position side)
+
+        Returns:
+            Copy of the cached payload, or None on a miss
+        """
+        vector = self.features(snapshot)
+        bucket = self._buckets.get((symbol, context))
+        if vector is None or bucket is None:
+            self._misses += 1
+            return None
+
+        self._expired += bucket.prune(time.time())
+        if not bucket.payloads:
+            self._misses += 1
+            return None
+
+        distances = self._distances(bucket.features, vector)
+        nearest = int(np.argmin(distances))
+        if distances[nearest] > 1.0:
+            self._misses += 1
+            logger.debug(
+                f"Decision cache miss for {symbol} "
+                f"(nearest distance {distances[nearest]:.2f})"
+            )
+            return None
+
+        self._hits += 1
+        logger.debug(
+            f"Decision cache hit for {symbol} (distance {distances[nearest]:.2f})"
+        )
+        return dict(bucket.payloads[nearest])
+
+    def store(
+        self,
+        symbol: str,
+        snapshot: MarketDataSnapshot,
+        payload: Dict[str, Any],
+        context: str = "",
+    ) -> bool:
+        """
+        Cache a decision for the snapshot's market state
+
+        Args:
+            symbol: Trading pair
+            snapshot: Market data snapshot the decision was made on
+            payload: JSON-compatible decision data
+            context: Extra exact-match key (must match lookups)
+
+        Returns:
+            True if stored, False if the snapshot has no usable price
+        """
+        vector = self.features(snapshot)
+        if vector is None:
+            return False
+
+        key = (symbol, context)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self.DIMENSIONS)
+
+        now = time.time()
+        self._expired += bucket.prune(now)
+
+        bucket.features = np.vstack([bucket.features, vector])
+        bucket.expires_at = np.append(bucket.expires_at, now + self.config.ttl_seconds)
+        bucket.payloads.append(dict(payload))
+
+        # Oldest entries go first once the bucket is full
+        overflow = len(bucket.payloads) - self.config.max_entries_per_symbol
+        if overflow > 0:
+            bucket.features = bucket.features[overflow:]
+            bucket.expires_at = bucket.expires_at[overflow:]
+            del bucket.payloads[:overflow]
+            self._evicted += overflow
+
+        self._stores += 1
+        return True
+
+    def invalidate(self, symbol: Optional[str] = None) -> int:
+        """
+        Drop cached decisions
+
+        Args:
+            symbol: Only drop this symbol's decisions (default: all)
+
+        Returns:
+            Number of entries removed
+        """
+        keys = [key for key in self._buckets if symbol is None or key[0] == symbol]
+        removed = 0
+        for key in keys:
+            removed += len(self._buckets.pop(key).payloads)
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hits, misses, hit rate, stores and entry counts
+        """
+        total = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate_percent": round(self._hits / total * 100, 2) if total else 0.0,
+            "stores": self._stores,
+            "expired": self._expired,
+            "evicted": self._evicted,
+            "entries": sum(len(b.payloads) for b in self._buckets.values()),
+        }
+
+    @staticmethod
+    def _distances(features: np.ndarray, vector: np.ndarray) -> np.ndarray:
+        """Chebyshev distance from vector to each row of features"""
+        diff = np.abs(features - vector)
+        stored_missing = np.isnan(features)
+        query_missing = np.isnan(vector)
+        # Missing on both sides matches; missing on one side never does
+        diff[stored_missing & query_missing] = 0.0
+        diff[stored_missing ^ query_missing] = np.inf
+        distances: np.ndarray = diff.max(axis=1)
+        return distances
+
+
+# Export
+__all__ = ["SemanticDecisionCache", "SemanticCacheConfig"]
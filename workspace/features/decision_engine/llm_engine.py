@@ -4,14 +4,31 @@ LLM Decision Engine
 Integrates with LLM providers (OpenRouter) to generate trading decisions
 based on market data analysis.
 
+In streaming mode the completion is consumed as server-sent events and
+each per-symbol decision is parsed, and optionally handed to a callback,
+as soon as its JSON object is complete.
+
+With a SemanticDecisionCache, decisions are cached per symbol by market
+state; only symbols without a nearby cached decision are sent to the LLM.
+
+Upstream calls can be rate limited (LLMRateLimiter, with a priority lane
+for requests that may close positions) and coalesced (RequestCoalescer),
+so identical in-flight requests share one call within and across
+processes.
+
+Large symbol universes can be split into shards sized by a token budget;
+shards are prompted concurrently and a failed shard only falls back to
+HOLD for its own symbols.
+
 Author: Decision Engine Implementation Team
 Date: 2025-10-28
 """
 
+import asyncio
 import logging
 import json
 import hashlib
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from decimal import Decimal
 from enum import Enum
 from dataclasses import dataclass
@@ -22,11 +39,20 @@ from workspace.api.config import settings
 from workspace.features.market_data import MarketDataSnapshot
 from workspace.features.trading_loop import TradingSignal, TradingDecision
 from workspace.features.caching import CacheService
+from .decision_cache import SemanticDecisionCache
 from .prompt_builder import PromptBuilder
+from .request_control import LLMRateLimiter, RequestCoalescer
+from .stream_parser import SignalStreamParser
 
 
 logger = logging.getLogger(__name__)
 
+# Reasoning of HOLD signals filled in for symbols the LLM skipped
+NO_SIGNAL_REASONING = "No signal generated by LLM"
+
+# Reasoning of HOLD signals generated when the LLM call or parsing fails
+FALLBACK_REASONING = "Fallback signal - LLM error or invalid response"
+
 
 class LLMProvider(str, Enum):
     """Supported LLM providers"""
@@ -47,6 +73,10 @@ class LLMConfig:
     temperature: float = 0.7
     max_tokens: int = 2000
     timeout: float = 30.0
+    stream: bool = False
+    shard_token_budget: Optional[int] = None
+    shard_max_symbols: Optional[int] = None
+    max_concurrent_shards: int = 4
 
 
 class LLMDecisionEngine:
@@ -60,7 +90,10 @@ class LLMDecisionEngine:
     - OpenRouter API integration
     - Multi-model support (Claude, GPT-4, etc.)
     - Structured prompt engineering
-    - JSON response parsing
+    - JSON response parsing (batch or incremental over a streamed response)
+    - Response caching (whole prompt, or per symbol by market state)
+    - Rate limiting and coalescing of identical in-flight requests
+    - Sharded prompting for large symbol universes
     - Error handling and retry logic
 
     Attributes:
@@ -95,6 +128,14 @@ class LLMDecisionEngine:
         max_tokens: int = 2000,
         timeout: float = 30.0,
         cache_service: Optional[CacheService] = None,
+        stream: bool = False,
+        decision_cache: Optional[SemanticDecisionCache] = None,
+        rate_limiter: Optional[LLMRateLimiter] = None,
+        coalescer: Optional[RequestCoalescer] = None,
+        prompt_builder: Optional[PromptBuilder] = None,
+        shard_token_budget: Optional[int] = None,
+        shard_max_symbols: Optional[int] = None,
+        max_concurrent_shards: int = 4,
     ):
         """
         Initialize LLM Decision Engine
@@ -107,6 +148,21 @@ class LLMDecisionEngine:
             max_tokens: Maximum response tokens (default: 2000)
             timeout: Request timeout in seconds (default: 30.0)
             cache_service: Optional CacheService instance (default: creates new one)
+            stream: Stream the completion and parse signals incrementally
+                (default: False)
+            decision_cache: Optional per-symbol semantic cache; replaces the
+                whole-prompt cache when set (default: None)
+            rate_limiter: Optional provider rate limiter (default: None)
+            coalescer: Optional single-flight coalescer for identical
+                requests; not used in streaming mode (default: None)
+            prompt_builder: Prompt builder, e.g. with the compact layout
+                (default: verbose PromptBuilder)
+            shard_token_budget: Max input tokens per prompt; larger symbol
+                sets are split into shards (default: None = one prompt)
+            shard_max_symbols: Max symbols per prompt, bounding response
+                length (default: None = no limit)
+            max_concurrent_shards: Shard prompts in flight at once
+                (default: 4)
         """
         self.config = LLMConfig(
             provider=LLMProvider(provider),
@@ -115,9 +171,13 @@ class LLMDecisionEngine:
             temperature=temperature,
             max_tokens=max_tokens,
             timeout=timeout,
+            stream=stream,
+            shard_token_budget=shard_token_budget,
+            shard_max_symbols=shard_max_symbols,
+            max_concurrent_shards=max_concurrent_shards,
         )
 
-        self.prompt_builder = PromptBuilder()
+        self.prompt_builder = prompt_builder or PromptBuilder()
         self.client = httpx.AsyncClient(timeout=timeout)
 
         # Initialize cache service
@@ -126,12 +186,21 @@ class LLMDecisionEngine:
         else:
             self.cache = CacheService()
 
+        self.decision_cache = decision_cache
+        self.rate_limiter = rate_limiter
+        self.coalescer = coalescer
+
         logger.info("LLM Decision Engine initialized with caching")
 
     async def close(self):
         """Close HTTP client"""
         await self.client.aclose()
 
+    @property
+    def streaming(self) -> bool:
+        """Whether generate_signals dispatches signals while streaming"""
+        return self.config.stream
+
     def _generate_cache_key(
         self,
         snapshots: Dict[str, MarketDataSnapshot],
@@ -211,12 +280,28 @@ class LLMDecisionEngine:
         current_positions: Optional[Dict[str, Dict]] = None,
         risk_context: Optional[Dict] = None,
         use_cache: bool = True,
+        on_signal: Optional[Callable[[TradingSignal], Awaitable[None]]] = None,
+        priority: Optional[bool] = None,
     ) -> Dict[str, TradingSignal]:
         """
         Generate trading signals for all symbols with LLM response caching
 
         Cache TTL: Matches trading cycle interval (TRADING_CYCLE_INTERVAL_SECONDS)
 
+        With a decision cache, symbols whose market state is within tolerance
+        of a cached decision reuse it, and only the remaining symbols are
+        prompted; the results are merged.
+
+        With a shard token budget or symbol limit, the prompted symbols are
+        split into shards that run concurrently; a failed shard falls back
+        to HOLD for its own symbols only.
+
+        In streaming mode, on_signal is awaited with each signal as soon as
+        its JSON object has been received (before the completion finishes).
+        It runs inline with the stream reader, so it should schedule work
+        rather than perform it. Signals that were not dispatched (cache
+        hits, fallbacks, missing symbols) are only returned.
+
         Args:
             snapshots: Market data snapshots for each symbol
             capital_chf: Available trading capital
@@ -224,6 +309,9 @@ class LLMDecisionEngine:
             current_positions: Current open positions (optional)
             risk_context: Additional risk context (optional)
             use_cache: Whether to use cache (default: True)
+            on_signal: Async callback for early dispatch (streaming mode)
+            priority: Use the rate limiter's priority lane (default: when
+                any prompted symbol has an open position, i.e. may CLOSE)
 
         Returns:
             Dictionary mapping symbol to TradingSignal
@@ -234,128 +322,103 @@ class LLMDecisionEngine:
         import time
 
         start_time = time.time()
+        # Signals already handed to on_signal (kept if the stream fails)
+        dispatched: Dict[str, TradingSignal] = {}
+        # Signals reused from the per-symbol decision cache
+        cached: Dict[str, TradingSignal] = {}
+        use_decision_cache = use_cache and self.decision_cache is not None
 
         logger.info(f"Generating trading signals for {len(snapshots)} symbols")
 
         try:
-            # Generate cache key
-            cache_key = self._generate_cache_key(snapshots)
+            # Symbols that still need an LLM decision
+            prompt_snapshots = snapshots
+
+            if use_decision_cache:
+                cached = self._lookup_decisions(snapshots, current_positions)
+                prompt_snapshots = {
+                    symbol: snapshot
+                    for symbol, snapshot in snapshots.items()
+                    if symbol not in cached
+                }
+                if not prompt_snapshots:
+                    logger.info(f"Decision cache hit for all {len(cached)} symbols")
+                    return cached
+
+                logger.info(
+                    f"Decision cache hit for {len(cached)} symbols, "
+                    f"calling LLM for {len(prompt_snapshots)}"
+                )
+
+            elif use_cache:
+                # Generate cache key
+                cache_key = self._generate_cache_key(snapshots)
 
-            # Try cache first
-            if use_cache:
+                # Try cache first
                 cached_signals = await self.cache.get(cache_key)
                 if cached_signals is not None:
                     logger.info(f"LLM cache hit for {len(snapshots)} symbols")
 
                     # Reconstruct signals from cached data
-                    signals = {}
-                    for symbol, signal_data in cached_signals.items():
-                        signal = TradingSignal(
-                            symbol=signal_data["symbol"],
-                            decision=TradingDecision(signal_data["decision"]),
-                            confidence=Decimal(str(signal_data["confidence"])),
-                            size_pct=Decimal(str(signal_data["size_pct"])),
-                            stop_loss_pct=(
-                                Decimal(str(signal_data["stop_loss_pct"]))
-                                if signal_data.get("stop_loss_pct")
-                                else None
-                            ),
-                            take_profit_pct=(
-                                Decimal(str(signal_data["take_profit_pct"]))
-                                if signal_data.get("take_profit_pct")
-                                else None
-                            ),
-                            reasoning=signal_data.get("reasoning", ""),
-                            model_used=signal_data.get("model_used", ""),
-                            tokens_input=signal_data.get("tokens_input", 0),
-                            tokens_output=signal_data.get("tokens_output", 0),
-                            cost_usd=Decimal(str(signal_data.get("cost_usd", 0))),
-                            generation_time_ms=signal_data.get("generation_time_ms", 0),
-                        )
-                        signals[symbol] = signal
-
-                    # Add cache metadata
-                    for signal in signals.values():
-                        signal.from_cache = True
-
-                    return signals
-
-            # Cache miss - call LLM
-            logger.info(f"LLM cache miss for {len(snapshots)} symbols, calling LLM")
+                    return {
+                        symbol: self._deserialize_signal(signal_data)
+                        for symbol, signal_data in cached_signals.items()
+                    }
 
-            # Build prompt
-            prompt = self.prompt_builder.build_trading_prompt(
-                snapshots=snapshots,
-                capital_chf=capital_chf,
-                max_position_size_chf=max_position_size_chf,
-                current_positions=current_positions,
-                risk_context=risk_context,
-            )
+                # Cache miss - call LLM
+                logger.info(f"LLM cache miss for {len(snapshots)} symbols, calling LLM")
 
-            prompt_tokens = len(prompt.split())  # Rough estimate
-            logger.debug(
-                f"Prompt length: {len(prompt)} characters (~{prompt_tokens} tokens)"
+            # Split large universes into shards sized by token budget
+            shards = self._shard_snapshots(
+                prompt_snapshots,
+                capital_chf,
+                max_position_size_chf,
+                current_positions,
+                risk_context,
             )
-
-            # Call LLM and capture usage data
-            response_text, usage_data = await self._call_llm(prompt)
-
-            logger.debug(f"LLM response length: {len(response_text)} characters")
-
-            # Calculate generation time
-            generation_time_ms = int((time.time() - start_time) * 1000)
-
-            # Parse response
-            signals = self._parse_response(response_text, snapshots)
-
-            # Add observability fields to all signals
-            for signal in signals.values():
-                signal.model_used = self.config.model
-                signal.tokens_input = usage_data.get("prompt_tokens", prompt_tokens)
-                signal.tokens_output = usage_data.get(
-                    "completion_tokens", len(response_text.split())
+            if len(shards) == 1:
+                signals = await self._request_signals(
+                    prompt_snapshots,
+                    capital_chf,
+                    max_position_size_chf,
+                    current_positions,
+                    risk_context,
+                    dispatched,
+                    on_signal,
+                    start_time,
+                    priority,
+                )
+            else:
+                signals = await self._request_sharded(
+                    shards,
+                    capital_chf,
+                    max_position_size_chf,
+                    current_positions,
+                    risk_context,
+                    dispatched,
+                    on_signal,
+                    start_time,
+                    priority,
                 )
-                signal.generation_time_ms = generation_time_ms
-                signal.from_cache = False
-
-                # Calculate cost based on provider/model
-                if signal.tokens_input and signal.tokens_output:
-                    signal.cost_usd = self._calculate_cost(
-                        signal.tokens_input, signal.tokens_output, self.config.model
-                    )
 
-            logger.info(
-                f"Generated {len(signals)} trading signals "
-                f"(tokens: {usage_data.get('prompt_tokens', 0)}/{usage_data.get('completion_tokens', 0)}, "
-                f"cost: ${sum(s.cost_usd or Decimal('0') for s in signals.values()):.4f}, "
-                f"time: {generation_time_ms}ms)"
+            # Fallback HOLDs (failed shard or unparseable response) are not
+            # cached, so those symbols are prompted again next cycle
+            complete = not any(
+                signal.reasoning == FALLBACK_REASONING for signal in signals.values()
             )
 
+            if use_decision_cache:
+                # Cache each decision against its symbol's market state
+                self._store_decisions(signals, prompt_snapshots, current_positions)
+                signals.update(cached)
+
             # Cache the signals for one decision cycle
-            if use_cache:
+            elif use_cache and complete:
                 # Serialize signals for caching
-                serialized_signals = {}
-                for symbol, signal in signals.items():
-                    serialized_signals[symbol] = {
-                        "symbol": signal.symbol,
-                        "decision": signal.decision.value,
-                        "confidence": str(signal.confidence),
-                        "size_pct": str(signal.size_pct),
-                        "stop_loss_pct": (
-                            str(signal.stop_loss_pct) if signal.stop_loss_pct else None
-                        ),
-                        "take_profit_pct": (
-                            str(signal.take_profit_pct)
-                            if signal.take_profit_pct
-                            else None
-                        ),
-                        "reasoning": signal.reasoning or "",
-                        "model_used": signal.model_used or "",
-                        "tokens_input": signal.tokens_input or 0,
-                        "tokens_output": signal.tokens_output or 0,
-                        "cost_usd": str(signal.cost_usd) if signal.cost_usd else "0",
-                        "generation_time_ms": signal.generation_time_ms or 0,
-                    }
+                serialized_signals = {
+                    symbol: self._serialize_signal(signal)
+                    for symbol, signal in signals.items()
+                }
 
                 await self.cache.set(
                     cache_key,
@@ -368,8 +431,486 @@ class LLMDecisionEngine:
 
         except Exception as e:
             logger.error(f"Error generating signals: {e}", exc_info=True)
-            # Return HOLD signals on error (fail-safe)
-            return self._generate_fallback_signals(snapshots)
+            # Return HOLD signals on error (fail-safe), keeping any signals
+            # that were already dispatched from the stream or reused from the
+            # decision cache
+            signals = self._generate_fallback_signals(snapshots)
+            signals.update(cached)
+            signals.update(dispatched)
+            return signals
+
+    def _generate_request_key(
+        self,
+        snapshots: Dict[str, MarketDataSnapshot],
+        capital_chf: Decimal,
+        max_position_size_chf: Decimal,
+        current_positions: Optional[Dict[str, Dict]],
+        risk_context: Optional[Dict],
+    ) -> str:
+        """
+        Identity of an LLM request for coalescing
+
+        The prompt itself embeds the analysis time, so the key combines the
+        market-state cache key with the prompt's account and risk context.
+
+        Args:
+            snapshots: Snapshots being prompted
+            capital_chf: Available trading capital
+            max_position_size_chf: Maximum position size per trade
+            current_positions: Current open positions (optional)
+            risk_context: Additional risk context (optional)
+
+        Returns:
+            Request key string
+        """
+        context = json.dumps(
+            {
+                "market": self._generate_cache_key(snapshots),
+                "capital": capital_chf,
+                "max_position": max_position_size_chf,
+                "positions": current_positions or {},
+                "risk": risk_context or {},
+                "temperature": self.config.temperature,
+                "max_tokens": self.config.max_tokens,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.md5(context.encode()).hexdigest()
+
+    def _handle_rate_limit(self, response: httpx.Response) -> None:
+        """Pause the rate limiter after a 429 (honouring Retry-After)"""
+        if self.rate_limiter is None or response.status_code != 429:
+            return
+        try:
+            retry_after = float(response.headers.get("Retry-After", 10))
+        except ValueError:
+            retry_after = 10.0
+        self.rate_limiter.backoff(retry_after)
+
+    def _decision_context(
+        self,
+        symbol: str,
+        current_positions: Optional[Dict[str, Dict]],
+    ) -> str:
+        """Exact-match part of a decision cache key (model and position side)"""
+        position = (current_positions or {}).get(symbol) or {}
+        side = position.get("side")
+        return f"{self.config.model}|{getattr(side, 'value', side) or ''}"
+
+    def _lookup_decisions(
+        self,
+        snapshots: Dict[str, MarketDataSnapshot],
+        current_positions: Optional[Dict[str, Dict]],
+    ) -> Dict[str, TradingSignal]:
+        """
+        Reuse cached decisions for symbols whose market state is unchanged
+
+        Args:
+            snapshots: Market data snapshots for each symbol
+            current_positions: Current open positions (optional)
+
+        Returns:
+            Cached signals for the symbols that hit
+        """
+        signals: Dict[str, TradingSignal] = {}
+        if self.decision_cache is None:
+            return signals
+        for symbol, snapshot in snapshots.items():
+            signal_data = self.decision_cache.lookup(
+                symbol, snapshot, self._decision_context(symbol, current_positions)
+            )
+            if signal_data is not None:
+                signals[symbol] = self._deserialize_signal(signal_data)
+        return signals
+
+    def _store_decisions(
+        self,
+        signals: Dict[str, TradingSignal],
+        snapshots: Dict[str, MarketDataSnapshot],
+        current_positions: Optional[Dict[str, Dict]],
+    ) -> None:
+        """
+        Cache fresh LLM decisions (HOLDs filled in for skipped or failed
+        symbols are not cached, so those symbols are prompted again)
+
+        Args:
+            signals: Signals parsed from the LLM response
+            snapshots: Snapshots the decisions were made on
+            current_positions: Current open positions (optional)
+        """
+        if self.decision_cache is None:
+            return
+        for symbol, signal in signals.items():
+            if symbol not in snapshots or signal.reasoning in (
+                NO_SIGNAL_REASONING,
+                FALLBACK_REASONING,
+            ):
+                continue
+            self.decision_cache.store(
+                symbol,
+                snapshots[symbol],
+                self._serialize_signal(signal),
+                self._decision_context(symbol, current_positions),
+            )
+
+    @staticmethod
+    def _serialize_signal(signal: TradingSignal) -> Dict[str, Any]:
+        """Convert a signal to JSON-compatible cache data"""
+        return {
+            "symbol": signal.symbol,
+            "decision": signal.decision.value,
+            "confidence": str(signal.confidence),
+            "size_pct": str(signal.size_pct),
+            "stop_loss_pct": (
+                str(signal.stop_loss_pct) if signal.stop_loss_pct else None
+            ),
+            "take_profit_pct": (
+                str(signal.take_profit_pct) if signal.take_profit_pct else None
+            ),
+            "reasoning": signal.reasoning or "",
+            "model_used": signal.model_used or "",
+            "tokens_input": signal.tokens_input or 0,
+            "tokens_output": signal.tokens_output or 0,
+            "cost_usd": str(signal.cost_usd) if signal.cost_usd else "0",
+            "generation_time_ms": signal.generation_time_ms or 0,
+        }
+
+    @staticmethod
+    def _deserialize_signal(signal_data: Dict[str, Any]) -> TradingSignal:
+        """Rebuild a cached signal (marked from_cache)"""
+        return TradingSignal(
+            symbol=signal_data["symbol"],
+            decision=TradingDecision(signal_data["decision"]),
+            confidence=Decimal(str(signal_data["confidence"])),
+            size_pct=Decimal(str(signal_data["size_pct"])),
+            stop_loss_pct=(
+                Decimal(str(signal_data["stop_loss_pct"]))
+                if signal_data.get("stop_loss_pct")
+                else None
+            ),
+            take_profit_pct=(
+                Decimal(str(signal_data["take_profit_pct"]))
+                if signal_data.get("take_profit_pct")
+                else None
+            ),
+            reasoning=signal_data.get("reasoning", ""),
+            model_used=signal_data.get("model_used", ""),
+            tokens_input=signal_data.get("tokens_input", 0),
+            tokens_output=signal_data.get("tokens_output", 0),
+            cost_usd=Decimal(str(signal_data.get("cost_usd", 0))),
+            generation_time_ms=signal_data.get("generation_time_ms", 0),
+            from_cache=True,
+        )
+
+    def _build_messages(self, prompt: str) -> List[Dict[str, Any]]:
+        """
+        Chat messages for a prompt
+
+        When the prompt starts with the builder's static prefix, the prefix
+        is sent as its own content part marked as a cache breakpoint
+        (Anthropic models via OpenRouter cache it explicitly; OpenAI-style
+        providers cache identical prefixes automatically).
+
+        Args:
+            prompt: Formatted prompt text
+
+        Returns:
+            OpenRouter messages list
+        """
+        prefix = self.prompt_builder.static_prefix
+        if not prefix or not prompt.startswith(prefix):
+            return [{"role": "user", "content": prompt}]
+
+        prefix_part: Dict[str, Any] = {"type": "text", "text": prefix}
+        if self.config.model.startswith("anthropic/"):
+            prefix_part["cache_control"] = {"type": "ephemeral"}
+        return [
+            {
+                "role": "user",
+                "content": [
+                    prefix_part,
+                    {"type": "text", "text": prompt[len(prefix) :]},
+                ],
+            }
+        ]
+
+    async def _request_signals(
+        self,
+        prompt_snapshots: Dict[str, MarketDataSnapshot],
+        capital_chf: Decimal,
+        max_position_size_chf: Decimal,
+        current_positions: Optional[Dict[str, Dict]],
+        risk_context: Optional[Dict],
+        dispatched: Dict[str, TradingSignal],
+        on_signal: Optional[Callable[[TradingSignal], Awaitable[None]]],
+        start_time: float,
+        priority: Optional[bool],
+    ) -> Dict[str, TradingSignal]:
+        """
+        Prompt the LLM for a set of symbols and parse its decisions
+
+        Args:
+            prompt_snapshots: Snapshots to prompt for
+            capital_chf: Available trading capital
+            max_position_size_chf: Maximum position size per trade
+            current_positions: Current open positions (optional)
+            risk_context: Additional risk context (optional)
+            dispatched: Receives streamed signals (streaming mode)
+            on_signal: Async callback for early dispatch (streaming mode)
+            start_time: Generation start (time.time()) for latency fields
+            priority: Rate limiter lane (None = open position in the prompt)
+
+        Returns:
+            Signal for every symbol in prompt_snapshots
+
+        Raises:
+            Exception: If the LLM call fails
+        """
+        import time
+
+        # Build prompt
+        prompt = self.prompt_builder.build_trading_prompt(
+            snapshots=prompt_snapshots,
+            capital_chf=capital_chf,
+            max_position_size_chf=max_position_size_chf,
+            current_positions=current_positions,
+            risk_context=risk_context,
+        )
+
+        prompt_tokens = self.prompt_builder.count_tokens(prompt)
+        logger.debug(
+            f"Prompt length: {len(prompt)} characters (~{prompt_tokens} tokens)"
+        )
+
+        if priority is None:
+            priority = any(
+                symbol in (current_positions or {}) for symbol in prompt_snapshots
+            )
+
+        async def request_completion():
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(
+                    prompt_tokens + self.config.max_tokens, priority=priority
+                )
+            if self.config.stream:
+                # Stream, parsing (and dispatching) signals as they complete
+                return await self._stream_signals(
+                    prompt, prompt_snapshots, dispatched, on_signal, start_time
+                )
+            # Call LLM and capture usage data
+            return await self._call_llm(prompt)
+
+        # Whether another caller's identical request answered this one
+        shared = False
+        if self.coalescer is not None and not self.config.stream:
+            request_key = self._generate_request_key(
+                prompt_snapshots,
+                capital_chf,
+                max_position_size_chf,
+                current_positions,
+                risk_context,
+            )
+            completion, shared = await self.coalescer.run(
+                request_key, request_completion
+            )
+            response_text, usage_data = completion
+        else:
+            response_text, usage_data = await request_completion()
+
+        logger.debug(f"LLM response length: {len(response_text)} characters")
+
+        # Calculate generation time
+        generation_time_ms = int((time.time() - start_time) * 1000)
+
+        # Parse response (dispatched is shared by all shards)
+        streamed = {
+            symbol: signal
+            for symbol, signal in dispatched.items()
+            if symbol in prompt_snapshots
+        }
+        if streamed:
+            signals = self._complete_signals(streamed, prompt_snapshots)
+        else:
+            signals = self._parse_response(response_text, prompt_snapshots)
+
+        # Add observability fields to all signals
+        for signal in signals.values():
+            signal.model_used = self.config.model
+            signal.tokens_input = usage_data.get("prompt_tokens", prompt_tokens)
+            signal.tokens_output = usage_data.get(
+                "completion_tokens", len(response_text.split())
+            )
+            if signal.symbol not in streamed:
+                signal.generation_time_ms = generation_time_ms
+            signal.from_cache = shared
+
+            # Calculate cost based on provider/model
+            if signal.tokens_input and signal.tokens_output:
+                signal.cost_usd = self._calculate_cost(
+                    signal.tokens_input, signal.tokens_output, self.config.model
+                )
+
+        logger.info(
+            f"Generated {len(signals)} trading signals "
+            f"(tokens: {usage_data.get('prompt_tokens', 0)}/{usage_data.get('completion_tokens', 0)}, "
+            f"cost: ${sum(s.cost_usd or Decimal('0') for s in signals.values()):.4f}, "
+            f"time: {generation_time_ms}ms)"
+        )
+
+        return signals
+
+    def _shard_snapshots(
+        self,
+        snapshots: Dict[str, MarketDataSnapshot],
+        capital_chf: Decimal,
+        max_position_size_chf: Decimal,
+        current_positions: Optional[Dict[str, Dict]],
+        risk_context: Optional[Dict],
+    ) -> List[Dict[str, MarketDataSnapshot]]:
+        """
+        Split symbols into prompt shards
+
+        Shards are filled in order until adding a symbol would exceed the
+        input token budget (prompt overhead plus per-symbol market data) or
+        the per-shard symbol limit. A symbol larger than the budget on its
+        own still gets a shard.
+
+        Args:
+            snapshots: Snapshots to prompt for
+            capital_chf: Available trading capital
+            max_position_size_chf: Maximum position size per trade
+            current_positions: Current open positions (optional)
+            risk_context: Additional risk context (optional)
+
+        Returns:
+            List of shards (a single shard when sharding is disabled)
+        """
+        budget = self.config.shard_token_budget
+        max_symbols = self.config.shard_max_symbols
+        if not snapshots or (budget is None and max_symbols is None):
+            return [snapshots]
+
+        overhead = 0
+        if budget is not None:
+            overhead = self.prompt_builder.count_tokens(
+                self.prompt_builder.build_trading_prompt(
+                    snapshots={},
+                    capital_chf=capital_chf,
+                    max_position_size_chf=max_position_size_chf,
+                    current_positions=current_positions,
+                    risk_context=risk_context,
+                )
+            )
+
+        shards: List[Dict[str, MarketDataSnapshot]] = []
+        shard: Dict[str, MarketDataSnapshot] = {}
+        used = overhead
+        for symbol, snapshot in snapshots.items():
+            cost = (
+                self.prompt_builder.symbol_tokens(symbol, snapshot)
+                if budget is not None
+                else 0
+            )
+            if shard and (
+                (budget is not None and used + cost > budget)
+                or (max_symbols is not None and len(shard) >= max_symbols)
+            ):
+                shards.append(shard)
+                shard, used = {}, overhead
+            shard[symbol] = snapshot
+            used += cost
+        shards.append(shard)
+
+        return shards
+
+    async def _request_sharded(
+        self,
+        shards: List[Dict[str, MarketDataSnapshot]],
+        capital_chf: Decimal,
+        max_position_size_chf: Decimal,
+        current_positions: Optional[Dict[str, Dict]],
+        risk_context: Optional[Dict],
+        dispatched: Dict[str, TradingSignal],
+        on_signal: Optional[Callable[[TradingSignal], Awaitable[None]]],
+        start_time: float,
+        priority: Optional[bool],
+    ) -> Dict[str, TradingSignal]:
+        """
+        Prompt shards concurrently and merge their signals
+
+        At most max_concurrent_shards prompts are in flight. Each shard only
+        sees the open positions of its own symbols. A failed shard falls
+        back to HOLD for its own symbols (keeping any it already streamed).
+
+        Args:
+            shards: Symbol groups from _shard_snapshots
+            capital_chf: Available trading capital
+            max_position_size_chf: Maximum position size per trade
+            current_positions: Current open positions (optional)
+            risk_context: Additional risk context (optional)
+            dispatched: Receives streamed signals (streaming mode)
+            on_signal: Async callback for early dispatch (streaming mode)
+            start_time: Generation start (time.time()) for latency fields
+            priority: Rate limiter lane (None = per shard)
+
+        Returns:
+            Merged signals for all shards
+        """
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_shards)
+        logger.info(
+            f"Prompting {sum(len(shard) for shard in shards)} symbols in "
+            f"{len(shards)} shards (max {self.config.max_concurrent_shards} "
+            f"concurrent)"
+        )
+
+        async def run_shard(index: int, shard: Dict[str, MarketDataSnapshot]):
+            shard_positions = (
+                {
+                    symbol: position
+                    for symbol, position in current_positions.items()
+                    if symbol in shard
+                }
+                if current_positions
+                else current_positions
+            )
+            async with semaphore:
+                try:
+                    return await self._request_signals(
+                        shard,
+                        capital_chf,
+                        max_position_size_chf,
+                        shard_positions,
+                        risk_context,
+                        dispatched,
+                        on_signal,
+                        start_time,
+                        priority,
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Shard {index + 1}/{len(shards)} failed "
+                        f"({len(shard)} symbols): {e}",
+                        exc_info=True,
+                    )
+                    signals = self._generate_fallback_signals(shard)
+                    signals.update(
+                        {
+                            symbol: signal
+                            for symbol, signal in dispatched.items()
+                            if symbol in shard
+                        }
+                    )
+                    return signals
+
+        results = await asyncio.gather(
+            *(run_shard(index, shard) for index, shard in enumerate(shards))
+        )
+
+        signals: Dict[str, TradingSignal] = {}
+        for shard_signals in results:
+            signals.update(shard_signals)
+        return signals
 
     async def _call_llm(self, prompt: str) -> tuple[str, Dict[str, int]]:
         """
@@ -414,12 +955,7 @@ class LLMDecisionEngine:
 
         payload = {
             "model": self.config.model,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt,
-                }
-            ],
+            "messages": self._build_messages(prompt),
             "temperature": self.config.temperature,
             "max_tokens": self.config.max_tokens,
         }
@@ -459,10 +995,11 @@ class LLMDecisionEngine:
                     )
                 else:
                     # Estimate if usage not provided
+                    prompt_tokens = self.prompt_builder.count_tokens(prompt)
                     usage_data = {
-                        "prompt_tokens": len(prompt.split()),
+                        "prompt_tokens": prompt_tokens,
                         "completion_tokens": len(content.split()),
-                        "total_tokens": len(prompt.split()) + len(content.split()),
+                        "total_tokens": prompt_tokens + len(content.split()),
                     }
 
                 return content, usage_data
@@ -474,12 +1011,170 @@ class LLMDecisionEngine:
             logger.error(
                 f"OpenRouter API error: {e.response.status_code} - {e.response.text}"
             )
+            self._handle_rate_limit(e.response)
             raise Exception(f"OpenRouter API error: {e.response.status_code}")
 
         except Exception as e:
             logger.error(f"Error calling OpenRouter API: {e}", exc_info=True)
             raise
 
+    async def _stream_signals(
+        self,
+        prompt: str,
+        snapshots: Dict[str, MarketDataSnapshot],
+        dispatched: Dict[str, TradingSignal],
+        on_signal: Optional[Callable[[TradingSignal], Awaitable[None]]],
+        start_time: float,
+    ) -> tuple[str, Dict[str, int]]:
+        """
+        Stream the completion, turning each finished JSON object into a signal
+
+        Args:
+            prompt: Formatted prompt text
+            snapshots: Market data snapshots (for validation)
+            dispatched: Receives each streamed signal, keyed by symbol
+            on_signal: Optional async callback awaited with each signal
+            start_time: Generation start (time.time()) for latency fields
+
+        Returns:
+            Tuple of (response_text, usage_data)
+        """
+        import time
+
+        parser = SignalStreamParser()
+
+        async def handle_delta(delta: str) -> None:
+            for data in parser.feed(delta):
+                signal = self._create_signal_from_json(data)
+                if signal is None or signal.symbol not in snapshots:
+                    logger.warning(
+                        f"Invalid or unknown symbol in signal: {data.get('symbol')}"
+                    )
+                    continue
+                if signal.symbol in dispatched:
+                    logger.warning(f"Ignoring duplicate signal for {signal.symbol}")
+                    continue
+
+                signal.model_used = self.config.model
+                signal.generation_time_ms = int((time.time() - start_time) * 1000)
+                dispatched[signal.symbol] = signal
+                logger.info(
+                    f"Streamed signal for {signal.symbol} after "
+                    f"{signal.generation_time_ms}ms"
+                )
+                if on_signal is not None:
+                    await on_signal(signal)
+
+        if self.config.provider != LLMProvider.OPENROUTER:
+            raise NotImplementedError(
+                f"Provider {self.config.provider} not implemented"
+            )
+        usage_data = await self._stream_openrouter(prompt, handle_delta)
+
+        response_text = parser.text
+        if not usage_data:
+            usage_data = {
+                "prompt_tokens": self.prompt_builder.count_tokens(prompt),
+                "completion_tokens": len(response_text.split()),
+                "total_tokens": self.prompt_builder.count_tokens(prompt)
+                + len(response_text.split()),
+            }
+        return response_text, usage_data
+
+    async def _stream_openrouter(
+        self,
+        prompt: str,
+        on_delta: Callable[[str], Awaitable[None]],
+    ) -> Dict[str, int]:
+        """
+        Call OpenRouter with stream=true and feed content deltas to on_delta
+
+        Args:
+            prompt: Formatted prompt text
+            on_delta: Async callback awaited with each content delta
+
+        Returns:
+            Usage data from the final event (empty if not reported)
+
+        Raises:
+            Exception: If API call fails or the stream reports an error
+        """
+        headers = {
+            "Authorization": f"Bearer {self.config.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/your-repo",  # Optional
+            "X-Title": "LLM Crypto Trading System",  # Optional
+        }
+
+        payload = {
+            "model": self.config.model,
+            "messages": self._build_messages(prompt),
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "stream": True,
+            # Ask OpenRouter to report token usage in the last event
+            "usage": {"include": True},
+        }
+
+        logger.debug(f"Streaming OpenRouter API: {self.config.model}")
+
+        usage_data: Dict[str, int] = {}
+        received_content = False
+
+        try:
+            async with self.client.stream(
+                "POST",
+                self.OPENROUTER_URL,
+                headers=headers,
+                json=payload,
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    # SSE: skip blank lines and comments (": OPENROUTER PROCESSING")
+                    if not line.startswith("data:"):
+                        continue
+                    event = line[5:].strip()
+                    if event == "[DONE]":
+                        break
+
+                    data: Dict[str, Any] = json.loads(event)
+                    if "error" in data:
+                        raise ValueError(f"OpenRouter stream error: {data['error']}")
+
+                    if data.get("usage"):
+                        usage_data = {
+                            "prompt_tokens": data["usage"].get("prompt_tokens", 0),
+                            "completion_tokens": data["usage"].get(
+                                "completion_tokens", 0
+                            ),
+                            "total_tokens": data["usage"].get("total_tokens", 0),
+                        }
+
+                    for choice in data.get("choices") or []:
+                        content = (choice.get("delta") or {}).get("content")
+                        if content:
+                            received_content = True
+                            await on_delta(content)
+
+            if not received_content:
+                raise ValueError("Empty response from LLM")
+
+            return usage_data
+
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"OpenRouter API error: {e.response.status_code} - {e.response.text}"
+            )
+            self._handle_rate_limit(e.response)
+            raise Exception(f"OpenRouter API error: {e.response.status_code}")
+
+        except Exception as e:
+            logger.error(f"Error streaming OpenRouter API: {e}", exc_info=True)
+            raise
+
     def _parse_response(
         self,
         response_text: str,
@@ -528,24 +1223,31 @@ class LLMDecisionEngine:
                     logger.warning(f"Failed to create signal from JSON: {e}")
                     continue
 
-            # Generate HOLD signals for missing symbols
-            for symbol in snapshots:
-                if symbol not in signals:
-                    logger.warning(f"No signal generated for {symbol}, using HOLD")
-                    signals[symbol] = TradingSignal(
-                        symbol=symbol,
-                        decision=TradingDecision.HOLD,
-                        confidence=Decimal("0.5"),
-                        size_pct=Decimal("0.0"),
-                        reasoning="No signal generated by LLM",
-                    )
-
-            return signals
+            return self._complete_signals(signals, snapshots)
 
         except Exception as e:
             logger.error(f"Error parsing LLM response: {e}", exc_info=True)
             return self._generate_fallback_signals(snapshots)
 
+    def _complete_signals(
+        self,
+        signals: Dict[str, TradingSignal],
+        snapshots: Dict[str, MarketDataSnapshot],
+    ) -> Dict[str, TradingSignal]:
+        """Add HOLD signals for symbols the LLM did not cover"""
+        for symbol in snapshots:
+            if symbol not in signals:
+                logger.warning(f"No signal generated for {symbol}, using HOLD")
+                signals[symbol] = TradingSignal(
+                    symbol=symbol,
+                    decision=TradingDecision.HOLD,
+                    confidence=Decimal("0.5"),
+                    size_pct=Decimal("0.0"),
+                    reasoning=NO_SIGNAL_REASONING,
+                )
+
+        return signals
+
     def _extract_json_blocks(self, text: str) -> List[str]:
         """
         Extract JSON code blocks from text
@@ -651,7 +1353,7 @@ class LLMDecisionEngine:
                 decision=TradingDecision.HOLD,
                 confidence=Decimal("0.5"),
                 size_pct=Decimal("0.0"),
-                reasoning="Fallback signal - LLM error or invalid response",
+                reasoning=FALLBACK_REASONING,
             )
 
         return signals
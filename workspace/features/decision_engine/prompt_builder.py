@@ -3,16 +3,52 @@ Prompt Builder
 
 Constructs optimized prompts for LLM trading decisions based on market data.
 
+Two layouts are available:
+- verbose: per-field prose sections for each symbol (default)
+- compact: a byte-stable static prefix (instructions, output format and
+  table legend) followed by the per-cycle context and one table row per
+  symbol, so provider prompt-prefix caching applies and input tokens
+  shrink roughly in proportion to the number of symbols
+
 Author: Decision Engine Implementation Team
 Date: 2025-10-28
 """
 
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Optional
+from enum import Enum
+from typing import Any, Dict, Optional
 
 from workspace.features.market_data import MarketDataSnapshot
 
+from .tokenizer import Tokenizer, get_tokenizer
+
+
+class PromptLayout(str, Enum):
+    """Prompt layouts"""
+
+    VERBOSE = "verbose"
+    COMPACT = "compact"
+
+
+@dataclass
+class PromptStats:
+    """Size of the last built prompt"""
+
+    layout: PromptLayout
+    total_tokens: int
+    prefix_tokens: int
+    characters: int
+    symbols: int
+
+
+# Market data table columns (compact layout), documented in the legend
+MARKET_COLUMNS = (
+    "symbol|last|chg24h%|hi24h|lo24h|vol24h|open|high|low|close|chg%|"
+    "rsi|macd|macd_sig|macd_hist|ema12|ema26|bb_up|bb_mid|bb_lo|bb_bw"
+)
+
 
 class PromptBuilder:
     """
@@ -22,10 +58,12 @@ class PromptBuilder:
     request trading decisions from the LLM.
 
     Features:
+    - Verbose or compact (prefix-cacheable, tabular) layout
     - Structured market data formatting
     - Technical indicator summary
     - Risk management context
     - Clear output format specification
+    - Token counts through a pluggable tokenizer
 
     Example:
         ```python
@@ -38,9 +76,62 @@ class PromptBuilder:
         ```
     """
 
-    def __init__(self):
-        """Initialize prompt builder"""
-        pass
+    def __init__(
+        self,
+        layout: str = "verbose",
+        tokenizer: Optional[Tokenizer] = None,
+    ):
+        """
+        Initialize prompt builder
+
+        Args:
+            layout: Prompt layout, "verbose" or "compact" (default: "verbose")
+            tokenizer: Token counter (default: get_tokenizer(), tiktoken if
+                available, else characters / 4)
+        """
+        self.layout = PromptLayout(layout)
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.last_stats: Optional[PromptStats] = None
+
+        # Built once so the prefix is byte-identical across cycles
+        self._static_prefix = (
+            self._build_compact_static_prefix()
+            if self.layout == PromptLayout.COMPACT
+            else ""
+        )
+        self._prefix_tokens = self.tokenizer.count(self._static_prefix)
+
+    @property
+    def static_prefix(self) -> str:
+        """Cycle-independent start of every prompt (empty for verbose)"""
+        return self._static_prefix
+
+    def symbol_tokens(self, symbol: str, snapshot: MarketDataSnapshot) -> int:
+        """
+        Tokens a symbol's market data adds to a prompt
+
+        Args:
+            symbol: Trading pair
+            snapshot: Market data snapshot
+
+        Returns:
+            Token count of the symbol's section (or table row)
+        """
+        if self.layout == PromptLayout.COMPACT:
+            return self.tokenizer.count(self._format_snapshot_row(symbol, snapshot))
+        return self.tokenizer.count(self._format_snapshot(symbol, snapshot))
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Count tokens with the configured tokenizer
+
+        Args:
+            text: Prompt text
+
+        Returns:
+            Token count
+        """
+        return self.tokenizer.count(text)
 
     def build_trading_prompt(
         self,
@@ -63,6 +154,41 @@ class PromptBuilder:
         Returns:
             Formatted prompt string for LLM
         """
+        if self.layout == PromptLayout.COMPACT:
+            prompt = self._build_compact_prompt(
+                snapshots=snapshots,
+                capital_chf=capital_chf,
+                max_position_size_chf=max_position_size_chf,
+                current_positions=current_positions,
+                risk_context=risk_context,
+            )
+        else:
+            prompt = self._build_verbose_prompt(
+                snapshots=snapshots,
+                capital_chf=capital_chf,
+                max_position_size_chf=max_position_size_chf,
+                current_positions=current_positions,
+                risk_context=risk_context,
+            )
+
+        self.last_stats = PromptStats(
+            layout=self.layout,
+            total_tokens=self.tokenizer.count(prompt),
+            prefix_tokens=self._prefix_tokens,
+            characters=len(prompt),
+            symbols=len(snapshots),
+        )
+        return prompt
+
+    def _build_verbose_prompt(
+        self,
+        snapshots: Dict[str, MarketDataSnapshot],
+        capital_chf: Decimal,
+        max_position_size_chf: Decimal,
+        current_positions: Optional[Dict[str, Dict]] = None,
+        risk_context: Optional[Dict] = None,
+    ) -> str:
+        """Build the verbose (per-field prose) prompt"""
         prompt_parts = []
 
         # System context
@@ -312,6 +438,141 @@ For each asset, provide your trading decision in the following JSON format:
 
 Provide decisions for ALL assets analyzed above."""
 
+    # ========================================================================
+    # Compact layout
+    # ========================================================================
+
+    def _build_compact_prompt(
+        self,
+        snapshots: Dict[str, MarketDataSnapshot],
+        capital_chf: Decimal,
+        max_position_size_chf: Decimal,
+        current_positions: Optional[Dict[str, Dict]] = None,
+        risk_context: Optional[Dict] = None,
+    ) -> str:
+        """Build the compact prompt: static prefix, then per-cycle data"""
+        lines = [
+            "# Account",
+            f"capital_chf={capital_chf:.2f} max_position_chf={max_position_size_chf:.2f}",
+        ]
+        if risk_context:
+            lines.append(
+                "risk: " + "; ".join(f"{k}={v}" for k, v in risk_context.items())
+            )
+
+        if current_positions:
+            lines.append("")
+            lines.append("# Positions")
+            lines.append("symbol|side|size|entry|pnl|stop")
+            for symbol, pos in current_positions.items():
+                lines.append(
+                    "|".join(
+                        [
+                            symbol,
+                            str(pos.get("side", "-")),
+                            self._fmt(pos.get("size")),
+                            self._fmt(pos.get("entry_price")),
+                            self._fmt(pos.get("pnl")),
+                            self._fmt(pos.get("stop_loss")),
+                        ]
+                    )
+                )
+
+        lines.append("")
+        lines.append(f"# Market Data ({len(snapshots)} assets)")
+        lines.append(MARKET_COLUMNS)
+        for symbol, snapshot in snapshots.items():
+            lines.append(self._format_snapshot_row(symbol, snapshot))
+
+        # Volatile values last so they never split the cached prefix
+        lines.append("")
+        lines.append(f"Analysis Time: {datetime.utcnow().isoformat()}")
+
+        return self._static_prefix + "\n".join(lines)
+
+    def _build_compact_static_prefix(self) -> str:
+        """Instructions, output format and table legend (no per-cycle data)"""
+        return f"""# Trading Decision System
+
+You are an expert cryptocurrency trading advisor. Analyze the market data table and decide BUY, SELL, HOLD or CLOSE for each asset, with reasoning, position size and risk parameters. Weigh RSI, MACD, EMA and Bollinger Bands, momentum, trend and risk-reward.
+
+# Rules
+- Max position size is given in the account section (20% of capital)
+- Stop-loss required for all positions: 2-3% for BTC/ETH, 1-2% for less volatile assets
+- Size by confidence: 0.8-1.0 -> 15-20%, 0.6-0.8 -> 10-15%, 0.4-0.6 -> 5-10%, < 0.4 -> HOLD
+- BUY opens a long (bullish, oversold, RSI < 40); SELL opens a short (bearish, overbought, RSI > 60)
+- HOLD when signals are mixed or weak; CLOSE only exits a position listed under Positions
+
+# Output Format
+One JSON object per asset, each in its own ```json block:
+{{"symbol": "BTCUSDT", "decision": "BUY", "confidence": 0.75, "size_pct": 0.15, "stop_loss_pct": 0.02, "take_profit_pct": 0.05, "reasoning": "..."}}
+confidence and size_pct are 0.0-1.0; stop_loss_pct/take_profit_pct are decimals (0.02 = 2%).
+Provide decisions for ALL assets in the market data table.
+
+# Table Legend
+Rows are pipe-separated; "-" means not available.
+{MARKET_COLUMNS}
+last/hi24h/lo24h: ticker price and 24h range; chg24h%: 24h change; vol24h: 24h quote volume
+open/high/low/close/chg%: latest 3min candle; rsi: RSI(14)
+macd/macd_sig/macd_hist: MACD(12,26,9); ema12/ema26: EMAs; bb_*: Bollinger(20,2) bands and bandwidth
+
+"""
+
+    def _format_snapshot_row(self, symbol: str, snapshot: MarketDataSnapshot) -> str:
+        """Format a snapshot as one market data table row"""
+        ticker = snapshot.ticker
+        ohlcv = snapshot.ohlcv
+        rsi = snapshot.rsi
+        macd = snapshot.macd
+        bb = snapshot.bollinger
+
+        values = [
+            ticker.last,
+            f"{ticker.change_24h_pct:+.2f}",
+            ticker.high_24h,
+            ticker.low_24h,
+            self._fmt_volume(ticker.quote_volume_24h),
+            ohlcv.open,
+            ohlcv.high,
+            ohlcv.low,
+            ohlcv.close,
+            f"{ohlcv.price_change_pct:+.2f}",
+            f"{rsi.value:.1f}" if rsi else None,
+            macd.macd_line if macd else None,
+            macd.signal_line if macd else None,
+            macd.histogram if macd else None,
+            snapshot.ema_fast.value if snapshot.ema_fast else None,
+            snapshot.ema_slow.value if snapshot.ema_slow else None,
+            bb.upper_band if bb else None,
+            bb.middle_band if bb else None,
+            bb.lower_band if bb else None,
+            f"{bb.bandwidth:.4f}" if bb else None,
+        ]
+        return "|".join([symbol] + [self._fmt(v) for v in values])
+
+    @staticmethod
+    def _fmt(value: Any) -> str:
+        """Format a number with 6 significant digits ("-" if missing)"""
+        if value is None:
+            return "-"
+        if isinstance(value, str):
+            return value
+        try:
+            return f"{float(value):.6g}"
+        except (TypeError, ValueError):
+            return str(value)
+
+    @staticmethod
+    def _fmt_volume(value: Any) -> str:
+        """Format a volume with a K/M/B suffix"""
+        if value is None:
+            return "-"
+        amount = float(value)
+        for threshold, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+            if abs(amount) >= threshold:
+                return f"{amount / threshold:.1f}{suffix}"
+        return f"{amount:.0f}"
+
 
 # Export
-__all__ = ["PromptBuilder"]
+__all__ = ["PromptBuilder", "PromptLayout", "PromptStats"]
@@ -0,0 +1,416 @@
+"""
+LLM Request Control
+
+Concurrency control for upstream LLM calls shared by every process that
+runs the decision engine (trading-cycle workers and the API):
+
+- TokenBucket / LLMRateLimiter: async token buckets sized to the
+  provider's request and token rate limits. Waiters are served in FIFO
+  order within two lanes; the priority lane (used for requests that may
+  CLOSE open positions) is always served first. A 429 drains the buckets
+  for the Retry-After period so callers queue instead of retrying in a
+  storm.
+- RequestCoalescer: single-flight execution keyed by request identity.
+  Identical in-flight requests in one process share one upstream call; in
+  distributed mode a Redis lock elects one leader across processes and
+  the result is handed to followers through a Redis key and pub/sub
+  channel. Followers fall back to their own call if the leader fails or
+  does not answer within the lock TTL.
+
+Author: Decision Engine Implementation Team
+Date: 2025-11-15
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+# Optional redis import (only needed for distributed coalescing)
+try:
+    from workspace.infrastructure.cache import get_redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    get_redis = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Async token bucket with a priority lane
+
+    Attributes:
+        rate_per_second: Refill rate
+        capacity: Maximum burst size
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        """
+        Initialize token bucket (starts full)
+
+        Args:
+            rate_per_second: Tokens added per second
+            capacity: Maximum tokens held
+        """
+        if rate_per_second <= 0 or capacity <= 0:
+            raise ValueError("rate_per_second and capacity must be positive")
+
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._priority: Deque[Tuple[float, asyncio.Future]] = deque()
+        self._normal: Deque[Tuple[float, asyncio.Future]] = deque()
+        self._pump: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (negative while backing off)"""
+        self._refill()
+        return self._tokens
+
+    @property
+    def waiting(self) -> int:
+        """Number of queued acquirers"""
+        return len(self._priority) + len(self._normal)
+
+    async def acquire(self, tokens: float = 1.0, priority: bool = False) -> float:
+        """
+        Wait until tokens are available and take them
+
+        Args:
+            tokens: Tokens to take (clamped to capacity)
+            priority: Use the priority lane
+
+        Returns:
+            Seconds spent waiting
+        """
+        tokens = min(tokens, self.capacity)
+        self._refill()
+        if not self.waiting and self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+
+        start = time.monotonic()
+        waiter = (tokens, asyncio.get_running_loop().create_future())
+        lane = self._priority if priority else self._normal
+        lane.append(waiter)
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.create_task(self._serve())
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            if waiter in lane:
+                lane.remove(waiter)
+            elif waiter[1].done() and not waiter[1].cancelled():
+                # Granted just before cancellation: give the tokens back
+                self._tokens += tokens
+            raise
+
+        return time.monotonic() - start
+
+    def backoff(self, seconds: float) -> None:
+        """
+        Empty the bucket so nothing is granted for the next seconds
+
+        Args:
+            seconds: Backoff duration (e.g. a 429 Retry-After)
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate_per_second
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated) * self.rate_per_second,
+        )
+        self._updated = now
+
+    async def _serve(self) -> None:
+        """Grant queued waiters in lane order as tokens refill"""
+        while self._priority or self._normal:
+            lane = self._priority or self._normal
+            tokens, future = lane[0]
+            if future.done():
+                lane.popleft()
+                continue
+
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                lane.popleft()
+                future.set_result(None)
+                continue
+
+            await asyncio.sleep((tokens - self._tokens) / self.rate_per_second)
+
+
+class LLMRateLimiter:
+    """
+    Provider rate limits as a request bucket and an optional token bucket
+
+    Example:
+        ```python
+        limiter = LLMRateLimiter(requests_per_minute=60, tokens_per_minute=100_000)
+        await limiter.acquire(estimated_tokens=3000, priority=True)
+        ```
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 60.0,
+        tokens_per_minute: Optional[float] = None,
+        burst_requests: Optional[float] = None,
+    ):
+        """
+        Initialize rate limiter
+
+        Args:
+            requests_per_minute: Request rate limit (default: 60)
+            tokens_per_minute: Token rate limit (default: None = unlimited)
+            burst_requests: Request burst size (default: 1/6 of a minute's
+                requests, at least 1)
+        """
+        self.requests = TokenBucket(
+            requests_per_minute / 60.0,
+            burst_requests or max(1.0, requests_per_minute / 6.0),
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute / 60.0, tokens_per_minute)
+            if tokens_per_minute
+            else None
+        )
+        self._waited_seconds = 0.0
+        self._acquired = 0
+        self._priority_acquired = 0
+        self._backoffs = 0
+
+    async def acquire(self, estimated_tokens: float = 0.0, priority: bool = False):
+        """
+        Wait for a request slot (and token budget, if limited)
+
+        Args:
+            estimated_tokens: Expected prompt + completion tokens
+            priority: Use the priority lane
+        """
+        waited = await self.requests.acquire(1.0, priority=priority)
+        if self.tokens is not None and estimated_tokens > 0:
+            waited += await self.tokens.acquire(estimated_tokens, priority=priority)
+
+        self._waited_seconds += waited
+        self._acquired += 1
+        if priority:
+            self._priority_acquired += 1
+        if waited > 0:
+            logger.debug(f"LLM rate limiter waited {waited:.2f}s")
+
+    def backoff(self, seconds: float) -> None:
+        """
+        Pause all lanes after a provider rate-limit response
+
+        Args:
+            seconds: Retry-After duration
+        """
+        self._backoffs += 1
+        self.requests.backoff(seconds)
+        if self.tokens is not None:
+            self.tokens.backoff(seconds)
+        logger.warning(f"LLM rate limited, pausing requests for {seconds:.1f}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get rate limiter statistics
+
+        Returns:
+            Dictionary with acquisitions, wait time, queue depth and backoffs
+        """
+        return {
+            "acquired": self._acquired,
+            "priority_acquired": self._priority_acquired,
+            "waited_seconds": round(self._waited_seconds, 3),
+            "waiting": self.requests.waiting
+            + (self.tokens.waiting if self.tokens else 0),
+            "backoffs": self._backoffs,
+        }
+
+
+class RequestCoalescer:
+    """
+    Single-flight execution of identical requests
+
+    In distributed mode results must be JSON-serializable (tuples come back
+    as lists for followers in other processes).
+    """
+
+    def __init__(
+        self,
+        distributed: bool = False,
+        lock_ttl_seconds: float = 60.0,
+        result_ttl_seconds: float = 10.0,
+        key_prefix: str = "llm:inflight",
+    ):
+        """
+        Initialize request coalescer
+
+        Args:
+            distributed: Coalesce across processes through Redis
+            lock_ttl_seconds: Leader lock lifetime; also how long followers
+                wait for the leader's result (default: 60)
+            result_ttl_seconds: How long a finished result stays readable
+                for late followers (default: 10)
+            key_prefix: Redis key/channel prefix (default: "llm:inflight")
+        """
+        self.distributed = distributed and REDIS_AVAILABLE
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self.key_prefix = key_prefix
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.stats = {
+            "calls": 0,
+            "coalesced_local": 0,
+            "coalesced_remote": 0,
+            "fallbacks": 0,
+        }
+
+        if distributed and not REDIS_AVAILABLE:
+            logger.warning("Redis not available, coalescing in-process only")
+
+    async def run(
+        self, key: str, call: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Run call once per key across concurrent callers
+
+        Args:
+            key: Request identity
+            call: Coroutine factory performing the upstream request
+
+        Returns:
+            Tuple of (result, shared); shared is True if the result came
+            from another caller's upstream request
+
+        Raises:
+            Exception: Whatever the upstream call raised (shared with
+                in-process followers)
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced_local"] += 1
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            if self.distributed:
+                result, shared = await self._run_distributed(key, call)
+            else:
+                self.stats["calls"] += 1
+                result, shared = await call(), False
+            future.set_result(result)
+            return result, shared
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark retrieved; followers (if any) re-raise it themselves
+                future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _run_distributed(
+        self, key: str, call: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """Elect a leader through a Redis lock and share its result"""
+        lock_key = f"{self.key_prefix}:lock:{key}"
+        result_key = f"{self.key_prefix}:result:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            redis = await get_redis()
+            leader = await redis.set_nx(lock_key, token, self.lock_ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Distributed coalescing unavailable: {e}")
+            self.stats["calls"] += 1
+            return await call(), False
+
+        if leader:
+            self.stats["calls"] += 1
+            # Announce before releasing the lock, so a caller arriving in
+            # between finds the outcome instead of becoming a new leader
+            try:
+                result = await call()
+            except Exception as e:
+                await self._announce(redis, result_key, {"error": str(e)})
+                raise
+            else:
+                await self._announce(redis, result_key, {"result": result})
+            finally:
+                await redis.delete_if_equals(lock_key, token)
+            return result, False
+
+        message = await self._wait_for_leader(redis, result_key)
+        if message is not None and "result" in message:
+            self.stats["coalesced_remote"] += 1
+            return message["result"], True
+
+        # Leader failed or timed out: make our own call
+        self.stats["fallbacks"] += 1
+        self.stats["calls"] += 1
+        return await call(), False
+
+    async def _announce(self, redis, result_key: str, message: Dict) -> None:
+        """Store and publish the leader's outcome"""
+        try:
+            # Errors are stored too: a follower subscribing after the
+            # publish must not wait out the lock TTL
+            await redis.set(
+                result_key,
+                message,
+                ttl_seconds=max(1, int(self.result_ttl_seconds)),
+            )
+            await redis.publish(result_key, message)
+        except Exception as e:
+            logger.warning(f"Failed to share coalesced result: {e}")
+
+    async def _wait_for_leader(self, redis, result_key: str) -> Optional[Dict]:
+        """Wait for the leader's outcome message (None on timeout/error)"""
+        pubsub = None
+        try:
+            # Subscribe before reading the key so a result cannot slip by
+            pubsub = await redis.subscribe(result_key)
+            stored = await redis.get(result_key)
+            if isinstance(stored, dict):
+                return stored
+
+            async with asyncio.timeout(self.lock_ttl_seconds):
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        outcome = json.loads(message["data"])
+                        if isinstance(outcome, dict):
+                            return outcome
+        except TimeoutError:
+            logger.warning(f"Timed out waiting for coalesced result {result_key}")
+        except Exception as e:
+            logger.warning(f"Error waiting for coalesced result: {e}")
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+        return None
+
+
+# Export
+__all__ = ["TokenBucket", "LLMRateLimiter", "RequestCoalescer"]
@@ -0,0 +1,115 @@
+"""
+Streaming Signal Parser
+
+Incrementally extracts per-symbol JSON decision objects from a streamed LLM
+completion, so each signal can be acted on as soon as its closing brace
+arrives instead of after the full response.
+
+The parser tracks brace depth and JSON string state across chunks; prose
+outside objects (markdown, code fences) is skipped. Every object that
+closes is decoded, and those carrying a "symbol" key are returned, so
+both standalone objects and objects nested in a wrapper are found.
+
+Usage:
+    parser = SignalStreamParser()
+    async for delta in stream:
+        for data in parser.feed(delta):
+            signal = create_signal(data)
+
+Author: Decision Engine Implementation Team
+Date: 2025-11-13
+"""
+
+import json
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class SignalStreamParser:
+    """
+    Incremental extractor of {"symbol": ...} objects from streamed text
+
+    Attributes:
+        objects_parsed: Decision objects returned so far
+        parse_errors: Closed objects that were not valid JSON
+    """
+
+    def __init__(self):
+        """Initialize parser state"""
+        self._parts: List[str] = []
+        # Characters of the outermost open object (only while depth > 0)
+        self._object: List[str] = []
+        # Start offsets (into _object) of the currently open objects
+        self._starts: List[int] = []
+        self._in_string = False
+        self._escaped = False
+
+        self.objects_parsed = 0
+        self.parse_errors = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consume the next chunk of completion text
+
+        Args:
+            chunk: Text delta from the stream
+
+        Returns:
+            Decision objects completed by this chunk, in order
+        """
+        self._parts.append(chunk)
+        completed: List[Dict[str, Any]] = []
+
+        for char in chunk:
+            if not self._starts:
+                if char == "{":
+                    self._starts.append(0)
+                    self._object.append(char)
+                continue
+
+            self._object.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._starts.append(len(self._object) - 1)
+            elif char == "}":
+                start = self._starts.pop()
+                data = self._decode("".join(self._object[start:]))
+                if data is not None:
+                    completed.append(data)
+                if not self._starts:
+                    self._object.clear()
+
+        return completed
+
+    @property
+    def text(self) -> str:
+        """Full completion text received so far"""
+        return "".join(self._parts)
+
+    def _decode(self, candidate: str) -> Any:
+        if '"symbol"' not in candidate:
+            return None
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError as e:
+            self.parse_errors += 1
+            logger.warning(f"Failed to parse streamed JSON object: {e}")
+            return None
+        if not isinstance(data, dict) or "symbol" not in data:
+            return None
+        self.objects_parsed += 1
+        return data
+
+
+# Export
+__all__ = ["SignalStreamParser"]
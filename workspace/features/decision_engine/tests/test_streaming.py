@@ -0,0 +1,164 @@
+"""
+Streaming Decision Tests
+
+Tests for incremental signal parsing over a streamed (SSE) completion and
+early per-symbol dispatch from LLMDecisionEngine.
+
+Author: Decision Engine Implementation Team
+Date: 2025-11-13
+"""
+
+import asyncio
+import json
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from workspace.features.decision_engine.llm_engine import LLMDecisionEngine
+from workspace.features.decision_engine.stream_parser import SignalStreamParser
+from workspace.features.trading_loop import TradingDecision
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+
+def _decision(symbol: str, decision: str = "BUY") -> str:
+    return json.dumps(
+        {
+            "symbol": symbol,
+            "decision": decision,
+            "confidence": 0.8,
+            "size_pct": 0.1,
+            "stop_loss_pct": 0.02,
+            "reasoning": 'RSI {oversold} and "rising"',
+        },
+        indent=2,
+    )
+
+
+def _sse(content: str) -> bytes:
+    event = {"choices": [{"delta": {"content": content}}]}
+    return f"data: {json.dumps(event)}\n\n".encode()
+
+
+def _snapshot(price: str = "100"):
+    snapshot = Mock()
+    snapshot.ticker.last = Decimal(price)
+    snapshot.rsi = None
+    snapshot.macd = None
+    return snapshot
+
+
+def _engine(handler) -> LLMDecisionEngine:
+    engine = LLMDecisionEngine(api_key="test-key", stream=True, cache_service=Mock())
+    engine.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    # Instance-level patch, discarded with the engine
+    patch.object(
+        engine.prompt_builder, "build_trading_prompt", return_value="prompt"
+    ).start()
+    return engine
+
+
+class TestSignalStreamParser:
+    def test_objects_split_across_chunks(self):
+        btc, eth = _decision("BTCUSDT"), _decision("ETHUSDT")
+        text = f"Analysis:\n```json\n{btc}\n```\n{eth}"
+        parser = SignalStreamParser()
+
+        completed = []
+        for i in range(0, len(text), 7):
+            completed.extend(parser.feed(text[i : i + 7]))
+
+        assert [data["symbol"] for data in completed] == ["BTCUSDT", "ETHUSDT"]
+        assert completed[0]["reasoning"] == 'RSI {oversold} and "rising"'
+        assert parser.text == text
+
+    def test_object_returned_as_soon_as_it_closes(self):
+        parser = SignalStreamParser()
+        first = _decision("BTCUSDT")
+
+        assert parser.feed(first[:-1]) == []
+        assert [d["symbol"] for d in parser.feed(first[-1] + "\n{")] == ["BTCUSDT"]
+
+    def test_nested_wrapper_and_invalid_objects(self):
+        parser = SignalStreamParser()
+        text = (
+            '{"signals": [' + _decision("BTCUSDT") + ", "
+            '{"symbol": "ETHUSDT", "decision": BUY}]}'
+        )
+
+        completed = parser.feed(text)
+
+        assert [data["symbol"] for data in completed] == ["BTCUSDT"]
+        # The invalid object, and the wrapper enclosing it
+        assert parser.parse_errors == 2
+
+
+@pytest.mark.asyncio
+async def test_signals_dispatched_before_stream_ends():
+    dispatched = asyncio.Event()
+
+    async def body():
+        yield b": OPENROUTER PROCESSING\n\n"
+        yield _sse(_decision("BTCUSDT"))
+        # The stream only continues once the first signal was dispatched
+        await asyncio.wait_for(dispatched.wait(), timeout=1)
+        yield _sse(_decision("ETHUSDT", "SELL"))
+        usage = {"prompt_tokens": 900, "completion_tokens": 120, "total_tokens": 1020}
+        yield f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, content=body())
+
+    received = []
+
+    async def on_signal(signal):
+        received.append(signal.symbol)
+        dispatched.set()
+
+    engine = _engine(handler)
+    snapshots = {symbol: _snapshot() for symbol in SYMBOLS}
+
+    signals = await engine.generate_signals(
+        snapshots, use_cache=False, on_signal=on_signal
+    )
+
+    assert requests[0]["stream"] is True
+    assert received == ["BTCUSDT", "ETHUSDT"]
+    assert signals["BTCUSDT"].decision == TradingDecision.BUY
+    assert signals["ETHUSDT"].decision == TradingDecision.SELL
+    assert signals["SOLUSDT"].decision == TradingDecision.HOLD
+    assert signals["BTCUSDT"].tokens_input == 900
+    assert signals["BTCUSDT"].tokens_output == 120
+    assert signals["BTCUSDT"].cost_usd > 0
+
+
+@pytest.mark.asyncio
+async def test_stream_failure_keeps_dispatched_signals():
+    async def body():
+        yield _sse(_decision("BTCUSDT"))
+        yield b'data: {"error": {"message": "provider overloaded"}}\n\n'
+
+    engine = _engine(lambda request: httpx.Response(200, content=body()))
+    snapshots = {symbol: _snapshot() for symbol in SYMBOLS[:2]}
+
+    signals = await engine.generate_signals(snapshots, use_cache=False)
+
+    assert signals["BTCUSDT"].decision == TradingDecision.BUY
+    assert signals["ETHUSDT"].decision == TradingDecision.HOLD
+
+
+@pytest.mark.asyncio
+async def test_http_error_falls_back_to_hold():
+    engine = _engine(lambda request: httpx.Response(429, text="rate limited"))
+    snapshots = {"BTCUSDT": _snapshot()}
+
+    signals = await engine.generate_signals(snapshots, use_cache=False)
+
+    assert signals["BTCUSDT"].decision == TradingDecision.HOLD
+    assert "Fallback" in signals["BTCUSDT"].reasoning
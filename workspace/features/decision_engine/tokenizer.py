@@ -0,0 +1,141 @@
+"""
+Prompt Tokenizers
+
+Pluggable token counters used by PromptBuilder to report prompt sizes and
+by LLMDecisionEngine for rate-limit and cost estimates.
+
+Any object with a count(text) -> int method can be used. Built in:
+- WhitespaceTokenizer: word count (the engine's historical estimate)
+- CharRatioTokenizer: characters / ratio (~4 for English with BPE models)
+- TiktokenTokenizer: exact BPE counts via tiktoken (optional dependency)
+
+Author: Decision Engine Implementation Team
+Date: 2025-11-16
+"""
+
+import logging
+from typing import Any, Optional, Protocol
+
+# Optional tiktoken import (only needed for exact BPE counts)
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+    tiktoken = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Shared default tokenizer, resolved on first use
+_DEFAULT_TOKENIZER: Optional["Tokenizer"] = None
+
+
+class Tokenizer(Protocol):
+    """Counts tokens in prompt text"""
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text"""
+        ...
+
+
+class WhitespaceTokenizer:
+    """Word count; cheap, but undercounts dense tables and numbers"""
+
+    def count(self, text: str) -> int:
+        """Number of whitespace-separated words in text"""
+        return len(text.split())
+
+
+class CharRatioTokenizer:
+    """Character count divided by an average characters-per-token ratio"""
+
+    def __init__(self, chars_per_token: float = 4.0):
+        """
+        Initialize tokenizer
+
+        Args:
+            chars_per_token: Average characters per token (default: 4.0)
+        """
+        if chars_per_token <= 0:
+            raise ValueError(f"chars_per_token must be positive, got {chars_per_token}")
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        """Estimated number of tokens in text"""
+        return int(round(len(text) / self.chars_per_token))
+
+
+class TiktokenTokenizer:
+    """Exact BPE token counts using a tiktoken encoding"""
+
+    def __init__(self, encoding: str = "cl100k_base"):
+        """
+        Initialize tokenizer (the encoding is loaded on first use)
+
+        Args:
+            encoding: tiktoken encoding name (default: "cl100k_base")
+
+        Raises:
+            ImportError: If tiktoken is not installed
+        """
+        if not TIKTOKEN_AVAILABLE:
+            raise ImportError("tiktoken is required for TiktokenTokenizer")
+        self.encoding_name = encoding
+        self._encoding: Optional[Any] = None  # tiktoken.Encoding
+
+    def count(self, text: str) -> int:
+        """Number of BPE tokens in text"""
+        if self._encoding is None:
+            self._encoding = tiktoken.get_encoding(self.encoding_name)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+def _default_tokenizer() -> Tokenizer:
+    """tiktoken if its encoding loads (it may need a download), else chars"""
+    global _DEFAULT_TOKENIZER
+    if _DEFAULT_TOKENIZER is None:
+        _DEFAULT_TOKENIZER = CharRatioTokenizer()
+        if TIKTOKEN_AVAILABLE:
+            tokenizer = TiktokenTokenizer()
+            try:
+                tokenizer.count("")
+                _DEFAULT_TOKENIZER = tokenizer
+            except Exception as e:
+                logger.warning(
+                    f"tiktoken encoding unavailable, estimating tokens from "
+                    f"characters: {e}"
+                )
+    return _DEFAULT_TOKENIZER
+
+
+def get_tokenizer(name: Optional[str] = None) -> Tokenizer:
+    """
+    Get a tokenizer by name
+
+    Args:
+        name: "whitespace", "chars", "tiktoken" or a tiktoken encoding name
+            (default: tiktoken if its encoding loads, else chars)
+
+    Returns:
+        Tokenizer instance
+    """
+    if name == "whitespace":
+        return WhitespaceTokenizer()
+    if name == "chars":
+        return CharRatioTokenizer()
+    if name is None:
+        return _default_tokenizer()
+    if name == "tiktoken":
+        return TiktokenTokenizer()
+    return TiktokenTokenizer(encoding=name)
+
+
+# Export
+__all__ = [
+    "Tokenizer",
+    "WhitespaceTokenizer",
+    "CharRatioTokenizer",
+    "TiktokenTokenizer",
+    "get_tokenizer",
+]
@@ -20,7 +20,14 @@ from .models import (
     Timeframe,
     WebSocketMessage,
 )
+from .candle_aggregator import AggregatedBar, CandleAggregator
+from .numpy_indicators import NumpyIndicatorCalculator
+from .ohlcv_buffer import OHLCVRingBuffer, OHLCVStore
+from .ohlcv_ingestor import OHLCVIngestor
+from .price_triggers import PriceTrigger, PriceTriggerEngine, TriggerDirection
+from .streaming_indicators import StreamingIndicatorEngine
 from .websocket_client import BybitWebSocketClient
+from .ws_decoder import BybitFrameDecoder, KlineFrame, TickerFrame
 
 __all__ = [
     "Timeframe",
@@ -34,5 +41,18 @@ __all__ = [
     "WebSocketMessage",
     "MarketDataService",
     "IndicatorCalculator",
+    "NumpyIndicatorCalculator",
+    "CandleAggregator",
+    "AggregatedBar",
+    "OHLCVRingBuffer",
+    "OHLCVStore",
+    "OHLCVIngestor",
+    "PriceTriggerEngine",
+    "PriceTrigger",
+    "TriggerDirection",
+    "StreamingIndicatorEngine",
     "BybitWebSocketClient",
+    "BybitFrameDecoder",
+    "KlineFrame",
+    "TickerFrame",
 ]
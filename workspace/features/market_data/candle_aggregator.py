@@ -0,0 +1,311 @@
+"""
+Multi-Timeframe Candle Aggregation
+
+Builds higher-timeframe bars (3m, 5m, 15m, 30m, 1h, 4h, 1d) locally from a
+single base (1m) kline stream, so one WebSocket subscription per symbol
+serves every timeframe.
+
+Aggregation is incremental: each timeframe keeps the running aggregate of
+the closed base bars in its current bucket, and the open base bar is merged
+on top of it. A revision of the open base bar therefore replaces (never
+double counts) its contribution to every higher-timeframe bar.
+
+Buckets are aligned to the epoch (UTC midnight for 1d), matching Bybit's
+kline boundaries. A bucket is reported closed either by a confirmed final
+base candle or, when confirmations are missing (plain OHLCV updates, a lost
+confirm frame), by the first base candle of a later bucket. After a restart the open bucket only
+covers the base bars seen since the stream started.
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-07
+"""
+
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .models import OHLCV, Timeframe
+from .ohlcv_buffer import OHLCVRingBuffer, from_micros, to_micros
+
+logger = logging.getLogger(__name__)
+
+# Timeframe value -> duration in seconds
+TIMEFRAME_SECONDS: Dict[str, int] = {
+    Timeframe.M1.value: 60,
+    Timeframe.M3.value: 3 * 60,
+    Timeframe.M5.value: 5 * 60,
+    Timeframe.M15.value: 15 * 60,
+    Timeframe.M30.value: 30 * 60,
+    Timeframe.H1.value: 60 * 60,
+    Timeframe.H4.value: 4 * 60 * 60,
+    Timeframe.D1.value: 24 * 60 * 60,
+}
+
+DEFAULT_AGGREGATE_TIMEFRAMES = [
+    Timeframe.M3,
+    Timeframe.M5,
+    Timeframe.M15,
+    Timeframe.H1,
+    Timeframe.H4,
+    Timeframe.D1,
+]
+
+# (open, high, low, close, volume, quote_volume, trades_count)
+_Values = Tuple[
+    Decimal, Decimal, Decimal, Decimal, Decimal, Optional[Decimal], Optional[int]
+]
+
+
+def _decimal(value: Any) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _values(candle: Any) -> _Values:
+    """Extract OHLCV values from a candle-like object (OHLCV or KlineFrame)"""
+    quote_volume = getattr(candle, "quote_volume", None)
+    return (
+        _decimal(candle.open),
+        _decimal(candle.high),
+        _decimal(candle.low),
+        _decimal(candle.close),
+        _decimal(candle.volume),
+        _decimal(quote_volume) if quote_volume is not None else None,
+        getattr(candle, "trades_count", None),
+    )
+
+
+def _merge(aggregate: Optional[_Values], values: _Values) -> _Values:
+    """Merge a later base bar into a bucket aggregate"""
+    if aggregate is None:
+        return values
+    open_, high, low, _, volume, quote_volume, trades = aggregate
+    if values[5] is not None:
+        quote_volume = values[5] if quote_volume is None else quote_volume + values[5]
+    if values[6] is not None:
+        trades = values[6] if trades is None else trades + values[6]
+    return (
+        open_,
+        max(high, values[1]),
+        min(low, values[2]),
+        values[3],
+        volume + values[4],
+        quote_volume,
+        trades,
+    )
+
+
+@dataclass
+class AggregatedBar:
+    """Higher-timeframe bar produced by a base candle update"""
+
+    timeframe: str
+    candle: OHLCV
+    closed: bool
+
+
+class CandleAggregator:
+    """
+    Incremental multi-timeframe aggregator for one symbol
+
+    Attributes:
+        symbol: Trading pair
+        base_timeframe: Timeframe of the input stream (default: 1m)
+        timeframes: Aggregated timeframe values
+        buffers: Ring buffer per aggregated timeframe
+
+    Example:
+        ```python
+        aggregator = CandleAggregator("BTC/USDT:USDT", [Timeframe.M3, Timeframe.D1])
+        for bar in aggregator.update(one_minute_candle):
+            if bar.closed:
+                logger.info(f"{bar.timeframe} bar closed @ {bar.candle.close}")
+        daily_closes = aggregator.buffers["1d"].closes()
+        ```
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframes: Iterable[Timeframe] = DEFAULT_AGGREGATE_TIMEFRAMES,
+        base_timeframe: Timeframe = Timeframe.M1,
+        capacity: int = 100,
+        buffers: Optional[Dict[str, OHLCVRingBuffer]] = None,
+    ):
+        """
+        Initialize aggregator
+
+        Args:
+            symbol: Trading pair
+            timeframes: Timeframes to build (multiples of base_timeframe)
+            base_timeframe: Timeframe of the input candles (default: 1m)
+            capacity: Ring buffer capacity per timeframe (default: 100)
+            buffers: Existing ring buffers to write into, keyed by timeframe
+                value (e.g. the service's primary buffer); missing ones are
+                created
+
+        Raises:
+            ValueError: If a timeframe is not a multiple of base_timeframe
+        """
+        self.symbol = symbol
+        self.base_timeframe = Timeframe(base_timeframe).value
+        base_seconds = TIMEFRAME_SECONDS[self.base_timeframe]
+        self._base_micros = base_seconds * 1_000_000
+
+        self.timeframes: List[str] = []
+        self._bucket_micros: Dict[str, int] = {}
+        for timeframe in timeframes:
+            value = Timeframe(timeframe).value
+            seconds = TIMEFRAME_SECONDS[value]
+            if seconds <= base_seconds or seconds % base_seconds:
+                raise ValueError(
+                    f"Cannot aggregate {value} from {self.base_timeframe} candles"
+                )
+            self.timeframes.append(value)
+            self._bucket_micros[value] = seconds * 1_000_000
+
+        self.buffers: Dict[str, OHLCVRingBuffer] = {}
+        for value in self.timeframes:
+            buffer = (buffers or {}).get(value)
+            if buffer is None:
+                buffer = OHLCVRingBuffer(symbol, value, capacity)
+            self.buffers[value] = buffer
+
+        # Closed base bars of the current bucket: timeframe -> (start, values)
+        self._closed: Dict[str, Tuple[int, _Values]] = {}
+        # Open base bar
+        self._open_micros: Optional[int] = None
+        self._open_values: Optional[_Values] = None
+        self._last_closed_micros = -1
+        # Start of the last bucket reported closed, per timeframe
+        self._reported: Dict[str, int] = {}
+
+    def update(self, candle: Any) -> List[AggregatedBar]:
+        """
+        Apply a base-timeframe candle (new bar or revision of the open bar)
+
+        A candle with a newer timestamp closes the previous open base bar;
+        a candle with confirm=True (e.g. a KlineFrame) closes its own bar.
+        Buckets left behind by a newer candle that were not yet reported
+        closed are returned first with closed=True.
+
+        Args:
+            candle: Base candle (OHLCV or any object with the same attributes)
+
+        Returns:
+            Rolled-over closed bars followed by the updated bar per
+            aggregated timeframe (empty if the candle was stale and ignored)
+        """
+        micros = to_micros(candle.timestamp)
+
+        if self._open_micros is not None and micros != self._open_micros:
+            if micros < self._open_micros:
+                logger.debug(
+                    f"Ignoring out-of-order {self.base_timeframe} candle for "
+                    f"{self.symbol} @ {candle.timestamp}"
+                )
+                return []
+            self._close_open_bar()
+        if self._open_micros is None and micros <= self._last_closed_micros:
+            logger.debug(
+                f"Ignoring candle for closed {self.base_timeframe} bar "
+                f"{self.symbol} @ {candle.timestamp}"
+            )
+            return []
+
+        values = _values(candle)
+        self._open_micros = micros
+        self._open_values = values
+        confirmed = bool(getattr(candle, "confirm", False))
+        tz = candle.timestamp.tzinfo
+
+        bars = self._roll_buckets(micros, tz)
+        for timeframe in self.timeframes:
+            size = self._bucket_micros[timeframe]
+            start = micros - micros % size
+            closed = self._closed.get(timeframe)
+            aggregate = _merge(
+                closed[1] if closed is not None and closed[0] == start else None,
+                values,
+            )
+            bar = self._build(timeframe, start, tz, aggregate)
+            self.buffers[timeframe].upsert(bar)
+            bar_closed = confirmed and micros + self._base_micros == start + size
+            if bar_closed:
+                self._reported[timeframe] = start
+            bars.append(
+                AggregatedBar(timeframe=timeframe, candle=bar, closed=bar_closed)
+            )
+
+        if confirmed:
+            self._close_open_bar()
+        return bars
+
+    def latest(self, timeframe: Timeframe) -> Optional[OHLCV]:
+        """Latest (possibly still open) bar for timeframe"""
+        return self.buffers[Timeframe(timeframe).value].last()
+
+    def _roll_buckets(self, micros: int, tz) -> List[AggregatedBar]:
+        """Report buckets ending at or before micros that were never closed"""
+        bars = []
+        for timeframe in self.timeframes:
+            closed = self._closed.get(timeframe)
+            if closed is None:
+                continue
+            start, values = closed
+            if (
+                start + self._bucket_micros[timeframe] <= micros
+                and self._reported.get(timeframe) != start
+            ):
+                # The ring buffer already holds these values from the last
+                # update of the bucket
+                self._reported[timeframe] = start
+                bars.append(
+                    AggregatedBar(
+                        timeframe=timeframe,
+                        candle=self._build(timeframe, start, tz, values),
+                        closed=True,
+                    )
+                )
+        return bars
+
+    def _close_open_bar(self) -> None:
+        """Fold the open base bar into each timeframe's bucket aggregate"""
+        micros = self._open_micros
+        values = self._open_values
+        if micros is None or values is None:
+            return
+        for timeframe in self.timeframes:
+            start = micros - micros % self._bucket_micros[timeframe]
+            closed = self._closed.get(timeframe)
+            if closed is not None and closed[0] == start:
+                self._closed[timeframe] = (start, _merge(closed[1], values))
+            else:
+                self._closed[timeframe] = (start, values)
+        self._last_closed_micros = micros
+        self._open_micros = None
+        self._open_values = None
+
+    def _build(self, timeframe: str, start: int, tz, values: _Values) -> OHLCV:
+        open_, high, low, close, volume, quote_volume, trades = values
+        return OHLCV.model_construct(
+            symbol=self.symbol,
+            timeframe=timeframe,
+            timestamp=from_micros(start, tz),
+            open=open_,
+            high=high,
+            low=low,
+            close=close,
+            volume=volume,
+            quote_volume=quote_volume,
+            trades_count=trades,
+        )
+
+
+# Export
+__all__ = [
+    "CandleAggregator",
+    "AggregatedBar",
+    "TIMEFRAME_SECONDS",
+    "DEFAULT_AGGREGATE_TIMEFRAMES",
+]
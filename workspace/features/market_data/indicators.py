@@ -10,7 +10,7 @@ Date: 2025-10-27
 
 import logging
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from .models import EMA, MACD, OHLCV, RSI, BollingerBands
 
@@ -448,6 +448,45 @@ class IndicatorCalculator:
             ),
         }
 
+    @staticmethod
+    def calculate_all_indicators_batch(
+        candles_by_symbol: Dict[str, List[OHLCV]],
+        backend: str = "numpy",
+        **kwargs,
+    ) -> Dict[str, dict]:
+        """
+        Calculate all technical indicators for many symbols at once
+
+        Args:
+            candles_by_symbol: Candles per symbol (sorted by timestamp ascending)
+            backend: 'numpy' (vectorized float64, Decimal-parity output) or
+                'decimal' (per-symbol calculate_all_indicators)
+            **kwargs: Indicator periods, as for calculate_all_indicators
+
+        Returns:
+            Dictionary mapping symbol to its indicator dictionary
+
+        Example:
+            ```python
+            results = IndicatorCalculator.calculate_all_indicators_batch(
+                service.ohlcv_data
+            )
+            btc_macd = results['BTC/USDT:USDT']['macd']
+            ```
+        """
+        if backend == "numpy":
+            from .numpy_indicators import NumpyIndicatorCalculator
+
+            return NumpyIndicatorCalculator.calculate_all_indicators(
+                candles_by_symbol, **kwargs
+            )
+        if backend == "decimal":
+            return {
+                symbol: IndicatorCalculator.calculate_all_indicators(candles, **kwargs)
+                for symbol, candles in candles_by_symbol.items()
+            }
+        raise ValueError(f"Unknown indicator backend: {backend}")
+
 
 # Export
 __all__ = ["IndicatorCalculator"]
@@ -12,7 +12,10 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import ccxt.async_support as ccxt
+import numpy as np
 
 from .models import (
     OHLCV,
@@ -20,8 +23,12 @@ from .models import (
     Timeframe,
     MarketDataSnapshot,
 )
-from .indicators import IndicatorCalculator
+from .candle_aggregator import AggregatedBar, CandleAggregator
+from .ohlcv_buffer import OHLCVRingBuffer, OHLCVStore, from_micros
+from .ohlcv_ingestor import OHLCVIngestor
+from .streaming_indicators import StreamingIndicatorEngine
 from .websocket_client import BybitWebSocketClient
+from .ws_decoder import KlineFrame, TickerFrame
 from workspace.shared.database.connection import DatabasePool
 from workspace.features.caching import CacheService
 
@@ -37,16 +44,23 @@ class MarketDataService:
 
     Features:
     - Real-time WebSocket data streaming
-    - OHLCV data storage in TimescaleDB
+    - Batched storage of every closed candle in TimescaleDB
     - Technical indicator calculation
     - Market data snapshots for trading decisions
     - In-memory caching for fast access
+    - Optional multi-timeframe bars aggregated from a single 1m stream
+    - Per-tick ticker listeners (e.g. PriceTriggerEngine for stop-losses)
+    - Closed-bar listeners on aggregated timeframes (e.g. CorrelationEngine)
 
     Attributes:
         symbols: List of trading pairs to track
         timeframe: Primary timeframe for trading
         testnet: Whether using testnet
         lookback_periods: Historical periods to maintain
+        aggregators: Per-symbol 1m -> higher timeframe aggregators (only
+            when aggregate_timeframes is set)
+        ingestor: Bulk loader persisting closed candles of every timeframe
+        exchange: ccxt REST client used to backfill candle gaps
     """
 
     def __init__(
@@ -56,6 +70,9 @@ class MarketDataService:
         testnet: bool = True,
         lookback_periods: int = 100,  # Keep 100 candles in memory
         cache_service: Optional[CacheService] = None,
+        aggregate_timeframes: Optional[List[Timeframe]] = None,
+        ingestor: Optional[OHLCVIngestor] = None,
+        exchange: Optional[Any] = None,
     ):
         """
         Initialize Market Data Service
@@ -66,6 +83,14 @@ class MarketDataService:
             testnet: Use testnet (default: True)
             lookback_periods: Number of historical periods to maintain
             cache_service: Optional CacheService instance (default: creates new one)
+            aggregate_timeframes: Extra timeframes to build locally from a
+                single 1m subscription (e.g. [Timeframe.H1, Timeframe.D1]);
+                the primary timeframe is then aggregated as well. Default
+                None subscribes to the primary timeframe directly.
+            ingestor: Optional OHLCVIngestor for candle persistence (default:
+                creates one backfilling gaps through exchange)
+            exchange: Optional ccxt-style REST client for gap backfill
+                (default: a public Bybit client created on start)
 
         Example:
             ```python
@@ -89,10 +114,46 @@ class MarketDataService:
 
         # In-memory data stores
         self.latest_tickers: Dict[str, Ticker] = {}
-        self.ohlcv_data: Dict[str, List[OHLCV]] = {
-            self._format_symbol(symbol): [] for symbol in symbols
-        }
+        # Raw ticker frames not yet materialized into latest_tickers
+        self.latest_ticker_frames: Dict[str, TickerFrame] = {}
+        # Synchronous callbacks run on every ticker frame
+        self.ticker_listeners: List[Callable[[TickerFrame], None]] = []
+        # Synchronous callbacks run on every closed aggregated bar
+        self.bar_listeners: List[Callable[[AggregatedBar], None]] = []
+        # Columnar ring buffer per symbol, capped at lookback_periods candles
+        self.ohlcv_data: OHLCVStore = OHLCVStore(
+            timeframe=timeframe.value, capacity=lookback_periods
+        )
+        for symbol in symbols:
+            self.ohlcv_data.create(self._format_symbol(symbol))
         self.latest_snapshots: Dict[str, MarketDataSnapshot] = {}
+        # Symbols whose snapshot lags the kline stream (rebuilt on read)
+        self._stale_snapshots: Set[str] = set()
+
+        # Incremental indicator state per (symbol, timeframe)
+        self.indicator_engines: Dict[Tuple[str, str], StreamingIndicatorEngine] = {}
+
+        # 1m -> multi-timeframe aggregation (one kline subscription per symbol)
+        self.aggregators: Dict[str, CandleAggregator] = {}
+        if aggregate_timeframes is not None:
+            timeframes = [timeframe]
+            timeframes += [tf for tf in aggregate_timeframes if tf != timeframe]
+            for symbol in symbols:
+                formatted_symbol = self._format_symbol(symbol)
+                self.aggregators[formatted_symbol] = CandleAggregator(
+                    formatted_symbol,
+                    timeframes=timeframes,
+                    base_timeframe=Timeframe.M1,
+                    capacity=lookback_periods,
+                    buffers={timeframe.value: self.ohlcv_data[formatted_symbol]},
+                )
+
+        # Closed candles of every timeframe -> market_data (batched COPY)
+        self.exchange = exchange
+        self._owns_exchange = False
+        self.ingestor = (
+            ingestor if ingestor is not None else OHLCVIngestor(exchange=exchange)
+        )
 
         # WebSocket client
         self.ws_client: Optional[BybitWebSocketClient] = None
@@ -100,7 +161,6 @@ class MarketDataService:
         # Background tasks
         self.running = False
         self.indicator_update_task: Optional[asyncio.Task] = None
-        self.storage_task: Optional[asyncio.Task] = None
 
     async def start(self):
         """Start market data service"""
@@ -110,10 +170,10 @@ class MarketDataService:
         # Initialize WebSocket client
         self.ws_client = BybitWebSocketClient(
             symbols=self.symbols,
-            timeframes=[self.timeframe],
+            timeframes=[Timeframe.M1] if self.aggregators else [self.timeframe],
             testnet=self.testnet,
-            on_ticker=self._handle_ticker_update,
-            on_kline=self._handle_kline_update,
+            on_ticker_frame=self._handle_ticker_frame,
+            on_kline_frame=self._handle_kline_frame,
             on_error=self._handle_websocket_error,
         )
 
@@ -125,7 +185,9 @@ class MarketDataService:
 
         # Start background tasks
         self.indicator_update_task = asyncio.create_task(self._indicator_update_loop())
-        self.storage_task = asyncio.create_task(self._storage_loop())
+        if self.ingestor.exchange is None:
+            self.ingestor.exchange = self._get_exchange()
+        await self.ingestor.start()
 
         logger.info("Market Data Service started successfully")
 
@@ -146,15 +208,29 @@ class MarketDataService:
             except asyncio.CancelledError:
                 pass
 
-        if self.storage_task:
-            self.storage_task.cancel()
-            try:
-                await self.storage_task
-            except asyncio.CancelledError:
-                pass
+        # Flush staged candles
+        await self.ingestor.close()
+
+        if self._owns_exchange and self.exchange is not None:
+            if self.ingestor.exchange is self.exchange:
+                self.ingestor.exchange = None
+            await self.exchange.close()
+            self.exchange = None
+            self._owns_exchange = False
 
         logger.info("Market Data Service stopped")
 
+    def _get_exchange(self) -> Any:
+        """REST client for gap backfill (public endpoints, no API keys)"""
+        if self.exchange is None:
+            self.exchange = ccxt.bybit(
+                {"enableRateLimit": True, "options": {"defaultType": "swap"}}
+            )
+            if self.testnet:
+                self.exchange.set_sandbox_mode(True)
+            self._owns_exchange = True
+        return self.exchange
+
     async def get_snapshot(self, symbol: str) -> Optional[MarketDataSnapshot]:
         """
         Get complete market data snapshot for symbol
@@ -169,6 +245,10 @@ class MarketDataService:
         """
         formatted_symbol = self._format_symbol(symbol)
 
+        # Rebuild the snapshot if kline frames arrived since the last build
+        if formatted_symbol in self._stale_snapshots:
+            await self._update_indicators(formatted_symbol)
+
         # Check if we have recent data
         if formatted_symbol not in self.latest_snapshots:
             logger.warning(f"No snapshot available for {symbol}")
@@ -230,7 +310,7 @@ class MarketDataService:
             logger.debug(f"Cache miss for ticker {formatted_symbol}")
 
         # Get from memory
-        ticker = self.latest_tickers.get(formatted_symbol)
+        ticker = self._latest_ticker(formatted_symbol)
 
         if use_cache and ticker:
             # Serialize for caching
@@ -326,33 +406,29 @@ class MarketDataService:
             )
 
         # Get from memory
-        candles = self.ohlcv_data.get(formatted_symbol, [])
-        result = candles[-limit:] if candles else []
-
-        if use_cache and result:
-            # Serialize for caching
+        buffer = self.ohlcv_data.get(formatted_symbol)
+        if not buffer:
+            return []
+        records = buffer.to_records(limit)
+        result = [OHLCV.model_construct(**record) for record in records]
+
+        if use_cache and records:
+            # Serialize for caching straight from the buffer columns
             serialized = [
                 {
-                    "symbol": c.symbol,
-                    "timeframe": (
-                        c.timeframe.value
-                        if hasattr(c.timeframe, "value")
-                        else str(c.timeframe)
+                    **record,
+                    "timestamp": record["timestamp"].isoformat(),
+                    "open": str(record["open"]),
+                    "high": str(record["high"]),
+                    "low": str(record["low"]),
+                    "close": str(record["close"]),
+                    "volume": str(record["volume"]),
+                    "quote_volume": (
+                        str(record["quote_volume"]) if record["quote_volume"] else "0"
                     ),
-                    "timestamp": (
-                        c.timestamp.isoformat()
-                        if hasattr(c.timestamp, "isoformat")
-                        else str(c.timestamp)
-                    ),
-                    "open": str(c.open),
-                    "high": str(c.high),
-                    "low": str(c.low),
-                    "close": str(c.close),
-                    "volume": str(c.volume),
-                    "quote_volume": str(c.quote_volume) if c.quote_volume else "0",
-                    "trades_count": c.trades_count or 0,
+                    "trades_count": record["trades_count"] or 0,
                 }
-                for c in result
+                for record in records
             ]
             # Cache for 60 seconds
             cache_key = (
@@ -362,30 +438,142 @@ class MarketDataService:
 
         return result
 
+    def get_ohlcv_arrays(
+        self, symbol: str, limit: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get zero-copy OHLCV column views for symbol
+
+        Views are read-only and only valid until the next kline update; copy
+        them if they need to outlive the current event-loop step.
+
+        Args:
+            symbol: Trading pair
+            limit: Number of most recent candles (default: all)
+
+        Returns:
+            Dictionary of timestamp/open/high/low/close/volume/quote_volume/
+            trades_count arrays (oldest first), empty if symbol is unknown
+        """
+        buffer = self.ohlcv_data.get(self._format_symbol(symbol))
+        if buffer is None:
+            return {}
+        return buffer.window(limit)
+
     async def _handle_ticker_update(self, ticker: Ticker):
         """Handle incoming ticker update from WebSocket"""
         self.latest_tickers[ticker.symbol] = ticker
         logger.debug(f"Ticker updated: {ticker.symbol} @ {ticker.last}")
 
+    def add_ticker_listener(self, listener: Callable[[TickerFrame], None]):
+        """
+        Register a callback for every WebSocket ticker frame
+
+        Listeners run inline on the receive path, so they must be
+        synchronous and cheap (schedule tasks for slow work).
+
+        Args:
+            listener: Callable receiving each TickerFrame
+        """
+        if listener not in self.ticker_listeners:
+            self.ticker_listeners.append(listener)
+
+    def remove_ticker_listener(self, listener: Callable[[TickerFrame], None]):
+        """
+        Unregister a ticker listener
+
+        Args:
+            listener: Callable previously passed to add_ticker_listener
+        """
+        if listener in self.ticker_listeners:
+            self.ticker_listeners.remove(listener)
+
+    def add_bar_listener(self, listener: Callable[[AggregatedBar], None]):
+        """
+        Register a callback for every closed aggregated bar
+
+        Only bars built by the 1m aggregator (aggregate_timeframes) are
+        delivered. Listeners run inline and must be synchronous and cheap.
+
+        Args:
+            listener: Callable receiving each closed AggregatedBar
+        """
+        if listener not in self.bar_listeners:
+            self.bar_listeners.append(listener)
+
+    def remove_bar_listener(self, listener: Callable[[AggregatedBar], None]):
+        """
+        Unregister a bar listener
+
+        Args:
+            listener: Callable previously passed to add_bar_listener
+        """
+        if listener in self.bar_listeners:
+            self.bar_listeners.remove(listener)
+
+    async def _handle_ticker_frame(self, frame: TickerFrame):
+        """Handle incoming ticker frame (Ticker model is built on read)"""
+        self.latest_ticker_frames[frame.symbol] = frame
+        for listener in self.ticker_listeners:
+            try:
+                listener(frame)
+            except Exception as e:
+                logger.error(f"Ticker listener failed for {frame.symbol}: {e}")
+
+    def _latest_ticker(self, symbol: str) -> Optional[Ticker]:
+        """Latest ticker for symbol, materializing a pending frame"""
+        frame = self.latest_ticker_frames.pop(symbol, None)
+        if frame is not None:
+            try:
+                self.latest_tickers[symbol] = frame.to_model()
+            except Exception as e:
+                logger.error(f"Invalid ticker frame for {symbol}: {e}")
+        return self.latest_tickers.get(symbol)
+
+    async def _handle_kline_frame(self, frame: KlineFrame):
+        """
+        Handle incoming kline frame without building Pydantic models
+
+        Open-bar revisions only update the ring buffer and indicator engine;
+        the snapshot is rebuilt when the bar is confirmed or on read.
+        """
+        symbol = frame.symbol
+        if symbol in self.aggregators:
+            await self._handle_base_candle(frame)
+            return
+
+        buffer = self.ohlcv_data.get(symbol)
+        if buffer is None:
+            return
+
+        buffer.upsert(frame)
+        self.ingestor.update(frame, confirmed=frame.confirm)
+        engine = self._get_indicator_engine(symbol)
+        engine.update(frame)
+
+        if frame.confirm:
+            engine.close_bar()
+            await self._update_indicators(symbol)
+        else:
+            self._stale_snapshots.add(symbol)
+
     async def _handle_kline_update(self, ohlcv: OHLCV):
         """Handle incoming kline update from WebSocket"""
         symbol = ohlcv.symbol
 
+        if symbol in self.aggregators and ohlcv.timeframe == Timeframe.M1.value:
+            await self._handle_base_candle(ohlcv)
+            return
+
         # Add to in-memory store
         if symbol in self.ohlcv_data:
-            candles = self.ohlcv_data[symbol]
-
-            # Check if this is an update to latest candle or new candle
-            if candles and candles[-1].timestamp == ohlcv.timestamp:
-                # Update existing candle
-                candles[-1] = ohlcv
-            else:
-                # New candle
-                candles.append(ohlcv)
+            # O(1): revise the open bar in place or append, evicting the oldest
+            self.ohlcv_data[symbol].upsert(ohlcv)
+            # Persisted once the next bar starts
+            self.ingestor.update(ohlcv)
 
-                # Maintain lookback window
-                if len(candles) > self.lookback_periods:
-                    candles.pop(0)
+            # O(1) incremental indicator update (revises or rolls the open bar)
+            self._get_indicator_engine(symbol).update(ohlcv)
 
             logger.debug(
                 f"Kline updated: {symbol} @ {ohlcv.timestamp} "
@@ -395,6 +583,85 @@ class MarketDataService:
             # Trigger indicator recalculation
             await self._update_indicators(symbol)
 
+    async def _handle_base_candle(self, candle):
+        """
+        Aggregate a 1m candle (OHLCV or KlineFrame) into every timeframe
+
+        The aggregator writes each timeframe's ring buffer (including the
+        primary one); the primary bar also drives the indicator engine. The
+        1m candle and every aggregated bar are handed to the ingestor.
+        """
+        symbol = candle.symbol
+        bars = self.aggregators[symbol].update(candle)
+        if bars:
+            self.ingestor.update(candle, confirmed=getattr(candle, "confirm", False))
+        for bar in bars:
+            self.ingestor.update(bar.candle, confirmed=bar.closed)
+            if bar.closed:
+                for listener in self.bar_listeners:
+                    try:
+                        listener(bar)
+                    except Exception as e:
+                        logger.error(f"Bar listener failed for {symbol}: {e}")
+            if bar.timeframe != self.timeframe.value:
+                continue
+
+            engine = self._get_indicator_engine(symbol)
+            engine.update(bar.candle)
+            if bar.closed:
+                engine.close_bar()
+                await self._update_indicators(symbol)
+            else:
+                self._stale_snapshots.add(symbol)
+
+    async def get_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "1d",
+        limit: int = 100,
+    ) -> List[List[float]]:
+        """
+        Get OHLCV rows for any tracked timeframe from memory
+
+        Rows use the ccxt fetch_ohlcv layout
+        [timestamp_ms, open, high, low, close, volume], so consumers written
+        against the exchange API (e.g. CorrelationAnalyzer) can read locally
+        aggregated bars without REST calls.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe value (e.g. '1d')
+            limit: Maximum number of candles
+
+        Returns:
+            Rows sorted by timestamp ascending (empty if not tracked)
+        """
+        formatted_symbol = self._format_symbol(symbol)
+        timeframe = Timeframe(timeframe).value
+
+        aggregator = self.aggregators.get(formatted_symbol)
+        buffer: Optional[OHLCVRingBuffer] = None
+        if aggregator is not None and timeframe in aggregator.buffers:
+            buffer = aggregator.buffers[timeframe]
+        elif timeframe == self.timeframe.value:
+            buffer = self.ohlcv_data.get(formatted_symbol)
+        if not buffer:
+            return []
+
+        window = buffer.window(limit)
+        millis = window["timestamp"] // 1000
+        return [
+            [int(ts), o, h, low, c, v]
+            for ts, o, h, low, c, v in zip(
+                millis.tolist(),
+                window["open"].tolist(),
+                window["high"].tolist(),
+                window["low"].tolist(),
+                window["close"].tolist(),
+                window["volume"].tolist(),
+            )
+        ]
+
     async def _handle_websocket_error(self, error: Exception):
         """Handle WebSocket errors"""
         logger.error(f"WebSocket error: {error}")
@@ -408,71 +675,119 @@ class MarketDataService:
 
             try:
                 async with DatabasePool.get_connection() as conn:
-                    # Load last N candles
-                    rows = await conn.fetch(
-                        """
-                        SELECT symbol, timeframe, timestamp, open, high, low, close,
-                               volume, quote_volume, trades_count
-                        FROM market_data
-                        WHERE symbol = $1 AND timeframe = $2
-                        ORDER BY timestamp DESC
-                        LIMIT $3
-                        """,
-                        formatted_symbol,
-                        self.timeframe.value,
-                        self.lookback_periods,
+                    candles = await self._fetch_candles(
+                        conn, formatted_symbol, self.timeframe.value
                     )
 
-                    # Convert to OHLCV objects (reverse to get ascending order)
-                    candles = []
-                    for row in reversed(rows):
-                        candle = OHLCV(
-                            symbol=row["symbol"],
-                            timeframe=Timeframe(row["timeframe"]),
-                            timestamp=row["timestamp"],
-                            open=row["open"],
-                            high=row["high"],
-                            low=row["low"],
-                            close=row["close"],
-                            volume=row["volume"],
-                            quote_volume=row["quote_volume"],
-                            trades_count=row["trades_count"],
-                        )
-                        candles.append(candle)
-
-                    self.ohlcv_data[formatted_symbol] = candles
+                    # Refill in place: the aggregator shares this buffer
+                    buffer = self.ohlcv_data[formatted_symbol]
+                    buffer.clear()
+                    buffer.extend(candles)
+                    self._get_indicator_engine(formatted_symbol).load_buffer(buffer)
+                    self._mark_persisted(buffer)
                     logger.info(f"Loaded {len(candles)} candles for {formatted_symbol}")
 
+                    # Seed the other aggregated timeframes
+                    aggregator = self.aggregators.get(formatted_symbol)
+                    if aggregator is not None:
+                        for timeframe, tf_buffer in aggregator.buffers.items():
+                            if tf_buffer is buffer:
+                                continue
+                            tf_buffer.clear()
+                            tf_buffer.extend(
+                                await self._fetch_candles(
+                                    conn, formatted_symbol, timeframe
+                                )
+                            )
+                            self._mark_persisted(tf_buffer)
+
             except Exception as e:
                 logger.error(
                     f"Error loading historical data for {symbol}: {e}", exc_info=True
                 )
 
+    async def _fetch_candles(self, conn, symbol: str, timeframe: str) -> List[OHLCV]:
+        """Load the last lookback_periods candles for symbol/timeframe"""
+        rows = await conn.fetch(
+            """
+            SELECT symbol, timeframe, timestamp, open, high, low, close,
+                   volume, quote_volume, trades_count
+            FROM market_data
+            WHERE symbol = $1 AND timeframe = $2
+            ORDER BY timestamp DESC
+            LIMIT $3
+            """,
+            symbol,
+            timeframe,
+            self.lookback_periods,
+        )
+
+        # Convert to OHLCV objects (reverse to get ascending order); timestamps
+        # are stored as microseconds since epoch
+        return [
+            OHLCV(
+                symbol=row["symbol"],
+                timeframe=Timeframe(row["timeframe"]),
+                timestamp=from_micros(row["timestamp"], None),
+                open=row["open"],
+                high=row["high"],
+                low=row["low"],
+                close=row["close"],
+                volume=row["volume"],
+                quote_volume=row["quote_volume"],
+                trades_count=row["trades_count"],
+            )
+            for row in reversed(rows)
+        ]
+
+    def _mark_persisted(self, buffer) -> None:
+        """Let the ingestor detect bars missed since the stored history"""
+        if buffer:
+            self.ingestor.mark_persisted(
+                buffer.symbol, buffer.timeframe, buffer.last_timestamp
+            )
+
     async def _update_indicators(self, symbol: str):
         """Calculate and update indicators for symbol"""
         try:
-            candles = self.ohlcv_data.get(symbol, [])
-            if len(candles) < 50:  # Need enough data for indicators
+            candles = self.ohlcv_data.get(symbol)
+            count = len(candles) if candles is not None else 0
+            if candles is None or count < 50:  # Need enough data for indicators
                 logger.debug(
-                    f"Insufficient data for indicators: {symbol} ({len(candles)} candles)"
+                    f"Insufficient data for indicators: {symbol} ({count} candles)"
                 )
                 return
 
             # Get latest ticker
-            ticker = self.latest_tickers.get(symbol)
+            ticker = self._latest_ticker(symbol)
             if not ticker:
                 logger.debug(f"No ticker available for {symbol}")
                 return
 
-            # Calculate all indicators
-            indicators = IndicatorCalculator.calculate_all_indicators(candles)
+            # Read indicators from the incremental engine, re-seeding it from
+            # the candle store if the two have diverged
+            engine = self._get_indicator_engine(symbol)
+            latest = engine.latest_candle
+            if (
+                latest is None
+                or latest.timestamp != candles.last_timestamp
+                or latest.close != candles.last_close
+            ):
+                engine.load_buffer(candles)
+            indicators = engine.indicators()
+            latest = engine.latest_candle
+            if latest is None:
+                logger.debug(f"No candle available for {symbol}")
+                return
+            if isinstance(latest, KlineFrame):
+                latest = latest.to_model()
 
             # Create snapshot
             snapshot = MarketDataSnapshot(
                 symbol=symbol,
                 timeframe=self.timeframe,
                 timestamp=datetime.utcnow(),
-                ohlcv=candles[-1],
+                ohlcv=latest,
                 ticker=ticker,
                 rsi=indicators.get("rsi"),
                 macd=indicators.get("macd"),
@@ -482,11 +797,21 @@ class MarketDataService:
             )
 
             self.latest_snapshots[symbol] = snapshot
+            self._stale_snapshots.discard(symbol)
             logger.debug(f"Indicators updated for {symbol}")
 
         except Exception as e:
             logger.error(f"Error updating indicators for {symbol}: {e}", exc_info=True)
 
+    def _get_indicator_engine(self, symbol: str) -> StreamingIndicatorEngine:
+        """Get or create the incremental indicator engine for symbol"""
+        key = (symbol, self.timeframe.value)
+        engine = self.indicator_engines.get(key)
+        if engine is None:
+            engine = StreamingIndicatorEngine(symbol, self.timeframe.value)
+            self.indicator_engines[key] = engine
+        return engine
+
     async def _indicator_update_loop(self):
         """Background task to periodically update indicators"""
         logger.info("Indicator update loop started")
@@ -507,66 +832,6 @@ class MarketDataService:
 
         logger.info("Indicator update loop stopped")
 
-    async def _storage_loop(self):
-        """Background task to periodically store data to database"""
-        logger.info("Storage loop started")
-
-        while self.running:
-            try:
-                # Store data every 60 seconds
-                await asyncio.sleep(60)
-
-                for symbol in self.symbols:
-                    formatted_symbol = self._format_symbol(symbol)
-                    candles = self.ohlcv_data.get(formatted_symbol, [])
-
-                    if candles:
-                        # Store last candle (most recent complete candle)
-                        await self._store_ohlcv(candles[-1])
-
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in storage loop: {e}", exc_info=True)
-
-        logger.info("Storage loop stopped")
-
-    async def _store_ohlcv(self, ohlcv: OHLCV):
-        """Store OHLCV data to database"""
-        try:
-            async with DatabasePool.get_connection() as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO market_data (
-                        symbol, timeframe, timestamp, open, high, low, close,
-                        volume, quote_volume, trades_count
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                    ON CONFLICT (symbol, timeframe, timestamp)
-                    DO UPDATE SET
-                        open = EXCLUDED.open,
-                        high = EXCLUDED.high,
-                        low = EXCLUDED.low,
-                        close = EXCLUDED.close,
-                        volume = EXCLUDED.volume,
-                        quote_volume = EXCLUDED.quote_volume,
-                        trades_count = EXCLUDED.trades_count
-                    """,
-                    ohlcv.symbol,
-                    ohlcv.timeframe.value,
-                    ohlcv.timestamp,
-                    ohlcv.open,
-                    ohlcv.high,
-                    ohlcv.low,
-                    ohlcv.close,
-                    ohlcv.volume,
-                    ohlcv.quote_volume,
-                    ohlcv.trades_count,
-                )
-            logger.debug(f"Stored OHLCV: {ohlcv.symbol} @ {ohlcv.timestamp}")
-
-        except Exception as e:
-            logger.error(f"Error storing OHLCV: {e}", exc_info=True)
-
     def _format_symbol(self, symbol: str) -> str:
         """Format symbol to standard format"""
         # If already formatted, return as-is
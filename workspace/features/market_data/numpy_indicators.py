@@ -0,0 +1,440 @@
+"""
+NumPy Indicator Backend
+
+Vectorized RSI, EMA, MACD and Bollinger Bands over contiguous float64 close
+arrays. A 2-D (symbols x bars) matrix computes the indicators for many
+symbols at once; the recursive EMA/Wilder steps loop over bars but are
+vectorized across the symbol axis.
+
+Parity mode (calculate_all_indicators) quantizes the float results into the
+same RSI/MACD/EMA/BollingerBands models that IndicatorCalculator produces,
+so strategies see the same values as on the Decimal path.
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-04
+"""
+
+import logging
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import EMA, MACD, OHLCV, RSI, BollingerBands
+from .ohlcv_buffer import OHLCVRingBuffer
+
+logger = logging.getLogger(__name__)
+
+_PRICE_QUANT = Decimal("0.00000001")
+_RSI_QUANT = Decimal("0.01")
+
+
+def _as_matrix(closes: np.ndarray) -> np.ndarray:
+    """Promote closes to a C-contiguous float64 (symbols x bars) matrix"""
+    matrix = np.ascontiguousarray(closes, dtype=np.float64)
+    if matrix.ndim == 1:
+        matrix = matrix[np.newaxis, :]
+    if matrix.ndim != 2:
+        raise ValueError(f"closes must be 1-D or 2-D, got {matrix.ndim}-D")
+    return matrix
+
+
+def _nan_column(rows: int) -> np.ndarray:
+    return np.full(rows, np.nan, dtype=np.float64)
+
+
+def _ema_series(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    SMA-seeded EMA for every bar (NaN before the seed)
+
+    Mirrors IndicatorCalculator._calculate_ema_unquantized applied to each
+    prefix of the series.
+    """
+    rows, bars = values.shape
+    series = np.full((rows, bars), np.nan, dtype=np.float64)
+    if bars < period:
+        return series
+
+    multiplier = 2.0 / (period + 1)
+    ema = values[:, :period].sum(axis=1) / period
+    series[:, period - 1] = ema
+    for j in range(period, bars):
+        ema = (values[:, j] - ema) * multiplier + ema
+        series[:, j] = ema
+    return series
+
+
+def _ema_last(values: np.ndarray, period: int) -> np.ndarray:
+    """SMA-seeded EMA at the last bar only"""
+    rows, bars = values.shape
+    if bars < period:
+        return _nan_column(rows)
+
+    multiplier = 2.0 / (period + 1)
+    ema: np.ndarray = values[:, :period].sum(axis=1) / period
+    for j in range(period, bars):
+        ema = (values[:, j] - ema) * multiplier + ema
+    return ema
+
+
+class NumpyIndicatorCalculator:
+    """
+    Vectorized Technical Indicator Calculator
+
+    Every method takes a 1-D close array or a 2-D (symbols x bars) matrix
+    and returns one value per symbol (NaN where there is insufficient data).
+
+    Methods:
+        calculate_rsi: Relative Strength Index
+        calculate_ema: Exponential Moving Average
+        calculate_macd: MACD line, signal line and histogram
+        calculate_bollinger_bands: Upper, middle and lower bands
+        calculate_all: All of the above as float arrays
+        calculate_all_indicators: Parity mode, returns indicator models
+    """
+
+    @staticmethod
+    def closes_to_array(ohlcv_data: Sequence[OHLCV]) -> np.ndarray:
+        """Extract close prices from candles (or an OHLCVRingBuffer) as float64"""
+        if isinstance(ohlcv_data, OHLCVRingBuffer):
+            return ohlcv_data.closes()
+        return np.fromiter(
+            (float(candle.close) for candle in ohlcv_data),
+            dtype=np.float64,
+            count=len(ohlcv_data),
+        )
+
+    @staticmethod
+    def calculate_rsi(closes: np.ndarray, period: int = 14) -> np.ndarray:
+        """
+        Calculate Wilder-smoothed RSI
+
+        Args:
+            closes: Close prices (1-D or symbols x bars)
+            period: RSI period (default: 14)
+
+        Returns:
+            RSI value per symbol
+        """
+        matrix = _as_matrix(closes)
+        rows, bars = matrix.shape
+        if bars < period + 1:
+            return _nan_column(rows)
+
+        changes = np.diff(matrix, axis=1)
+        gains = np.maximum(changes, 0.0)
+        losses = np.maximum(-changes, 0.0)
+
+        avg_gain = gains[:, :period].sum(axis=1) / period
+        avg_loss = losses[:, :period].sum(axis=1) / period
+        for j in range(period, changes.shape[1]):
+            avg_gain = (avg_gain * (period - 1) + gains[:, j]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[:, j]) / period
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = avg_gain / avg_loss
+            rsi = 100.0 - (100.0 / (1.0 + rs))
+        return np.where(avg_loss == 0, 100.0, rsi)
+
+    @staticmethod
+    def calculate_ema(closes: np.ndarray, period: int) -> np.ndarray:
+        """
+        Calculate SMA-seeded EMA
+
+        Args:
+            closes: Close prices (1-D or symbols x bars)
+            period: EMA period
+
+        Returns:
+            EMA value per symbol
+        """
+        return _ema_last(_as_matrix(closes), period)
+
+    @staticmethod
+    def calculate_macd(
+        closes: np.ndarray,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate MACD
+
+        The MACD history used for the signal line starts at bar index
+        slow_period, matching IndicatorCalculator.calculate_macd.
+
+        Args:
+            closes: Close prices (1-D or symbols x bars)
+            fast_period: Fast EMA period (default: 12)
+            slow_period: Slow EMA period (default: 26)
+            signal_period: Signal line period (default: 9)
+
+        Returns:
+            Tuple of (macd_line, signal_line, histogram) per symbol
+        """
+        matrix = _as_matrix(closes)
+        rows, bars = matrix.shape
+        if bars < slow_period + signal_period:
+            nan = _nan_column(rows)
+            return nan, nan.copy(), nan.copy()
+
+        macd_series = _ema_series(matrix, fast_period) - _ema_series(
+            matrix, slow_period
+        )
+        macd_line = macd_series[:, -1]
+        signal_line = _ema_last(macd_series[:, slow_period:], signal_period)
+        return macd_line, signal_line, macd_line - signal_line
+
+    @staticmethod
+    def calculate_bollinger_bands(
+        closes: np.ndarray,
+        period: int = 20,
+        std_dev: float = 2.0,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate Bollinger Bands over the last period closes
+
+        Args:
+            closes: Close prices (1-D or symbols x bars)
+            period: SMA period (default: 20)
+            std_dev: Standard deviation multiplier (default: 2)
+
+        Returns:
+            Tuple of (upper, middle, lower) bands per symbol
+        """
+        matrix = _as_matrix(closes)
+        rows, bars = matrix.shape
+        if bars < period:
+            nan = _nan_column(rows)
+            return nan, nan.copy(), nan.copy()
+
+        window = matrix[:, -period:]
+        middle = window.sum(axis=1) / period
+        std = np.sqrt(((window - middle[:, np.newaxis]) ** 2).sum(axis=1) / period)
+        return middle + std_dev * std, middle, middle - std_dev * std
+
+    @staticmethod
+    def calculate_all(
+        closes: np.ndarray,
+        rsi_period: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_signal: int = 9,
+        ema_fast_period: int = 12,
+        ema_slow_period: int = 26,
+        bb_period: int = 20,
+        bb_std_dev: float = 2.0,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate all indicators as float arrays
+
+        Returns:
+            Dictionary of per-symbol arrays: rsi, macd_line, macd_signal,
+            macd_histogram, ema_fast, ema_slow, bb_upper, bb_middle, bb_lower
+        """
+        matrix = _as_matrix(closes)
+        macd_line, macd_signal_line, macd_histogram = (
+            NumpyIndicatorCalculator.calculate_macd(
+                matrix, macd_fast, macd_slow, macd_signal
+            )
+        )
+        bb_upper, bb_middle, bb_lower = (
+            NumpyIndicatorCalculator.calculate_bollinger_bands(
+                matrix, bb_period, bb_std_dev
+            )
+        )
+        return {
+            "rsi": NumpyIndicatorCalculator.calculate_rsi(matrix, rsi_period),
+            "macd_line": macd_line,
+            "macd_signal": macd_signal_line,
+            "macd_histogram": macd_histogram,
+            "ema_fast": _ema_last(matrix, ema_fast_period),
+            "ema_slow": _ema_last(matrix, ema_slow_period),
+            "bb_upper": bb_upper,
+            "bb_middle": bb_middle,
+            "bb_lower": bb_lower,
+        }
+
+    @staticmethod
+    def calculate_all_indicators(
+        candles_by_symbol: Dict[str, List[OHLCV]],
+        rsi_period: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_signal: int = 9,
+        ema_fast_period: int = 12,
+        ema_slow_period: int = 26,
+        bb_period: int = 20,
+        bb_std_dev: Decimal = Decimal("2"),
+    ) -> Dict[str, dict]:
+        """
+        Calculate all indicators for many symbols (Decimal-parity mode)
+
+        Symbols are grouped by history length so each group is one
+        rectangular matrix, then results are quantized into the same models
+        as IndicatorCalculator.calculate_all_indicators. Values agree with
+        the Decimal path to within one quantization step (in practice they
+        are identical except on exact rounding ties).
+
+        Args:
+            candles_by_symbol: Candles per symbol (sorted by timestamp ascending)
+
+        Returns:
+            Dictionary mapping symbol to an indicator dict with keys
+            rsi, macd, ema_fast, ema_slow, bollinger
+
+        Example:
+            ```python
+            results = NumpyIndicatorCalculator.calculate_all_indicators(
+                {"BTC/USDT:USDT": btc_candles, "ETH/USDT:USDT": eth_candles}
+            )
+            btc_rsi = results["BTC/USDT:USDT"]["rsi"]
+            ```
+        """
+        groups: Dict[int, List[str]] = defaultdict(list)
+        for symbol, candles in candles_by_symbol.items():
+            groups[len(candles)].append(symbol)
+
+        results: Dict[str, dict] = {}
+        for length, symbols in groups.items():
+            if length == 0:
+                for symbol in symbols:
+                    results[symbol] = {
+                        "rsi": None,
+                        "macd": None,
+                        "ema_fast": None,
+                        "ema_slow": None,
+                        "bollinger": None,
+                    }
+                continue
+
+            matrix = np.empty((len(symbols), length), dtype=np.float64)
+            for row, symbol in enumerate(symbols):
+                matrix[row] = NumpyIndicatorCalculator.closes_to_array(
+                    candles_by_symbol[symbol]
+                )
+
+            arrays = NumpyIndicatorCalculator.calculate_all(
+                matrix,
+                rsi_period=rsi_period,
+                macd_fast=macd_fast,
+                macd_slow=macd_slow,
+                macd_signal=macd_signal,
+                ema_fast_period=ema_fast_period,
+                ema_slow_period=ema_slow_period,
+                bb_period=bb_period,
+                bb_std_dev=float(bb_std_dev),
+            )
+
+            for row, symbol in enumerate(symbols):
+                latest = candles_by_symbol[symbol][-1]
+                results[symbol] = {
+                    "rsi": _build_rsi(latest, arrays["rsi"][row], rsi_period),
+                    "macd": _build_macd(
+                        latest,
+                        arrays["macd_line"][row],
+                        arrays["macd_signal"][row],
+                        arrays["macd_histogram"][row],
+                        macd_fast,
+                        macd_slow,
+                        macd_signal,
+                    ),
+                    "ema_fast": _build_ema(
+                        latest, arrays["ema_fast"][row], ema_fast_period
+                    ),
+                    "ema_slow": _build_ema(
+                        latest, arrays["ema_slow"][row], ema_slow_period
+                    ),
+                    "bollinger": _build_bollinger(
+                        latest,
+                        arrays["bb_upper"][row],
+                        arrays["bb_middle"][row],
+                        arrays["bb_lower"][row],
+                        bb_period,
+                        bb_std_dev,
+                    ),
+                }
+
+        return results
+
+
+def _quantize(value: float, quant: Decimal) -> Decimal:
+    return Decimal(float(value)).quantize(quant)
+
+
+def _build_rsi(latest: OHLCV, value: float, period: int) -> Optional[RSI]:
+    if np.isnan(value):
+        return None
+    return RSI(
+        symbol=latest.symbol,
+        timeframe=latest.timeframe,
+        timestamp=latest.timestamp,
+        value=_quantize(value, _RSI_QUANT),
+        period=period,
+        overbought_level=Decimal("70"),
+        oversold_level=Decimal("30"),
+    )
+
+
+def _build_macd(
+    latest: OHLCV,
+    macd_line: float,
+    signal_line: float,
+    histogram: float,
+    fast_period: int,
+    slow_period: int,
+    signal_period: int,
+) -> Optional[MACD]:
+    if np.isnan(macd_line) or np.isnan(signal_line):
+        return None
+    return MACD(
+        symbol=latest.symbol,
+        timeframe=latest.timeframe,
+        timestamp=latest.timestamp,
+        macd_line=_quantize(macd_line, _PRICE_QUANT),
+        signal_line=_quantize(signal_line, _PRICE_QUANT),
+        histogram=_quantize(histogram, _PRICE_QUANT),
+        fast_period=fast_period,
+        slow_period=slow_period,
+        signal_period=signal_period,
+    )
+
+
+def _build_ema(latest: OHLCV, value: float, period: int) -> Optional[EMA]:
+    if np.isnan(value):
+        return None
+    return EMA(
+        symbol=latest.symbol,
+        timeframe=latest.timeframe,
+        timestamp=latest.timestamp,
+        value=_quantize(value, _PRICE_QUANT),
+        period=period,
+    )
+
+
+def _build_bollinger(
+    latest: OHLCV,
+    upper: float,
+    middle: float,
+    lower: float,
+    period: int,
+    std_dev: Decimal,
+) -> Optional[BollingerBands]:
+    if np.isnan(middle):
+        return None
+    return BollingerBands(
+        symbol=latest.symbol,
+        timeframe=latest.timeframe,
+        timestamp=latest.timestamp,
+        upper_band=_quantize(upper, _PRICE_QUANT),
+        middle_band=_quantize(middle, _PRICE_QUANT),
+        lower_band=_quantize(lower, _PRICE_QUANT),
+        bandwidth=_quantize(upper - lower, _PRICE_QUANT),
+        period=period,
+        std_dev=std_dev,
+    )
+
+
+# Export
+__all__ = ["NumpyIndicatorCalculator"]
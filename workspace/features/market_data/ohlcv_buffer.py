@@ -0,0 +1,410 @@
+"""
+Columnar OHLCV Ring Buffer
+
+Fixed-capacity, array-backed candle storage for one symbol/timeframe.
+Timestamps and OHLCV values live in parallel NumPy columns instead of a
+list of Pydantic OHLCV objects:
+
+- O(1) append of a new bar and in-place update of the open bar
+- Zero-copy, read-only window views (each column is mirrored across twice
+  the capacity, so the latest N bars are always one contiguous slice)
+- Roughly 130 bytes per candle instead of a Pydantic model with Decimals
+
+Prices are stored as float64 and converted back to Decimal through their
+shortest repr, which restores the original value for prices with up to 15
+significant digits.
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-05
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone, tzinfo
+from decimal import Decimal
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
+
+import numpy as np
+
+from .models import OHLCV
+
+if TYPE_CHECKING:
+    from .ws_decoder import Candle
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NO_TRADES = -1
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume", "quote_volume")
+
+
+def to_micros(timestamp: datetime) -> int:
+    """Datetime to microseconds since epoch (naive datetimes are taken as UTC)"""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def from_micros(micros: int, tz: Optional[tzinfo]) -> datetime:
+    """Microseconds since epoch to datetime (naive UTC when tz is None)"""
+    timestamp = _EPOCH + timedelta(microseconds=micros)
+    if tz is None:
+        return timestamp
+    return timestamp.replace(tzinfo=timezone.utc).astimezone(tz)
+
+
+def float_to_decimal(value: float) -> Decimal:
+    """Stored float64 price to Decimal through its shortest repr"""
+    return Decimal(repr(value))
+
+
+class OHLCVRingBuffer:
+    """
+    Fixed-capacity columnar ring buffer of OHLCV candles
+
+    Behaves like a read-only sequence of OHLCV (len, iteration, indexing and
+    slicing materialize models on demand) while exposing the underlying
+    columns as zero-copy NumPy views for vectorized consumers.
+
+    Attributes:
+        symbol: Trading pair
+        timeframe: Candle timeframe value (e.g. '3m')
+        capacity: Maximum number of candles retained
+
+    Example:
+        ```python
+        buffer = OHLCVRingBuffer("BTC/USDT:USDT", "3m", capacity=100)
+        buffer.upsert(candle)           # append or revise the open bar
+        closes = buffer.column("close")  # zero-copy float64 view
+        candles = buffer.to_ohlcv(20)   # last 20 candles as OHLCV models
+        ```
+    """
+
+    def __init__(self, symbol: str, timeframe: str, capacity: int = 100):
+        """
+        Initialize OHLCV ring buffer
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe value
+            capacity: Number of candles to retain (default: 100)
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.capacity = capacity
+
+        size = 2 * capacity
+        self._timestamps = np.zeros(size, dtype=np.int64)
+        self._prices: Dict[str, np.ndarray] = {
+            name: np.zeros(size, dtype=np.float64) for name in PRICE_COLUMNS
+        }
+        self._trades = np.zeros(size, dtype=np.int64)
+
+        self._count = 0
+        self._last_slot = -1  # Slot of the newest candle in [0, capacity)
+        self._tz: Optional[tzinfo] = None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, candle: "Candle") -> None:
+        """Append a new candle, evicting the oldest when full (O(1))"""
+        slot = (self._last_slot + 1) % self.capacity
+        self._write(slot, candle)
+        self._last_slot = slot
+        if self._count < self.capacity:
+            self._count += 1
+
+    def update_last(self, candle: "Candle") -> None:
+        """Overwrite the newest candle in place (O(1))"""
+        if self._count == 0:
+            raise IndexError("update_last on empty OHLCVRingBuffer")
+        self._write(self._last_slot, candle)
+
+    def upsert(self, candle: "Candle") -> bool:
+        """
+        Append a new bar or revise the open bar
+
+        Args:
+            candle: Candle from the stream
+
+        Returns:
+            True if a new bar was appended, False if the open bar was updated
+            (or the candle was older than the newest bar and ignored)
+        """
+        if self._count:
+            last = int(self._timestamps[self._last_slot])
+            micros = to_micros(candle.timestamp)
+            if micros == last:
+                self._write(self._last_slot, candle)
+                return False
+            if micros < last:
+                logger.debug(
+                    f"Ignoring out-of-order candle for {self.symbol} @ {candle.timestamp}"
+                )
+                return False
+        self.append(candle)
+        return True
+
+    def extend(self, candles: Iterable[OHLCV]) -> None:
+        """Append candles in order"""
+        for candle in candles:
+            self.append(candle)
+
+    def clear(self) -> None:
+        """Drop all candles (keeps the allocated columns)"""
+        self._count = 0
+        self._last_slot = -1
+
+    def _write(self, slot: int, candle: "Candle") -> None:
+        # Duck-typed: anything with OHLCV's attributes (e.g. a KlineFrame
+        # holding raw price strings) can be written without a model
+        mirror = slot + self.capacity
+        micros = to_micros(candle.timestamp)
+        self._timestamps[slot] = self._timestamps[mirror] = micros
+        if candle.timestamp.tzinfo is not None:
+            self._tz = candle.timestamp.tzinfo
+
+        prices = self._prices
+        for name in ("open", "high", "low", "close", "volume"):
+            value = float(getattr(candle, name))
+            prices[name][slot] = prices[name][mirror] = value
+
+        quote_volume = (
+            float(candle.quote_volume) if candle.quote_volume is not None else np.nan
+        )
+        prices["quote_volume"][slot] = prices["quote_volume"][mirror] = quote_volume
+
+        trades = candle.trades_count if candle.trades_count is not None else _NO_TRADES
+        self._trades[slot] = self._trades[mirror] = trades
+
+    # ------------------------------------------------------------------
+    # Zero-copy reads
+    # ------------------------------------------------------------------
+
+    def _window(self, n: Optional[int]) -> slice:
+        if n is None or n > self._count:
+            n = self._count
+        end = self._last_slot + self.capacity + 1
+        return slice(end - n, end)
+
+    @staticmethod
+    def _read_only(view: np.ndarray) -> np.ndarray:
+        view.flags.writeable = False
+        return view
+
+    def column(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        Zero-copy view of the last n values of a column (oldest first)
+
+        The view is only valid until the next write to the buffer.
+
+        Args:
+            name: One of timestamp, open, high, low, close, volume,
+                quote_volume, trades_count
+            n: Number of most recent bars (default: all)
+
+        Returns:
+            Read-only NumPy view
+        """
+        window = self._window(n)
+        if name == "timestamp":
+            return self._read_only(self._timestamps[window])
+        if name == "trades_count":
+            return self._read_only(self._trades[window])
+        if name not in self._prices:
+            raise KeyError(f"Unknown OHLCV column: {name}")
+        return self._read_only(self._prices[name][window])
+
+    def closes(self, n: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of the last n close prices"""
+        return self.column("close", n)
+
+    def window(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Zero-copy views of all columns for the last n bars"""
+        window = self._window(n)
+        views = {"timestamp": self._read_only(self._timestamps[window])}
+        for name, column in self._prices.items():
+            views[name] = self._read_only(column[window])
+        views["trades_count"] = self._read_only(self._trades[window])
+        return views
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated for the columns"""
+        return (
+            self._timestamps.nbytes
+            + self._trades.nbytes
+            + sum(column.nbytes for column in self._prices.values())
+        )
+
+    @property
+    def last_timestamp(self) -> Optional[datetime]:
+        """Timestamp of the newest candle"""
+        if self._count == 0:
+            return None
+        return from_micros(int(self._timestamps[self._last_slot]), self._tz)
+
+    @property
+    def last_close(self) -> Optional[Decimal]:
+        """Close of the newest candle"""
+        if self._count == 0:
+            return None
+        return float_to_decimal(float(self._prices["close"][self._last_slot]))
+
+    # ------------------------------------------------------------------
+    # Materialization
+    # ------------------------------------------------------------------
+
+    def _records(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Candles at chronological positions [start, stop) as plain dicts"""
+        base = self._last_slot + self.capacity + 1 - self._count
+        window = slice(base + start, base + stop)
+        timestamps = self._timestamps[window].tolist()
+        columns = {name: self._prices[name][window].tolist() for name in PRICE_COLUMNS}
+        trades = self._trades[window].tolist()
+
+        records = []
+        for i, micros in enumerate(timestamps):
+            quote_volume = columns["quote_volume"][i]
+            records.append(
+                {
+                    "symbol": self.symbol,
+                    "timeframe": self.timeframe,
+                    "timestamp": from_micros(micros, self._tz),
+                    "open": float_to_decimal(columns["open"][i]),
+                    "high": float_to_decimal(columns["high"][i]),
+                    "low": float_to_decimal(columns["low"][i]),
+                    "close": float_to_decimal(columns["close"][i]),
+                    "volume": float_to_decimal(columns["volume"][i]),
+                    "quote_volume": (
+                        None
+                        if np.isnan(quote_volume)
+                        else float_to_decimal(quote_volume)
+                    ),
+                    "trades_count": None if trades[i] == _NO_TRADES else trades[i],
+                }
+            )
+        return records
+
+    def to_records(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Last n candles as plain dicts of Python scalars (oldest first)"""
+        if n is None or n > self._count:
+            n = self._count
+        return self._records(self._count - n, self._count)
+
+    def to_ohlcv(self, n: Optional[int] = None) -> List[OHLCV]:
+        """Last n candles as OHLCV models (oldest first)"""
+        # Values were validated on the way in; skip re-validation
+        return [OHLCV.model_construct(**record) for record in self.to_records(n)]
+
+    def last(self) -> Optional[OHLCV]:
+        """Newest candle as an OHLCV model"""
+        candles = self.to_ohlcv(1)
+        return candles[0] if candles else None
+
+    # ------------------------------------------------------------------
+    # Sequence protocol
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __iter__(self) -> Iterator[OHLCV]:
+        return iter(self.to_ohlcv())
+
+    @overload
+    def __getitem__(self, index: int) -> OHLCV: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[OHLCV]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[OHLCV, List[OHLCV]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if step != 1:
+                return self.to_ohlcv()[index]
+            return [
+                OHLCV.model_construct(**record)
+                for record in self._records(start, max(start, stop))
+            ]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("OHLCVRingBuffer index out of range")
+        return OHLCV.model_construct(**self._records(index, index + 1)[0])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, OHLCVRingBuffer):
+            return self.to_records() == other.to_records()
+        if isinstance(other, (list, tuple)):
+            return self.to_ohlcv() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"OHLCVRingBuffer(symbol={self.symbol!r}, timeframe={self.timeframe!r}, "
+            f"len={self._count}, capacity={self.capacity})"
+        )
+
+
+class OHLCVStore(Dict[str, OHLCVRingBuffer]):
+    """
+    Mapping of symbol -> OHLCVRingBuffer
+
+    Assigning a plain candle sequence converts it into a ring buffer of the
+    store's capacity (keeping the newest candles), so callers can keep
+    writing `store[symbol] = candles`.
+    """
+
+    def __init__(self, timeframe: str, capacity: int):
+        super().__init__()
+        self.timeframe = timeframe
+        self.capacity = capacity
+
+    def create(self, symbol: str) -> OHLCVRingBuffer:
+        """Create (or reset) an empty buffer for symbol"""
+        buffer = OHLCVRingBuffer(symbol, self.timeframe, self.capacity)
+        super().__setitem__(symbol, buffer)
+        return buffer
+
+    def __setitem__(
+        self, symbol: str, value: Union[OHLCVRingBuffer, Sequence[OHLCV]]
+    ) -> None:
+        if isinstance(value, OHLCVRingBuffer):
+            super().__setitem__(symbol, value)
+            return
+        buffer = OHLCVRingBuffer(symbol, self.timeframe, self.capacity)
+        buffer.extend(value)
+        super().__setitem__(symbol, buffer)
+
+
+# Export
+__all__ = [
+    "OHLCVRingBuffer",
+    "OHLCVStore",
+    "to_micros",
+    "from_micros",
+    "float_to_decimal",
+]
@@ -0,0 +1,488 @@
+"""
+OHLCV Bulk Ingestion
+
+Persists every confirmed candle, for all symbols and timeframes, to the
+market_data hypertable without a database round trip per row:
+
+- Closed candles are staged in memory, keyed by (symbol, timeframe,
+  timestamp) so revisions and backfilled bars never produce duplicates
+- A background task COPYs each batch into a transaction-scoped staging
+  table and merges it with one set-based INSERT ... SELECT ... ON CONFLICT
+- Gaps in a stream (missed bars after a WebSocket reconnect or a restart)
+  are detected from bar timestamps and backfilled from the exchange REST API
+
+Usage:
+    from workspace.features.market_data.ohlcv_ingestor import OHLCVIngestor
+
+    ingestor = OHLCVIngestor(exchange=ccxt_exchange)
+    await ingestor.start()
+
+    ingestor.update(frame, confirmed=frame.confirm)
+
+    # Flush remaining candles on shutdown
+    await ingestor.close()
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-11
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from .candle_aggregator import TIMEFRAME_SECONDS
+from .models import Timeframe
+from .ohlcv_buffer import to_micros
+from workspace.shared.database.connection import DatabasePool, get_pool
+
+logger = logging.getLogger(__name__)
+
+# (symbol, timeframe, timestamp_micros)
+_Key = Tuple[str, str, int]
+# (symbol, timeframe, start_micros, end_micros) - missing bars in [start, end)
+_Gap = Tuple[str, str, int, int]
+
+MARKET_DATA_COLUMNS = (
+    "symbol",
+    "timeframe",
+    "timestamp",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "quote_volume",
+    "trades_count",
+)
+
+_STAGING_TABLE = "market_data_staging"
+
+_CREATE_STAGING_SQL = f"""
+    CREATE TEMP TABLE {_STAGING_TABLE} (
+        symbol VARCHAR(20) NOT NULL,
+        timeframe VARCHAR(5) NOT NULL,
+        timestamp BIGINT NOT NULL,
+        open NUMERIC(20, 8) NOT NULL,
+        high NUMERIC(20, 8) NOT NULL,
+        low NUMERIC(20, 8) NOT NULL,
+        close NUMERIC(20, 8) NOT NULL,
+        volume NUMERIC(20, 8) NOT NULL,
+        quote_volume NUMERIC(30, 8),
+        trades_count INTEGER
+    ) ON COMMIT DROP
+"""
+
+_MERGE_STAGING_SQL = f"""
+    INSERT INTO market_data (
+        symbol, timeframe, timestamp, open, high, low, close,
+        volume, quote_volume, trades_count
+    )
+    SELECT symbol, timeframe, timestamp, open, high, low, close,
+           volume, quote_volume, trades_count
+    FROM {_STAGING_TABLE}
+    ON CONFLICT (symbol, timeframe, timestamp)
+    DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume,
+        quote_volume = EXCLUDED.quote_volume,
+        trades_count = EXCLUDED.trades_count
+"""
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    if value is None or isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _row(candle: Any) -> tuple:
+    """market_data row for a candle (OHLCV, KlineFrame or any look-alike)"""
+    return (
+        candle.symbol,
+        Timeframe(candle.timeframe).value,
+        to_micros(candle.timestamp),
+        _decimal(candle.open),
+        _decimal(candle.high),
+        _decimal(candle.low),
+        _decimal(candle.close),
+        _decimal(candle.volume),
+        _decimal(candle.quote_volume),
+        candle.trades_count,
+    )
+
+
+class OHLCVIngestor:
+    """
+    Batched COPY + upsert loader for closed candles
+
+    Attributes:
+        exchange: ccxt-style exchange used for gap backfill (fetch_ohlcv)
+        batch_size: Maximum candles merged per flush
+        flush_interval: Seconds between background flushes
+        flush_timeout: Seconds before a flush is abandoned and retried
+        max_pending: Staged candles kept before the oldest are dropped
+        backfill_limit: Maximum candles requested per REST call
+        max_gaps: Gaps kept for backfill before the oldest are dropped
+    """
+
+    def __init__(
+        self,
+        pool: Optional[DatabasePool] = None,
+        exchange: Optional[Any] = None,
+        batch_size: int = 5000,
+        flush_interval: float = 5.0,
+        flush_timeout: float = 30.0,
+        max_pending: int = 200_000,
+        backfill_limit: int = 1000,
+        max_gaps: int = 1000,
+    ):
+        """
+        Initialize OHLCV ingestor
+
+        Args:
+            pool: Database pool (default: global pool from get_pool())
+            exchange: ccxt-style exchange for backfilling gaps (default: None,
+                gaps are only logged and counted until one is set)
+            batch_size: Maximum candles per flush (default: 5000)
+            flush_interval: Background flush interval in seconds (default: 5.0)
+            flush_timeout: Flush timeout in seconds (default: 30.0)
+            max_pending: Staged candles held before the oldest are dropped
+                (default: 200000)
+            backfill_limit: Candles per fetch_ohlcv request (default: 1000)
+            max_gaps: Gaps awaiting backfill before the oldest are dropped
+                (default: 1000)
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+
+        self._pool = pool
+        self.exchange = exchange
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_timeout = flush_timeout
+        self.max_pending = max_pending
+        self.backfill_limit = backfill_limit
+        self.max_gaps = max_gaps
+
+        # Closed candles waiting for the next flush (insertion ordered)
+        self._pending: Dict[_Key, tuple] = {}
+        # Latest still-open bar per stream, staged once a newer bar starts
+        self._open: Dict[Tuple[str, str], Any] = {}
+        # Newest bar timestamp seen or persisted per stream
+        self._last_seen: Dict[Tuple[str, str], int] = {}
+        self._gaps: List[_Gap] = []
+
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+        # Statistics
+        self.ingested_total = 0
+        self.flushed_total = 0
+        self.flush_failures_total = 0
+        self.dropped_total = 0
+        self.gaps_detected = 0
+        self.backfilled_total = 0
+        self.last_flush_ms = 0.0
+
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+
+    async def start(self) -> None:
+        """Start the background flush task"""
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info(
+            f"OHLCV ingestor started (batch: {self.batch_size}, "
+            f"interval: {self.flush_interval}s)"
+        )
+
+    async def close(self) -> None:
+        """Stop the flush task and flush everything staged"""
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while self._pending:
+            if not await self.flush():
+                break
+        if self._pending:
+            logger.error(
+                f"OHLCV ingestor closed with {len(self._pending)} unwritten candles"
+            )
+        logger.info("OHLCV ingestor closed")
+
+    # ========================================================================
+    # Staging
+    # ========================================================================
+
+    def update(self, candle: Any, confirmed: bool = False) -> None:
+        """
+        Observe a candle update (new bar or revision of the open bar)
+
+        A confirmed candle is staged immediately; an unconfirmed one is held
+        as the stream's open bar and staged once a newer bar starts.
+
+        Args:
+            candle: OHLCV, KlineFrame or any object with the same attributes
+            confirmed: Whether the bar is closed
+        """
+        stream = (candle.symbol, Timeframe(candle.timeframe).value)
+        held = self._open.get(stream)
+        if held is not None:
+            if candle.timestamp < held.timestamp:
+                return  # out-of-order update for an older bar
+            if held.timestamp < candle.timestamp:
+                self.add(held)
+            del self._open[stream]
+
+        if confirmed:
+            self.add(candle)
+        else:
+            self._open[stream] = candle
+
+    def add(self, candle: Any) -> None:
+        """
+        Stage a closed candle for the next flush (never touches the database)
+
+        Args:
+            candle: OHLCV, KlineFrame or any object with the same attributes
+        """
+        row = _row(candle)
+        self._stage(row)
+        self._track(row[0], row[1], row[2])
+
+    def mark_persisted(self, symbol: str, timeframe: str, timestamp: datetime) -> None:
+        """
+        Record the newest stored bar of a stream (e.g. after loading history)
+
+        The first live bar after it is then checked for a gap, so bars missed
+        while the service was down are backfilled too.
+        """
+        stream = (symbol, Timeframe(timeframe).value)
+        micros = to_micros(timestamp)
+        if micros > self._last_seen.get(stream, -1):
+            self._last_seen[stream] = micros
+
+    def _stage(self, row: tuple) -> None:
+        key = (row[0], row[1], row[2])
+        self._pending.pop(key, None)  # re-insert so revisions keep flush order
+        self._pending[key] = row
+        self.ingested_total += 1
+
+        if len(self._pending) > self.max_pending:
+            oldest = next(iter(self._pending))
+            del self._pending[oldest]
+            self.dropped_total += 1
+            logger.error(f"OHLCV ingestor full, dropped candle {oldest}")
+
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def _track(self, symbol: str, timeframe: str, micros: int) -> None:
+        """Detect missing bars between the last seen bar and this one"""
+        stream = (symbol, timeframe)
+        last = self._last_seen.get(stream)
+        step = TIMEFRAME_SECONDS[timeframe] * 1_000_000
+
+        if last is not None and micros > last + step:
+            self.gaps_detected += 1
+            logger.warning(
+                f"Gap in {symbol} {timeframe}: "
+                f"{(micros - last) // step - 1} missing bars"
+            )
+            if self.exchange is not None:
+                self._add_gap((symbol, timeframe, last + step, micros))
+                self._wakeup.set()
+        if last is None or micros > last:
+            self._last_seen[stream] = micros
+
+    def _add_gap(self, gap: _Gap) -> None:
+        """Queue a gap for backfill, dropping the oldest beyond max_gaps"""
+        self._gaps.append(gap)
+        if len(self._gaps) > self.max_gaps:
+            dropped = self._gaps.pop(0)
+            logger.error(
+                f"Too many gaps awaiting backfill, dropped {dropped[0]} {dropped[1]}"
+            )
+
+    # ========================================================================
+    # Flush
+    # ========================================================================
+
+    async def flush(self) -> bool:
+        """
+        Merge one batch of staged candles into market_data
+
+        Returns:
+            True if the batch was written (or nothing was staged), False if
+            the write failed (the batch stays staged for the next flush)
+        """
+        async with self._flush_lock:
+            keys = list(self._pending)[: self.batch_size]
+            if not keys:
+                return True
+            rows = [self._pending[key] for key in keys]
+
+            try:
+                await self._write(rows)
+            except Exception as e:
+                self.flush_failures_total += 1
+                logger.warning(f"OHLCV flush of {len(rows)} candles failed: {e}")
+                return False
+
+            for key, row in zip(keys, rows):
+                # Keep revisions staged while the write was in flight
+                if self._pending.get(key) is row:
+                    del self._pending[key]
+            return True
+
+    async def _write(self, rows: List[tuple]) -> None:
+        """COPY rows into a staging table and upsert them in one statement"""
+        start = time.perf_counter()
+        pool = self._pool or await get_pool()
+
+        async with asyncio.timeout(self.flush_timeout):
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute(_CREATE_STAGING_SQL)
+                    await conn.copy_records_to_table(
+                        _STAGING_TABLE, records=rows, columns=MARKET_DATA_COLUMNS
+                    )
+                    await conn.execute(_MERGE_STAGING_SQL)
+
+        self.flushed_total += len(rows)
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+        logger.debug(
+            f"OHLCV ingestor flushed {len(rows)} candles in {self.last_flush_ms:.1f}ms"
+        )
+
+    async def _flush_loop(self) -> None:
+        """Backfill gaps and flush on a timer, or as soon as a batch is full"""
+        while self._running:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                if self._gaps and self.exchange is not None:
+                    await self.backfill()
+                while self._pending:
+                    if not await self.flush():
+                        break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in OHLCV ingestion loop: {e}", exc_info=True)
+
+    # ========================================================================
+    # Backfill
+    # ========================================================================
+
+    async def backfill(self) -> int:
+        """
+        Fetch missing bars for every detected gap from the exchange
+
+        Gaps whose fetch fails are kept and retried on the next call.
+
+        Returns:
+            Number of candles staged from the exchange
+        """
+        exchange = self.exchange
+        if exchange is None:
+            return 0
+
+        gaps, self._gaps = self._gaps, []
+        staged = 0
+        for gap in gaps:
+            try:
+                staged += await self._backfill_gap(exchange, *gap)
+            except Exception as e:
+                logger.warning(f"Backfill of {gap[0]} {gap[1]} failed: {e}")
+                self._add_gap(gap)
+
+        if staged:
+            self.backfilled_total += staged
+            logger.info(f"Backfilled {staged} candles from {len(gaps)} gaps")
+        return staged
+
+    async def _backfill_gap(
+        self, exchange: Any, symbol: str, timeframe: str, start: int, end: int
+    ) -> int:
+        step = TIMEFRAME_SECONDS[timeframe] * 1_000_000
+        staged = 0
+        since = start
+        while since < end:
+            limit = min((end - since) // step, self.backfill_limit)
+            rows = await exchange.fetch_ohlcv(symbol, timeframe, since // 1000, limit)
+            if not rows:
+                break
+
+            for timestamp_ms, open_, high, low, close, volume in rows:
+                micros = int(timestamp_ms) * 1000
+                key = (symbol, timeframe, micros)
+                # Bars already seen live take precedence over REST data
+                if since <= micros < end and key not in self._pending:
+                    self._stage(
+                        (
+                            symbol,
+                            timeframe,
+                            micros,
+                            _decimal(open_),
+                            _decimal(high),
+                            _decimal(low),
+                            _decimal(close),
+                            _decimal(volume),
+                            None,
+                            None,
+                        )
+                    )
+                    staged += 1
+
+            since = max(since + step, int(rows[-1][0]) * 1000 + step)
+        return staged
+
+    # ========================================================================
+    # Metrics
+    # ========================================================================
+
+    @property
+    def pending(self) -> int:
+        """Candles staged in memory"""
+        return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ingestion statistics"""
+        return {
+            "pending": len(self._pending),
+            "open_bars": len(self._open),
+            "ingested_total": self.ingested_total,
+            "flushed_total": self.flushed_total,
+            "flush_failures_total": self.flush_failures_total,
+            "dropped_total": self.dropped_total,
+            "gaps_detected": self.gaps_detected,
+            "gaps_pending": len(self._gaps),
+            "backfilled_total": self.backfilled_total,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+        }
+
+
+# Export
+__all__ = ["OHLCVIngestor", "MARKET_DATA_COLUMNS"]
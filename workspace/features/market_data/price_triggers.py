@@ -0,0 +1,370 @@
+"""
+Price Trigger Engine
+
+Event-driven price-level triggers (stop-loss, take-profit, emergency
+liquidation) fed by the shared WebSocket ticker stream instead of one
+polling loop per position:
+
+- A single MarketDataService ticker listener serves every position, so
+  no REST ticker requests or position queries are made between ticks.
+- Levels are indexed per symbol in two sorted arrays: triggers that fire
+  at or below their level and triggers that fire at or above it. A tick
+  bisects each array and fires the crossed slice, O(log n + fired).
+- Triggers are one-shot. Callbacks run as tasks so the tick path never
+  waits on order placement; a consumer re-arms a trigger if its action
+  failed.
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-18
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from .ws_decoder import TickerFrame, format_symbol
+
+logger = logging.getLogger(__name__)
+
+
+class TriggerDirection(str, Enum):
+    """Side of the level on which a trigger fires"""
+
+    BELOW = "below"  # price <= level (long stop, short take-profit)
+    ABOVE = "above"  # price >= level (short stop, long take-profit)
+
+
+TriggerCallback = Callable[["PriceTrigger", float], Awaitable[None]]
+
+
+@dataclass(eq=False)
+class PriceTrigger:
+    """
+    One armed price level
+
+    Attributes:
+        trigger_id: Engine-assigned identifier
+        symbol: Trading pair (BTC/USDT:USDT format)
+        level: Trigger price
+        direction: Fire when price is at/below or at/above level
+        callback: Awaited with (trigger, price) when the level is crossed
+        key: Group key for bulk removal (e.g. position ID)
+        fired_price: Price that fired the trigger
+        fired_at: time.monotonic() when fired
+    """
+
+    trigger_id: int
+    symbol: str
+    level: float
+    direction: TriggerDirection
+    callback: TriggerCallback
+    key: Optional[str] = None
+    fired_price: Optional[float] = None
+    fired_at: Optional[float] = field(default=None, repr=False)
+
+    def crossed(self, price: float) -> bool:
+        """Whether price is at or beyond the level"""
+        if self.direction == TriggerDirection.BELOW:
+            return price <= self.level
+        return price >= self.level
+
+
+class _SymbolIndex:
+    """Sorted (level, trigger_id) arrays for one symbol"""
+
+    __slots__ = ("below", "above")
+
+    def __init__(self):
+        self.below: List[Tuple[float, int]] = []
+        self.above: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.below) + len(self.above)
+
+    def lane(self, direction: TriggerDirection) -> List[Tuple[float, int]]:
+        return self.below if direction == TriggerDirection.BELOW else self.above
+
+    def pop_crossed(self, price: float) -> List[int]:
+        """Remove and return IDs of all triggers crossed by price"""
+        fired: List[int] = []
+
+        # BELOW fires for level >= price: a suffix of the ascending array
+        start = bisect_left(self.below, (price,))
+        if start < len(self.below):
+            fired.extend(trigger_id for _, trigger_id in self.below[start:])
+            del self.below[start:]
+
+        # ABOVE fires for level <= price: a prefix of the ascending array
+        end = bisect_right(self.above, (price, math.inf))
+        if end:
+            fired.extend(trigger_id for _, trigger_id in self.above[:end])
+            del self.above[:end]
+
+        return fired
+
+
+class PriceTriggerEngine:
+    """
+    Shared price-level trigger index
+
+    Example:
+        ```python
+        engine = PriceTriggerEngine()
+        engine.attach(market_data_service)
+
+        async def on_stop(trigger, price):
+            await executor.close_position(position_id=trigger.key)
+
+        engine.add_trigger(
+            "BTC/USDT:USDT", Decimal("89000"), TriggerDirection.BELOW,
+            on_stop, key=position_id,
+        )
+        ```
+    """
+
+    def __init__(self):
+        """Initialize an empty engine (call attach() to receive ticks)"""
+        self._indexes: Dict[str, _SymbolIndex] = {}
+        self._triggers: Dict[int, PriceTrigger] = {}
+        self._by_key: Dict[str, Set[int]] = {}
+        self._last_prices: Dict[str, float] = {}
+        self._ids = itertools.count(1)
+        self._tasks: Set[asyncio.Task] = set()
+        self._service = None
+
+        self.stats = {"ticks": 0, "fired": 0, "callback_errors": 0}
+
+    def attach(self, service) -> None:
+        """
+        Receive ticks from a MarketDataService's WebSocket ticker stream
+
+        Args:
+            service: MarketDataService instance
+        """
+        if self._service is not None:
+            self.detach()
+        service.add_ticker_listener(self.on_ticker_frame)
+        self._service = service
+        logger.info("PriceTriggerEngine attached to market data ticker stream")
+
+    def detach(self) -> None:
+        """Stop receiving ticks"""
+        if self._service is not None:
+            self._service.remove_ticker_listener(self.on_ticker_frame)
+            self._service = None
+
+    def on_ticker_frame(self, frame: TickerFrame) -> None:
+        """Ticker listener: evaluate triggers against the frame's last price"""
+        self.update_price(frame.symbol, frame.last_price)
+
+    def update_price(self, symbol: str, price: float) -> List[PriceTrigger]:
+        """
+        Record a price tick and fire every trigger it crosses
+
+        Args:
+            symbol: Trading pair
+            price: Last traded price
+
+        Returns:
+            Triggers fired by this tick
+        """
+        if not price or price <= 0:
+            # Empty ticker fields decode as 0 and must not fire BELOW stops
+            return []
+
+        symbol = format_symbol(symbol)
+        self._last_prices[symbol] = price
+        self.stats["ticks"] += 1
+
+        index = self._indexes.get(symbol)
+        if not index:
+            return []
+
+        fired = [
+            self._triggers.pop(trigger_id) for trigger_id in index.pop_crossed(price)
+        ]
+        for trigger in fired:
+            self._forget_key(trigger)
+            self._fire(trigger, price)
+        return fired
+
+    def add_trigger(
+        self,
+        symbol: str,
+        level: Any,
+        direction: TriggerDirection,
+        callback: TriggerCallback,
+        key: Optional[str] = None,
+    ) -> PriceTrigger:
+        """
+        Arm a one-shot trigger
+
+        If the last known price already crosses the level, the trigger
+        fires immediately. Callbacks run as tasks, so outside a running
+        event loop a crossed trigger is armed instead and fires on the
+        next crossing tick.
+
+        Args:
+            symbol: Trading pair (any format accepted by format_symbol)
+            level: Trigger price (Decimal, float or str)
+            direction: TriggerDirection.BELOW or TriggerDirection.ABOVE
+            callback: Async callable awaited with (trigger, price)
+            key: Group key for remove_key() (e.g. position ID)
+
+        Returns:
+            The armed PriceTrigger
+        """
+        trigger = PriceTrigger(
+            trigger_id=next(self._ids),
+            symbol=format_symbol(symbol),
+            level=float(level),
+            direction=TriggerDirection(direction),
+            callback=callback,
+            key=key,
+        )
+
+        last_price = self._last_prices.get(trigger.symbol)
+        if last_price is not None and trigger.crossed(last_price) and _loop_running():
+            self._fire(trigger, last_price)
+            return trigger
+
+        index = self._indexes.setdefault(trigger.symbol, _SymbolIndex())
+        insort(index.lane(trigger.direction), (trigger.level, trigger.trigger_id))
+        self._triggers[trigger.trigger_id] = trigger
+        if key is not None:
+            self._by_key.setdefault(key, set()).add(trigger.trigger_id)
+
+        logger.debug(
+            f"Armed {trigger.direction.value} trigger {trigger.trigger_id} for "
+            f"{trigger.symbol} at {trigger.level}"
+        )
+        return trigger
+
+    def remove_trigger(self, trigger: PriceTrigger) -> bool:
+        """
+        Disarm a trigger
+
+        Args:
+            trigger: Trigger returned by add_trigger()
+
+        Returns:
+            True if the trigger was armed
+        """
+        if self._triggers.pop(trigger.trigger_id, None) is None:
+            return False
+
+        lane = self._indexes[trigger.symbol].lane(trigger.direction)
+        entry = (trigger.level, trigger.trigger_id)
+        position = bisect_left(lane, entry)
+        if position < len(lane) and lane[position] == entry:
+            del lane[position]
+        self._forget_key(trigger)
+        return True
+
+    def remove_key(self, key: str) -> int:
+        """
+        Disarm every trigger registered under key
+
+        Args:
+            key: Group key (e.g. position ID)
+
+        Returns:
+            Number of triggers removed
+        """
+        removed = 0
+        for trigger_id in list(self._by_key.get(key, ())):
+            trigger = self._triggers.get(trigger_id)
+            if trigger is not None and self.remove_trigger(trigger):
+                removed += 1
+        self._by_key.pop(key, None)
+        return removed
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        """Last price seen for symbol (None before the first tick)"""
+        return self._last_prices.get(format_symbol(symbol))
+
+    def pending(self, symbol: Optional[str] = None) -> int:
+        """
+        Number of armed triggers
+
+        Args:
+            symbol: Count only this symbol (default: all)
+        """
+        if symbol is None:
+            return len(self._triggers)
+        index = self._indexes.get(format_symbol(symbol))
+        return len(index) if index else 0
+
+    async def drain(self) -> None:
+        """Wait for running trigger callbacks to finish"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get engine statistics
+
+        Returns:
+            Dictionary with tick, fire and error counts and armed triggers
+        """
+        return {
+            **self.stats,
+            "armed": len(self._triggers),
+            "symbols": sum(1 for index in self._indexes.values() if index),
+            "running_callbacks": len(self._tasks),
+        }
+
+    def _forget_key(self, trigger: PriceTrigger) -> None:
+        if trigger.key is None:
+            return
+        ids = self._by_key.get(trigger.key)
+        if ids is not None:
+            ids.discard(trigger.trigger_id)
+            if not ids:
+                del self._by_key[trigger.key]
+
+    def _fire(self, trigger: PriceTrigger, price: float) -> None:
+        """Run the trigger's callback as a task"""
+        trigger.fired_price = price
+        trigger.fired_at = time.monotonic()
+        self.stats["fired"] += 1
+        logger.info(
+            f"Price trigger {trigger.trigger_id} fired for {trigger.symbol}: "
+            f"{price} {trigger.direction.value} {trigger.level}"
+        )
+
+        task = asyncio.get_running_loop().create_task(
+            self._run_callback(trigger, price)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_callback(self, trigger: PriceTrigger, price: float) -> None:
+        try:
+            await trigger.callback(trigger, price)
+        except Exception as e:
+            self.stats["callback_errors"] += 1
+            logger.error(
+                f"Price trigger {trigger.trigger_id} callback failed for "
+                f"{trigger.symbol}: {e}",
+                exc_info=True,
+            )
+
+
+def _loop_running() -> bool:
+    """Whether an asyncio event loop is running in this thread"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+# Export
+__all__ = ["PriceTriggerEngine", "PriceTrigger", "TriggerDirection"]
@@ -0,0 +1,573 @@
+"""
+Streaming Technical Indicators
+
+Stateful, incremental versions of the RSI, EMA, MACD and Bollinger Bands
+calculations in IndicatorCalculator. Each engine keeps the Wilder/EMA/rolling
+window state for one (symbol, timeframe) and updates in O(1) per candle
+instead of re-walking the whole candle history.
+
+The latest (still open) candle is held as a provisional bar: revisions of the
+open bar are evaluated against the committed state without mutating it, so a
+revision is rolled back simply by replacing the provisional bar. The bar is
+committed once a newer candle arrives or close_bar() is called.
+
+Fed the same candle history, the engine produces the same values as
+IndicatorCalculator.calculate_all_indicators.
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-03
+"""
+
+import logging
+from collections import deque
+from decimal import Context, Decimal
+from typing import TYPE_CHECKING, Deque, Iterable, Optional, Tuple
+
+from .models import EMA, MACD, OHLCV, RSI, BollingerBands, Timeframe
+
+if TYPE_CHECKING:
+    from .ohlcv_buffer import OHLCVRingBuffer
+    from .ws_decoder import Candle
+
+logger = logging.getLogger(__name__)
+
+# Rolling sums for Bollinger Bands are kept in a wide context so that
+# add/subtract of the outgoing close stays exact.
+_WIDE_CONTEXT = Context(prec=60)
+
+_ZERO = Decimal("0")
+_ONE = Decimal("1")
+_HUNDRED = Decimal("100")
+_PRICE_QUANT = Decimal("0.00000001")
+_RSI_QUANT = Decimal("0.01")
+
+
+class _EMAState:
+    """SMA-seeded EMA over an arbitrary series (closes or MACD values)"""
+
+    __slots__ = ("period", "_period_d", "_multiplier", "count", "seed_sum", "value")
+
+    def __init__(self, period: int):
+        self.period = period
+        self._period_d = Decimal(str(period))
+        self._multiplier = Decimal("2") / Decimal(str(period + 1))
+        self.count = 0
+        self.seed_sum: Decimal = _ZERO
+        self.value: Optional[Decimal] = None
+
+    def advance(self, x: Decimal) -> Tuple[int, Decimal, Optional[Decimal]]:
+        """Return the state after appending x, without mutating self"""
+        count = self.count + 1
+        if count < self.period:
+            return count, self.seed_sum + x, None
+        if self.value is None:  # count == period: the seed completes
+            seed_sum = self.seed_sum + x
+            return count, seed_sum, seed_sum / self._period_d
+        return count, self.seed_sum, (x - self.value) * self._multiplier + self.value
+
+    def commit(self, step: Tuple[int, Decimal, Optional[Decimal]]) -> None:
+        self.count, self.seed_sum, self.value = step
+
+
+class _RSIState:
+    """Wilder-smoothed RSI state"""
+
+    __slots__ = (
+        "period",
+        "_period_d",
+        "_period_minus_one",
+        "prev_close",
+        "changes",
+        "gain_sum",
+        "loss_sum",
+        "avg_gain",
+        "avg_loss",
+    )
+
+    def __init__(self, period: int):
+        self.period = period
+        self._period_d = Decimal(str(period))
+        self._period_minus_one = Decimal(str(period - 1))
+        self.prev_close: Optional[Decimal] = None
+        self.changes = 0
+        self.gain_sum: Decimal = _ZERO
+        self.loss_sum: Decimal = _ZERO
+        self.avg_gain: Optional[Decimal] = None
+        self.avg_loss: Optional[Decimal] = None
+
+    def advance(self, close: Decimal) -> tuple:
+        """Return the state after appending close, without mutating self"""
+        if self.prev_close is None:
+            return (close, 0, _ZERO, _ZERO, None, None)
+
+        change = close - self.prev_close
+        gain = max(change, _ZERO)
+        loss = abs(min(change, _ZERO))
+        changes = self.changes + 1
+
+        if changes < self.period:
+            return (
+                close,
+                changes,
+                self.gain_sum + gain,
+                self.loss_sum + loss,
+                None,
+                None,
+            )
+        if self.avg_gain is None or self.avg_loss is None:  # changes == period
+            gain_sum = self.gain_sum + gain
+            loss_sum = self.loss_sum + loss
+            return (
+                close,
+                changes,
+                gain_sum,
+                loss_sum,
+                gain_sum / self._period_d,
+                loss_sum / self._period_d,
+            )
+
+        avg_gain = ((self.avg_gain * self._period_minus_one) + gain) / self._period_d
+        avg_loss = ((self.avg_loss * self._period_minus_one) + loss) / self._period_d
+        return (close, changes, self.gain_sum, self.loss_sum, avg_gain, avg_loss)
+
+    def commit(self, step: tuple) -> None:
+        (
+            self.prev_close,
+            self.changes,
+            self.gain_sum,
+            self.loss_sum,
+            self.avg_gain,
+            self.avg_loss,
+        ) = step
+
+    @staticmethod
+    def value(step: tuple) -> Optional[Decimal]:
+        """RSI value (quantized) for a state tuple, or None while warming up"""
+        avg_gain, avg_loss = step[4], step[5]
+        if avg_gain is None:
+            return None
+        if avg_loss == 0:
+            rsi_value = _HUNDRED
+        else:
+            rs = avg_gain / avg_loss
+            rsi_value = _HUNDRED - (_HUNDRED / (_ONE + rs))
+        return rsi_value.quantize(_RSI_QUANT)
+
+
+class _MACDState:
+    """Fast/slow EMA pair plus the EMA signal line over MACD values"""
+
+    __slots__ = ("fast", "slow", "signal", "slow_period", "bars")
+
+    def __init__(self, fast_period: int, slow_period: int, signal_period: int):
+        self.fast = _EMAState(fast_period)
+        self.slow = _EMAState(slow_period)
+        self.signal = _EMAState(signal_period)
+        self.slow_period = slow_period
+        self.bars = 0
+
+    def advance(self, close: Decimal) -> tuple:
+        """Return the state after appending close, without mutating self"""
+        fast_step = self.fast.advance(close)
+        slow_step = self.slow.advance(close)
+        bars = self.bars + 1
+        signal_step = None
+
+        # IndicatorCalculator starts the MACD history one bar after the slow
+        # EMA is seeded (range(slow_period, len(ohlcv_data))).
+        fast_value, slow_value = fast_step[2], slow_step[2]
+        if bars > self.slow_period and fast_value and slow_value:
+            signal_step = self.signal.advance(fast_value - slow_value)
+
+        return (fast_step, slow_step, signal_step, bars)
+
+    def commit(self, step: tuple) -> None:
+        fast_step, slow_step, signal_step, bars = step
+        self.fast.commit(fast_step)
+        self.slow.commit(slow_step)
+        if signal_step is not None:
+            self.signal.commit(signal_step)
+        self.bars = bars
+
+    def values(self, step: tuple) -> Optional[Tuple[Decimal, Decimal, Decimal]]:
+        """(macd_line, signal_line, histogram) for a state tuple"""
+        fast_step, slow_step, signal_step, bars = step
+        if bars < self.slow_period + self.signal.period:
+            return None
+
+        fast_value, slow_value = fast_step[2], slow_step[2]
+        if not fast_value or not slow_value:
+            return None
+
+        signal_line = signal_step[2] if signal_step is not None else self.signal.value
+        if signal_line is None:
+            return None
+
+        macd_line = fast_value - slow_value
+        return macd_line, signal_line, macd_line - signal_line
+
+
+class _BollingerState:
+    """Rolling window with running sum and sum of squares"""
+
+    __slots__ = ("period", "_period_d", "window", "total", "total_sq")
+
+    def __init__(self, period: int):
+        self.period = period
+        self._period_d = Decimal(str(period))
+        self.window: Deque[Decimal] = deque()
+        self.total: Decimal = _ZERO
+        self.total_sq: Decimal = _ZERO
+
+    def advance(self, close: Decimal) -> Tuple[Decimal, Decimal, int, bool]:
+        """Return (sum, sum_sq, count, evicts) after appending close"""
+        ctx = _WIDE_CONTEXT
+        total = ctx.add(self.total, close)
+        total_sq = ctx.add(self.total_sq, ctx.multiply(close, close))
+        evicts = len(self.window) == self.period
+        if evicts:
+            outgoing = self.window[0]
+            total = ctx.subtract(total, outgoing)
+            total_sq = ctx.subtract(total_sq, ctx.multiply(outgoing, outgoing))
+        count = len(self.window) + (0 if evicts else 1)
+        return total, total_sq, count, evicts
+
+    def commit(self, close: Decimal, step: Tuple[Decimal, Decimal, int, bool]) -> None:
+        self.total, self.total_sq, _, evicts = step
+        if evicts:
+            self.window.popleft()
+        self.window.append(close)
+
+    def values(
+        self, step: Tuple[Decimal, Decimal, int, bool], std_dev: Decimal
+    ) -> Optional[Tuple[Decimal, Decimal, Decimal]]:
+        """(upper, middle, lower) bands for a state tuple"""
+        total, total_sq, count, _ = step
+        if count < self.period:
+            return None
+
+        ctx = _WIDE_CONTEXT
+        middle_band = total / self._period_d
+        # Population variance: (n * sum_sq - sum^2) / n^2
+        variance = ctx.divide(
+            ctx.subtract(ctx.multiply(self._period_d, total_sq), total * total),
+            ctx.multiply(self._period_d, self._period_d),
+        )
+        variance = +max(variance, _ZERO)
+        std = variance.sqrt()
+        return (
+            middle_band + (std_dev * std),
+            middle_band,
+            middle_band - (std_dev * std),
+        )
+
+
+class StreamingIndicatorEngine:
+    """
+    Incremental indicator engine for a single (symbol, timeframe)
+
+    Maintains RSI, MACD, fast/slow EMA and Bollinger Bands state and updates
+    it in O(1) per candle. Results use the same models and quantization as
+    IndicatorCalculator so they can be dropped into a MarketDataSnapshot.
+
+    Attributes:
+        symbol: Trading pair
+        timeframe: Candle timeframe
+        bar_count: Number of bars seen (committed plus provisional)
+
+    Example:
+        ```python
+        engine = StreamingIndicatorEngine("BTC/USDT:USDT", Timeframe.M3)
+        engine.load(historical_candles)
+        engine.update(live_candle)  # O(1), revises or rolls the open bar
+        indicators = engine.indicators()
+        rsi = indicators["rsi"]
+        ```
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframe: str,
+        rsi_period: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_signal: int = 9,
+        ema_fast_period: int = 12,
+        ema_slow_period: int = 26,
+        bb_period: int = 20,
+        bb_std_dev: Decimal = Decimal("2"),
+    ):
+        """
+        Initialize streaming indicator engine
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            rsi_period: RSI period
+            macd_fast: MACD fast period
+            macd_slow: MACD slow period
+            macd_signal: MACD signal period
+            ema_fast_period: Fast EMA period
+            ema_slow_period: Slow EMA period
+            bb_period: Bollinger Bands period
+            bb_std_dev: Bollinger Bands standard deviation
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.rsi_period = rsi_period
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_signal = macd_signal
+        self.ema_fast_period = ema_fast_period
+        self.ema_slow_period = ema_slow_period
+        self.bb_period = bb_period
+        self.bb_std_dev = bb_std_dev
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all indicator state"""
+        self._rsi = _RSIState(self.rsi_period)
+        self._macd = _MACDState(self.macd_fast, self.macd_slow, self.macd_signal)
+        self._ema_fast = _EMAState(self.ema_fast_period)
+        self._ema_slow = _EMAState(self.ema_slow_period)
+        self._bollinger = _BollingerState(self.bb_period)
+
+        self._committed_bars = 0
+        self._last_committed: Optional["Candle"] = None
+        self._provisional: Optional["Candle"] = None
+        self._cached: Optional[dict] = None
+
+    @property
+    def bar_count(self) -> int:
+        """Number of bars seen, including the provisional bar"""
+        return self._committed_bars + (1 if self._provisional is not None else 0)
+
+    @property
+    def latest_candle(self) -> Optional["Candle"]:
+        """Most recent candle fed to the engine"""
+        return self._provisional or self._last_committed
+
+    def load(self, candles: Iterable[OHLCV]) -> None:
+        """
+        Rebuild state from a candle history
+
+        All candles but the last are committed; the last one stays
+        provisional so that later revisions of it are still accepted.
+
+        Args:
+            candles: OHLCV candles sorted by timestamp ascending
+        """
+        self.reset()
+        for candle in candles:
+            self.update(candle)
+
+    def load_buffer(self, buffer: "OHLCVRingBuffer") -> None:
+        """
+        Rebuild state directly from a columnar OHLCV buffer
+
+        Walks the buffer's close column without materializing OHLCV models;
+        only the last two candles are materialized (the last committed bar and
+        the provisional bar).
+
+        Args:
+            buffer: Ring buffer holding the candle history
+        """
+        self.reset()
+        count = len(buffer)
+        if count == 0:
+            return
+
+        closes = buffer.closes().tolist()
+        for close in closes[:-1]:
+            self._commit_close(Decimal(repr(close)))
+        if count > 1:
+            self._last_committed = buffer[-2]
+        self._provisional = buffer[-1]
+
+    def update(self, candle: "Candle") -> None:
+        """
+        Feed a candle update
+
+        A candle with the same timestamp as the provisional bar replaces it
+        (rolling back the previous revision); a newer candle commits the
+        provisional bar and becomes the new provisional bar. Stale candles
+        are ignored.
+
+        Args:
+            candle: Latest OHLCV candle from the stream
+        """
+        provisional = self._provisional
+        if provisional is not None:
+            if candle.timestamp == provisional.timestamp:
+                self._provisional = candle
+                self._cached = None
+                return
+            if candle.timestamp < provisional.timestamp:
+                logger.debug(
+                    f"Ignoring out-of-order candle for {self.symbol}: "
+                    f"{candle.timestamp} < {provisional.timestamp}"
+                )
+                return
+            self._commit(provisional)
+        elif (
+            self._last_committed is not None
+            and candle.timestamp <= self._last_committed.timestamp
+        ):
+            logger.debug(
+                f"Ignoring candle for closed bar {self.symbol} @ {candle.timestamp}"
+            )
+            return
+
+        self._provisional = candle
+        self._cached = None
+
+    def close_bar(self) -> None:
+        """Commit the provisional bar (e.g. on a confirmed kline)"""
+        if self._provisional is not None:
+            self._commit(self._provisional)
+            self._provisional = None
+
+    def _commit(self, candle: "Candle") -> None:
+        """Fold a closed candle into the committed state"""
+        self._commit_close(candle.close)
+        self._last_committed = candle
+
+    def _commit_close(self, close: Decimal) -> None:
+        self._rsi.commit(self._rsi.advance(close))
+        self._macd.commit(self._macd.advance(close))
+        self._ema_fast.commit(self._ema_fast.advance(close))
+        self._ema_slow.commit(self._ema_slow.advance(close))
+        self._bollinger.commit(close, self._bollinger.advance(close))
+        self._committed_bars += 1
+        self._cached = None
+
+    def indicators(self) -> dict:
+        """
+        Current indicator values
+
+        Returns:
+            Dictionary with the same keys as
+            IndicatorCalculator.calculate_all_indicators
+            (rsi, macd, ema_fast, ema_slow, bollinger); values are None
+            while an indicator is still warming up.
+        """
+        if self._cached is not None:
+            return self._cached
+
+        latest = self.latest_candle
+        if latest is None:
+            self._cached = {
+                "rsi": None,
+                "macd": None,
+                "ema_fast": None,
+                "ema_slow": None,
+                "bollinger": None,
+            }
+            return self._cached
+
+        if self._provisional is not None:
+            close = self._provisional.close
+            rsi_step = self._rsi.advance(close)
+            macd_step = self._macd.advance(close)
+            ema_fast_value = self._ema_fast.advance(close)[2]
+            ema_slow_value = self._ema_slow.advance(close)[2]
+            bb_step = self._bollinger.advance(close)
+        else:
+            rsi = self._rsi
+            rsi_step = (
+                rsi.prev_close,
+                rsi.changes,
+                rsi.gain_sum,
+                rsi.loss_sum,
+                rsi.avg_gain,
+                rsi.avg_loss,
+            )
+            macd = self._macd
+            macd_step = (
+                (macd.fast.count, macd.fast.seed_sum, macd.fast.value),
+                (macd.slow.count, macd.slow.seed_sum, macd.slow.value),
+                None,
+                macd.bars,
+            )
+            ema_fast_value = self._ema_fast.value
+            ema_slow_value = self._ema_slow.value
+            bb = self._bollinger
+            bb_step = (bb.total, bb.total_sq, len(bb.window), False)
+
+        self._cached = {
+            "rsi": self._build_rsi(latest, rsi_step),
+            "macd": self._build_macd(latest, macd_step),
+            "ema_fast": self._build_ema(latest, ema_fast_value, self.ema_fast_period),
+            "ema_slow": self._build_ema(latest, ema_slow_value, self.ema_slow_period),
+            "bollinger": self._build_bollinger(latest, bb_step),
+        }
+        return self._cached
+
+    def _build_rsi(self, latest: "Candle", step: tuple) -> Optional[RSI]:
+        value = _RSIState.value(step)
+        if value is None:
+            return None
+        return RSI(
+            symbol=latest.symbol,
+            timeframe=Timeframe(latest.timeframe),
+            timestamp=latest.timestamp,
+            value=value,
+            period=self.rsi_period,
+            overbought_level=Decimal("70"),
+            oversold_level=Decimal("30"),
+        )
+
+    def _build_macd(self, latest: "Candle", step: tuple) -> Optional[MACD]:
+        values = self._macd.values(step)
+        if values is None:
+            return None
+        macd_line, signal_line, histogram = values
+        return MACD(
+            symbol=latest.symbol,
+            timeframe=Timeframe(latest.timeframe),
+            timestamp=latest.timestamp,
+            macd_line=macd_line.quantize(_PRICE_QUANT),
+            signal_line=signal_line.quantize(_PRICE_QUANT),
+            histogram=histogram.quantize(_PRICE_QUANT),
+            fast_period=self.macd_fast,
+            slow_period=self.macd_slow,
+            signal_period=self.macd_signal,
+        )
+
+    @staticmethod
+    def _build_ema(
+        latest: "Candle", value: Optional[Decimal], period: int
+    ) -> Optional[EMA]:
+        if value is None:
+            return None
+        return EMA(
+            symbol=latest.symbol,
+            timeframe=Timeframe(latest.timeframe),
+            timestamp=latest.timestamp,
+            value=value.quantize(_PRICE_QUANT),
+            period=period,
+        )
+
+    def _build_bollinger(
+        self, latest: "Candle", step: Tuple[Decimal, Decimal, int, bool]
+    ) -> Optional[BollingerBands]:
+        bands = self._bollinger.values(step, self.bb_std_dev)
+        if bands is None:
+            return None
+        upper_band, middle_band, lower_band = bands
+        return BollingerBands(
+            symbol=latest.symbol,
+            timeframe=Timeframe(latest.timeframe),
+            timestamp=latest.timestamp,
+            upper_band=upper_band.quantize(_PRICE_QUANT),
+            middle_band=middle_band.quantize(_PRICE_QUANT),
+            lower_band=lower_band.quantize(_PRICE_QUANT),
+            bandwidth=(upper_band - lower_band).quantize(_PRICE_QUANT),
+            period=self.bb_period,
+            std_dev=self.bb_std_dev,
+        )
+
+
+# Export
+__all__ = ["StreamingIndicatorEngine"]
@@ -4,6 +4,10 @@ Bybit WebSocket Client
 Real-time market data streaming via Bybit WebSocket API.
 Handles ticker and kline (candle) subscriptions for all trading symbols.
 
+Frames are decoded by BybitFrameDecoder into lightweight TickerFrame /
+KlineFrame structs; Pydantic models are only built when a model callback
+(on_ticker / on_kline) is registered.
+
 Author: Market Data Service Implementation Team
 Date: 2025-10-27
 """
@@ -11,14 +15,13 @@ Date: 2025-10-27
 import asyncio
 import json
 import logging
-from datetime import datetime
-from decimal import Decimal
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TextIO
 
 import websockets
 from websockets.client import ClientProtocol
 
 from .models import OHLCV, Ticker, Timeframe
+from .ws_decoder import BybitFrameDecoder, KlineFrame, TickerFrame, format_symbol
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +39,10 @@ class BybitWebSocketClient:
         testnet: Whether to use testnet
         on_ticker: Callback for ticker updates
         on_kline: Callback for kline updates
+        on_ticker_frame: Callback for raw TickerFrame updates (fast path)
+        on_kline_frame: Callback for raw KlineFrame updates (fast path)
         on_error: Callback for errors
+        decoder: Frame decoder (JSON backend picked at construction)
     """
 
     # WebSocket URLs
@@ -48,14 +54,24 @@ class BybitWebSocketClient:
         symbols: List[str],
         timeframes: Optional[List[Timeframe]] = None,
         testnet: bool = True,
-        on_ticker: Optional[Callable[[Ticker], None]] = None,
-        on_kline: Optional[Callable[[OHLCV], None]] = None,
-        on_error: Optional[Callable[[Exception], None]] = None,
+        on_ticker: Optional[Callable[[Ticker], Optional[Awaitable[None]]]] = None,
+        on_kline: Optional[Callable[[OHLCV], Optional[Awaitable[None]]]] = None,
+        on_error: Optional[Callable[[Exception], Optional[Awaitable[None]]]] = None,
         ping_interval: int = 20,
+        on_ticker_frame: Optional[
+            Callable[[TickerFrame], Optional[Awaitable[None]]]
+        ] = None,
+        on_kline_frame: Optional[
+            Callable[[KlineFrame], Optional[Awaitable[None]]]
+        ] = None,
+        decoder_backend: Optional[str] = None,
+        record_path: Optional[str] = None,
     ):
         """
         Initialize Bybit WebSocket Client
 
+        Callbacks may be plain functions or coroutine functions.
+
         Args:
             symbols: List of trading pairs (e.g., ['BTCUSDT', 'ETHUSDT'])
             timeframes: List of timeframes to subscribe to (default: ['3m'])
@@ -64,6 +80,12 @@ class BybitWebSocketClient:
             on_kline: Callback for kline updates
             on_error: Callback for errors
             ping_interval: Ping interval in seconds (default: 20)
+            on_ticker_frame: Callback receiving TickerFrame (no Pydantic)
+            on_kline_frame: Callback receiving KlineFrame (no Pydantic)
+            decoder_backend: JSON backend ('msgspec', 'orjson', 'json');
+                default picks the fastest installed one
+            record_path: Append every raw frame to this file (one per
+                line) for replay benchmarks
 
         Example:
             ```python
@@ -83,6 +105,13 @@ class BybitWebSocketClient:
         self.on_kline = on_kline
         self.on_error = on_error
         self.ping_interval = ping_interval
+        self.on_ticker_frame = on_ticker_frame
+        self.on_kline_frame = on_kline_frame
+
+        # Frame decoding
+        self.decoder = BybitFrameDecoder(decoder_backend)
+        self.record_path = record_path
+        self._record_file: Optional[TextIO] = None
 
         # WebSocket connection
         self.ws: Optional[ClientProtocol] = None
@@ -137,10 +166,7 @@ class BybitWebSocketClient:
             except Exception as e:
                 logger.error(f"WebSocket error: {e}", exc_info=True)
                 if self.on_error:
-                    try:
-                        self.on_error(e)
-                    except Exception as callback_error:
-                        logger.error(f"Error callback failed: {callback_error}")
+                    await self._invoke(self.on_error, e, "error")
 
                 if self.running:
                     await asyncio.sleep(reconnect_delay)
@@ -153,6 +179,9 @@ class BybitWebSocketClient:
         if self.ws:
             await self.ws.close()
             self.ws = None
+        if self._record_file:
+            self._record_file.close()
+            self._record_file = None
 
     async def _subscribe_to_channels(self):
         """Subscribe to ticker and kline channels for all symbols"""
@@ -193,20 +222,44 @@ class BybitWebSocketClient:
 
     async def _receive_messages(self):
         """Receive and process WebSocket messages"""
+        if self.record_path and self._record_file is None:
+            self._record_file = open(self.record_path, "a", encoding="utf-8")
+
         async for message in self.ws:
-            try:
-                data = json.loads(message)
+            await self._process_message(message)
 
-                # Handle different message types
-                if "topic" in data:
-                    await self._handle_topic_message(data)
-                elif "op" in data:
-                    await self._handle_operation_message(data)
+    async def _process_message(self, message):
+        """Decode and route one raw WebSocket frame"""
+        if self._record_file is not None:
+            if isinstance(message, bytes):
+                message = message.decode("utf-8")
+            self._record_file.write(message.rstrip("\n") + "\n")
 
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse WebSocket message: {e}")
-            except Exception as e:
-                logger.error(f"Error processing WebSocket message: {e}", exc_info=True)
+        try:
+            data = self.decoder.loads(message)
+
+            # Handle different message types
+            if "topic" in data:
+                await self._handle_topic_message(data)
+            elif "op" in data:
+                await self._handle_operation_message(data)
+
+        except ValueError as e:
+            # json.JSONDecodeError, orjson.JSONDecodeError and
+            # msgspec.DecodeError are all ValueError subclasses
+            logger.error(f"Failed to parse WebSocket message: {e}")
+        except Exception as e:
+            logger.error(f"Error processing WebSocket message: {e}", exc_info=True)
+
+    async def _invoke(self, callback: Callable, payload: Any, kind: str):
+        """Invoke a sync or async callback, logging callback errors"""
+        try:
+            if asyncio.iscoroutinefunction(callback):
+                await callback(payload)
+            else:
+                callback(payload)
+        except Exception as e:
+            logger.error(f"Error in {kind} callback: {e}", exc_info=True)
 
     async def _handle_topic_message(self, data: Dict[str, Any]):
         """Handle topic-based messages (ticker, kline)"""
@@ -256,39 +309,14 @@ class BybitWebSocketClient:
         }
         """
         try:
-            topic = data.get("topic", "")
-            symbol = topic.split(".")[-1]
-            ticker_data = data.get("data", {})
-
-            # Parse ticker data
-            ticker = Ticker(
-                symbol=self._format_symbol(symbol),
-                timestamp=datetime.fromtimestamp(data.get("ts", 0) / 1000),
-                bid=Decimal(str(ticker_data.get("bid1Price", 0))),
-                ask=Decimal(str(ticker_data.get("ask1Price", 0))),
-                last=Decimal(str(ticker_data.get("lastPrice", 0))),
-                high_24h=Decimal(str(ticker_data.get("highPrice24h", 0))),
-                low_24h=Decimal(str(ticker_data.get("lowPrice24h", 0))),
-                volume_24h=Decimal(str(ticker_data.get("volume24h", 0))),
-                change_24h=Decimal("0"),  # Will calculate
-                change_24h_pct=Decimal(str(ticker_data.get("price24hPcnt", 0)))
-                * Decimal("100"),
-            )
+            frame = self.decoder.parse_ticker(data)
 
-            # Calculate 24h change
-            ticker.change_24h = ticker.last - (
-                ticker.last / (Decimal("1") + (ticker.change_24h_pct / Decimal("100")))
-            )
+            if self.on_ticker_frame:
+                await self._invoke(self.on_ticker_frame, frame, "ticker frame")
 
-            # Invoke callback
+            # Pydantic model only when someone consumes it
             if self.on_ticker:
-                try:
-                    if asyncio.iscoroutinefunction(self.on_ticker):
-                        await self.on_ticker(ticker)
-                    else:
-                        self.on_ticker(ticker)
-                except Exception as e:
-                    logger.error(f"Error in ticker callback: {e}", exc_info=True)
+                await self._invoke(self.on_ticker, frame.to_model(), "ticker")
 
         except Exception as e:
             logger.error(f"Error handling ticker message: {e}", exc_info=True)
@@ -317,38 +345,12 @@ class BybitWebSocketClient:
         }
         """
         try:
-            topic = data.get("topic", "")
-            parts = topic.split(".")
-            interval = parts[1]
-            symbol = parts[2]
-
-            kline_list = data.get("data", [])
-
-            for kline_data in kline_list:
-                # Parse kline data
-                timeframe = self._parse_interval(interval)
-
-                ohlcv = OHLCV(
-                    symbol=self._format_symbol(symbol),
-                    timeframe=timeframe,
-                    timestamp=datetime.fromtimestamp(kline_data.get("start", 0) / 1000),
-                    open=Decimal(str(kline_data.get("open", 0))),
-                    high=Decimal(str(kline_data.get("high", 0))),
-                    low=Decimal(str(kline_data.get("low", 0))),
-                    close=Decimal(str(kline_data.get("close", 0))),
-                    volume=Decimal(str(kline_data.get("volume", 0))),
-                    quote_volume=Decimal(str(kline_data.get("turnover", 0))),
-                )
-
-                # Invoke callback
+            for frame in self.decoder.parse_klines(data):
+                if self.on_kline_frame:
+                    await self._invoke(self.on_kline_frame, frame, "kline frame")
+
                 if self.on_kline:
-                    try:
-                        if asyncio.iscoroutinefunction(self.on_kline):
-                            await self.on_kline(ohlcv)
-                        else:
-                            self.on_kline(ohlcv)
-                    except Exception as e:
-                        logger.error(f"Error in kline callback: {e}", exc_info=True)
+                    await self._invoke(self.on_kline, frame.to_model(), "kline")
 
         except Exception as e:
             logger.error(f"Error handling kline message: {e}", exc_info=True)
@@ -360,11 +362,7 @@ class BybitWebSocketClient:
         Bybit: 'BTCUSDT'
         Standard: 'BTC/USDT:USDT'
         """
-        # For perpetual futures
-        if symbol.endswith("USDT"):
-            base = symbol[:-4]
-            return f"{base}/USDT:USDT"
-        return symbol
+        return format_symbol(symbol)
 
     def _parse_interval(self, interval: str) -> Timeframe:
         """Parse Bybit interval to Timeframe enum"""
@@ -0,0 +1,386 @@
+"""
+Bybit WebSocket Frame Decoder
+
+Fast-path decoding of Bybit public WebSocket frames. Frames are parsed with
+msgspec or orjson when installed (falling back to the standard json module)
+straight into compact __slots__ structs that keep the raw string fields.
+Decimal-heavy Pydantic Ticker/OHLCV models are only built on demand via
+to_model(), e.g. when a candle is confirmed or a snapshot is requested.
+
+Ticker deltas are merged into the last snapshot per symbol, so a frame
+always carries the full ticker state.
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-06
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .models import OHLCV, Ticker, Timeframe
+
+# Optional fast JSON parsers (plain json is used when neither is installed)
+try:
+    import msgspec
+
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+    msgspec = None  # type: ignore
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Bybit interval -> Timeframe value
+BYBIT_INTERVALS = {
+    "1": Timeframe.M1.value,
+    "3": Timeframe.M3.value,
+    "5": Timeframe.M5.value,
+    "15": Timeframe.M15.value,
+    "30": Timeframe.M30.value,
+    "60": Timeframe.H1.value,
+    "240": Timeframe.H4.value,
+    "D": Timeframe.D1.value,
+}
+
+_PRICE_QUANT = Decimal("0.00000001")
+_PCT_QUANT = Decimal("0.0001")
+_EPOCH = datetime(1970, 1, 1)
+
+# Bybit ticker field -> TickerFrame slot
+_TICKER_FIELDS = {
+    "bid1Price": "bid",
+    "ask1Price": "ask",
+    "lastPrice": "last",
+    "highPrice24h": "high_24h",
+    "lowPrice24h": "low_24h",
+    "volume24h": "volume_24h",
+    "turnover24h": "turnover_24h",
+    "price24hPcnt": "price_24h_pcnt",
+}
+
+
+def format_symbol(symbol: str) -> str:
+    """Bybit 'BTCUSDT' -> standard 'BTC/USDT:USDT' (perpetual futures)"""
+    if "/" in symbol:
+        return symbol
+    if symbol.endswith("USDT"):
+        return f"{symbol[:-4]}/USDT:USDT"
+    return symbol
+
+
+def _decimal(value: Any) -> Decimal:
+    return Decimal(str(value))
+
+
+def _from_millis(millis: int) -> datetime:
+    """Epoch milliseconds to a naive UTC datetime (independent of host TZ)"""
+    return _EPOCH + timedelta(milliseconds=millis)
+
+
+def resolve_json_loads(
+    backend: Optional[str] = None,
+) -> Tuple[str, Callable[[Union[str, bytes]], Any]]:
+    """
+    Pick a JSON parser
+
+    Args:
+        backend: 'msgspec', 'orjson' or 'json'; None picks the fastest
+            installed one
+
+    Returns:
+        Tuple of (backend name, loads function)
+    """
+    if backend is None:
+        if MSGSPEC_AVAILABLE:
+            backend = "msgspec"
+        elif ORJSON_AVAILABLE:
+            backend = "orjson"
+        else:
+            backend = "json"
+
+    if backend == "msgspec":
+        if not MSGSPEC_AVAILABLE:
+            raise ValueError("msgspec is not installed")
+        return backend, msgspec.json.decode
+    if backend == "orjson":
+        if not ORJSON_AVAILABLE:
+            raise ValueError("orjson is not installed")
+        return backend, orjson.loads
+    if backend == "json":
+        return backend, json.loads
+    raise ValueError(f"Unknown JSON backend: {backend}")
+
+
+class TickerFrame:
+    """
+    Compact ticker state for one symbol
+
+    Price fields hold Bybit's raw strings; last_price is a float for cheap
+    comparisons. to_model() builds (and caches) the validated Ticker.
+    """
+
+    __slots__ = (
+        "symbol",
+        "ts",
+        "bid",
+        "ask",
+        "last",
+        "high_24h",
+        "low_24h",
+        "volume_24h",
+        "turnover_24h",
+        "price_24h_pcnt",
+        "_model",
+    )
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.ts = 0
+        self.bid = "0"
+        self.ask = "0"
+        self.last = "0"
+        self.high_24h = "0"
+        self.low_24h = "0"
+        self.volume_24h = "0"
+        self.turnover_24h = "0"
+        self.price_24h_pcnt = "0"
+        self._model: Optional[Ticker] = None
+
+    def copy(self) -> "TickerFrame":
+        frame = TickerFrame(self.symbol)
+        for slot in TickerFrame.__slots__[1:-1]:
+            setattr(frame, slot, getattr(self, slot))
+        return frame
+
+    @property
+    def last_price(self) -> float:
+        return float(self.last)
+
+    @property
+    def timestamp(self) -> datetime:
+        return _from_millis(self.ts)
+
+    def to_model(self) -> Ticker:
+        """Build the validated Ticker model (cached per frame)"""
+        if self._model is None:
+            last = _decimal(self.last)
+            change_24h_pct = _decimal(self.price_24h_pcnt) * Decimal("100")
+            change_24h = last - (
+                last / (Decimal("1") + (change_24h_pct / Decimal("100")))
+            )
+            self._model = Ticker(
+                symbol=self.symbol,
+                timestamp=self.timestamp,
+                bid=_decimal(self.bid),
+                ask=_decimal(self.ask),
+                last=last,
+                high_24h=_decimal(self.high_24h),
+                low_24h=_decimal(self.low_24h),
+                volume_24h=_decimal(self.volume_24h),
+                quote_volume_24h=_decimal(self.turnover_24h),
+                change_24h=change_24h.quantize(_PRICE_QUANT),
+                change_24h_pct=change_24h_pct.quantize(_PCT_QUANT),
+            )
+        return self._model
+
+
+class KlineFrame:
+    """
+    Compact kline (candle) update
+
+    Exposes the candle attributes StreamingIndicatorEngine and
+    OHLCVRingBuffer read (symbol, timeframe, timestamp, open/high/low/close,
+    volume, quote_volume, trades_count), so it can be fed to both directly;
+    to_model() builds the validated OHLCV.
+    """
+
+    # Bybit klines carry no trade count
+    trades_count = None
+
+    __slots__ = (
+        "symbol",
+        "timeframe",
+        "start",
+        "end",
+        "open",
+        "high",
+        "low",
+        "close_raw",
+        "volume",
+        "turnover",
+        "confirm",
+        "timestamp",
+        "_model",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: int,
+        end: int,
+        open: str,
+        high: str,
+        low: str,
+        close: str,
+        volume: str,
+        turnover: str,
+        confirm: bool,
+    ):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.start = start
+        self.end = end
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close_raw = close
+        self.volume = volume
+        self.turnover = turnover
+        self.confirm = confirm
+        self.timestamp = _from_millis(start)
+        self._model: Optional[OHLCV] = None
+
+    @property
+    def close(self) -> Decimal:
+        return _decimal(self.close_raw)
+
+    @property
+    def quote_volume(self) -> str:
+        return self.turnover
+
+    def values(self) -> Tuple[float, float, float, float, float, float]:
+        """(open, high, low, close, volume, turnover) as floats"""
+        return (
+            float(self.open),
+            float(self.high),
+            float(self.low),
+            float(self.close_raw),
+            float(self.volume),
+            float(self.turnover),
+        )
+
+    def to_model(self) -> OHLCV:
+        """Build the validated OHLCV model (cached per frame)"""
+        if self._model is None:
+            self._model = OHLCV(
+                symbol=self.symbol,
+                timeframe=Timeframe(self.timeframe),
+                timestamp=self.timestamp,
+                open=_decimal(self.open),
+                high=_decimal(self.high),
+                low=_decimal(self.low),
+                close=_decimal(self.close_raw),
+                volume=_decimal(self.volume),
+                quote_volume=_decimal(self.turnover),
+            )
+        return self._model
+
+
+# Anything the ring buffer and streaming indicators accept as a candle
+Candle = Union[OHLCV, KlineFrame]
+
+
+class BybitFrameDecoder:
+    """
+    Decoder for Bybit public WebSocket frames
+
+    Attributes:
+        backend: Name of the JSON parser in use
+
+    Example:
+        ```python
+        decoder = BybitFrameDecoder()
+        data = decoder.loads(raw_message)
+        if data.get("topic", "").startswith("kline."):
+            for frame in decoder.parse_klines(data):
+                if frame.confirm:
+                    candle = frame.to_model()
+        ```
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Initialize decoder
+
+        Args:
+            backend: JSON parser ('msgspec', 'orjson', 'json'); default picks
+                the fastest installed one
+        """
+        self.backend, self._loads = resolve_json_loads(backend)
+        self._tickers: Dict[str, TickerFrame] = {}
+
+    def loads(self, message: Union[str, bytes]) -> Dict[str, Any]:
+        """Parse a raw frame"""
+        data: Dict[str, Any] = self._loads(message)
+        return data
+
+    def parse_ticker(self, data: Dict[str, Any]) -> TickerFrame:
+        """
+        Parse a tickers.* message, merging deltas into the last snapshot
+
+        Returns:
+            A new TickerFrame holding the full ticker state
+        """
+        raw_symbol = data.get("topic", "").rsplit(".", 1)[-1]
+        previous = self._tickers.get(raw_symbol)
+        if data.get("type") == "delta" and previous is not None:
+            frame = previous.copy()
+        else:
+            frame = TickerFrame(format_symbol(raw_symbol))
+
+        frame.ts = data.get("ts", 0)
+        payload = data.get("data", {})
+        for field, slot in _TICKER_FIELDS.items():
+            value = payload.get(field)
+            if value is not None:
+                setattr(frame, slot, value)
+
+        self._tickers[raw_symbol] = frame
+        return frame
+
+    def parse_klines(self, data: Dict[str, Any]) -> List[KlineFrame]:
+        """Parse a kline.* message into one frame per candle"""
+        _, interval, raw_symbol = data.get("topic", "").split(".", 2)
+        symbol = format_symbol(raw_symbol)
+        timeframe = BYBIT_INTERVALS.get(interval, Timeframe.M3.value)
+        return [
+            KlineFrame(
+                symbol=symbol,
+                timeframe=timeframe,
+                start=kline.get("start", 0),
+                end=kline.get("end", 0),
+                open=kline.get("open", "0"),
+                high=kline.get("high", "0"),
+                low=kline.get("low", "0"),
+                close=kline.get("close", "0"),
+                volume=kline.get("volume", "0"),
+                turnover=kline.get("turnover", "0"),
+                confirm=bool(kline.get("confirm", False)),
+            )
+            for kline in data.get("data", [])
+        ]
+
+
+# Export
+__all__ = [
+    "BybitFrameDecoder",
+    "KlineFrame",
+    "TickerFrame",
+    "resolve_json_loads",
+    "format_symbol",
+    "BYBIT_INTERVALS",
+    "MSGSPEC_AVAILABLE",
+    "ORJSON_AVAILABLE",
+]
@@ -112,6 +112,19 @@ class MetricsService:
         if rejected:
             self.metrics.orders_rejected_total += 1
 
+    def record_order_execution(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        success: bool,
+        latency_ms: float,
+    ):
+        """Record a completed order submission and its latency"""
+        self.record_order(placed=True, filled=success, rejected=not success)
+        if success:
+            self._record_latency(latency_ms)
+
     # ========================================================================
     # Performance Metrics
     # ========================================================================
@@ -221,6 +234,23 @@ class MetricsService:
         """Record cache eviction"""
         self.metrics.cache_evictions_total += 1
 
+    # ========================================================================
+    # Persistence Metrics
+    # ========================================================================
+
+    def update_write_behind_metrics(
+        self,
+        queue_depth: int,
+        spilled_records: int,
+        flushed_total: int,
+        flush_failures_total: int,
+    ):
+        """Update write-behind queue gauges and counters"""
+        self.metrics.write_behind_queue_depth = queue_depth
+        self.metrics.write_behind_spilled_records = spilled_records
+        self.metrics.write_behind_flushed_total = flushed_total
+        self.metrics.write_behind_flush_failures_total = flush_failures_total
+
     # ========================================================================
     # System Health
     # ========================================================================
@@ -120,6 +120,20 @@ class TradingMetrics(BaseModel):
     cache_misses_total: int = Field(default=0, description="Cache misses")
     cache_evictions_total: int = Field(default=0, description="Cache evictions")
 
+    # Persistence metrics (write-behind queue)
+    write_behind_queue_depth: int = Field(
+        default=0, description="Database writes waiting in memory"
+    )
+    write_behind_spilled_records: int = Field(
+        default=0, description="Database writes waiting in the spill file"
+    )
+    write_behind_flushed_total: int = Field(
+        default=0, description="Database writes flushed"
+    )
+    write_behind_flush_failures_total: int = Field(
+        default=0, description="Failed write-behind flushes"
+    )
+
     class Config:
         json_encoders = {
             Decimal: str,
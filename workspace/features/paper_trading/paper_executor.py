@@ -22,12 +22,13 @@ import random
 import time
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence
 from uuid import uuid4
 
 
 from workspace.features.trade_executor.executor_service import TradeExecutor
 from workspace.features.trade_executor.models import (
+    ExecutionResult,
     Order,
     OrderType,
     OrderSide,
@@ -415,6 +416,93 @@ class PaperTradingExecutor(TradeExecutor):
 
         return order
 
+    async def create_orders_batch(
+        self, orders: Sequence[Order]
+    ) -> List[ExecutionResult]:
+        """
+        Simulate a batch of orders one by one against the virtual portfolio
+
+        Market orders fill through create_market_order and stop-market
+        orders rest through create_stop_loss_order; nothing reaches the
+        exchange.
+
+        Args:
+            orders: Pending orders (market or stop-market)
+
+        Returns:
+            ExecutionResult per order, in input order
+        """
+        results = []
+        for order in orders:
+            start_time = time.time()
+            try:
+                if order.type == OrderType.MARKET:
+                    simulated = await self.create_market_order(
+                        symbol=order.symbol,
+                        side=OrderSide(order.side),
+                        quantity=order.quantity,
+                        reduce_only=order.reduce_only,
+                        position_id=order.position_id,
+                    )
+                elif order.type == OrderType.STOP_MARKET:
+                    if order.stop_price is None:
+                        raise ValueError("Stop-market order without a stop price")
+                    simulated = await self.create_stop_loss_order(
+                        symbol=order.symbol,
+                        side=OrderSide(order.side),
+                        quantity=order.quantity,
+                        stop_price=order.stop_price,
+                        position_id=order.position_id,
+                    )
+                else:
+                    raise ValueError(f"Unsupported paper order type: {order.type}")
+            except Exception as e:
+                order.status = OrderStatus.FAILED
+                results.append(
+                    ExecutionResult(
+                        success=False,
+                        order=order,
+                        error_code="PAPER_ORDER_FAILED",
+                        error_message=str(e),
+                        latency_ms=_round_decimal(
+                            Decimal(str((time.time() - start_time) * 1000)), 2
+                        ),
+                    )
+                )
+                continue
+
+            simulated.metadata.update(order.metadata)
+            results.append(
+                ExecutionResult(
+                    success=True,
+                    order=simulated,
+                    latency_ms=_round_decimal(
+                        Decimal(str((time.time() - start_time) * 1000)), 2
+                    ),
+                )
+            )
+        return results
+
+    async def cancel_orders_batch(
+        self, orders: Sequence[Order]
+    ) -> List[ExecutionResult]:
+        """
+        Simulate cancelling resting paper orders
+
+        Args:
+            orders: Simulated orders to cancel
+
+        Returns:
+            ExecutionResult per order, in input order
+        """
+        results = []
+        for order in orders:
+            order.status = OrderStatus.CANCELED
+            order.updated_at = datetime.utcnow()
+            results.append(ExecutionResult(success=True, order=order))
+        logger.info(f"Paper orders cancelled: {len(orders)}")
+        return results
+
     async def get_account_balance(self) -> Decimal:
         """
         Get virtual account balance
@@ -11,19 +11,70 @@ Key Metrics:
 - Daily P&L tracking
 - Trade frequency and holding periods
 
+All metrics are maintained by streaming accumulators (win/loss sums and
+extremes, a running equity peak for drawdown, Welford mean/variance of
+daily P&L for Sharpe), so recording a trade and generating a report cost
+O(1) regardless of history length. The in-memory trade log can be
+bounded; older trades then spill to a JSON-lines file.
+
 Author: Implementation Specialist (Sprint 2 Stream B)
 Date: 2025-10-29
 """
 
+import json
 import logging
-from datetime import date
+import math
+import os
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from collections import defaultdict
-import statistics
 
 logger = logging.getLogger(__name__)
 
+# Trade fields restored as Decimal when reading spilled trades
+_DECIMAL_FIELDS = ("quantity", "price", "fees", "pnl")
+
+
+class _RunningStats:
+    """Welford mean/variance that also supports replacing a sample"""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value: float):
+        if self.count <= 1:
+            self.reset()
+            return
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (value - self.mean)
+
+    def replace(self, old: float, new: float):
+        self.remove(old)
+        self.add(new)
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation"""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / (self.count - 1))
+
 
 class PaperTradingPerformanceTracker:
     """
@@ -32,17 +83,52 @@ class PaperTradingPerformanceTracker:
     Tracks all trades and calculates comprehensive performance metrics.
 
     Attributes:
-        trades: List of all executed trades
+        trades: Executed trades kept in memory (the most recent max_trades)
         daily_pnl: Dictionary of P&L by date
         metrics: Current performance metrics
         equity_curve: Historical equity values
+        max_trades: In-memory trade log bound (None = unbounded)
+        spill_path: JSON-lines file receiving trades evicted from memory
+        spilled_trades: Number of trades evicted from memory
     """
 
-    def __init__(self):
-        """Initialize performance tracker"""
+    def __init__(
+        self, max_trades: Optional[int] = None, spill_path: Optional[str] = None
+    ):
+        """
+        Initialize performance tracker
+
+        Args:
+            max_trades: Maximum trades kept in memory; the oldest quarter is
+                evicted when exceeded (default: None = keep all)
+            spill_path: File that evicted trades are appended to as JSON
+                lines (default: None = evicted trades are dropped; metrics
+                still include them)
+        """
+        if max_trades is not None and max_trades < 1:
+            raise ValueError("max_trades must be positive")
+
+        self.max_trades = max_trades
+        self.spill_path = spill_path
+        self._init_state()
+
+        logger.info("Performance tracker initialized")
+
+    def _init_state(self):
+        """Reset trades, accumulators and metrics"""
         self.trades: List[Dict[str, Any]] = []
         self.daily_pnl: Dict[date, Decimal] = defaultdict(lambda: Decimal("0"))
         self.equity_curve: List[Dict[str, Any]] = []
+        self.spilled_trades = 0
+
+        # Streaming accumulators
+        self._gross_profit = Decimal("0")
+        self._gross_loss = Decimal("0")
+        self._equity = Decimal("0")
+        self._equity_peak = Decimal("0")
+        self._max_drawdown = Decimal("0")
+        self._daily_stats = _RunningStats()
+        self._symbol_stats: Dict[str, Dict[str, Any]] = {}
 
         self.metrics = {
             "total_trades": 0,
@@ -61,8 +147,6 @@ class PaperTradingPerformanceTracker:
             "sharpe_ratio": Decimal("0"),
         }
 
-        logger.info("Performance tracker initialized")
-
     def record_trade(self, trade: Dict[str, Any]):
         """
         Record a completed trade
@@ -70,29 +154,66 @@ class PaperTradingPerformanceTracker:
         Args:
             trade: Trade dictionary with symbol, side, quantity, price, fees, pnl, timestamp
         """
+        pnl = trade["pnl"]
         self.trades.append(trade)
+        if self.max_trades is not None and len(self.trades) > self.max_trades:
+            self._spill()
 
-        # Update daily P&L
+        # Update daily P&L and its running mean/variance
         trade_date = trade["timestamp"].date()
-        self.daily_pnl[trade_date] += trade["pnl"]
+        if trade_date in self.daily_pnl:
+            previous = self.daily_pnl[trade_date]
+            self.daily_pnl[trade_date] = previous + pnl
+            self._daily_stats.replace(float(previous), float(previous + pnl))
+        else:
+            self.daily_pnl[trade_date] = pnl
+            self._daily_stats.add(float(pnl))
 
         # Update metrics
         self.metrics["total_trades"] += 1
-        self.metrics["total_pnl"] += trade["pnl"]
+        self.metrics["total_pnl"] += pnl
         self.metrics["total_fees"] += trade["fees"]
 
         # Categorize trade
-        if trade["pnl"] > 0:
+        if pnl > 0:
             self.metrics["winning_trades"] += 1
-            if trade["pnl"] > self.metrics["largest_win"]:
-                self.metrics["largest_win"] = trade["pnl"]
-        elif trade["pnl"] < 0:
+            self._gross_profit += pnl
+            if pnl > self.metrics["largest_win"]:
+                self.metrics["largest_win"] = pnl
+        elif pnl < 0:
             self.metrics["losing_trades"] += 1
-            if trade["pnl"] < self.metrics["largest_loss"]:
-                self.metrics["largest_loss"] = trade["pnl"]
+            self._gross_loss += pnl
+            if pnl < self.metrics["largest_loss"]:
+                self.metrics["largest_loss"] = pnl
         else:
             self.metrics["breakeven_trades"] += 1
 
+        # Running equity peak for drawdown
+        self._equity += pnl
+        if self._equity > self._equity_peak:
+            self._equity_peak = self._equity
+        drawdown = self._equity_peak - self._equity
+        if drawdown > self._max_drawdown:
+            self._max_drawdown = drawdown
+
+        # Per-symbol totals
+        stats = self._symbol_stats.get(trade["symbol"])
+        if stats is None:
+            stats = self._symbol_stats[trade["symbol"]] = {
+                "trades": 0,
+                "wins": 0,
+                "losses": 0,
+                "total_pnl": Decimal("0"),
+                "total_fees": Decimal("0"),
+            }
+        stats["trades"] += 1
+        stats["total_pnl"] += pnl
+        stats["total_fees"] += trade["fees"]
+        if pnl > 0:
+            stats["wins"] += 1
+        elif pnl < 0:
+            stats["losses"] += 1
+
         # Recalculate derived metrics
         self._calculate_metrics()
 
@@ -102,7 +223,7 @@ class PaperTradingPerformanceTracker:
         )
 
     def _calculate_metrics(self):
-        """Calculate derived performance metrics"""
+        """Calculate derived performance metrics from the accumulators"""
         if self.metrics["total_trades"] == 0:
             return
 
@@ -112,27 +233,18 @@ class PaperTradingPerformanceTracker:
         )
 
         # Calculate average win/loss
-        winning_trades = [t for t in self.trades if t["pnl"] > 0]
-        losing_trades = [t for t in self.trades if t["pnl"] < 0]
-
-        if winning_trades:
-            total_wins = sum(t["pnl"] for t in winning_trades)
-            self.metrics["avg_win"] = total_wins / len(winning_trades)
-
-        if losing_trades:
-            total_losses = sum(t["pnl"] for t in losing_trades)
-            self.metrics["avg_loss"] = total_losses / len(losing_trades)
-
-        # Calculate profit factor
-        if losing_trades:
-            gross_profit = (
-                sum(t["pnl"] for t in winning_trades)
-                if winning_trades
-                else Decimal("0")
+        if self.metrics["winning_trades"]:
+            self.metrics["avg_win"] = (
+                self._gross_profit / self.metrics["winning_trades"]
             )
-            gross_loss = abs(sum(t["pnl"] for t in losing_trades))
+
+        if self.metrics["losing_trades"]:
+            self.metrics["avg_loss"] = self._gross_loss / self.metrics["losing_trades"]
+
+            # Calculate profit factor
+            gross_loss = abs(self._gross_loss)
             self.metrics["profit_factor"] = (
-                gross_profit / gross_loss if gross_loss > 0 else Decimal("0")
+                self._gross_profit / gross_loss if gross_loss > 0 else Decimal("0")
             )
 
         # Calculate maximum drawdown
@@ -142,48 +254,18 @@ class PaperTradingPerformanceTracker:
         self._calculate_sharpe_ratio()
 
     def _calculate_max_drawdown(self):
-        """Calculate maximum drawdown from equity curve"""
-        if not self.trades:
-            self.metrics["max_drawdown"] = Decimal("0")
-            return
-
-        # Build equity curve
-        running_pnl = Decimal("0")
-        peak = Decimal("0")
-        max_dd = Decimal("0")
-
-        for trade in self.trades:
-            running_pnl += trade["pnl"]
-
-            # Update peak
-            if running_pnl > peak:
-                peak = running_pnl
-
-            # Calculate drawdown from peak
-            drawdown = peak - running_pnl
-
-            # Update max drawdown
-            if drawdown > max_dd:
-                max_dd = drawdown
-
-        self.metrics["max_drawdown"] = max_dd
+        """Maximum drawdown of cumulative P&L from its running peak"""
+        self.metrics["max_drawdown"] = self._max_drawdown
 
     def _calculate_sharpe_ratio(self):
         """Calculate annualized Sharpe ratio"""
-        if len(self.daily_pnl) < 2:
-            self.metrics["sharpe_ratio"] = Decimal("0")
-            return
-
-        # Get daily returns
-        daily_returns = [float(pnl) for pnl in self.daily_pnl.values()]
-
-        if not daily_returns:
+        if self._daily_stats.count < 2:
             self.metrics["sharpe_ratio"] = Decimal("0")
             return
 
-        # Calculate mean and std dev
-        mean_return = statistics.mean(daily_returns)
-        std_return = statistics.stdev(daily_returns) if len(daily_returns) > 1 else 0
+        # Mean and std dev of daily P&L
+        mean_return = self._daily_stats.mean
+        std_return = self._daily_stats.stdev
 
         if std_return == 0:
             self.metrics["sharpe_ratio"] = Decimal("0")
@@ -266,6 +348,9 @@ class PaperTradingPerformanceTracker:
         """
         Get trade history with optional filtering
 
+        Only trades still in memory are returned; see iter_trades() for
+        the full history including spilled trades.
+
         Args:
             limit: Maximum number of trades to return
             winning_only: Return only winning trades
@@ -298,32 +383,9 @@ class PaperTradingPerformanceTracker:
         Returns:
             Dictionary of performance metrics by symbol
         """
-        symbol_stats: Dict[str, Dict[str, Any]] = defaultdict(
-            lambda: {
-                "trades": 0,
-                "wins": 0,
-                "losses": 0,
-                "total_pnl": Decimal("0"),
-                "total_fees": Decimal("0"),
-            }
-        )
-
-        for trade in self.trades:
-            symbol = trade["symbol"]
-            stats = symbol_stats[symbol]
-
-            stats["trades"] += 1
-            stats["total_pnl"] += trade["pnl"]
-            stats["total_fees"] += trade["fees"]
-
-            if trade["pnl"] > 0:
-                stats["wins"] += 1
-            elif trade["pnl"] < 0:
-                stats["losses"] += 1
-
         # Calculate derived metrics for each symbol
         result = {}
-        for symbol, stats in symbol_stats.items():
+        for symbol, stats in self._symbol_stats.items():
             result[symbol] = {
                 "trades": stats["trades"],
                 "wins": stats["wins"],
@@ -346,30 +408,51 @@ class PaperTradingPerformanceTracker:
         return result
 
     def reset(self):
-        """Reset all performance tracking"""
-        self.trades = []
-        self.daily_pnl = defaultdict(lambda: Decimal("0"))
-        self.equity_curve = []
-
-        self.metrics = {
-            "total_trades": 0,
-            "winning_trades": 0,
-            "losing_trades": 0,
-            "breakeven_trades": 0,
-            "total_pnl": Decimal("0"),
-            "total_fees": Decimal("0"),
-            "win_rate": Decimal("0"),
-            "avg_win": Decimal("0"),
-            "avg_loss": Decimal("0"),
-            "largest_win": Decimal("0"),
-            "largest_loss": Decimal("0"),
-            "profit_factor": Decimal("0"),
-            "max_drawdown": Decimal("0"),
-            "sharpe_ratio": Decimal("0"),
-        }
+        """Reset all performance tracking (including the spill file)"""
+        self._init_state()
+        if self.spill_path and os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
 
         logger.info("Performance tracker reset")
 
+    def iter_trades(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the full trade history, oldest first
+
+        Spilled trades are read back from spill_path before the trades
+        still in memory.
+
+        Yields:
+            Trade dictionaries
+        """
+        if self.spill_path and self.spilled_trades and os.path.exists(self.spill_path):
+            with open(self.spill_path) as f:
+                for line in f:
+                    trade = json.loads(line)
+                    for field in _DECIMAL_FIELDS:
+                        if field in trade:
+                            trade[field] = Decimal(trade[field])
+                    trade["timestamp"] = datetime.fromisoformat(trade["timestamp"])
+                    yield trade
+
+        yield from self.trades
+
+    def _spill(self):
+        """Evict the oldest trades from memory, appending them to spill_path"""
+        count = len(self.trades) - self.max_trades + self.max_trades // 4
+        evicted = self.trades[:count]
+        del self.trades[:count]
+        self.spilled_trades += len(evicted)
+
+        if not self.spill_path:
+            return
+
+        with open(self.spill_path, "a") as f:
+            for trade in evicted:
+                f.write(json.dumps(trade, default=_json_default) + "\n")
+
+        logger.debug(f"Spilled {len(evicted)} trades to {self.spill_path}")
+
     def export_trades_csv(self, filepath: str):
         """
         Export trades to CSV file
@@ -394,7 +477,9 @@ class PaperTradingPerformanceTracker:
             )
             writer.writeheader()
 
-            for trade in self.trades:
+            exported = 0
+            for trade in self.iter_trades():
+                exported += 1
                 writer.writerow(
                     {
                         "timestamp": trade["timestamp"].isoformat(),
@@ -407,4 +492,11 @@ class PaperTradingPerformanceTracker:
                     }
                 )
 
-        logger.info(f"Exported {len(self.trades)} trades to {filepath}")
+        logger.info(f"Exported {exported} trades to {filepath}")
+
+
+def _json_default(value: Any) -> Any:
+    """JSON encoder for Decimal and datetime trade fields"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
@@ -74,6 +74,7 @@ class VirtualPortfolio:
         quantity: Decimal,
         entry_price: Decimal,
         fees: Decimal,
+        timestamp: Optional[datetime] = None,
     ):
         """
         Open or add to virtual position
@@ -86,7 +87,9 @@ class VirtualPortfolio:
             quantity: Position quantity
             entry_price: Entry price
             fees: Trading fees paid
+            timestamp: Fill time (defaults to now; backtests pass bar time)
         """
+        now = timestamp or datetime.utcnow()
         if symbol in self.positions:
             # Update existing position
             pos = self.positions[symbol]
@@ -102,7 +105,7 @@ class VirtualPortfolio:
             pos["quantity"] = total_quantity
             pos["entry_price"] = avg_price
             pos["total_fees"] = _round_decimal(pos["total_fees"] + fees)
-            pos["last_updated"] = datetime.utcnow()
+            pos["last_updated"] = now
 
             logger.info(
                 f"Added to position {symbol}: "
@@ -117,8 +120,8 @@ class VirtualPortfolio:
                 "quantity": quantity,
                 "entry_price": entry_price,
                 "total_fees": fees,
-                "opened_at": datetime.utcnow(),
-                "last_updated": datetime.utcnow(),
+                "opened_at": now,
+                "last_updated": now,
             }
 
             logger.info(
@@ -144,7 +147,7 @@ class VirtualPortfolio:
                 "quantity": quantity,
                 "price": entry_price,
                 "fees": fees,
-                "timestamp": datetime.utcnow(),
+                "timestamp": now,
             }
         )
 
@@ -154,6 +157,7 @@ class VirtualPortfolio:
         exit_price: Decimal,
         fees: Decimal,
         quantity: Optional[Decimal] = None,
+        timestamp: Optional[datetime] = None,
     ) -> Decimal:
         """
         Close virtual position (fully or partially)
@@ -163,6 +167,7 @@ class VirtualPortfolio:
             exit_price: Exit price
             fees: Trading fees paid
             quantity: Quantity to close (None = close all)
+            timestamp: Fill time (defaults to now; backtests pass bar time)
 
         Returns:
             Realized P&L in USDT
@@ -174,6 +179,7 @@ class VirtualPortfolio:
             raise ValueError(f"No position for {symbol}")
 
         pos = self.positions[symbol]
+        now = timestamp or datetime.utcnow()
         close_quantity = quantity if quantity is not None else pos["quantity"]
 
         # Validate quantity
@@ -209,8 +215,8 @@ class VirtualPortfolio:
             "pnl": pnl,
             "total_fees": pos["total_fees"] + fees,
             "opened_at": pos["opened_at"],
-            "closed_at": datetime.utcnow(),
-            "holding_period": (datetime.utcnow() - pos["opened_at"]).total_seconds(),
+            "closed_at": now,
+            "holding_period": (now - pos["opened_at"]).total_seconds(),
         }
         self.closed_positions.append(closed_pos)
 
@@ -222,7 +228,7 @@ class VirtualPortfolio:
         else:
             # Partially closed
             pos["quantity"] = _round_decimal(pos["quantity"] - close_quantity)
-            pos["last_updated"] = datetime.utcnow()
+            pos["last_updated"] = now
             logger.info(
                 f"Partially closed position {symbol}: "
                 f"Closed: {close_quantity}, Remaining: {pos['quantity']}, "
@@ -239,7 +245,7 @@ class VirtualPortfolio:
                 "price": exit_price,
                 "fees": fees,
                 "pnl": pnl,
-                "timestamp": datetime.utcnow(),
+                "timestamp": now,
             }
         )
 
@@ -14,6 +14,7 @@ Usage:
     )
 """
 
+from workspace.features.position_manager.position_book import PositionBook
 from workspace.features.position_manager.position_service import (
     PositionService,
     bulk_update_prices,
@@ -51,6 +52,7 @@ __all__ = [
     # Service
     "PositionService",
     "PositionManager",  # Alias for PositionService
+    "PositionBook",
     "bulk_update_prices",
     # Request Models
     "PositionCreateRequest",
@@ -0,0 +1,315 @@
+"""
+Position Book
+
+In-process, authoritative view of all open positions. PositionService
+writes every committed create/update/close through to the book and serves
+active-position reads, exposure and trigger checks from it, so the hot
+paths (risk checks, stop-loss/take-profit scans, mark-to-market) do not
+touch the database.
+
+The book keeps:
+- Open positions by ID, in creation order
+- A per-symbol index
+- Running aggregates (exposure, margin, unrealized P&L) adjusted by each
+  position's delta instead of being re-summed
+
+Consistency: writes go to PostgreSQL first and reach the book only after
+commit. PositionService.reconcile_position_book() reloads the book from
+the database on start and whenever other processes may have written;
+positions written through while a reload was in flight keep
+their newer in-memory state.
+
+Usage:
+    from workspace.features.position_manager import PositionBook, PositionService
+
+    book = PositionBook()
+    service = PositionService(pool, position_book=book)
+    await service.reconcile_position_book()
+
+    exposure = book.total_exposure_chf
+    btc_positions = book.positions("BTCUSDT")
+"""
+
+import logging
+import time
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from workspace.features.position_manager.models import USD_CHF_RATE, PositionWithPnL
+from workspace.shared.database.models import PositionStatus, usd_to_chf
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0")
+
+
+class PositionBook:
+    """
+    In-memory book of open positions with per-symbol index and aggregates.
+
+    Attributes:
+        loaded: Whether the book has been loaded from the database
+        loaded_at: time.monotonic() of the last full load
+        version: Incremented on every change
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty, not yet loaded book."""
+        self._positions: Dict[UUID, PositionWithPnL] = {}
+        self._by_symbol: Dict[str, Dict[UUID, PositionWithPnL]] = {}
+        # Per-position (exposure, margin, unrealized P&L) contributions
+        self._contributions: Dict[UUID, Tuple[Decimal, Decimal, Decimal]] = {}
+        self._exposure_chf = ZERO
+        self._margin_chf = ZERO
+        self._unrealized_pnl_chf = ZERO
+        # Position IDs written through while a reload is in flight
+        self._touched: Optional[Set[UUID]] = None
+
+        self.loaded = False
+        self.loaded_at: Optional[float] = None
+        self.version = 0
+
+    # ========================================================================
+    # Reads
+    # ========================================================================
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, position_id: UUID) -> bool:
+        return position_id in self._positions
+
+    def get(self, position_id: UUID) -> Optional[PositionWithPnL]:
+        """
+        Get an open position by ID.
+
+        Args:
+            position_id: Position ID
+
+        Returns:
+            PositionWithPnL or None if not open
+        """
+        return self._positions.get(position_id)
+
+    def positions(self, symbol: Optional[str] = None) -> List[PositionWithPnL]:
+        """
+        Get open positions, newest first (same order as the database query).
+
+        Args:
+            symbol: Optional symbol filter
+
+        Returns:
+            List of PositionWithPnL
+        """
+        if symbol is None:
+            source = self._positions
+        else:
+            source = self._by_symbol.get(symbol, {})
+        return list(reversed(source.values()))
+
+    def symbols(self) -> List[str]:
+        """Symbols with at least one open position."""
+        return list(self._by_symbol)
+
+    def count(self, symbol: Optional[str] = None) -> int:
+        """
+        Number of open positions.
+
+        Args:
+            symbol: Optional symbol filter
+        """
+        if symbol is None:
+            return len(self._positions)
+        return len(self._by_symbol.get(symbol, ()))
+
+    @property
+    def total_exposure_chf(self) -> Decimal:
+        """Sum of leveraged position values in CHF."""
+        return self._exposure_chf.quantize(Decimal("0.00000001"))
+
+    @property
+    def total_margin_chf(self) -> Decimal:
+        """Sum of unleveraged position values (capital at risk) in CHF."""
+        return self._margin_chf.quantize(Decimal("0.00000001"))
+
+    @property
+    def total_unrealized_pnl_chf(self) -> Decimal:
+        """Sum of unrealized P&L in CHF."""
+        return self._unrealized_pnl_chf.quantize(Decimal("0.00000001"))
+
+    def stop_loss_triggered(self) -> List[PositionWithPnL]:
+        """Open positions whose current price is at or past the stop-loss."""
+        return [p for p in self.positions() if p.is_stop_loss_triggered]
+
+    def take_profit_triggered(self) -> List[PositionWithPnL]:
+        """Open positions whose current price is at or past the take-profit."""
+        return [p for p in self.positions() if p.is_take_profit_triggered]
+
+    def age_seconds(self) -> Optional[float]:
+        """Seconds since the last full load (None if never loaded)."""
+        if self.loaded_at is None:
+            return None
+        return time.monotonic() - self.loaded_at
+
+    # ========================================================================
+    # Writes
+    # ========================================================================
+
+    def upsert(self, position: PositionWithPnL) -> None:
+        """
+        Apply a committed position state.
+
+        Positions that are no longer open are removed.
+
+        Args:
+            position: Position as returned by the database write
+        """
+        if self._touched is not None:
+            self._touched.add(position.id)
+
+        if position.status != PositionStatus.OPEN:
+            self._discard(position.id)
+            return
+
+        previous = self._positions.get(position.id)
+        if previous is not None and previous.symbol != position.symbol:
+            self._discard(position.id)
+
+        self._subtract(position.id)
+        self._positions[position.id] = position
+        self._by_symbol.setdefault(position.symbol, {})[position.id] = position
+        self._add(position)
+        self.version += 1
+
+    def remove(self, position_id: UUID) -> Optional[PositionWithPnL]:
+        """
+        Remove a position (closed or deleted).
+
+        Args:
+            position_id: Position ID
+
+        Returns:
+            The removed position, or None if it was not in the book
+        """
+        if self._touched is not None:
+            self._touched.add(position_id)
+        return self._discard(position_id)
+
+    def start_reload(self) -> None:
+        """Begin tracking writes that must survive the next load()."""
+        self._touched = set()
+
+    def load(self, positions: Iterable[PositionWithPnL]) -> Dict[str, int]:
+        """
+        Replace the book with the open positions read from the database.
+
+        Positions written through since start_reload() keep their
+        in-memory state, since the database read may predate the write.
+
+        Args:
+            positions: Open positions from the database
+
+        Returns:
+            Dict with counts of added, removed and changed positions
+        """
+        touched = self._touched or set()
+        self._touched = None
+
+        incoming = {
+            position.id: position
+            for position in positions
+            if position.status == PositionStatus.OPEN
+        }
+        diff = {"added": 0, "removed": 0, "changed": 0}
+        for position_id, position in incoming.items():
+            previous = self._positions.get(position_id)
+            if position_id in touched:
+                continue
+            if previous is None:
+                diff["added"] += 1
+            elif previous != position:
+                diff["changed"] += 1
+        diff["removed"] = sum(
+            1
+            for position_id in self._positions
+            if position_id not in incoming and position_id not in touched
+        )
+
+        # Rebuild in creation order so positions() stays newest-first
+        merged = [
+            position
+            for position_id, position in incoming.items()
+            if position_id not in touched
+        ]
+        merged += [
+            self._positions[position_id]
+            for position_id in touched
+            if position_id in self._positions
+        ]
+        self._reset()
+        for position in sorted(merged, key=lambda p: p.created_at):
+            self.upsert(position)
+
+        self.loaded = True
+        self.loaded_at = time.monotonic()
+        self.version += 1
+        return diff
+
+    def clear(self) -> None:
+        """Empty the book and mark it as not loaded."""
+        self._reset()
+        self._touched = None
+        self.loaded = False
+        self.loaded_at = None
+        self.version += 1
+
+    # ========================================================================
+    # Aggregates
+    # ========================================================================
+
+    def _reset(self) -> None:
+        self._positions.clear()
+        self._by_symbol.clear()
+        self._contributions.clear()
+        self._exposure_chf = ZERO
+        self._margin_chf = ZERO
+        self._unrealized_pnl_chf = ZERO
+
+    def _discard(self, position_id: UUID) -> Optional[PositionWithPnL]:
+        position = self._positions.pop(position_id, None)
+        if position is None:
+            return None
+
+        symbol_positions = self._by_symbol.get(position.symbol)
+        if symbol_positions is not None:
+            symbol_positions.pop(position_id, None)
+            if not symbol_positions:
+                del self._by_symbol[position.symbol]
+
+        self._subtract(position_id)
+        self.version += 1
+        return position
+
+    def _add(self, position: PositionWithPnL) -> None:
+        exposure = position.position_value_chf or ZERO
+        margin = ZERO
+        if position.current_price:
+            margin = usd_to_chf(
+                position.quantity * position.current_price, USD_CHF_RATE
+            )
+        unrealized = position.unrealized_pnl_chf or ZERO
+
+        self._contributions[position.id] = (exposure, margin, unrealized)
+        self._exposure_chf += exposure
+        self._margin_chf += margin
+        self._unrealized_pnl_chf += unrealized
+
+    def _subtract(self, position_id: UUID) -> None:
+        contribution = self._contributions.pop(position_id, None)
+        if contribution is None:
+            return
+        exposure, margin, unrealized = contribution
+        self._exposure_chf -= exposure
+        self._margin_chf -= margin
+        self._unrealized_pnl_chf -= unrealized
@@ -16,6 +16,8 @@ Key Responsibilities:
 - Track daily P&L for circuit breaker
 - Calculate total exposure across all positions
 - Audit all position changes
+- Optionally keep an in-memory PositionBook of open positions, written
+  through on every change, so reads and risk checks skip the database
 
 Usage:
     from workspace.features.position_manager.position_service import PositionService
@@ -48,6 +50,9 @@ Usage:
         current_price=Decimal("45500.00")
     )
 
+    # Mark all open positions to market in one statement
+    updated = await service.update_prices({"BTCUSDT": Decimal("45500.00")})
+
     # Check stop losses
     triggered = await service.check_stop_loss_triggers()
 
@@ -64,7 +69,7 @@ import logging
 from datetime import date as Date
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from uuid import UUID, uuid4
 
 import asyncpg
@@ -81,6 +86,7 @@ from workspace.features.position_manager.models import (
     RiskLimitError,
     ValidationError,
 )
+from workspace.features.position_manager.position_book import PositionBook
 from workspace.shared.database.connection import DatabasePool
 from workspace.shared.database.models import (
     Position,
@@ -91,6 +97,8 @@ from workspace.shared.database.models import (
 
 logger = logging.getLogger(__name__)
 
+PriceUpdateListener = Callable[[Dict[UUID, PositionWithPnL]], None]
+
 
 class PositionService:
     """
@@ -101,19 +109,39 @@ class PositionService:
 
     Attributes:
         pool: Database connection pool
+        position_book: Optional in-memory book of open positions
+        book_max_age_seconds: Reload the book when older than this
+        price_update_listeners: Callables notified once per update_prices()
         _max_retries: Maximum retry attempts for database operations
     """
 
-    def __init__(self, pool: DatabasePool, max_retries: int = 3):
+    def __init__(
+        self,
+        pool: DatabasePool,
+        max_retries: int = 3,
+        position_book: Optional[PositionBook] = None,
+        book_max_age_seconds: Optional[float] = None,
+    ):
         """
         Initialize position service.
 
         Args:
             pool: Database connection pool
             max_retries: Maximum retry attempts (default: 3)
+            position_book: PositionBook serving open-position reads; loaded
+                from the database on first use (default: None = always
+                query the database)
+            book_max_age_seconds: Reload the book from the database when
+                its last load is older than this, for deployments where
+                other processes also write positions (default: None =
+                write-through only)
         """
         self.pool = pool
         self._max_retries = max_retries
+        self.position_book = position_book
+        self.book_max_age_seconds = book_max_age_seconds
+        self._book_reload: Optional[asyncio.Task] = None
+        self.price_update_listeners: List[PriceUpdateListener] = []
         logger.info("PositionService initialized")
 
     # ========================================================================
@@ -271,6 +299,7 @@ class PositionService:
                 )
 
                 position_with_pnl = PositionWithPnL.from_position(position)
+                self._write_through(position_with_pnl)
 
                 logger.info(
                     f"Position created successfully: {position_id} "
@@ -364,6 +393,7 @@ class PositionService:
                 )
 
                 position_with_pnl = PositionWithPnL.from_position(position)
+                self._write_through(position_with_pnl)
 
                 logger.debug(
                     f"Position {position_id} updated: price={current_price} "
@@ -386,6 +416,123 @@ class PositionService:
         # Should not reach here due to raise above, but mypy needs explicit return
         raise ConnectionError("Failed to update position - unexpected error")
 
+    async def update_prices(
+        self, price_updates: Dict[str, Decimal]
+    ) -> Dict[UUID, PositionWithPnL]:
+        """
+        Mark all open positions to market in a single statement.
+
+        One UPDATE joins the open positions against the unnested
+        (symbol, price) arrays, so the round-trips stay constant however
+        many positions are open. P&L is recalculated from the returned
+        rows, the position book is written through and price update
+        listeners are notified once with the whole batch.
+
+        Args:
+            price_updates: Dict mapping symbol to current price in USD
+
+        Returns:
+            Dict mapping position ID to updated position
+
+        Raises:
+            ConnectionError: If database operation fails
+        """
+        if not price_updates:
+            return {}
+
+        symbols = list(price_updates)
+        prices = [
+            Decimal(price).quantize(Decimal("0.00000001"))
+            for price in price_updates.values()
+        ]
+
+        for attempt in range(self._max_retries):
+            try:
+                async with self.pool.acquire() as conn:
+                    rows = await conn.fetch(
+                        """
+                        UPDATE positions AS p
+                        SET current_price = u.price,
+                            updated_at = $3
+                        FROM unnest($1::varchar[], $2::numeric[]) AS u(symbol, price)
+                        WHERE p.symbol = u.symbol AND p.status = $4
+                        RETURNING p.*
+                        """,
+                        symbols,
+                        prices,
+                        datetime.utcnow(),
+                        PositionStatus.OPEN.value,
+                    )
+                break
+
+            except asyncpg.PostgresError as e:
+                logger.warning(
+                    f"Database error on attempt {attempt + 1}/{self._max_retries}: {e}"
+                )
+                if attempt == self._max_retries - 1:
+                    raise ConnectionError(
+                        f"Failed to update prices after {self._max_retries} attempts"
+                    ) from e
+                await asyncio.sleep(0.5 * (attempt + 1))
+
+        updated = {}
+        for row in rows:
+            position = PositionWithPnL.from_position(
+                Position(
+                    id=row["id"],
+                    symbol=row["symbol"],
+                    side=PositionSide(row["side"]),
+                    quantity=row["quantity"],
+                    entry_price=row["entry_price"],
+                    current_price=row["current_price"],
+                    leverage=row["leverage"],
+                    stop_loss=row["stop_loss"],
+                    take_profit=row["take_profit"],
+                    status=PositionStatus(row["status"]),
+                    pnl_chf=row["pnl_chf"],
+                    created_at=row["created_at"],
+                    updated_at=row["updated_at"],
+                    closed_at=row["closed_at"],
+                )
+            )
+            self._write_through(position)
+            updated[position.id] = position
+
+        if updated:
+            for listener in self.price_update_listeners:
+                try:
+                    listener(updated)
+                except Exception as e:
+                    logger.error(f"Price update listener failed: {e}")
+
+        logger.debug(
+            f"Marked {len(updated)} positions to market across {len(symbols)} symbols"
+        )
+        return updated
+
+    def add_price_update_listener(self, listener: PriceUpdateListener):
+        """
+        Register a listener for update_prices() batches.
+
+        Listeners are called synchronously with the dict of updated
+        positions, once per batch; schedule tasks for slow work.
+
+        Args:
+            listener: Callable receiving Dict[UUID, PositionWithPnL]
+        """
+        if listener not in self.price_update_listeners:
+            self.price_update_listeners.append(listener)
+
+    def remove_price_update_listener(self, listener: PriceUpdateListener):
+        """
+        Unregister a price update listener.
+
+        Args:
+            listener: Callable previously passed to add_price_update_listener
+        """
+        if listener in self.price_update_listeners:
+            self.price_update_listeners.remove(listener)
+
     # ========================================================================
     # Position Closure
     # ========================================================================
@@ -543,6 +690,7 @@ class PositionService:
                 )
 
                 position_with_pnl = PositionWithPnL.from_position(position)
+                self._write_through(position_with_pnl)
 
                 logger.info(
                     f"Position {position_id} closed: "
@@ -578,6 +726,12 @@ class PositionService:
         Returns:
             PositionWithPnL or None if not found
         """
+        if self.position_book is not None and self.position_book.loaded:
+            # Open positions are served from the book; closed ones need the DB
+            cached = self.position_book.get(position_id)
+            if cached is not None:
+                return cached
+
         try:
             row = await self.pool.fetchrow(
                 "SELECT * FROM positions WHERE id = $1", position_id
@@ -615,12 +769,24 @@ class PositionService:
         """
         Get all active (open) positions.
 
+        Served from the position book when one is configured.
+
         Args:
             symbol: Optional symbol filter
 
         Returns:
             List of PositionWithPnL
         """
+        if self.position_book is not None:
+            await self._ensure_book()
+            return self.position_book.positions(symbol or None)
+
+        return await self._fetch_active_positions(symbol)
+
+    async def _fetch_active_positions(
+        self, symbol: Optional[str] = None
+    ) -> List[PositionWithPnL]:
+        """Query open positions from the database."""
         try:
             if symbol:
                 rows = await self.pool.fetch(
@@ -661,6 +827,62 @@ class PositionService:
             logger.error(f"Failed to fetch active positions: {e}")
             raise ConnectionError(f"Database query failed: {e}") from e
 
+    # ========================================================================
+    # Position Book
+    # ========================================================================
+
+    async def reconcile_position_book(self) -> Dict[str, int]:
+        """
+        Reload the position book from the database.
+
+        Call on start and after anything that may have written positions
+        outside this service (other processes, manual fixes, exchange
+        reconciliation).
+
+        Returns:
+            Dict with counts of added, removed and changed positions
+
+        Raises:
+            ValueError: If no position book is configured
+            ConnectionError: If database query fails
+        """
+        if self.position_book is None:
+            raise ValueError("PositionService has no position book")
+
+        self.position_book.start_reload()
+        positions = await self._fetch_active_positions()
+        diff = self.position_book.load(positions)
+
+        if diff["added"] or diff["removed"] or diff["changed"]:
+            logger.info(
+                f"Position book reconciled: {len(self.position_book)} open "
+                f"(added={diff['added']} removed={diff['removed']} "
+                f"changed={diff['changed']})"
+            )
+        return diff
+
+    async def _ensure_book(self) -> None:
+        """Load the book on first use and reload it when too old."""
+        book = self.position_book
+        if book is None:
+            return
+        age = book.age_seconds()
+        if book.loaded and (
+            self.book_max_age_seconds is None
+            or (age is not None and age <= self.book_max_age_seconds)
+        ):
+            return
+
+        # Concurrent readers share one reload
+        if self._book_reload is None or self._book_reload.done():
+            self._book_reload = asyncio.create_task(self.reconcile_position_book())
+        await asyncio.shield(self._book_reload)
+
+    def _write_through(self, position: PositionWithPnL) -> None:
+        """Apply a committed position change to the book."""
+        if self.position_book is not None:
+            self.position_book.upsert(position)
+
     # ========================================================================
     # Stop-Loss Monitoring
     # ========================================================================
@@ -745,6 +967,12 @@ class PositionService:
             Decimal: Total exposure in CHF
         """
         try:
+            if self.position_book is not None:
+                await self._ensure_book()
+                total_exposure = self.position_book.total_exposure_chf
+                logger.debug(f"Total exposure: CHF {total_exposure:.2f}")
+                return total_exposure
+
             positions = await self.get_active_positions()
 
             total_exposure = Decimal("0")
@@ -914,6 +1142,9 @@ async def bulk_update_prices(
     """
     Update prices for multiple positions efficiently.
 
+    Thin wrapper around PositionService.update_prices(): all open positions
+    for the given symbols are updated by one statement.
+
     Args:
         service: PositionService instance
         price_updates: Dict mapping symbol to current price
@@ -928,20 +1159,7 @@ async def bulk_update_prices(
         }
         updated = await bulk_update_prices(service, prices)
     """
-    updated_positions = {}
-
-    # Get all open positions
-    open_positions = await service.get_active_positions()
-
-    # Update each position with matching symbol
-    for position in open_positions:
-        if position.symbol in price_updates:
-            new_price = price_updates[position.symbol]
-            try:
-                updated = await service.update_position_price(position.id, new_price)
-                updated_positions[position.id] = updated
-            except Exception as e:
-                logger.error(f"Failed to update position {position.id}: {e}")
+    updated_positions = await service.update_prices(price_updates)
 
     logger.info(f"Bulk updated {len(updated_positions)} positions")
     return updated_positions
@@ -15,6 +15,7 @@ from .correlation_analysis import (
     CorrelationPair,
     PriceHistory,
 )
+from .correlation_engine import CorrelationEngine
 from .models import (
     CircuitBreakerState,
     CircuitBreakerStatus,
@@ -34,7 +35,7 @@ from .portfolio_risk import (
 )
 from .position_sizing import KellyPositionSizer, PositionSizingResult, TradeResult
 from .risk_manager import RiskManager
-from .risk_metrics import RiskMetrics, RiskMetricsCalculator
+from .risk_metrics import BATCH_METRICS, RiskMetrics, RiskMetricsCalculator
 from .stop_loss_manager import StopLossManager
 
 __all__ = [
@@ -61,6 +62,8 @@ __all__ = [
     "CorrelationMatrix",
     "CorrelationPair",
     "PriceHistory",
+    "CorrelationEngine",
     "RiskMetricsCalculator",
     "RiskMetrics",
+    "BATCH_METRICS",
 ]
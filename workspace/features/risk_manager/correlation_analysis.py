@@ -7,11 +7,17 @@ Analyzes correlation between positions to assess portfolio diversification:
 - Calculates diversification score
 - Monitors concentration risk
 
+Price histories are fetched concurrently and the full matrix is computed
+in one vectorized call. With a CorrelationEngine attached, matrices and
+signal-time checks are served from its incrementally updated state
+without fetching history.
+
 Author: Trading System Implementation Team
 Date: 2025-10-29
 Sprint: 3, Stream B, Task 045
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime
@@ -20,6 +26,12 @@ from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
+from .correlation_engine import (
+    CorrelationEngine,
+    pairwise_correlation,
+    returns_from_prices,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,6 +81,8 @@ class CorrelationAnalyzer:
         market_data_service,
         max_correlation_threshold: float = 0.7,
         lookback_days: int = 30,
+        engine: Optional[CorrelationEngine] = None,
+        correlation_method: str = "rolling",
     ):
         """
         Initialize correlation analyzer.
@@ -77,10 +91,15 @@ class CorrelationAnalyzer:
             market_data_service: Service to fetch historical price data
             max_correlation_threshold: Correlation above this triggers alert
             lookback_days: Days of historical data to analyze
+            engine: Incremental CorrelationEngine serving matrices for the
+                symbols it tracks (default: None = fetch history each time)
+            correlation_method: Engine matrix, 'rolling' or 'ewma'
         """
         self.market_data_service = market_data_service
         self.max_correlation_threshold = max_correlation_threshold
         self.lookback_days = lookback_days
+        self.engine = engine
+        self.correlation_method = correlation_method
 
         logger.info(
             f"CorrelationAnalyzer initialized: "
@@ -110,41 +129,33 @@ class CorrelationAnalyzer:
         if days is None:
             days = self.lookback_days
 
-        price_histories = {}
-
-        for symbol in symbols:
-            try:
-                # Fetch OHLCV data
-                ohlcv = await self.market_data_service.get_ohlcv(
-                    symbol=symbol,
-                    timeframe="1d",  # Daily candles
-                    limit=days,
-                )
+        histories = await asyncio.gather(
+            *(self._fetch_symbol_history(symbol, days) for symbol in symbols)
+        )
+        return dict(zip(symbols, histories))
 
-                # Extract closing prices
-                prices = [Decimal(str(candle[4])) for candle in ohlcv]
-                timestamps = [
-                    datetime.fromtimestamp(candle[0] / 1000) for candle in ohlcv
-                ]
+    async def _fetch_symbol_history(self, symbol: str, days: int) -> PriceHistory:
+        """Fetch one symbol's daily closes (empty history on error)"""
+        try:
+            # Fetch OHLCV data
+            ohlcv = await self.market_data_service.get_ohlcv(
+                symbol=symbol,
+                timeframe="1d",  # Daily candles
+                limit=days,
+            )
 
-                price_histories[symbol] = PriceHistory(
-                    symbol=symbol,
-                    prices=prices,
-                    timestamps=timestamps,
-                )
+            # Extract closing prices
+            prices = [Decimal(str(candle[4])) for candle in ohlcv]
+            timestamps = [datetime.fromtimestamp(candle[0] / 1000) for candle in ohlcv]
 
-                logger.debug(f"Fetched {len(prices)} price points for {symbol}")
+            logger.debug(f"Fetched {len(prices)} price points for {symbol}")
 
-            except Exception as e:
-                logger.error(f"Failed to fetch price history for {symbol}: {e}")
-                # Return empty history on error
-                price_histories[symbol] = PriceHistory(
-                    symbol=symbol,
-                    prices=[],
-                    timestamps=[],
-                )
+            return PriceHistory(symbol=symbol, prices=prices, timestamps=timestamps)
 
-        return price_histories
+        except Exception as e:
+            logger.error(f"Failed to fetch price history for {symbol}: {e}")
+            # Return empty history on error
+            return PriceHistory(symbol=symbol, prices=[], timestamps=[])
 
     # ========================================================================
     # Returns Calculation
@@ -160,17 +171,7 @@ class CorrelationAnalyzer:
         Returns:
             List of returns (price[i] - price[i-1]) / price[i-1]
         """
-        if len(prices) < 2:
-            return []
-
-        returns = []
-        for i in range(1, len(prices)):
-            if prices[i - 1] == 0:
-                continue
-            ret = float((prices[i] - prices[i - 1]) / prices[i - 1])
-            returns.append(ret)
-
-        return returns
+        return [float(r) for r in returns_from_prices(prices)]
 
     # ========================================================================
     # Correlation Calculation
@@ -241,29 +242,16 @@ class CorrelationAnalyzer:
                 timestamp=datetime.utcnow(),
             )
 
-        # Fetch price histories
-        price_histories = await self.fetch_price_history(symbols, days)
-
-        # Calculate returns for each symbol
-        returns_map = {}
-        for symbol, history in price_histories.items():
-            returns = self.calculate_returns(history.prices)
-            returns_map[symbol] = returns
-            logger.debug(f"{symbol}: {len(returns)} return points")
+        engine = self._covering_engine(symbols)
+        if engine is not None:
+            values = engine.matrix(symbols, method=self.correlation_method)
+        else:
+            values = await self._fetch_correlation_values(symbols, days)
 
-        # Calculate correlation matrix
-        matrix: dict[str, dict[str, float]] = {}
-        for symbol1 in symbols:
-            matrix[symbol1] = {}
-            for symbol2 in symbols:
-                if symbol1 == symbol2:
-                    correlation = 1.0
-                else:
-                    correlation = self.calculate_correlation(
-                        returns_map.get(symbol1, []),
-                        returns_map.get(symbol2, []),
-                    )
-                matrix[symbol1][symbol2] = correlation
+        matrix: dict[str, dict[str, float]] = {
+            symbol1: dict(zip(symbols, row))
+            for symbol1, row in zip(symbols, values.tolist())
+        }
 
         # Identify highly correlated pairs
         highly_correlated = self.check_correlation_limits(matrix)
@@ -284,6 +272,70 @@ class CorrelationAnalyzer:
             timestamp=datetime.utcnow(),
         )
 
+    async def _fetch_correlation_values(
+        self, symbols: List[str], days: Optional[int]
+    ) -> np.ndarray:
+        """Fetch histories and compute the full matrix in one call"""
+        price_histories = await self.fetch_price_history(symbols, days)
+        returns_map = {
+            symbol: returns_from_prices(price_histories[symbol].prices)
+            for symbol in symbols
+        }
+
+        # Align series on their most recent returns and correlate each pair
+        # over its overlap; symbols with too little history correlate 0.0
+        # with everything
+        return pairwise_correlation([returns_map[s] for s in symbols])
+
+    def _covering_engine(self, symbols: List[str]) -> Optional[CorrelationEngine]:
+        """The attached engine if it is warm and tracks every symbol"""
+        engine = self.engine
+        if (
+            engine is not None
+            and engine.ready
+            and all(symbol in engine for symbol in symbols)
+        ):
+            return engine
+        return None
+
+    def check_signal_correlation(
+        self,
+        symbol: str,
+        open_symbols: List[str],
+        max_correlation: Optional[float] = None,
+    ) -> List[CorrelationPair]:
+        """
+        Pairs a new position in `symbol` would form above the threshold.
+
+        Served from the attached engine in O(len(open_symbols)); returns an
+        empty list when no warm engine tracks the symbol.
+
+        Args:
+            symbol: Symbol of the signal being validated
+            open_symbols: Symbols with open positions
+            max_correlation: Threshold (uses self.max_correlation_threshold if None)
+
+        Returns:
+            List of highly correlated pairs
+        """
+        if max_correlation is None:
+            max_correlation = self.max_correlation_threshold
+        engine = self._covering_engine([symbol])
+        if engine is None:
+            return []
+
+        return [
+            CorrelationPair(
+                symbol1=symbol,
+                symbol2=other,
+                correlation=correlation,
+                strength=self.classify_correlation_strength(abs(correlation)),
+            )
+            for other, correlation in engine.correlated_with(
+                symbol, open_symbols, max_correlation, method=self.correlation_method
+            )
+        ]
+
     # ========================================================================
     # Correlation Analysis
     # ========================================================================
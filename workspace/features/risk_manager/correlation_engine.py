@@ -0,0 +1,480 @@
+"""
+Incremental Correlation Engine
+
+Keeps correlation matrices for a symbol universe up to date as daily bars
+close, so correlation limits can be enforced at signal-validation time
+without refetching history:
+
+- A ring buffer holds the last `window` cross-sectional return rows.
+  Rolling sums of x and of the outer products x·xᵀ are adjusted by the
+  entering and leaving rows, so each bar costs O(n²) instead of
+  recomputing O(window · n²); the sums are rebuilt exactly from the buffer
+  once per window to bound floating-point drift.
+- An EWMA covariance (RiskMetrics style, zero mean) is updated alongside.
+- Seeding from history and full-matrix reads are single vectorized calls.
+
+Author: Trading System Implementation Team
+Date: 2025-11-19
+"""
+
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ROLLING = "rolling"
+EWMA = "ewma"
+
+
+def returns_from_prices(prices: Sequence[Any]) -> np.ndarray:
+    """
+    Simple returns of a price series, skipping periods with a zero price
+
+    Args:
+        prices: Prices (Decimal, float or str)
+
+    Returns:
+        Array of (price[i] - price[i-1]) / price[i-1]
+    """
+    values = np.asarray([float(p) for p in prices], dtype=float)
+    if values.size < 2:
+        return np.empty(0)
+    previous = values[:-1]
+    valid = previous != 0
+    returns: np.ndarray = (values[1:][valid] - previous[valid]) / previous[valid]
+    return returns
+
+
+def correlation_from_covariance(covariance: np.ndarray) -> np.ndarray:
+    """
+    Normalize a covariance matrix to correlations
+
+    Series with zero variance correlate 0.0 with everything else; the
+    diagonal is always 1.0.
+    """
+    std = np.sqrt(np.clip(np.diag(covariance), 0.0, None))
+    scale = np.outer(std, std)
+    correlation = np.zeros_like(covariance)
+    np.divide(covariance, scale, out=correlation, where=scale > 0)
+    np.clip(correlation, -1.0, 1.0, out=correlation)
+    np.fill_diagonal(correlation, 1.0)
+    return correlation
+
+
+def correlation_from_returns(returns: np.ndarray) -> np.ndarray:
+    """
+    Full Pearson correlation matrix in one vectorized call
+
+    Args:
+        returns: (n_periods, n_symbols) return matrix
+
+    Returns:
+        (n_symbols, n_symbols) correlation matrix
+    """
+    returns = np.asarray(returns, dtype=float)
+    n_symbols = returns.shape[1]
+    if returns.shape[0] < 2:
+        return np.eye(n_symbols)
+    return correlation_from_covariance(np.cov(returns, rowvar=False, ddof=1))
+
+
+def pairwise_correlation(series: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Pearson correlation matrix over each pair's overlapping periods
+
+    Series are aligned on their most recent value. Each pair is correlated
+    over the periods both series cover, so a short series does not shorten
+    the window of every other pair.
+
+    Args:
+        series: Return series (most recent last), possibly of unequal length
+
+    Returns:
+        (n_series, n_series) correlation matrix; pairs overlapping by fewer
+        than 2 periods correlate 0.0
+    """
+    lengths = [len(s) for s in series]
+    periods = max(lengths, default=0)
+    returns = np.zeros((periods, len(series)))
+    present = np.zeros((periods, len(series)))
+    for column, (values, length) in enumerate(zip(series, lengths)):
+        if length:
+            returns[periods - length :, column] = values
+            present[periods - length :, column] = 1.0
+
+    # Pair (i, j) sums over rows where both series are present
+    overlap = present.T @ present
+    sums = returns.T @ present
+    squares = (returns**2).T @ present
+    products = returns.T @ returns
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = products - sums * sums.T / overlap
+        variance = squares - sums**2 / overlap
+        scale = np.sqrt(np.clip(variance * variance.T, 0.0, None))
+        correlation = np.where((overlap >= 2) & (scale > 0), covariance / scale, 0.0)
+    np.clip(correlation, -1.0, 1.0, out=correlation)
+    np.fill_diagonal(correlation, 1.0)
+    return correlation
+
+
+class CorrelationEngine:
+    """
+    Rolling-window and EWMA correlation matrices for a symbol universe
+
+    Attributes:
+        window: Number of return periods in the rolling matrix
+        ewma_lambda: EWMA decay factor (0.94 is the RiskMetrics daily value)
+        symbols: Symbols in matrix order
+        count: Return rows currently in the rolling window
+
+    Example:
+        ```python
+        engine = CorrelationEngine(window=30)
+        engine.load_prices({"BTCUSDT": btc_closes, "ETHUSDT": eth_closes})
+
+        # On each daily close (or engine.attach(market_data_service))
+        engine.update_close("BTCUSDT", day_start, btc_close)
+
+        engine.correlation("BTCUSDT", "ETHUSDT")
+        engine.correlated_with("SOLUSDT", open_symbols, threshold=0.7)
+        ```
+    """
+
+    def __init__(self, window: int = 30, ewma_lambda: float = 0.94):
+        """
+        Initialize an empty engine
+
+        Args:
+            window: Rolling window in return periods (at least 2)
+            ewma_lambda: EWMA decay factor in (0, 1)
+        """
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        if not 0.0 < ewma_lambda < 1.0:
+            raise ValueError("ewma_lambda must be between 0 and 1")
+
+        self.window = window
+        self.ewma_lambda = ewma_lambda
+        self._service = None
+        self._timeframe: Optional[str] = None
+        self._reset([])
+
+    def _reset(self, symbols: Sequence[str]):
+        n = len(symbols)
+        self.symbols: List[str] = list(symbols)
+        self._index: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        self._buffer = np.zeros((self.window, n))
+        self._position = 0
+        self.count = 0
+        self._sum = np.zeros(n)
+        self._sum_products = np.zeros((n, n))
+        self._ewma = np.zeros((n, n))
+        self._ewma_rows = 0
+        self._last_closes = np.full(n, np.nan)
+        # Closes of the bar being collected: (bar timestamp, {index: close})
+        self._pending: Optional[Tuple[Any, Dict[int, float]]] = None
+
+    # ========================================================================
+    # Loading
+    # ========================================================================
+
+    def load_prices(self, prices: Mapping[str, Sequence[Any]]):
+        """
+        Reset the universe and seed it from close histories
+
+        Args:
+            prices: Symbol -> closes, oldest first
+        """
+        returns = {symbol: returns_from_prices(p) for symbol, p in prices.items()}
+        last_closes = {
+            symbol: float(p[-1]) for symbol, p in prices.items() if len(p) > 0
+        }
+        self.load_returns(returns, last_closes)
+
+    def load_returns(
+        self,
+        returns: Mapping[str, Union[Sequence[float], np.ndarray]],
+        last_closes: Optional[Mapping[str, float]] = None,
+    ):
+        """
+        Reset the universe and seed it from return histories
+
+        Series are aligned on their most recent values; the common length
+        (capped at window) is used.
+
+        Args:
+            returns: Symbol -> returns, oldest first
+            last_closes: Latest close per symbol, needed before
+                update_close() can compute the next return
+        """
+        symbols = list(returns)
+        self._reset(symbols)
+        if not symbols:
+            return
+
+        length = min(self.window, min(len(r) for r in returns.values()))
+        if length:
+            matrix = np.column_stack(
+                [np.asarray(returns[s], dtype=float)[-length:] for s in symbols]
+            )
+            self._buffer[:length] = matrix
+            self._position = length % self.window
+            self.count = length
+            self._rebuild_sums()
+
+            # EWMA over the seeded rows: sum of lambda^age * (1 - lambda) * r rᵀ
+            ages = np.arange(length - 1, -1, -1)
+            weights = (1.0 - self.ewma_lambda) * self.ewma_lambda**ages
+            self._ewma = (matrix * weights[:, None]).T @ matrix
+            self._ewma_rows = length
+
+        for symbol, close in (last_closes or {}).items():
+            if symbol in self._index:
+                self._last_closes[self._index[symbol]] = float(close)
+
+        logger.info(
+            f"CorrelationEngine loaded {len(symbols)} symbols "
+            f"with {self.count} return periods"
+        )
+
+    # ========================================================================
+    # Incremental Updates
+    # ========================================================================
+
+    def add_returns(self, returns: Mapping[str, float]):
+        """
+        Append one cross-sectional return row
+
+        Symbols missing from the row get a 0.0 return; symbols outside the
+        universe are ignored (call load_prices() to change the universe).
+
+        Args:
+            returns: Symbol -> return for the period
+        """
+        row = np.zeros(len(self.symbols))
+        for symbol, value in returns.items():
+            index = self._index.get(symbol)
+            if index is not None:
+                row[index] = value
+        self._push(row)
+
+    def update_close(self, symbol: str, timestamp: Any, close: Any):
+        """
+        Record a closed bar for one symbol
+
+        Closes are collected per bar timestamp; the return row is added once
+        every symbol has reported, or when a bar with a later timestamp
+        arrives (symbols that did not report keep their previous close).
+
+        Args:
+            symbol: Trading symbol
+            timestamp: Bar open time (any comparable value)
+            close: Closing price
+        """
+        index = self._index.get(symbol)
+        if index is None:
+            return
+
+        if self._pending is not None and timestamp != self._pending[0]:
+            if timestamp < self._pending[0]:
+                return  # Late bar for an already committed period
+            self._commit_pending()
+        if self._pending is None:
+            self._pending = (timestamp, {})
+
+        self._pending[1][index] = float(close)
+        if len(self._pending[1]) == len(self.symbols):
+            self._commit_pending()
+
+    def _commit_pending(self):
+        _, closes = self._pending
+        self._pending = None
+
+        row = np.zeros(len(self.symbols))
+        for index, close in closes.items():
+            previous = self._last_closes[index]
+            if previous > 0:
+                row[index] = (close - previous) / previous
+            self._last_closes[index] = close
+        self._push(row)
+
+    def _push(self, row: np.ndarray):
+        if self.count == self.window:
+            leaving = self._buffer[self._position]
+            self._sum -= leaving
+            self._sum_products -= np.outer(leaving, leaving)
+        else:
+            self.count += 1
+
+        self._buffer[self._position] = row
+        self._sum += row
+        self._sum_products += np.outer(row, row)
+        self._position = (self._position + 1) % self.window
+
+        self._ewma *= self.ewma_lambda
+        self._ewma += (1.0 - self.ewma_lambda) * np.outer(row, row)
+        self._ewma_rows += 1
+
+        if self._position == 0:
+            self._rebuild_sums()
+
+    def _rebuild_sums(self):
+        """Recompute the rolling sums exactly from the buffer"""
+        rows = self._buffer[: self.count]
+        self._sum = rows.sum(axis=0)
+        self._sum_products = rows.T @ rows
+
+    # ========================================================================
+    # Market Data Wiring
+    # ========================================================================
+
+    def attach(self, service, timeframe: str = "1d"):
+        """
+        Update on closed bars from a MarketDataService
+
+        Args:
+            service: MarketDataService with multi-timeframe aggregation
+            timeframe: Bar timeframe feeding the engine (default: 1d)
+        """
+        if self._service is not None:
+            self.detach()
+        self._timeframe = timeframe
+        service.add_bar_listener(self.on_bar)
+        self._service = service
+
+    def detach(self):
+        """Stop receiving bars"""
+        if self._service is not None:
+            self._service.remove_bar_listener(self.on_bar)
+            self._service = None
+
+    def on_bar(self, bar):
+        """Bar listener: feed closed bars of the attached timeframe"""
+        if bar.closed and bar.timeframe == self._timeframe:
+            candle = bar.candle
+            symbol = candle.symbol
+            if symbol not in self._index:
+                symbol = symbol.split(":")[0].replace("/", "")
+            self.update_close(symbol, candle.timestamp, candle.close)
+
+    # ========================================================================
+    # Reads
+    # ========================================================================
+
+    @property
+    def ready(self) -> bool:
+        """Whether at least two return periods are available"""
+        return self.count >= 2
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def covariance(self, method: str = ROLLING) -> np.ndarray:
+        """
+        Covariance matrix of the whole universe
+
+        Args:
+            method: 'rolling' (sample covariance over the window) or 'ewma'
+        """
+        n = len(self.symbols)
+        if method == EWMA:
+            if not self._ewma_rows:
+                return np.zeros((n, n))
+            return self._ewma.copy()
+        if method != ROLLING:
+            raise ValueError(f"Unknown correlation method: {method}")
+
+        if self.count < 2:
+            return np.zeros((n, n))
+        centered = self._sum_products - np.outer(self._sum, self._sum) / self.count
+        return centered / (self.count - 1)
+
+    def matrix(
+        self, symbols: Optional[Sequence[str]] = None, method: str = ROLLING
+    ) -> np.ndarray:
+        """
+        Correlation matrix
+
+        Args:
+            symbols: Subset and order of symbols (default: whole universe)
+            method: 'rolling' or 'ewma'
+
+        Returns:
+            (n, n) correlation matrix
+        """
+        correlation = correlation_from_covariance(self.covariance(method))
+        if symbols is None:
+            return correlation
+        indexes = [self._index[s] for s in symbols]
+        return correlation[np.ix_(indexes, indexes)]
+
+    def correlation(self, symbol1: str, symbol2: str, method: str = ROLLING) -> float:
+        """Correlation of one pair, O(1)"""
+        if symbol1 == symbol2:
+            return 1.0
+        i, j = self._index[symbol1], self._index[symbol2]
+        covariance = self._pair_covariance(i, j, method)
+        scale = np.sqrt(
+            max(self._pair_covariance(i, i, method), 0.0)
+            * max(self._pair_covariance(j, j, method), 0.0)
+        )
+        if scale == 0:
+            return 0.0
+        return float(np.clip(covariance / scale, -1.0, 1.0))
+
+    def correlated_with(
+        self,
+        symbol: str,
+        others: Sequence[str],
+        threshold: float,
+        method: str = ROLLING,
+    ) -> List[Tuple[str, float]]:
+        """
+        Symbols whose absolute correlation with `symbol` exceeds threshold
+
+        Costs O(len(others)), for signal-time checks against open positions.
+
+        Args:
+            symbol: Candidate symbol
+            others: Symbols to compare against (unknown ones are skipped)
+            threshold: Absolute correlation limit
+            method: 'rolling' or 'ewma'
+
+        Returns:
+            List of (other symbol, correlation)
+        """
+        if symbol not in self._index:
+            return []
+        result = []
+        for other in others:
+            if other == symbol or other not in self._index:
+                continue
+            correlation = self.correlation(symbol, other, method)
+            if abs(correlation) > threshold:
+                result.append((other, correlation))
+        return result
+
+    def _pair_covariance(self, i: int, j: int, method: str) -> float:
+        if method == EWMA:
+            return float(self._ewma[i, j])
+        if method != ROLLING:
+            raise ValueError(f"Unknown correlation method: {method}")
+        if self.count < 2:
+            return 0.0
+        centered = self._sum_products[i, j] - self._sum[i] * self._sum[j] / self.count
+        return float(centered / (self.count - 1))
+
+
+# Export
+__all__ = [
+    "CorrelationEngine",
+    "correlation_from_returns",
+    "correlation_from_covariance",
+    "pairwise_correlation",
+    "returns_from_prices",
+    "ROLLING",
+    "EWMA",
+]
@@ -10,7 +10,7 @@ Date: 2025-10-28
 
 import logging
 from decimal import Decimal
-from typing import Any, List, Optional
+from typing import TYPE_CHECKING, Any, List, Optional
 
 from .circuit_breaker import CircuitBreaker
 from .models import (
@@ -22,6 +22,9 @@ from .models import (
 )
 from .stop_loss_manager import StopLossManager
 
+if TYPE_CHECKING:
+    from workspace.features.position_manager import PositionBook
+
 logger = logging.getLogger(__name__)
 
 
@@ -82,6 +85,8 @@ class RiskManager:
         exchange=None,
         trade_executor=None,
         position_tracker=None,
+        trigger_engine=None,
+        position_book: Optional["PositionBook"] = None,
     ):
         """
         Initialize Risk Manager
@@ -92,12 +97,17 @@ class RiskManager:
             exchange: Exchange API client
             trade_executor: Trade executor instance
             position_tracker: Position tracking system
+            trigger_engine: PriceTriggerEngine for event-driven stop-loss
+                monitoring (default: None = polling)
+            position_book: Loaded PositionBook; open positions and exposure
+                are read from it instead of the position tracker
         """
         self.starting_balance_chf = starting_balance_chf
         self.current_balance_chf = starting_balance_chf
         self.exchange = exchange
         self.trade_executor = trade_executor
         self.position_tracker = position_tracker
+        self.position_book = position_book
 
         # Initialize sub-managers
         self.circuit_breaker = CircuitBreaker(
@@ -109,6 +119,7 @@ class RiskManager:
         self.stop_loss_manager = StopLossManager(
             exchange=exchange,
             trade_executor=trade_executor,
+            trigger_engine=trigger_engine,
         )
 
         logger.info(
@@ -435,6 +446,8 @@ class RiskManager:
 
     async def _get_open_positions(self) -> List[Any]:
         """Get list of currently open positions"""
+        if self.position_book is not None and self.position_book.loaded:
+            return self.position_book.positions()
         if self.position_tracker:
             positions = await self.position_tracker.get_open_positions()
             return list(positions) if positions else []
@@ -442,6 +455,12 @@ class RiskManager:
 
     async def _calculate_total_exposure(self) -> Decimal:
         """Calculate total exposure across all positions"""
+        if self.position_book is not None and self.position_book.loaded:
+            # Capital committed to open positions as a fraction of balance
+            if self.current_balance_chf <= 0:
+                return Decimal("0")
+            return self.position_book.total_margin_chf / self.current_balance_chf
+
         positions = await self._get_open_positions()
 
         if not positions:
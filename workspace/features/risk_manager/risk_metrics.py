@@ -10,21 +10,77 @@ Calculates comprehensive risk and performance metrics:
 - Calmar Ratio: Return / Max Drawdown
 - Win Rate, Profit Factor, and other performance metrics
 
+calculate_batch_metrics() computes every metric at once over NumPy arrays:
+a single return/equity series, a 2-D array of many strategies or symbols
+(one series per row), or rolling windows via calculate_rolling_metrics().
+
 Author: Trading System Implementation Team
 Date: 2025-10-29
 Sprint: 3, Stream B, Task 045
 """
 
 import logging
+import math
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Union
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 logger = logging.getLogger(__name__)
 
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+# Cap for ratios whose denominator is zero (no losses / no drawdown)
+RATIO_CAP = 10.0
+
+# Names returned by calculate_batch_metrics()
+BATCH_METRICS = (
+    "total_return_pct",
+    "annualized_return",
+    "sharpe_ratio",
+    "sortino_ratio",
+    "max_drawdown",
+    "max_drawdown_pct",
+    "calmar_ratio",
+    "value_at_risk_95",
+    "value_at_risk_99",
+    "conditional_var_95",
+    "conditional_var_99",
+    "parametric_var_95",
+    "parametric_var_99",
+    "parametric_cvar_95",
+    "parametric_cvar_99",
+    "volatility",
+    "downside_deviation",
+    "win_rate",
+    "profit_factor",
+    "win_loss_ratio",
+    "winning_trades",
+    "losing_trades",
+    "total_wins",
+    "total_losses",
+    "largest_win",
+    "largest_loss",
+    "average_win",
+    "average_loss",
+)
+
+
+def _divide(
+    numerator: np.ndarray, denominator: np.ndarray, fill: float = 0.0
+) -> np.ndarray:
+    """Element-wise division with `fill` where the denominator is zero"""
+    numerator, denominator = np.broadcast_arrays(
+        np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float)
+    )
+    out = np.full(numerator.shape, fill, dtype=float)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
 
 @dataclass
 class RiskMetrics:
@@ -133,14 +189,13 @@ class RiskMetricsCalculator:
         # Convert annual risk-free rate to period rate
         period_rf_rate = risk_free_rate / self.trading_days_per_year
 
-        # Calculate excess returns
-        excess_returns = [r - period_rf_rate for r in returns]
+        values = np.asarray(returns, dtype=float)
 
         # Mean excess return
-        mean_excess = np.mean(excess_returns)
+        mean_excess = values.mean() - period_rf_rate
 
         # Standard deviation of returns
-        std_dev = np.std(returns, ddof=1)
+        std_dev = values.std(ddof=1)
 
         if std_dev == 0:
             return 0.0
@@ -178,15 +233,17 @@ class RiskMetricsCalculator:
 
         period_rf_rate = risk_free_rate / self.trading_days_per_year
 
+        values = np.asarray(returns, dtype=float)
+
         # Mean return
-        mean_return = np.mean(returns)
+        mean_return = values.mean()
 
         # Downside deviation (only negative returns)
-        downside_returns = [r for r in returns if r < 0]
+        downside_returns = values[values < 0]
 
-        if not downside_returns:
+        if not downside_returns.size:
             # No losses: infinite Sortino (cap at 10.0)
-            return 10.0
+            return RATIO_CAP
 
         downside_dev = np.std(downside_returns, ddof=1)
 
@@ -332,12 +389,13 @@ class RiskMetricsCalculator:
         var = self.calculate_var(returns, confidence)
 
         # Calculate expected value of returns below VaR
-        tail_returns = [r for r in returns if r <= var]
+        values = np.asarray(returns, dtype=float)
+        tail_returns = values[values <= var]
 
-        if not tail_returns:
+        if not tail_returns.size:
             return var
 
-        cvar = float(np.mean(tail_returns))
+        cvar = float(tail_returns.mean())
 
         return cvar
 
@@ -456,9 +514,10 @@ class RiskMetricsCalculator:
             return 0.0
 
         # Extract negative returns
-        downside_returns = [r for r in returns if r < 0]
+        values = np.asarray(returns, dtype=float)
+        downside_returns = values[values < 0]
 
-        if not downside_returns:
+        if not downside_returns.size:
             return 0.0
 
         # Calculate standard deviation of downside
@@ -469,6 +528,217 @@ class RiskMetricsCalculator:
 
         return float(annualized_downside)
 
+    # ========================================================================
+    # Vectorized Metrics
+    # ========================================================================
+
+    def calculate_batch_metrics(
+        self,
+        returns: Optional[ArrayLike] = None,
+        equity: Optional[ArrayLike] = None,
+        risk_free_rate: Optional[float] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate all return-based metrics over NumPy arrays.
+
+        Series run along the last axis, so a 1-D array is one series and
+        an (n_series, n_periods) array scores many strategies or symbols
+        at once. Definitions match the per-metric methods above, plus
+        parametric (normal) VaR/CVaR.
+
+        Args:
+            returns: Period returns; derived from equity if None
+            equity: Portfolio values; compounded from returns (starting
+                at 1.0) if None
+            risk_free_rate: Risk-free rate (uses self.risk_free_rate if None)
+
+        Returns:
+            Dict mapping each name in BATCH_METRICS to an array of shape
+            returns.shape[:-1] (0-d for a single series)
+
+        Raises:
+            ValueError: If neither returns nor equity is given
+        """
+        if returns is None and equity is None:
+            raise ValueError("returns or equity is required")
+
+        curve = None if equity is None else np.asarray(equity, dtype=float)
+        if curve is not None and returns is None:
+            period_returns = _divide(curve[..., 1:], curve[..., :-1], 1.0) - 1.0
+        else:
+            period_returns = np.asarray(returns, dtype=float)
+
+        shape = period_returns.shape[:-1]
+        n = period_returns.shape[-1]
+        if n < 2:
+            return {name: np.zeros(shape) for name in BATCH_METRICS}
+
+        if curve is None:
+            growth = np.cumprod(1.0 + period_returns, axis=-1)
+            curve = np.concatenate([np.ones(shape + (1,)), growth], axis=-1)
+
+        if risk_free_rate is None:
+            risk_free_rate = self.risk_free_rate
+        period_rf_rate = risk_free_rate / self.trading_days_per_year
+        annualize = math.sqrt(self.trading_days_per_year)
+
+        # Moments
+        mean = period_returns.mean(axis=-1)
+        std = period_returns.std(axis=-1, ddof=1)
+
+        # Win/loss split
+        wins = period_returns > 0
+        losses = period_returns < 0
+        winning = wins.sum(axis=-1)
+        losing = losses.sum(axis=-1)
+        gains = np.where(wins, period_returns, 0.0)
+        drops = np.where(losses, period_returns, 0.0)
+        total_wins = gains.sum(axis=-1)
+        total_losses = -drops.sum(axis=-1)
+        average_win = _divide(total_wins, winning)
+        average_loss = _divide(total_losses, losing)
+
+        # Downside deviation over negative returns only (ddof=1)
+        downside_mean = -average_loss
+        downside_sq = (
+            np.where(losses, period_returns - downside_mean[..., None], 0.0) ** 2
+        )
+        downside_std = np.sqrt(_divide(downside_sq.sum(axis=-1), losing - 1))
+        downside_std = np.where(losing > 1, downside_std, 0.0)
+
+        sharpe = _divide(mean - period_rf_rate, std) * annualize
+        sortino = np.where(
+            losing == 0,
+            RATIO_CAP,
+            _divide(mean - period_rf_rate, downside_std) * annualize,
+        )
+
+        # Historical VaR/CVaR
+        var_95, var_99 = np.percentile(period_returns, [5, 1], axis=-1)
+        tail_95 = period_returns <= var_95[..., None]
+        tail_99 = period_returns <= var_99[..., None]
+        cvar_95 = np.where(
+            tail_95.any(axis=-1),
+            _divide(
+                np.where(tail_95, period_returns, 0.0).sum(axis=-1), tail_95.sum(-1)
+            ),
+            var_95,
+        )
+        cvar_99 = np.where(
+            tail_99.any(axis=-1),
+            _divide(
+                np.where(tail_99, period_returns, 0.0).sum(axis=-1), tail_99.sum(-1)
+            ),
+            var_99,
+        )
+
+        # Parametric (normal) VaR/CVaR
+        normal = NormalDist()
+        parametric = {}
+        for confidence in (0.95, 0.99):
+            tail = 1 - confidence
+            z = normal.inv_cdf(tail)
+            suffix = int(round(confidence * 100))
+            parametric[f"parametric_var_{suffix}"] = mean + z * std
+            parametric[f"parametric_cvar_{suffix}"] = mean - std * (
+                normal.pdf(z) / tail
+            )
+
+        # Drawdown from the running peak
+        peak = np.maximum.accumulate(curve, axis=-1)
+        drawdown = peak - curve
+        worst = drawdown.argmax(axis=-1)[..., None]
+        max_drawdown = np.take_along_axis(drawdown, worst, axis=-1)[..., 0]
+        peak_at_worst = np.take_along_axis(peak, worst, axis=-1)[..., 0]
+        max_drawdown_pct = np.where(
+            peak_at_worst > 0, _divide(max_drawdown, peak_at_worst), 0.0
+        )
+
+        # Returns
+        total_return_pct = _divide(curve[..., -1], curve[..., 0], 1.0) - 1.0
+        growth = 1.0 + total_return_pct
+        annualized_return = np.where(
+            growth > 0,
+            np.power(np.maximum(growth, 0.0), self.trading_days_per_year / n) - 1.0,
+            -1.0,
+        )
+        calmar = np.where(
+            max_drawdown_pct == 0,
+            np.where(annualized_return > 0, RATIO_CAP, 0.0),
+            _divide(annualized_return, max_drawdown_pct),
+        )
+
+        return {
+            "total_return_pct": total_return_pct,
+            "annualized_return": annualized_return,
+            "sharpe_ratio": sharpe,
+            "sortino_ratio": sortino,
+            "max_drawdown": max_drawdown,
+            "max_drawdown_pct": max_drawdown_pct,
+            "calmar_ratio": calmar,
+            "value_at_risk_95": var_95,
+            "value_at_risk_99": var_99,
+            "conditional_var_95": cvar_95,
+            "conditional_var_99": cvar_99,
+            **parametric,
+            "volatility": std * annualize,
+            "downside_deviation": downside_std * annualize,
+            "win_rate": _divide(winning, winning + losing),
+            "profit_factor": np.where(
+                total_losses == 0,
+                np.where(total_wins > 0, RATIO_CAP, 0.0),
+                _divide(total_wins, total_losses),
+            ),
+            "win_loss_ratio": np.where(
+                average_loss == 0,
+                np.where(average_win > 0, RATIO_CAP, 0.0),
+                _divide(average_win, average_loss),
+            ),
+            "winning_trades": winning,
+            "losing_trades": losing,
+            "total_wins": total_wins,
+            "total_losses": total_losses,
+            "largest_win": gains.max(axis=-1),
+            "largest_loss": drops.min(axis=-1),
+            "average_win": average_win,
+            "average_loss": average_loss,
+        }
+
+    def calculate_rolling_metrics(
+        self,
+        returns: ArrayLike,
+        window: int,
+        risk_free_rate: Optional[float] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate all metrics over a rolling window.
+
+        Each window is scored as its own series (drawdown and total return
+        are compounded from the window's first period).
+
+        Args:
+            returns: Period returns, 1-D or (n_series, n_periods)
+            window: Window length in periods (at least 2)
+            risk_free_rate: Risk-free rate (uses self.risk_free_rate if None)
+
+        Returns:
+            Dict of arrays with shape returns.shape[:-1] + (n_windows,),
+            where window i covers periods i .. i + window - 1
+
+        Raises:
+            ValueError: If window is shorter than 2 or longer than the series
+        """
+        returns = np.asarray(returns, dtype=float)
+        if window < 2 or window > returns.shape[-1]:
+            raise ValueError(
+                f"window must be between 2 and {returns.shape[-1]}, got {window}"
+            )
+
+        windows = sliding_window_view(returns, window, axis=-1)
+        return self.calculate_batch_metrics(
+            returns=windows, risk_free_rate=risk_free_rate
+        )
+
     # ========================================================================
     # All Metrics Calculation
     # ========================================================================
@@ -502,19 +772,29 @@ class RiskMetricsCalculator:
         Returns:
             Complete RiskMetrics object
         """
+        # All return-based statistics in one vectorized pass
+        returns_array = np.asarray(returns, dtype=float)
+        if returns_array.size:
+            batch = self.calculate_batch_metrics(returns=returns_array)
+            wins = returns_array[returns_array > 0]
+            losses = returns_array[returns_array < 0]
+        else:
+            batch = None
+            wins = losses = returns_array
+
         # Calculate from returns if trade stats not provided
         if winning_trades is None:
-            winning_trades = sum(1 for r in returns if r > 0)
+            winning_trades = int(wins.size)
         if losing_trades is None:
-            losing_trades = sum(1 for r in returns if r < 0)
+            losing_trades = int(losses.size)
 
         total_trades = winning_trades + losing_trades
 
         # Calculate totals if not provided
         if total_wins is None:
-            total_wins = Decimal(str(sum(r for r in returns if r > 0)))
+            total_wins = Decimal(str(float(wins.sum())))
         if total_losses is None:
-            total_losses = Decimal(str(abs(sum(r for r in returns if r < 0))))
+            total_losses = Decimal(str(abs(float(losses.sum()))))
 
         # Calculate averages
         avg_win = total_wins / winning_trades if winning_trades > 0 else Decimal("0")
@@ -522,16 +802,10 @@ class RiskMetricsCalculator:
 
         # Find largest win/loss if not provided
         if largest_win is None:
-            largest_win = (
-                Decimal(str(max(r for r in returns if r > 0)))
-                if winning_trades > 0
-                else Decimal("0")
-            )
+            largest_win = Decimal(str(float(wins.max()))) if wins.size else Decimal("0")
         if largest_loss is None:
             largest_loss = (
-                Decimal(str(min(r for r in returns if r < 0)))
-                if losing_trades > 0
-                else Decimal("0")
+                Decimal(str(float(losses.min()))) if losses.size else Decimal("0")
             )
 
         # Calculate return metrics
@@ -548,17 +822,20 @@ class RiskMetricsCalculator:
         ) - 1
 
         # Calculate risk metrics
-        sharpe = self.calculate_sharpe_ratio(returns)
-        sortino = self.calculate_sortino_ratio(returns)
+        def metric(name: str) -> float:
+            return float(batch[name]) if batch is not None else 0.0
+
+        sharpe = metric("sharpe_ratio")
+        sortino = metric("sortino_ratio")
         max_dd, max_dd_pct = self.calculate_max_drawdown(equity_curve)
-        var_95 = self.calculate_var(returns, 0.95)
-        var_99 = self.calculate_var(returns, 0.99)
-        cvar_95 = self.calculate_cvar(returns, 0.95)
+        var_95 = metric("value_at_risk_95")
+        var_99 = metric("value_at_risk_99")
+        cvar_95 = metric("conditional_var_95")
         calmar = self.calculate_calmar_ratio(annualized_return, max_dd_pct)
 
         # Calculate volatility metrics
-        volatility = self.calculate_volatility(returns)
-        downside_dev = self.calculate_downside_deviation(returns)
+        volatility = metric("volatility")
+        downside_dev = metric("downside_deviation")
 
         # Calculate performance metrics
         win_rate = self.calculate_win_rate(winning_trades, total_trades)
@@ -3,6 +3,10 @@ Stop-Loss Manager
 
 Multi-layered stop-loss protection system with 3 independent layers.
 
+Layers 2 and 3 either poll the exchange ticker per position or, with a
+PriceTriggerEngine, arm price triggers on the shared WebSocket ticker
+stream.
+
 Author: Risk Management Team
 Date: 2025-10-28
 """
@@ -52,6 +56,7 @@ class StopLossManager:
         trade_executor=None,  # Trade executor instance
         check_interval_seconds: int = 2,  # Layer 2 check interval
         emergency_check_interval_seconds: int = 1,  # Layer 3 check interval
+        trigger_engine=None,  # PriceTriggerEngine (None = polling loops)
     ):
         """
         Initialize Stop-Loss Manager
@@ -61,11 +66,15 @@ class StopLossManager:
             trade_executor: Trade executor for emergency closes
             check_interval_seconds: Interval for layer 2 monitoring
             emergency_check_interval_seconds: Interval for layer 3 monitoring
+            trigger_engine: PriceTriggerEngine fed by the market data ticker
+                stream; layers 2 and 3 arm price triggers instead of polling
+                (intervals are then only used as retry delays)
         """
         self.exchange = exchange
         self.trade_executor = trade_executor
         self.check_interval = check_interval_seconds
         self.emergency_check_interval = emergency_check_interval_seconds
+        self.trigger_engine = trigger_engine
 
         # Active protections
         self.protections: Dict[str, Protection] = {}
@@ -189,8 +198,15 @@ class StopLossManager:
         """
         Layer 2: Start application-level monitoring
 
-        Monitors price every 2 seconds and triggers if exchange stop fails.
+        Monitors price every 2 seconds (or on every tick with a trigger
+        engine) and triggers if exchange stop fails.
         """
+        if self.trigger_engine is not None:
+            protection.app_monitor_active = True
+            self._arm_app_trigger(protection, side)
+            logger.info(f"Layer 2 (App Trigger) armed for {protection.symbol}")
+            return
+
         task = asyncio.create_task(self._app_monitor_loop(protection, side))
 
         protection.app_monitor_active = True
@@ -210,19 +226,7 @@ class StopLossManager:
                 if self._should_trigger_stop(
                     current_price, protection.stop_loss_price, side
                 ):
-                    logger.warning(
-                        f"⚠️ Layer 2 (App Monitor) triggered for {protection.symbol}: "
-                        f"Price ${current_price} hit stop ${protection.stop_loss_price}"
-                    )
-
-                    # Close position at market
-                    await self._close_position_market(protection)
-
-                    # Deactivate monitoring
-                    protection.app_monitor_active = False
-                    protection.triggered_layer = ProtectionLayer.APP_MONITOR
-                    protection.triggered_at = datetime.now(timezone.utc)
-
+                    await self._trigger_app_stop(protection, current_price)
                     break
 
                 # Update last check time
@@ -238,12 +242,59 @@ class StopLossManager:
                 logger.error(f"Error in app monitor: {e}")
                 await asyncio.sleep(self.check_interval)
 
+    async def _trigger_app_stop(self, protection: Protection, current_price: Decimal):
+        """Close the position after the layer 2 stop was hit"""
+        logger.warning(
+            f"⚠️ Layer 2 (App Monitor) triggered for {protection.symbol}: "
+            f"Price ${current_price} hit stop ${protection.stop_loss_price}"
+        )
+
+        # Close position at market
+        await self._close_position_market(protection)
+
+        # Deactivate monitoring
+        protection.app_monitor_active = False
+        protection.triggered_layer = ProtectionLayer.APP_MONITOR
+        protection.triggered_at = datetime.now(timezone.utc)
+
+    def _arm_app_trigger(self, protection: Protection, side: str):
+        """Arm the layer 2 stop price on the trigger engine"""
+
+        async def on_trigger(trigger, price: float):
+            if not protection.app_monitor_active:
+                return
+            protection.last_check_at = datetime.now(timezone.utc)
+            try:
+                await self._trigger_app_stop(protection, Decimal(str(price)))
+            except Exception as e:
+                logger.error(f"Error in app trigger: {e}")
+                await asyncio.sleep(self.check_interval)
+                if protection.app_monitor_active:
+                    self._arm_app_trigger(protection, side)
+
+        self.trigger_engine.add_trigger(
+            protection.symbol,
+            protection.stop_loss_price,
+            "below" if side == "long" else "above",
+            on_trigger,
+            key=protection.position_id,
+        )
+
     async def _start_emergency_monitor(self, protection: Protection, side: str):
         """
         Layer 3: Start emergency liquidation monitoring
 
         Monitors for >15% loss and triggers emergency close.
         """
+        if self.trigger_engine is not None:
+            protection.emergency_monitor_active = True
+            self._arm_emergency_trigger(protection, side)
+            logger.info(
+                f"Layer 3 (Emergency Trigger) armed for {protection.symbol} "
+                f"(threshold: {protection.emergency_threshold_pct:.1%})"
+            )
+            return
+
         task = asyncio.create_task(self._emergency_monitor_loop(protection, side))
 
         protection.emergency_monitor_active = True
@@ -268,22 +319,7 @@ class StopLossManager:
 
                 # Check if emergency threshold exceeded
                 if loss_pct > protection.emergency_threshold_pct:
-                    logger.critical(
-                        f"🚨 Layer 3 (EMERGENCY) triggered for {protection.symbol}: "
-                        f"Loss {loss_pct:.1%} exceeds threshold {protection.emergency_threshold_pct:.1%}"
-                    )
-
-                    # Emergency close
-                    await self._emergency_close(protection)
-
-                    # Deactivate monitoring
-                    protection.emergency_monitor_active = False
-                    protection.triggered_layer = ProtectionLayer.EMERGENCY
-                    protection.triggered_at = datetime.now(timezone.utc)
-
-                    # Send alert
-                    await self._send_emergency_alert(protection, loss_pct)
-
+                    await self._trigger_emergency(protection, loss_pct)
                     break
 
                 # Update last check time
@@ -299,6 +335,55 @@ class StopLossManager:
                 logger.error(f"Error in emergency monitor: {e}")
                 await asyncio.sleep(self.emergency_check_interval)
 
+    async def _trigger_emergency(self, protection: Protection, loss_pct: Decimal):
+        """Emergency-close the position after the layer 3 threshold was hit"""
+        logger.critical(
+            f"🚨 Layer 3 (EMERGENCY) triggered for {protection.symbol}: "
+            f"Loss {loss_pct:.1%} exceeds threshold {protection.emergency_threshold_pct:.1%}"
+        )
+
+        # Emergency close
+        await self._emergency_close(protection)
+
+        # Deactivate monitoring
+        protection.emergency_monitor_active = False
+        protection.triggered_layer = ProtectionLayer.EMERGENCY
+        protection.triggered_at = datetime.now(timezone.utc)
+
+        # Send alert
+        await self._send_emergency_alert(protection, loss_pct)
+
+    def _arm_emergency_trigger(self, protection: Protection, side: str):
+        """Arm the layer 3 emergency loss price on the trigger engine"""
+        threshold = protection.emergency_threshold_pct
+        if side == "long":
+            emergency_price = protection.entry_price * (Decimal("1") - threshold)
+        else:
+            emergency_price = protection.entry_price * (Decimal("1") + threshold)
+
+        async def on_trigger(trigger, price: float):
+            if not protection.emergency_monitor_active:
+                return
+            protection.last_check_at = datetime.now(timezone.utc)
+            try:
+                loss_pct = await self._calculate_loss_pct(
+                    protection.entry_price, Decimal(str(price)), side
+                )
+                await self._trigger_emergency(protection, loss_pct)
+            except Exception as e:
+                logger.error(f"Error in emergency trigger: {e}")
+                await asyncio.sleep(self.emergency_check_interval)
+                if protection.emergency_monitor_active:
+                    self._arm_emergency_trigger(protection, side)
+
+        self.trigger_engine.add_trigger(
+            protection.symbol,
+            emergency_price,
+            "below" if side == "long" else "above",
+            on_trigger,
+            key=protection.position_id,
+        )
+
     async def stop_protection(self, position_id: str):
         """
         Stop all protection layers for a position
@@ -314,6 +399,10 @@ class StopLossManager:
 
         logger.info(f"Stopping protection for {protection.symbol}")
 
+        # Disarm price triggers
+        if self.trigger_engine is not None:
+            self.trigger_engine.remove_key(position_id)
+
         # Cancel exchange stop order
         if protection.exchange_stop_active and protection.exchange_stop_order_id:
             try:
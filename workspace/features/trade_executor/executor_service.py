@@ -13,10 +13,11 @@ import logging
 import time
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import ccxt.async_support as ccxt
 from ccxt.base.errors import (
+    DuplicateOrderId,
     InsufficientFunds,
     InvalidOrder,
     NetworkError,
@@ -32,6 +33,7 @@ from workspace.features.monitoring.metrics import MetricsService
 from workspace.features.position_manager import PositionService
 from workspace.features.trade_history import TradeHistoryService, TradeType
 from workspace.shared.database.connection import get_pool
+from workspace.shared.database.write_behind import WriteBehindQueue
 
 from .models import (
     ExecutionResult,
@@ -44,12 +46,116 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Bybit V5 batch endpoints accept at most 10 orders per request
+BYBIT_MAX_BATCH_SIZE = 10
+
+
+_INSERT_ORDER_SQL = """
+    INSERT INTO orders (
+        id, exchange_order_id, symbol, type, side, quantity, price, stop_price,
+        filled_quantity, remaining_quantity, average_fill_price, status,
+        time_in_force, reduce_only, position_id, created_at, submitted_at,
+        updated_at, filled_at, fees_paid, metadata
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15,
+        $16, $17, $18, $19, $20, $21
+    )
+"""
+
+_UPDATE_ORDER_SQL = """
+    UPDATE orders SET
+        filled_quantity = $1,
+        remaining_quantity = $2,
+        average_fill_price = $3,
+        status = $4,
+        updated_at = $5,
+        filled_at = $6,
+        fees_paid = $7
+    WHERE id = $8
+"""
+
+
+def _enum_value(value: Any) -> Any:
+    """Order fields hold plain values (use_enum_values) unless set after init"""
+    return getattr(value, "value", value)
+
+
+def _order_insert_args(order: Order) -> tuple:
+    return (
+        order.id,
+        order.exchange_order_id,
+        order.symbol,
+        _enum_value(order.type),
+        _enum_value(order.side),
+        order.quantity,
+        order.price,
+        order.stop_price,
+        order.filled_quantity,
+        order.remaining_quantity,
+        order.average_fill_price,
+        _enum_value(order.status),
+        _enum_value(order.time_in_force),
+        order.reduce_only,
+        order.position_id,
+        order.created_at,
+        order.submitted_at,
+        order.updated_at,
+        order.filled_at,
+        order.fees_paid,
+        order.metadata,
+    )
+
+
+def _order_update_args(order: Order) -> tuple:
+    return (
+        order.filled_quantity,
+        order.remaining_quantity,
+        order.average_fill_price,
+        _enum_value(order.status),
+        order.updated_at,
+        order.filled_at,
+        order.fees_paid,
+        order.id,
+    )
+
 
 def _round_latency_ms(latency_seconds: float) -> Decimal:
     """Round latency to 2 decimal places for pydantic validation."""
     return Decimal(str(round(latency_seconds * 1000, 2)))
 
 
+def _align(responses: Any, count: int) -> List[Any]:
+    """Pad or trim a batch response list to one entry per request"""
+    aligned: List[Any] = list(responses or [])[:count]
+    missing = count - len(aligned)
+    return aligned + [Exception("No response for order in batch")] * missing
+
+
+def _outcome_error(outcome: Any) -> Optional[Tuple[str, str]]:
+    """
+    Classify a per-order batch outcome
+
+    Returns:
+        (error_code, error_message) if the order failed, None if accepted
+    """
+    if isinstance(outcome, RateLimitExceeded):
+        return "RATE_LIMIT_EXCEEDED", str(outcome)
+    if isinstance(outcome, NetworkError):
+        return "NETWORK_ERROR", str(outcome)
+    if isinstance(outcome, InsufficientFunds):
+        return "INSUFFICIENT_FUNDS", str(outcome)
+    if isinstance(outcome, InvalidOrder):
+        return "INVALID_ORDER", str(outcome)
+    if isinstance(outcome, BaseException):
+        return "UNKNOWN_ERROR", str(outcome)
+    if not isinstance(outcome, dict) or not outcome.get("id"):
+        # Bybit batch endpoints report per-order rejections in place
+        info = outcome.get("info") if isinstance(outcome, dict) else None
+        message = (info or {}).get("msg") if isinstance(info, dict) else None
+        return "ORDER_REJECTED", message or "Order rejected by exchange"
+    return None
+
+
 class TradeExecutor:
     """
     Trade Executor service for Bybit exchange
@@ -64,6 +170,7 @@ class TradeExecutor:
         max_retries: Maximum number of retry attempts
         retry_delay: Initial retry delay in seconds
         rate_limit_buffer: Buffer time for rate limiting (seconds)
+        max_batch_size: Maximum orders per batch request
     """
 
     def __init__(
@@ -79,6 +186,8 @@ class TradeExecutor:
         trade_history_service: Optional[TradeHistoryService] = None,
         metrics_service: Optional[MetricsService] = None,
         enable_circuit_breaker: bool = True,
+        max_batch_size: int = BYBIT_MAX_BATCH_SIZE,
+        write_behind: Optional[WriteBehindQueue] = None,
     ):
         """
         Initialize Trade Executor
@@ -95,6 +204,10 @@ class TradeExecutor:
             trade_history_service: Optional pre-configured trade history service (for testing)
             metrics_service: Optional pre-configured metrics service (for testing)
             enable_circuit_breaker: Enable circuit breaker protection (default: True)
+            max_batch_size: Maximum orders per batch request (default: 10)
+            write_behind: Optional write-behind queue; when set, order inserts
+                and updates are queued instead of written on the hot path
+                (the caller owns the queue's start/close)
         """
         self.api_key = api_key
         self.api_secret = api_secret
@@ -102,6 +215,8 @@ class TradeExecutor:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.rate_limit_buffer = rate_limit_buffer
+        self.max_batch_size = max_batch_size
+        self.write_behind = write_behind
 
         # Initialize exchange (or use provided one for testing)
         if exchange is not None:
@@ -135,7 +250,7 @@ class TradeExecutor:
         if trade_history_service is not None:
             self.trade_history_service = trade_history_service
         else:
-            self.trade_history_service = TradeHistoryService()
+            self.trade_history_service = TradeHistoryService(write_behind=write_behind)
 
         # Initialize Metrics Service (or use provided one for testing)
         if metrics_service is not None:
@@ -312,7 +427,7 @@ class TradeExecutor:
         1. Validates signal via risk manager (if provided)
         2. Calculates position size based on signal.size_pct
         3. Places market order to open/close position
-        4. Places stop-loss order (if opening position)
+        4. Places stop-loss order (if opening position, once the entry fills)
         5. Returns unified execution result
 
         Args:
@@ -413,12 +528,12 @@ class TradeExecutor:
                     )
                     logger.info(f"Stop-loss price calculated: ${stop_loss_price:.2f}")
 
-                # Place market buy order
-                order_result = await self.create_market_order(
+                # Place market buy order, then its stop-loss
+                return await self._open_with_stop(
                     symbol=signal.symbol,
                     side=OrderSide.BUY,
                     quantity=quantity,
-                    reduce_only=False,
+                    stop_loss_price=stop_loss_price,
                     metadata={
                         "signal_decision": signal.decision.value,
                         "signal_confidence": str(signal.confidence),
@@ -426,33 +541,6 @@ class TradeExecutor:
                     },
                 )
 
-                if not order_result.success:
-                    return order_result
-
-                # Place stop-loss order (Layer 1 protection)
-                if stop_loss_price:
-                    logger.info(f"Placing stop-loss order @ ${stop_loss_price:.2f}")
-                    stop_result = await self.create_stop_market_order(
-                        symbol=signal.symbol,
-                        side=OrderSide.SELL,  # Opposite of entry
-                        quantity=quantity,
-                        stop_price=stop_loss_price,
-                        reduce_only=True,
-                        position_id=(
-                            order_result.order.position_id
-                            if order_result.order
-                            else None
-                        ),
-                        metadata={"protection_layer": "layer1"},
-                    )
-
-                    if not stop_result.success:
-                        logger.warning(
-                            f"Failed to place stop-loss order: {stop_result.error_message}"
-                        )
-
-                return order_result
-
             elif signal.decision == TradingDecision.SELL:
                 # Open short position
                 logger.info(f"Executing SELL signal for {signal.symbol}")
@@ -465,12 +553,12 @@ class TradeExecutor:
                     )
                     logger.info(f"Stop-loss price calculated: ${stop_loss_price:.2f}")
 
-                # Place market sell order
-                order_result = await self.create_market_order(
+                # Place market sell order, then its stop-loss
+                return await self._open_with_stop(
                     symbol=signal.symbol,
                     side=OrderSide.SELL,
                     quantity=quantity,
-                    reduce_only=False,
+                    stop_loss_price=stop_loss_price,
                     metadata={
                         "signal_decision": signal.decision.value,
                         "signal_confidence": str(signal.confidence),
@@ -478,33 +566,6 @@ class TradeExecutor:
                     },
                 )
 
-                if not order_result.success:
-                    return order_result
-
-                # Place stop-loss order (Layer 1 protection)
-                if stop_loss_price:
-                    logger.info(f"Placing stop-loss order @ ${stop_loss_price:.2f}")
-                    stop_result = await self.create_stop_market_order(
-                        symbol=signal.symbol,
-                        side=OrderSide.BUY,  # Opposite of entry
-                        quantity=quantity,
-                        stop_price=stop_loss_price,
-                        reduce_only=True,
-                        position_id=(
-                            order_result.order.position_id
-                            if order_result.order
-                            else None
-                        ),
-                        metadata={"protection_layer": "layer1"},
-                    )
-
-                    if not stop_result.success:
-                        logger.warning(
-                            f"Failed to place stop-loss order: {stop_result.error_message}"
-                        )
-
-                return order_result
-
             elif signal.decision == TradingDecision.CLOSE:
                 # Close existing position
                 logger.info(f"Executing CLOSE signal for {signal.symbol}")
@@ -561,6 +622,85 @@ class TradeExecutor:
                 latency_ms=latency_ms,
             )
 
+    async def _open_with_stop(
+        self,
+        symbol: str,
+        side: OrderSide,
+        quantity: Decimal,
+        stop_loss_price: Optional[Decimal],
+        metadata: Dict[str, Any],
+        position_id: Optional[str] = None,
+    ) -> ExecutionResult:
+        """
+        Place an entry market order, then its Layer 1 stop-loss
+
+        The reduce-only stop is only sent once the entry fill is confirmed,
+        since the exchange rejects it while no position exists. It covers
+        the filled quantity and carries the entry's position ID.
+
+        This costs two sequential exchange round trips (three when the
+        entry response lacks the fill and it is fetched), so the position
+        has no Layer 1 stop for about one round trip after the fill. The
+        gap is logged per entry; Layers 2 and 3 cover it. Bybit's stopLoss
+        entry param would save the round trip, but sets a position-level
+        stop instead of a tracked reduce-only order.
+
+        Args:
+            symbol: Trading pair
+            side: Entry side
+            quantity: Order quantity
+            stop_loss_price: Stop trigger price (None places the entry only)
+            metadata: Entry order metadata
+            position_id: Associated position ID
+
+        Returns:
+            ExecutionResult of the entry order
+        """
+        entry = Order(
+            symbol=symbol,
+            type=OrderType.MARKET,
+            side=side,
+            quantity=quantity,
+            reduce_only=False,
+            position_id=position_id,
+            metadata=metadata,
+        )
+        (order_result,) = await self.create_orders_batch([entry])
+        if not order_result.success or not stop_loss_price:
+            return order_result
+
+        filled = order_result.order
+        if filled is None or not filled.filled_quantity:
+            logger.warning(
+                f"Entry fill for {symbol} not confirmed, stop-loss not placed"
+            )
+            return order_result
+
+        logger.info(f"Placing stop-loss order @ ${stop_loss_price:.2f}")
+        filled_at = time.time()
+        stop = Order(
+            symbol=symbol,
+            type=OrderType.STOP_MARKET,
+            side=OrderSide.SELL if side == OrderSide.BUY else OrderSide.BUY,
+            quantity=filled.filled_quantity,
+            stop_price=stop_loss_price.quantize(Decimal("0.00000001")),
+            reduce_only=True,
+            position_id=filled.position_id,
+            metadata={"protection_layer": "layer1"},
+        )
+        (stop_result,) = await self.create_orders_batch([stop])
+        if not stop_result.success:
+            logger.warning(
+                f"Failed to place stop-loss order: {stop_result.error_message}"
+            )
+        else:
+            logger.info(
+                f"Layer 1 stop for {symbol} live "
+                f"{(time.time() - filled_at) * 1000:.0f}ms after the entry fill"
+            )
+
+        return order_result
+
     async def create_market_order(  # noqa: C901 - Complex order execution with retry logic
         self,
         symbol: str,
@@ -687,89 +827,15 @@ class TradeExecutor:
 
                 # Log trade to history (if order is filled)
                 if order.is_fully_filled and order.average_fill_price:
-                    try:
-                        # Determine trade type based on side and reduce_only
-                        if not reduce_only:
-                            # Opening position
-                            trade_type = (
-                                TradeType.ENTRY_LONG
-                                if side == OrderSide.BUY
-                                else TradeType.ENTRY_SHORT
-                            )
-                        else:
-                            # Closing position
-                            # Check metadata for specific close reason
-                            close_reason = (
-                                metadata.get("reason", "") if metadata else ""
-                            )
-                            if (
-                                "stop_loss" in close_reason
-                                or "stop-loss" in close_reason
-                            ):
-                                trade_type = TradeType.STOP_LOSS
-                            elif (
-                                "take_profit" in close_reason
-                                or "take-profit" in close_reason
-                            ):
-                                trade_type = TradeType.TAKE_PROFIT
-                            elif "liquidation" in close_reason:
-                                trade_type = TradeType.LIQUIDATION
-                            else:
-                                trade_type = (
-                                    TradeType.EXIT_LONG
-                                    if side == OrderSide.SELL
-                                    else TradeType.EXIT_SHORT
-                                )
-
-                        # Extract signal metadata if available
-                        signal_confidence = None
-                        signal_reasoning = None
-                        realized_pnl = None
-                        if metadata:
-                            confidence_str = metadata.get("signal_confidence")
-                            if confidence_str:
-                                signal_confidence = Decimal(str(confidence_str))
-                            signal_reasoning = metadata.get("signal_reasoning")
-
-                            # Extract realized P&L for closing trades
-                            if reduce_only and "realized_pnl_before_fees" in metadata:
-                                pnl_before_fees = Decimal(
-                                    str(metadata["realized_pnl_before_fees"])
-                                )
-                                # Subtract fees to get net realized P&L
-                                realized_pnl = pnl_before_fees - order.fees_paid
-
-                        # Log the trade
-                        await self.trade_history_service.log_trade(
-                            trade_type=trade_type,
-                            symbol=symbol,
-                            order_id=order.exchange_order_id or order.id,
-                            side=side.value,
-                            quantity=order.filled_quantity,
-                            price=order.average_fill_price,
-                            fees=order.fees_paid,
-                            position_id=position_id,
-                            realized_pnl=realized_pnl,
-                            signal_confidence=signal_confidence,
-                            signal_reasoning=signal_reasoning,
-                            execution_latency_ms=latency_ms,
-                            metadata=metadata or {},
-                        )
-
-                        if realized_pnl is not None:
-                            logger.info(
-                                f"Trade logged to history: {order.exchange_order_id} (P&L: {realized_pnl:+.2f})"
-                            )
-                        else:
-                            logger.debug(
-                                f"Trade logged to history: {order.exchange_order_id}"
-                            )
-                    except Exception as log_error:
-                        # Don't fail the trade if logging fails
-                        logger.error(
-                            f"Failed to log trade to history: {log_error}",
-                            exc_info=True,
-                        )
+                    await self._log_filled_trade(
+                        order=order,
+                        symbol=symbol,
+                        side=side,
+                        reduce_only=reduce_only,
+                        position_id=position_id,
+                        metadata=metadata,
+                        latency_ms=latency_ms,
+                    )
 
                 return ExecutionResult(
                     success=True,
@@ -865,6 +931,94 @@ class TradeExecutor:
             latency_ms=latency_ms,
         )
 
+    async def _log_filled_trade(
+        self,
+        order: Order,
+        symbol: str,
+        side: OrderSide,
+        reduce_only: bool,
+        position_id: Optional[str],
+        metadata: Optional[Dict[str, Any]],
+        latency_ms: Decimal,
+    ):
+        """
+        Log a filled market order to trade history
+
+        Failures are logged and never fail the trade itself.
+        """
+        price = order.average_fill_price
+        if price is None:
+            return  # No fill to log
+
+        try:
+            # Determine trade type based on side and reduce_only
+            if not reduce_only:
+                # Opening position
+                trade_type = (
+                    TradeType.ENTRY_LONG
+                    if side == OrderSide.BUY
+                    else TradeType.ENTRY_SHORT
+                )
+            else:
+                # Closing position
+                # Check metadata for specific close reason
+                close_reason = metadata.get("reason", "") if metadata else ""
+                if "stop_loss" in close_reason or "stop-loss" in close_reason:
+                    trade_type = TradeType.STOP_LOSS
+                elif "take_profit" in close_reason or "take-profit" in close_reason:
+                    trade_type = TradeType.TAKE_PROFIT
+                elif "liquidation" in close_reason:
+                    trade_type = TradeType.LIQUIDATION
+                else:
+                    trade_type = (
+                        TradeType.EXIT_LONG
+                        if side == OrderSide.SELL
+                        else TradeType.EXIT_SHORT
+                    )
+
+            # Extract signal metadata if available
+            signal_confidence = None
+            signal_reasoning = None
+            realized_pnl = None
+            if metadata:
+                confidence_str = metadata.get("signal_confidence")
+                if confidence_str:
+                    signal_confidence = Decimal(str(confidence_str))
+                signal_reasoning = metadata.get("signal_reasoning")
+
+                # Extract realized P&L for closing trades
+                if reduce_only and "realized_pnl_before_fees" in metadata:
+                    pnl_before_fees = Decimal(str(metadata["realized_pnl_before_fees"]))
+                    # Subtract fees to get net realized P&L
+                    realized_pnl = pnl_before_fees - order.fees_paid
+
+            # Log the trade
+            await self.trade_history_service.log_trade(
+                trade_type=trade_type,
+                symbol=symbol,
+                order_id=order.exchange_order_id or order.id,
+                side=side.value,
+                quantity=order.filled_quantity,
+                price=price,
+                fees=order.fees_paid,
+                position_id=position_id,
+                realized_pnl=realized_pnl,
+                signal_confidence=signal_confidence,
+                signal_reasoning=signal_reasoning,
+                execution_latency_ms=latency_ms,
+                metadata=metadata or {},
+            )
+
+            if realized_pnl is not None:
+                logger.info(
+                    f"Trade logged to history: {order.exchange_order_id} (P&L: {realized_pnl:+.2f})"
+                )
+            else:
+                logger.debug(f"Trade logged to history: {order.exchange_order_id}")
+        except Exception as log_error:
+            # Don't fail the trade if logging fails
+            logger.error(f"Failed to log trade to history: {log_error}", exc_info=True)
+
     async def create_limit_order(
         self,
         symbol: str,
@@ -1096,6 +1250,377 @@ class TradeExecutor:
                 latency_ms=latency_ms,
             )
 
+    async def create_orders_batch(
+        self, orders: Sequence[Order]
+    ) -> List[ExecutionResult]:
+        """
+        Submit several orders through the exchange's batch endpoint
+
+        Orders are sent in chunks of max_batch_size. Exchanges without a
+        batch endpoint (exchange.has["createOrders"]) fall back to concurrent
+        single-order requests. Results are fanned back out per order, so a
+        partially rejected batch only fails the rejected orders. Orders that
+        failed with a network or rate-limit error are resubmitted with
+        exponential backoff; accepted orders are never resent.
+
+        A network error does not tell whether the exchange accepted the
+        order, so each order is sent with its Order.id as clientOrderId.
+        Before a resend, orders an earlier attempt placed are looked up by
+        that ID (on exchanges with fetchOpenOrders/fetchClosedOrders), and
+        a resend the exchange rejects as a duplicate ID is looked up again
+        instead of failing.
+
+        Args:
+            orders: Pending orders (market, limit or stop-market)
+
+        Returns:
+            ExecutionResult per order, in input order
+
+        Example:
+            ```python
+            entry, stop = await executor.create_orders_batch([
+                Order(symbol='BTC/USDT:USDT', type=OrderType.MARKET,
+                      side=OrderSide.BUY, quantity=Decimal('0.001')),
+                Order(symbol='BTC/USDT:USDT', type=OrderType.STOP_MARKET,
+                      side=OrderSide.SELL, quantity=Decimal('0.001'),
+                      stop_price=Decimal('89000'), reduce_only=True),
+            ])
+            if not stop.success:
+                print(f"Stop rejected: {stop.error_message}")
+            ```
+        """
+        start_time = time.time()
+        results: List[Optional[ExecutionResult]] = [None] * len(orders)
+
+        # Validate symbol format (critical for Bybit perpetuals)
+        pending = []
+        for index, order in enumerate(orders):
+            if ":" in order.symbol:
+                pending.append(index)
+                continue
+            error_msg = f"Invalid symbol format: {order.symbol}"
+            logger.error(error_msg)
+            results[index] = ExecutionResult(
+                success=False,
+                error_code="INVALID_SYMBOL",
+                error_message=error_msg,
+                latency_ms=_round_latency_ms(time.time() - start_time),
+            )
+
+        attempt = 0
+        while pending:
+            logger.info(
+                f"Submitting {len(pending)} orders in batch "
+                f"(attempt {attempt + 1}/{self.max_retries})"
+            )
+            outcomes = await self._submit_orders([orders[i] for i in pending])
+
+            retry = []
+            for index, outcome in zip(pending, outcomes):
+                # A duplicate client ID on a resend: an earlier attempt landed
+                landed = attempt > 0 and isinstance(outcome, DuplicateOrderId)
+                if (
+                    isinstance(outcome, NetworkError) or landed
+                ) and attempt < self.max_retries - 1:
+                    retry.append(index)
+                else:
+                    results[index] = await self._order_result(
+                        orders[index], outcome, start_time
+                    )
+
+            pending = retry
+            if pending:
+                delay = self.retry_delay * (2**attempt)  # Exponential backoff
+                logger.warning(
+                    f"{len(pending)} batch orders failed with network errors, "
+                    f"retrying in {delay}s..."
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+                placed = await self._find_submitted(
+                    [orders[i] for i in pending], start_time
+                )
+                for index in pending:
+                    if orders[index].id in placed:
+                        results[index] = await self._order_result(
+                            orders[index], placed[orders[index].id], start_time
+                        )
+                pending = [i for i in pending if orders[i].id not in placed]
+
+        return [result for result in results if result is not None]
+
+    async def _find_submitted(
+        self, orders: List[Order], since: float
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up orders an earlier attempt may have placed, by client order ID
+
+        Args:
+            orders: Orders whose submission ended in a network error
+            since: Time of the first attempt (epoch seconds)
+
+        Returns:
+            Exchange order per Order.id for the orders found on the exchange
+        """
+        wanted = {order.id for order in orders}
+        since_ms = int((since - 60) * 1000)  # Allow for exchange clock skew
+        found: Dict[str, Dict[str, Any]] = {}
+        for symbol in sorted({order.symbol for order in orders}):
+            for feature, method in (
+                ("fetchOpenOrders", "fetch_open_orders"),
+                ("fetchClosedOrders", "fetch_closed_orders"),
+            ):
+                if not self._supports(feature):
+                    continue
+                try:
+                    listed = await getattr(self.exchange, method)(symbol, since_ms)
+                except Exception as e:
+                    logger.warning(f"Could not look up {symbol} orders: {e}")
+                    continue
+                for exchange_order in listed or []:
+                    client_id = exchange_order.get("clientOrderId")
+                    if client_id in wanted:
+                        found[client_id] = exchange_order
+        if found:
+            logger.info(f"{len(found)} orders were placed by an earlier attempt")
+        return found
+
+    async def cancel_orders_batch(
+        self, orders: Sequence[Order]
+    ) -> List[ExecutionResult]:
+        """
+        Cancel several orders with as few exchange requests as possible
+
+        Orders are grouped per symbol and cancelled in chunks of
+        max_batch_size through exchange.cancel_orders, falling back to
+        concurrent cancel_order requests on exchanges without it.
+
+        Args:
+            orders: Submitted orders to cancel
+
+        Returns:
+            ExecutionResult per order, in input order
+        """
+        start_time = time.time()
+        results: List[Optional[ExecutionResult]] = [None] * len(orders)
+
+        by_symbol: Dict[str, List[int]] = {}
+        for index, order in enumerate(orders):
+            if order.exchange_order_id:
+                by_symbol.setdefault(order.symbol, []).append(index)
+            else:
+                results[index] = ExecutionResult(
+                    success=False,
+                    order=order,
+                    error_code="ORDER_NOT_SUBMITTED",
+                    error_message=f"Order {order.id} has no exchange order ID",
+                    latency_ms=_round_latency_ms(time.time() - start_time),
+                )
+
+        for symbol, indices in by_symbol.items():
+            for offset in range(0, len(indices), self.max_batch_size):
+                chunk = indices[offset : offset + self.max_batch_size]
+                ids = [orders[i].exchange_order_id for i in chunk]
+                logger.info(f"Cancelling {len(ids)} orders for {symbol}")
+
+                if self._supports("cancelOrders"):
+                    try:
+                        responses = _align(
+                            await self.exchange.cancel_orders(ids, symbol), len(ids)
+                        )
+                    except Exception as e:
+                        responses = [e] * len(ids)
+                else:
+                    responses = await asyncio.gather(
+                        *(self.exchange.cancel_order(i, symbol) for i in ids),
+                        return_exceptions=True,
+                    )
+
+                for index, response in zip(chunk, responses):
+                    results[index] = await self._cancel_result(
+                        orders[index], response, start_time
+                    )
+
+        return [result for result in results if result is not None]
+
+    def _supports(self, feature: str) -> bool:
+        """Whether the exchange advertises a ccxt capability"""
+        has = getattr(self.exchange, "has", None)
+        return isinstance(has, dict) and bool(has.get(feature))
+
+    def _order_request(self, order: Order) -> Dict[str, Any]:
+        """Build ccxt create_order/create_orders arguments for an order"""
+        order_type = OrderType(order.type)
+        params: Dict[str, Any] = {
+            "reduceOnly": order.reduce_only,
+            "clientOrderId": order.id,  # Stable across retries
+        }
+        price = None
+        if order_type in (OrderType.LIMIT, OrderType.STOP_LIMIT):
+            params["timeInForce"] = TimeInForce(order.time_in_force).value
+            price = float(order.price) if order.price is not None else None
+        if order_type in (OrderType.STOP_MARKET, OrderType.STOP_LIMIT):
+            params["stopPrice"] = float(order.stop_price or 0)
+        return {
+            "symbol": order.symbol,
+            "type": order_type.value,
+            "side": OrderSide(order.side).value,
+            "amount": float(order.quantity),
+            "price": price,
+            "params": params,
+        }
+
+    async def _submit_orders(
+        self, orders: List[Order]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Send orders in batch chunks, returning a response or error per order"""
+        outcomes: List[Union[Dict[str, Any], Exception]] = []
+        for offset in range(0, len(orders), self.max_batch_size):
+            requests = [
+                self._order_request(order)
+                for order in orders[offset : offset + self.max_batch_size]
+            ]
+
+            if self._supports("createOrders"):
+                try:
+                    responses = await self.exchange.create_orders(requests)
+                    outcomes.extend(_align(responses, len(requests)))
+                except Exception as e:
+                    # The whole request failed: every order in it shares the error
+                    outcomes.extend([e] * len(requests))
+            else:
+                outcomes.extend(
+                    await asyncio.gather(
+                        *(self.exchange.create_order(**r) for r in requests),
+                        return_exceptions=True,
+                    )
+                )
+        return outcomes
+
+    async def _order_result(
+        self,
+        order: Order,
+        outcome: Union[Dict[str, Any], BaseException],
+        start_time: float,
+    ) -> ExecutionResult:
+        """Fan a batch outcome back out into the order's ExecutionResult"""
+        latency_ms = _round_latency_ms(time.time() - start_time)
+
+        error = _outcome_error(outcome)
+        if error is not None or not isinstance(outcome, dict):
+            error_code, error_message = error or ("UNKNOWN_ERROR", str(outcome))
+            logger.error(
+                f"Batch order failed: {order.side} {order.quantity} {order.symbol} "
+                f"[{error_code}] {error_message}"
+            )
+            order.status = OrderStatus.FAILED
+            self.metrics_service.record_order(rejected=True)
+            return ExecutionResult(
+                success=False,
+                order=order,
+                error_code=error_code,
+                error_message=error_message,
+                exchange_response=outcome if isinstance(outcome, dict) else None,
+                latency_ms=latency_ms,
+            )
+
+        order.exchange_order_id = str(outcome["id"])
+        order.submitted_at = datetime.utcnow()
+        if OrderType(order.type) == OrderType.STOP_MARKET:
+            order.status = OrderStatus.OPEN  # Stop orders are "open" until triggered
+        else:
+            order.status = self._map_exchange_status(outcome.get("status"))
+            order.filled_quantity = Decimal(str(outcome.get("filled") or 0))
+            order.average_fill_price = (
+                Decimal(str(outcome["average"])) if outcome.get("average") else None
+            )
+            order.fees_paid = Decimal(str((outcome.get("fee") or {}).get("cost") or 0))
+            if order.is_fully_filled:
+                order.status = OrderStatus.FILLED
+                order.filled_at = datetime.utcnow()
+
+        await self._store_order(order)
+        self.active_orders[order.id] = order
+
+        if OrderType(order.type) == OrderType.MARKET and (
+            outcome.get("filled") is None or not outcome.get("average")
+        ):
+            # Batch responses often carry only the order ID
+            await self.fetch_order_status(order.exchange_order_id, order.symbol)
+
+        self.metrics_service.record_order(placed=True, filled=order.is_fully_filled)
+
+        logger.info(
+            f"Batch order placed: {order.exchange_order_id} "
+            f"({order.type} {order.side} {order.quantity} {order.symbol})"
+        )
+
+        if (
+            OrderType(order.type) == OrderType.MARKET
+            and order.is_fully_filled
+            and order.average_fill_price
+        ):
+            self.metrics_service.record_trade(
+                success=True,
+                fees=order.fees_paid,
+                latency_ms=latency_ms,
+            )
+            await self._log_filled_trade(
+                order=order,
+                symbol=order.symbol,
+                side=OrderSide(order.side),
+                reduce_only=order.reduce_only,
+                position_id=order.position_id,
+                metadata=order.metadata,
+                latency_ms=latency_ms,
+            )
+
+        return ExecutionResult(
+            success=True,
+            order=order,
+            exchange_response=outcome,
+            latency_ms=latency_ms,
+        )
+
+    async def _cancel_result(
+        self,
+        order: Order,
+        outcome: Union[Dict[str, Any], BaseException],
+        start_time: float,
+    ) -> ExecutionResult:
+        """Fan a cancel outcome back out into the order's ExecutionResult"""
+        latency_ms = _round_latency_ms(time.time() - start_time)
+
+        error = _outcome_error(outcome)
+        if error is not None:
+            error_code, error_message = error
+            logger.error(
+                f"Failed to cancel order {order.exchange_order_id}: {error_message}"
+            )
+            return ExecutionResult(
+                success=False,
+                order=order,
+                error_code=error_code,
+                error_message=error_message,
+                latency_ms=latency_ms,
+            )
+
+        order.status = OrderStatus.CANCELED
+        order.updated_at = datetime.utcnow()
+        await self._update_order(order)
+        self.active_orders.pop(order.id, None)
+        self.metrics_service.record_order(cancelled=True)
+
+        logger.info(f"Order cancelled: {order.exchange_order_id}")
+
+        return ExecutionResult(
+            success=True,
+            order=order,
+            exchange_response=outcome if isinstance(outcome, dict) else None,
+            latency_ms=latency_ms,
+        )
+
     async def open_position(
         self,
         symbol: str,
@@ -1325,6 +1850,9 @@ class TradeExecutor:
                     if exchange_order.get("average")
                     else None
                 )
+                fee_cost = (exchange_order.get("fee") or {}).get("cost")
+                if fee_cost is not None:
+                    order.fees_paid = Decimal(str(fee_cost))
                 order.updated_at = datetime.utcnow()
 
                 if order.is_fully_filled:
@@ -1342,7 +1870,7 @@ class TradeExecutor:
             logger.error(f"Error fetching order status: {e}", exc_info=True)
             return None
 
-    def _map_exchange_status(self, exchange_status: str) -> OrderStatus:
+    def _map_exchange_status(self, exchange_status: Optional[str]) -> OrderStatus:
         """Map exchange order status to our OrderStatus enum"""
         status_map = {
             "open": OrderStatus.OPEN,
@@ -1350,78 +1878,35 @@ class TradeExecutor:
             "canceled": OrderStatus.CANCELED,
             "expired": OrderStatus.EXPIRED,
         }
-        return status_map.get(exchange_status, OrderStatus.OPEN)
+        return status_map.get(exchange_status or "", OrderStatus.OPEN)
 
     async def _store_order(self, order: Order):
-        """Store order in database"""
+        """Store order in database (queued when write-behind is enabled)"""
+        args = _order_insert_args(order)
+        if self.write_behind is not None:
+            self.write_behind.enqueue(_INSERT_ORDER_SQL, *args)
+            return
+
         try:
             pool = await get_pool()
             async with pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO orders (
-                        id, exchange_order_id, symbol, type, side, quantity, price, stop_price,
-                        filled_quantity, remaining_quantity, average_fill_price, status,
-                        time_in_force, reduce_only, position_id, created_at, submitted_at,
-                        updated_at, filled_at, fees_paid, metadata
-                    ) VALUES (
-                        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15,
-                        $16, $17, $18, $19, $20, $21
-                    )
-                    """,
-                    order.id,
-                    order.exchange_order_id,
-                    order.symbol,
-                    order.type.value,
-                    order.side.value,
-                    order.quantity,
-                    order.price,
-                    order.stop_price,
-                    order.filled_quantity,
-                    order.remaining_quantity,
-                    order.average_fill_price,
-                    order.status.value,
-                    order.time_in_force.value,
-                    order.reduce_only,
-                    order.position_id,
-                    order.created_at,
-                    order.submitted_at,
-                    order.updated_at,
-                    order.filled_at,
-                    order.fees_paid,
-                    order.metadata,
-                )
+                await conn.execute(_INSERT_ORDER_SQL, *args)
             logger.debug(f"Order stored in database: {order.id}")
 
         except Exception as e:
             logger.error(f"Error storing order: {e}", exc_info=True)
 
     async def _update_order(self, order: Order):
-        """Update order in database"""
+        """Update order in database (queued when write-behind is enabled)"""
+        args = _order_update_args(order)
+        if self.write_behind is not None:
+            self.write_behind.enqueue(_UPDATE_ORDER_SQL, *args)
+            return
+
         try:
             pool = await get_pool()
             async with pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    UPDATE orders SET
-                        filled_quantity = $1,
-                        remaining_quantity = $2,
-                        average_fill_price = $3,
-                        status = $4,
-                        updated_at = $5,
-                        filled_at = $6,
-                        fees_paid = $7
-                    WHERE id = $8
-                    """,
-                    order.filled_quantity,
-                    order.remaining_quantity,
-                    order.average_fill_price,
-                    order.status.value,
-                    order.updated_at,
-                    order.filled_at,
-                    order.fees_paid,
-                    order.id,
-                )
+                await conn.execute(_UPDATE_ORDER_SQL, *args)
             logger.debug(f"Order updated in database: {order.id}")
 
         except Exception as e:
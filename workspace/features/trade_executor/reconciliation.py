@@ -18,11 +18,20 @@ import ccxt.async_support as ccxt
 
 from workspace.features.position_manager import PositionService
 from workspace.shared.database.connection import get_pool
+from workspace.shared.database.write_behind import WriteBehindQueue
 
 from .models import PositionSnapshot, ReconciliationResult
 
 logger = logging.getLogger(__name__)
 
+_INSERT_RECONCILIATION_SQL = """
+    INSERT INTO position_reconciliation (
+        position_id, system_quantity, exchange_quantity,
+        discrepancy, needs_correction, corrections_applied,
+        timestamp
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7)
+"""
+
 
 class ReconciliationService:
     """
@@ -50,6 +59,7 @@ class ReconciliationService:
         position_service: Optional[PositionService] = None,
         periodic_interval: int = 300,  # 5 minutes
         discrepancy_threshold: Decimal = Decimal("0.00001"),
+        write_behind: Optional[WriteBehindQueue] = None,
     ):
         """
         Initialize Reconciliation Service
@@ -59,12 +69,14 @@ class ReconciliationService:
             position_service: Position Manager instance
             periodic_interval: Periodic reconciliation interval (seconds)
             discrepancy_threshold: Minimum discrepancy to flag (0.001%)
+            write_behind: Optional write-behind queue for reconciliation results
         """
         self.exchange = exchange
         self.position_service = position_service
         self._position_service_provided = position_service is not None
         self.periodic_interval = periodic_interval
         self.discrepancy_threshold = discrepancy_threshold
+        self.write_behind = write_behind
 
         # Periodic reconciliation task
         self.reconciliation_task: Optional[asyncio.Task] = None
@@ -396,26 +408,24 @@ class ReconciliationService:
             raise
 
     async def _store_reconciliation_result(self, result: ReconciliationResult):
-        """Store reconciliation result in database"""
+        """Store reconciliation result in database (queued with write-behind)"""
+        args = (
+            result.position_id,
+            result.system_quantity,
+            result.exchange_quantity,
+            result.discrepancy,
+            result.needs_correction,
+            result.corrections_applied,
+            result.timestamp,
+        )
+        if self.write_behind is not None:
+            self.write_behind.enqueue(_INSERT_RECONCILIATION_SQL, *args)
+            return
+
         try:
             pool = await get_pool()
             async with pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO position_reconciliation (
-                        position_id, system_quantity, exchange_quantity,
-                        discrepancy, needs_correction, corrections_applied,
-                        timestamp
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7)
-                    """,
-                    result.position_id,
-                    result.system_quantity,
-                    result.exchange_quantity,
-                    result.discrepancy,
-                    result.needs_correction,
-                    result.corrections_applied,
-                    result.timestamp,
-                )
+                await conn.execute(_INSERT_RECONCILIATION_SQL, *args)
             logger.debug(f"Reconciliation result stored for {result.position_id}")
 
         except Exception as e:
@@ -6,6 +6,11 @@ Implements 3-layer stop-loss protection system for risk management:
 - Layer 2: Application-level monitoring (secondary, polls every 2 seconds)
 - Layer 3: Emergency liquidation (tertiary, polls every 1 second, triggers at 15% loss)
 
+With a PriceTriggerEngine, Layers 2 and 3 are price triggers on the shared
+WebSocket ticker stream instead of per-position polling loops: no REST
+ticker or position queries between ticks, and stops fire on the tick that
+crosses them.
+
 Author: Trade Executor Implementation Team
 Date: 2025-10-27
 """
@@ -14,9 +19,10 @@ import asyncio
 import logging
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
 from uuid import UUID
 
+from workspace.features.market_data import PriceTriggerEngine, TriggerDirection
 from workspace.features.position_manager import PositionService
 from workspace.shared.database.connection import get_pool
 
@@ -54,6 +60,7 @@ class StopLossManager:
         layer2_interval: Layer 2 monitoring interval (seconds)
         layer3_interval: Layer 3 monitoring interval (seconds)
         emergency_threshold: Emergency loss threshold (default: 15%)
+        trigger_engine: Shared price trigger engine (None = polling loops)
     """
 
     def __init__(
@@ -63,6 +70,7 @@ class StopLossManager:
         layer2_interval: float = 2.0,
         layer3_interval: float = 1.0,
         emergency_threshold: Decimal = Decimal("0.15"),
+        trigger_engine: Optional[PriceTriggerEngine] = None,
     ):
         """
         Initialize Stop-Loss Manager
@@ -73,6 +81,9 @@ class StopLossManager:
             layer2_interval: Layer 2 monitoring interval (seconds)
             layer3_interval: Layer 3 monitoring interval (seconds)
             emergency_threshold: Emergency loss threshold (15% = 0.15)
+            trigger_engine: PriceTriggerEngine fed by the market data
+                ticker stream; Layers 2 and 3 become price triggers
+                (default: None = poll every layer2/layer3_interval)
         """
         self.executor = executor
         self.position_service = position_service
@@ -80,6 +91,7 @@ class StopLossManager:
         self.layer2_interval = layer2_interval
         self.layer3_interval = layer3_interval
         self.emergency_threshold = emergency_threshold
+        self.trigger_engine = trigger_engine
 
         # Track active protections
         self.active_protections: Dict[str, StopLossProtection] = {}
@@ -87,6 +99,9 @@ class StopLossManager:
         # Track monitoring tasks
         self.monitoring_tasks: Dict[str, asyncio.Task] = {}
 
+        # Positions with a Layer 2 or Layer 3 close in flight
+        self._closing: Set[str] = set()
+
     async def start_protection(
         self,
         position_id: str,
@@ -149,23 +164,33 @@ class StopLossManager:
             else:
                 logger.warning(f"Layer 1 protection failed for position {position_id}")
 
-            # Layer 2: Start application-level monitoring
-            protection.layer2_active = True
-            layer2_task = asyncio.create_task(
-                self._monitor_layer2(position, stop_price, protection)
-            )
-            self.monitoring_tasks[f"{position_id}_layer2"] = layer2_task
-            logger.info(f"Layer 2 monitoring started for position {position_id}")
+            if self.trigger_engine is not None:
+                # Layers 2 and 3: price triggers on the shared ticker stream
+                protection.layer2_active = True
+                self._arm_layer2(position, stop_price, protection)
+                protection.layer3_active = True
+                self._arm_layer3(position, protection)
+                logger.info(
+                    f"Layer 2/3 price triggers armed for position {position_id}"
+                )
+            else:
+                # Layer 2: Start application-level monitoring
+                protection.layer2_active = True
+                layer2_task = asyncio.create_task(
+                    self._monitor_layer2(position, stop_price, protection)
+                )
+                self.monitoring_tasks[f"{position_id}_layer2"] = layer2_task
+                logger.info(f"Layer 2 monitoring started for position {position_id}")
 
-            # Layer 3: Start emergency monitoring
-            protection.layer3_active = True
-            layer3_task = asyncio.create_task(
-                self._monitor_layer3(position, protection)
-            )
-            self.monitoring_tasks[f"{position_id}_layer3"] = layer3_task
-            logger.info(
-                f"Layer 3 emergency monitoring started for position {position_id}"
-            )
+                # Layer 3: Start emergency monitoring
+                protection.layer3_active = True
+                layer3_task = asyncio.create_task(
+                    self._monitor_layer3(position, protection)
+                )
+                self.monitoring_tasks[f"{position_id}_layer3"] = layer3_task
+                logger.info(
+                    f"Layer 3 emergency monitoring started for position {position_id}"
+                )
 
             # Store protection
             await self._store_protection(protection)
@@ -190,6 +215,10 @@ class StopLossManager:
         """
         logger.info(f"Stopping all protection layers for position {position_id}")
 
+        # Disarm price triggers
+        if self.trigger_engine is not None:
+            self.trigger_engine.remove_key(str(position_id))
+
         # Cancel monitoring tasks
         for task_key in [f"{position_id}_layer2", f"{position_id}_layer3"]:
             if task_key in self.monitoring_tasks:
@@ -310,48 +339,77 @@ class StopLossManager:
                     should_trigger = True
 
                 if should_trigger:
-                    logger.warning(
-                        f"Layer 2 TRIGGERED for {position.id}: "
-                        f"Current price {current_price} crossed stop {stop_price}"
-                    )
-
-                    # Execute market order to close position
-                    close_result = await self.executor.close_position(
-                        position_id=position.id,
-                        reason="layer2_stop_loss_triggered",
-                    )
-
-                    if close_result.success:
-                        if close_result.order is not None:
-                            logger.info(
-                                f"Layer 2: Position {position.id} closed successfully "
-                                f"(Order: {close_result.order.exchange_order_id})"
-                            )
-                        else:
-                            logger.info(
-                                f"Layer 2: Position {position.id} closed successfully"
-                            )
-
-                        # Update protection
-                        protection.triggered_at = datetime.utcnow()
-                        protection.triggered_layer = StopLossLayer.APPLICATION
-                        await self._update_protection(protection)
-
-                        # Stop all monitoring
-                        await self.stop_protection(position.id)
+                    if await self._close_layer2(
+                        position, stop_price, protection, current_price
+                    ):
                         break
-                    else:
-                        logger.error(
-                            f"Layer 2: Failed to close position {position.id}: "
-                            f"{close_result.error_message}"
-                        )
-                        # Continue monitoring, Layer 3 will catch it if critical
+                    # Continue monitoring, Layer 3 will catch it if critical
 
         except asyncio.CancelledError:
             logger.info(f"Layer 2 monitoring cancelled for {position.id}")
         except Exception as e:
             logger.error(f"Layer 2 monitoring error: {e}", exc_info=True)
 
+    async def _close_layer2(
+        self,
+        position,
+        stop_price: Decimal,
+        protection: StopLossProtection,
+        current_price: Decimal,
+    ) -> bool:
+        """
+        Close a position whose Layer 2 stop was crossed
+
+        Args:
+            position: Position object
+            stop_price: Stop trigger price
+            protection: StopLossProtection object
+            current_price: Price that crossed the stop
+
+        Returns:
+            True if the position was closed
+        """
+        # Both layers can fire on one gap tick; only one closes
+        if not self._begin_close(position.id, "Layer 2"):
+            return False
+        try:
+            logger.warning(
+                f"Layer 2 TRIGGERED for {position.id}: "
+                f"Current price {current_price} crossed stop {stop_price}"
+            )
+
+            # Execute market order to close position
+            close_result = await self.executor.close_position(
+                position_id=position.id,
+                reason="layer2_stop_loss_triggered",
+            )
+
+            if not close_result.success:
+                logger.error(
+                    f"Layer 2: Failed to close position {position.id}: "
+                    f"{close_result.error_message}"
+                )
+                return False
+
+            if close_result.order is not None:
+                logger.info(
+                    f"Layer 2: Position {position.id} closed successfully "
+                    f"(Order: {close_result.order.exchange_order_id})"
+                )
+            else:
+                logger.info(f"Layer 2: Position {position.id} closed successfully")
+
+            # Update protection
+            protection.triggered_at = datetime.utcnow()
+            protection.triggered_layer = StopLossLayer.APPLICATION
+            await self._update_protection(protection)
+
+            # Stop all monitoring
+            await self.stop_protection(position.id)
+            return True
+        finally:
+            self._closing.discard(str(position.id))
+
     async def _monitor_layer3(self, position, protection: StopLossProtection):
         """
         Layer 3: Emergency liquidation monitoring
@@ -403,55 +461,205 @@ class StopLossManager:
 
                 # Check if emergency threshold exceeded
                 if loss_pct > self.emergency_threshold:
-                    logger.critical(
-                        f"Layer 3 EMERGENCY TRIGGERED for {position.id}: "
-                        f"Loss {loss_pct * 100:.2f}% exceeds threshold {self.emergency_threshold * 100:.0f}%"
-                    )
-
-                    # Send alert (placeholder for now)
-                    await self._send_emergency_alert(
-                        position.id,
-                        loss_pct,
-                        current_price,
-                    )
-
-                    # Emergency close position
-                    close_result = await self.executor.close_position(
-                        position_id=position.id,
-                        reason="layer3_emergency_liquidation",
-                    )
-
-                    if close_result.success:
-                        if close_result.order is not None:
-                            logger.critical(
-                                f"Layer 3: EMERGENCY CLOSE successful for {position.id} "
-                                f"(Order: {close_result.order.exchange_order_id})"
-                            )
-                        else:
-                            logger.critical(
-                                f"Layer 3: EMERGENCY CLOSE successful for {position.id}"
-                            )
-
-                        # Update protection
-                        protection.triggered_at = datetime.utcnow()
-                        protection.triggered_layer = StopLossLayer.EMERGENCY
-                        await self._update_protection(protection)
-
-                        # Stop all monitoring
-                        await self.stop_protection(position.id)
+                    if await self._close_layer3(
+                        position, protection, current_price, loss_pct
+                    ):
                         break
-                    else:
-                        logger.critical(
-                            f"Layer 3: EMERGENCY CLOSE FAILED for {position.id}: "
-                            f"{close_result.error_message}"
-                        )
-                        # Try again next iteration
+                    # Try again next iteration
 
         except asyncio.CancelledError:
             logger.info(f"Layer 3 monitoring cancelled for {position.id}")
         except Exception as e:
             logger.error(f"Layer 3 monitoring error: {e}", exc_info=True)
 
+    async def _close_layer3(
+        self,
+        position,
+        protection: StopLossProtection,
+        current_price: Decimal,
+        loss_pct: Decimal,
+    ) -> bool:
+        """
+        Emergency-close a position past the Layer 3 loss threshold
+
+        Args:
+            position: Position object
+            protection: StopLossProtection object
+            current_price: Price that breached the threshold
+            loss_pct: Loss at current_price
+
+        Returns:
+            True if the position was closed
+        """
+        # Both layers can fire on one gap tick; only one closes
+        if not self._begin_close(position.id, "Layer 3"):
+            return False
+        try:
+            logger.critical(
+                f"Layer 3 EMERGENCY TRIGGERED for {position.id}: "
+                f"Loss {loss_pct * 100:.2f}% exceeds threshold {self.emergency_threshold * 100:.0f}%"
+            )
+
+            # Send alert (placeholder for now)
+            await self._send_emergency_alert(
+                position.id,
+                loss_pct,
+                current_price,
+            )
+
+            # Emergency close position
+            close_result = await self.executor.close_position(
+                position_id=position.id,
+                reason="layer3_emergency_liquidation",
+            )
+
+            if not close_result.success:
+                logger.critical(
+                    f"Layer 3: EMERGENCY CLOSE FAILED for {position.id}: "
+                    f"{close_result.error_message}"
+                )
+                return False
+
+            if close_result.order is not None:
+                logger.critical(
+                    f"Layer 3: EMERGENCY CLOSE successful for {position.id} "
+                    f"(Order: {close_result.order.exchange_order_id})"
+                )
+            else:
+                logger.critical(
+                    f"Layer 3: EMERGENCY CLOSE successful for {position.id}"
+                )
+
+            # Update protection
+            protection.triggered_at = datetime.utcnow()
+            protection.triggered_layer = StopLossLayer.EMERGENCY
+            await self._update_protection(protection)
+
+            # Stop all monitoring
+            await self.stop_protection(position.id)
+            return True
+        finally:
+            self._closing.discard(str(position.id))
+
+    def _arm_layer2(
+        self,
+        position,
+        stop_price: Decimal,
+        protection: StopLossProtection,
+    ):
+        """
+        Layer 2: Arm the stop price on the shared trigger engine
+
+        Args:
+            position: Position object
+            stop_price: Stop trigger price
+            protection: StopLossProtection object
+        """
+
+        async def on_trigger(trigger, price: float):
+            if not self._protection_active(protection):
+                return  # Already closed by the other layer
+            if not await self._position_open(position):
+                logger.info(
+                    f"Layer 2: Position {position.id} no longer open, stopping monitoring"
+                )
+                await self.stop_protection(position.id)
+                return
+
+            current_price = Decimal(str(price))
+            if not await self._close_layer2(
+                position, stop_price, protection, current_price
+            ):
+                # Retry after the polling interval, Layer 3 stays armed
+                await asyncio.sleep(self.layer2_interval)
+                if self._protection_active(protection):
+                    self._arm_layer2(position, stop_price, protection)
+
+        if self.trigger_engine is None:
+            raise RuntimeError("Price trigger engine not initialized")
+        self.trigger_engine.add_trigger(
+            position.symbol,
+            stop_price,
+            (
+                TriggerDirection.BELOW
+                if position.side == "long"
+                else TriggerDirection.ABOVE
+            ),
+            on_trigger,
+            key=str(position.id),
+        )
+
+    def _arm_layer3(self, position, protection: StopLossProtection):
+        """
+        Layer 3: Arm the emergency loss price on the shared trigger engine
+
+        The trigger fires at the price where the loss reaches
+        emergency_threshold.
+
+        Args:
+            position: Position object
+            protection: StopLossProtection object
+        """
+        if position.side == "long":
+            emergency_price = position.entry_price * (1 - self.emergency_threshold)
+            direction = TriggerDirection.BELOW
+        else:
+            emergency_price = position.entry_price * (1 + self.emergency_threshold)
+            direction = TriggerDirection.ABOVE
+
+        async def on_trigger(trigger, price: float):
+            if not self._protection_active(protection):
+                return  # Already closed by the other layer
+            if not await self._position_open(position):
+                logger.info(
+                    f"Layer 3: Position {position.id} no longer open, stopping monitoring"
+                )
+                await self.stop_protection(position.id)
+                return
+
+            current_price = Decimal(str(price))
+            loss_pct = abs(current_price - position.entry_price) / position.entry_price
+            if not await self._close_layer3(
+                position, protection, current_price, loss_pct
+            ):
+                # Try again after the polling interval
+                await asyncio.sleep(self.layer3_interval)
+                if self._protection_active(protection):
+                    self._arm_layer3(position, protection)
+
+        if self.trigger_engine is None:
+            raise RuntimeError("Price trigger engine not initialized")
+        self.trigger_engine.add_trigger(
+            position.symbol,
+            emergency_price,
+            direction,
+            on_trigger,
+            key=str(position.id),
+        )
+
+    def _begin_close(self, position_id, layer: str) -> bool:
+        """Claim the close of a position (False if another layer holds it)"""
+        key = str(position_id)
+        if key in self._closing:
+            logger.info(f"{layer}: close of {position_id} already in progress")
+            return False
+        self._closing.add(key)
+        return True
+
+    def _protection_active(self, protection: StopLossProtection) -> bool:
+        """Whether protection is still registered and not yet triggered"""
+        return (
+            self.active_protections.get(protection.position_id) is protection
+            and protection.triggered_at is None
+        )
+
+    async def _position_open(self, position) -> bool:
+        """Whether the position is still open in the database"""
+        if self.position_service is None:
+            raise RuntimeError("Position service not initialized")
+        current_position = await self.position_service.get_position_by_id(position.id)
+        return current_position is not None and current_position.status == "open"
+
     async def _send_emergency_alert(
         self,
         position_id: str,
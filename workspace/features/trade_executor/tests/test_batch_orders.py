@@ -0,0 +1,317 @@
+"""
+Batch Order Tests
+
+Tests for batched order submission and bulk cancellation: result fan-out,
+partial batch failure, retries and the single-order fallback.
+
+Author: Trade Executor Implementation Team
+Date: 2025-11-09
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from ccxt.base.errors import DuplicateOrderId, InsufficientFunds, NetworkError
+
+from workspace.features.trade_executor.executor_service import TradeExecutor
+from workspace.features.trade_executor.models import (
+    Order,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+)
+from workspace.features.trading_loop import TradingDecision, TradingSignal
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+def _market(side: OrderSide = OrderSide.BUY, symbol: str = SYMBOL) -> Order:
+    return Order(
+        symbol=symbol, type=OrderType.MARKET, side=side, quantity=Decimal("0.001")
+    )
+
+
+def _stop(stop_price: str = "89000") -> Order:
+    return Order(
+        symbol=SYMBOL,
+        type=OrderType.STOP_MARKET,
+        side=OrderSide.SELL,
+        quantity=Decimal("0.001"),
+        stop_price=Decimal(stop_price),
+        reduce_only=True,
+    )
+
+
+def _filled(order_id: str) -> dict:
+    return {
+        "id": order_id,
+        "status": "closed",
+        "filled": 0.001,
+        "average": 90000,
+        "fee": {"cost": 0.5},
+    }
+
+
+@pytest.fixture
+def batch_exchange():
+    """Exchange stand-in with Bybit-style batch endpoints"""
+    exchange = Mock()
+    exchange.has = {"createOrders": True, "cancelOrders": True}
+    exchange.fetch_ticker = AsyncMock(return_value={"last": 90000})
+
+    async def create_orders(requests):
+        return [_filled(f"batch-{i}") for i in range(len(requests))]
+
+    async def cancel_orders(ids, symbol):
+        return [{"id": order_id, "status": "canceled"} for order_id in ids]
+
+    exchange.create_orders = AsyncMock(side_effect=create_orders)
+    exchange.cancel_orders = AsyncMock(side_effect=cancel_orders)
+    exchange.create_order = AsyncMock()
+    return exchange
+
+
+@pytest.fixture
+def executor(batch_exchange):
+    """TradeExecutor on the batch exchange with persistence mocked out"""
+    executor = TradeExecutor(
+        api_key="test_key",
+        api_secret="test_secret",
+        exchange=batch_exchange,
+        position_service=Mock(),
+        trade_history_service=AsyncMock(),
+        max_retries=3,
+        retry_delay=0,
+    )
+    executor._store_order = AsyncMock()
+    executor._update_order = AsyncMock()
+    return executor
+
+
+@pytest.mark.asyncio
+async def test_batch_fans_out_results(executor, batch_exchange):
+    entry, stop = await executor.create_orders_batch([_market(), _stop()])
+
+    batch_exchange.create_orders.assert_awaited_once()
+    batch_exchange.create_order.assert_not_called()
+    requests = batch_exchange.create_orders.await_args.args[0]
+    assert [r["type"] for r in requests] == ["market", "stop_market"]
+    assert requests[1]["params"] == {
+        "reduceOnly": True,
+        "clientOrderId": stop.order.id,
+        "stopPrice": 89000.0,
+    }
+
+    assert entry.success and stop.success
+    assert entry.order.exchange_order_id == "batch-0"
+    assert entry.order.status == OrderStatus.FILLED
+    assert stop.order.status == OrderStatus.OPEN
+    assert len(executor.active_orders) == 2
+    executor.trade_history_service.log_trade.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_chunks_by_max_batch_size(executor, batch_exchange):
+    executor.max_batch_size = 4
+
+    results = await executor.create_orders_batch([_market() for _ in range(10)])
+
+    calls = batch_exchange.create_orders.await_args_list
+    assert [len(call.args[0]) for call in calls] == [4, 4, 2]
+    assert all(r.success for r in results)
+
+
+@pytest.mark.asyncio
+async def test_partial_rejection(executor, batch_exchange):
+    batch_exchange.create_orders = AsyncMock(
+        return_value=[
+            _filled("ok-1"),
+            {"id": None, "info": {"code": 10001, "msg": "qty too large"}},
+        ]
+    )
+
+    entry, stop = await executor.create_orders_batch([_market(), _stop()])
+
+    assert entry.success is True
+    assert stop.success is False
+    assert stop.error_code == "ORDER_REJECTED"
+    assert stop.error_message == "qty too large"
+    assert stop.order.status == OrderStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_invalid_symbol_not_submitted(executor, batch_exchange):
+    bad, good = await executor.create_orders_batch(
+        [_market(symbol="BTC/USDT"), _market()]
+    )
+
+    assert bad.error_code == "INVALID_SYMBOL"
+    assert good.success is True
+    assert len(batch_exchange.create_orders.await_args.args[0]) == 1
+
+
+@pytest.mark.asyncio
+async def test_network_error_retried_once_accepted(executor, batch_exchange):
+    batch_exchange.create_orders = AsyncMock(
+        side_effect=[NetworkError("timeout"), [_filled("a"), _filled("b")]]
+    )
+
+    results = await executor.create_orders_batch([_market(), _market()])
+
+    assert batch_exchange.create_orders.await_count == 2
+    assert [r.order.exchange_order_id for r in results] == ["a", "b"]
+    first, resend = batch_exchange.create_orders.await_args_list
+    assert [r["params"]["clientOrderId"] for r in first.args[0]] == [
+        r["params"]["clientOrderId"] for r in resend.args[0]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_network_error_not_resent_when_order_landed(executor, batch_exchange):
+    orders = [_market(), _market()]
+    batch_exchange.has["fetchClosedOrders"] = True
+    batch_exchange.create_orders = AsyncMock(
+        side_effect=[NetworkError("timeout"), [_filled("b")]]
+    )
+    batch_exchange.fetch_closed_orders = AsyncMock(
+        return_value=[{**_filled("a"), "clientOrderId": orders[0].id}]
+    )
+
+    first, second = await executor.create_orders_batch(orders)
+
+    assert first.order.exchange_order_id == "a"
+    assert second.order.exchange_order_id == "b"
+    (resend,) = batch_exchange.create_orders.await_args_list[1].args[0]
+    assert resend["params"]["clientOrderId"] == orders[1].id
+
+
+@pytest.mark.asyncio
+async def test_duplicate_client_id_on_resend_is_looked_up(executor, batch_exchange):
+    order = _market()
+    batch_exchange.has["fetchClosedOrders"] = True
+    batch_exchange.create_orders = AsyncMock(
+        side_effect=[NetworkError("timeout"), DuplicateOrderId("duplicate")]
+    )
+    batch_exchange.fetch_closed_orders = AsyncMock(
+        side_effect=[[], [{**_filled("a"), "clientOrderId": order.id}]]
+    )
+
+    (result,) = await executor.create_orders_batch([order])
+
+    assert result.success is True
+    assert result.order.exchange_order_id == "a"
+    assert batch_exchange.create_orders.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_error_fails_whole_chunk(executor, batch_exchange):
+    batch_exchange.create_orders = AsyncMock(side_effect=InsufficientFunds("margin"))
+
+    results = await executor.create_orders_batch([_market(), _stop()])
+
+    assert batch_exchange.create_orders.await_count == 1
+    assert [r.error_code for r in results] == ["INSUFFICIENT_FUNDS"] * 2
+
+
+@pytest.mark.asyncio
+async def test_fallback_to_single_orders(executor, batch_exchange):
+    batch_exchange.has = {}
+    batch_exchange.create_order = AsyncMock(
+        side_effect=[_filled("single"), InsufficientFunds("margin")]
+    )
+
+    entry, stop = await executor.create_orders_batch([_market(), _stop()])
+
+    assert batch_exchange.create_order.await_count == 2
+    assert entry.success is True
+    assert stop.error_code == "INSUFFICIENT_FUNDS"
+
+
+@pytest.mark.asyncio
+async def test_cancel_orders_batch(executor, batch_exchange):
+    placed = await executor.create_orders_batch([_stop(), _stop("88000")])
+    orders = [r.order for r in placed] + [_stop()]  # last one never submitted
+
+    results = await executor.cancel_orders_batch(orders)
+
+    batch_exchange.cancel_orders.assert_awaited_once_with(
+        ["batch-0", "batch-1"], SYMBOL
+    )
+    assert [r.success for r in results] == [True, True, False]
+    assert results[2].error_code == "ORDER_NOT_SUBMITTED"
+    assert orders[0].status == OrderStatus.CANCELED
+    assert executor.active_orders == {}
+
+
+@pytest.mark.asyncio
+async def test_signal_stop_placed_after_entry_fill(executor, batch_exchange):
+    signal = TradingSignal(
+        symbol=SYMBOL,
+        decision=TradingDecision.BUY,
+        confidence=Decimal("0.8"),
+        size_pct=Decimal("0.1"),
+        stop_loss_pct=Decimal("0.02"),
+    )
+
+    result = await executor.execute_signal(
+        signal=signal, account_balance_chf=Decimal("2500")
+    )
+
+    assert result.success is True
+    entry_call, stop_call = batch_exchange.create_orders.await_args_list
+    assert [r["type"] for r in entry_call.args[0]] == ["market"]
+    (stop_request,) = stop_call.args[0]
+    assert stop_request["side"] == "sell"
+    assert stop_request["amount"] == 0.001  # Filled quantity of the entry
+    assert stop_request["params"]["stopPrice"] == 88200.0
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_fetched_fill(executor, batch_exchange):
+    responses = [[{"id": "entry"}], [{"id": "stop"}]]
+    batch_exchange.create_orders = AsyncMock(side_effect=responses)
+    batch_exchange.fetch_order = AsyncMock(
+        return_value={
+            "id": "entry",
+            "status": "closed",
+            "filled": 0.0008,
+            "average": 90010,
+            "fee": {"cost": 0.04},
+        }
+    )
+
+    result = await executor._open_with_stop(
+        symbol=SYMBOL,
+        side=OrderSide.BUY,
+        quantity=Decimal("0.001"),
+        stop_loss_price=Decimal("88200"),
+        metadata={},
+        position_id="pos-1",
+    )
+
+    batch_exchange.fetch_order.assert_awaited_once_with("entry", SYMBOL)
+    assert result.order.average_fill_price == Decimal("90010")
+    assert result.order.fees_paid == Decimal("0.04")
+    (stop_request,) = batch_exchange.create_orders.await_args_list[1].args[0]
+    assert stop_request["amount"] == 0.0008
+    stop = next(o for o in executor.active_orders.values() if o.reduce_only)
+    assert stop.position_id == "pos-1"
+
+
+@pytest.mark.asyncio
+async def test_failed_entry_places_no_stop(executor, batch_exchange):
+    batch_exchange.create_orders = AsyncMock(
+        return_value=[{"id": "", "info": {"msg": "insufficient margin"}}]
+    )
+
+    result = await executor._open_with_stop(
+        symbol=SYMBOL,
+        side=OrderSide.BUY,
+        quantity=Decimal("0.001"),
+        stop_loss_price=Decimal("88200"),
+        metadata={},
+    )
+
+    assert result.success is False
+    batch_exchange.create_orders.assert_awaited_once()
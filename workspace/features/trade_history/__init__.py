@@ -6,6 +6,7 @@ Comprehensive trade history tracking and reporting.
 Components:
 - TradeHistoryEntry: Individual trade records
 - TradeHistoryService: Service for logging and querying trades
+- TradeIndex: Time-indexed in-memory trade store with daily rollups
 - TradeStatistics: Aggregated performance metrics
 - DailyTradeReport: Daily summary reports
 
@@ -21,6 +22,7 @@ from .models import (
     TradeType,
 )
 from .trade_history_service import TradeHistoryService
+from .trade_index import TradeCursor, TradeIndex, TradeRollup
 
 __all__ = [
     # Enums
@@ -32,4 +34,8 @@ __all__ = [
     "DailyTradeReport",
     # Service
     "TradeHistoryService",
+    # Storage
+    "TradeIndex",
+    "TradeRollup",
+    "TradeCursor",
 ]
@@ -3,6 +3,13 @@ Trade History Service
 
 Service for logging and querying trade history with PostgreSQL backend.
 
+With a database pool, queries run against the trades hypertable (composite
+(symbol, timestamp, trade_id) indexes, keyset pagination) and statistics
+are read from the trade_stats_daily continuous aggregate, scanning raw rows
+only for the partial days at the edges of a period (see migration 004).
+Without one, the in-memory TradeIndex serves the same queries; it is also
+the fallback when a database query fails.
+
 Author: Trading System Implementation Team
 Date: 2025-10-28
 """
@@ -11,7 +18,10 @@ import logging
 import uuid
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
+
+from workspace.shared.database.connection import DatabasePool
+from workspace.shared.database.write_behind import WriteBehindQueue
 
 from .models import (
     DailyTradeReport,
@@ -20,9 +30,62 @@ from .models import (
     TradeStatus,
     TradeType,
 )
+from .trade_index import TradeCursor, TradeIndex, TradeRollup
 
 logger = logging.getLogger(__name__)
 
+_INSERT_TRADE_SQL = """
+    INSERT INTO trades (
+        trade_id, timestamp, symbol, trade_type, side, entry_price, exit_price,
+        quantity, fees_paid, realized_pnl, signal_confidence, signal_reasoning,
+        execution_latency_ms, exchange, order_id
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15
+    )
+"""
+
+_SELECT_TRADES_SQL = """
+    SELECT trade_id, timestamp, symbol, trade_type, side, entry_price,
+           exit_price, quantity, fees_paid, realized_pnl, unrealized_pnl,
+           signal_confidence, signal_reasoning, leverage, execution_latency_ms,
+           exchange, order_id
+    FROM trades
+"""
+
+# Same columns as the trade_stats_daily continuous aggregate
+_RAW_ROLLUP_SQL = """
+    SELECT COUNT(*) AS trade_count,
+           SUM(quantity * entry_price) AS volume,
+           SUM(fees_paid) AS fees,
+           COUNT(realized_pnl) AS exit_count,
+           COUNT(*) FILTER (WHERE realized_pnl > 0) AS win_count,
+           COUNT(*) FILTER (WHERE realized_pnl < 0) AS loss_count,
+           SUM(realized_pnl) FILTER (WHERE realized_pnl > 0) AS gross_profit,
+           SUM(realized_pnl) FILTER (WHERE realized_pnl < 0) AS gross_loss,
+           MAX(realized_pnl) FILTER (WHERE realized_pnl > 0) AS largest_win,
+           MIN(realized_pnl) FILTER (WHERE realized_pnl < 0) AS largest_loss
+    FROM trades
+    WHERE timestamp >= $1 AND timestamp <= $2
+      AND ($3::varchar IS NULL OR symbol = $3)
+      AND NOT (timestamp >= $4 AND timestamp < $5)
+"""
+
+_DAILY_ROLLUP_SQL = """
+    SELECT SUM(trade_count) AS trade_count,
+           SUM(volume) AS volume,
+           SUM(fees) AS fees,
+           SUM(exit_count) AS exit_count,
+           SUM(win_count) AS win_count,
+           SUM(loss_count) AS loss_count,
+           SUM(gross_profit) AS gross_profit,
+           SUM(gross_loss) AS gross_loss,
+           MAX(largest_win) AS largest_win,
+           MIN(largest_loss) AS largest_loss
+    FROM trade_stats_daily
+    WHERE day >= $1 AND day < $2
+      AND ($3::varchar IS NULL OR symbol = $3)
+"""
+
 
 class TradeHistoryService:
     """
@@ -38,21 +101,33 @@ class TradeHistoryService:
     with in-memory fallback for development/errors.
     """
 
-    def __init__(self, use_database: bool = True):
+    def __init__(
+        self,
+        use_database: bool = True,
+        write_behind: Optional[WriteBehindQueue] = None,
+        pool: Optional[DatabasePool] = None,
+    ):
         """
         Initialize trade history service
 
         Args:
             use_database: If True, use PostgreSQL backend; if False, use in-memory
+            write_behind: Optional write-behind queue used to persist logged
+                trades to the trades table off the execution path
+            pool: Database pool for queries; without one, queries are served
+                from the in-memory index even when use_database is True
         """
         self.use_database = use_database
+        self.write_behind = write_behind
+        self.pool = pool
 
-        # In-memory fallback storage
-        self._trades: Dict[str, TradeHistoryEntry] = {}
-        self._trades_by_date: Dict[str, List[str]] = {}  # date -> trade_ids
-        self._trades_by_symbol: Dict[str, List[str]] = {}  # symbol -> trade_ids
+        # In-memory index (primary store without a pool, fallback with one)
+        self._index = TradeIndex()
+        self._trades: Dict[str, TradeHistoryEntry] = self._index.trades
+        self._trades_by_date: Dict[str, List[str]] = self._index.by_date
+        self._trades_by_symbol: Dict[str, List[str]] = self._index.by_symbol
 
-        storage_mode = "database" if use_database else "in-memory"
+        storage_mode = "database" if self.database_queries else "in-memory"
         logger.info(f"Trade History Service initialized ({storage_mode} mode)")
 
     async def log_trade(
@@ -127,19 +202,31 @@ class TradeHistoryService:
                 metadata=metadata or {},
             )
 
-            # Store trade
-            self._trades[trade_id] = trade
-
-            # Index by date
-            date_key = trade.timestamp.strftime("%Y-%m-%d")
-            if date_key not in self._trades_by_date:
-                self._trades_by_date[date_key] = []
-            self._trades_by_date[date_key].append(trade_id)
-
-            # Index by symbol
-            if symbol not in self._trades_by_symbol:
-                self._trades_by_symbol[symbol] = []
-            self._trades_by_symbol[symbol].append(trade_id)
+            # Store and index trade (time, date and symbol indexes, rollups)
+            self._index.add(trade)
+
+            insert_args = (
+                trade.id,
+                trade.timestamp,
+                symbol,
+                trade_type.value,
+                side,
+                trade.entry_price,
+                trade.exit_price,
+                quantity,
+                fees,
+                realized_pnl,
+                signal_confidence,
+                signal_reasoning,
+                execution_latency_ms,
+                trade.exchange,
+                order_id,
+            )
+            if self.use_database and self.write_behind is not None:
+                # Persist without blocking the caller on the database
+                self.write_behind.enqueue(_INSERT_TRADE_SQL, *insert_args)
+            elif self.use_database and self.pool is not None:
+                await self.pool.execute(_INSERT_TRADE_SQL, *insert_args)
 
             logger.info(
                 f"Logged trade: {trade_id} | {trade_type.value} | "
@@ -165,7 +252,19 @@ class TradeHistoryService:
         Returns:
             TradeHistoryEntry or None if not found
         """
-        return self._trades.get(trade_id)
+        trade = self._trades.get(trade_id)
+        if trade is not None or not self.database_queries:
+            return trade
+
+        try:
+            pool = await self._query_pool()
+            row = await pool.fetchrow(
+                _SELECT_TRADES_SQL + " WHERE trade_id = $1", trade_id
+            )
+            return self._row_to_trade(row) if row else None
+        except Exception as e:
+            logger.error(f"Error fetching trade {trade_id}: {e}", exc_info=True)
+            return None
 
     async def get_trades(
         self,
@@ -173,43 +272,48 @@ class TradeHistoryService:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         trade_type: Optional[TradeType] = None,
-        limit: int = 100,
+        limit: Optional[int] = 100,
+        before: Optional[TradeCursor] = None,
     ) -> List[TradeHistoryEntry]:
         """
         Query trade history with filters
 
+        Results are ordered newest first by (timestamp, trade ID). To page
+        through large histories, pass the (timestamp, id) of the last trade
+        of the previous page as before (keyset pagination).
+
         Args:
             symbol: Filter by symbol
             start_date: Filter by start date
             end_date: Filter by end date
             trade_type: Filter by trade type
-            limit: Maximum results to return
+            limit: Maximum results to return (None for all)
+            before: Only return trades ordered before this cursor
 
         Returns:
             List of TradeHistoryEntry objects
         """
         try:
-            # Start with all trades
-            trades = list(self._trades.values())
-
-            # Apply filters
-            if symbol:
-                trades = [t for t in trades if t.symbol == symbol]
-
-            if start_date:
-                trades = [t for t in trades if t.timestamp >= start_date]
-
-            if end_date:
-                trades = [t for t in trades if t.timestamp <= end_date]
-
-            if trade_type:
-                trades = [t for t in trades if t.trade_type == trade_type]
-
-            # Sort by timestamp (newest first)
-            trades.sort(key=lambda t: t.timestamp, reverse=True)
-
-            # Apply limit
-            trades = trades[:limit]
+            if self.database_queries:
+                try:
+                    trades = await self._query_trades(
+                        symbol, start_date, end_date, trade_type, limit, before
+                    )
+                    logger.debug(f"Retrieved {len(trades)} trades from database")
+                    return trades
+                except Exception as e:
+                    logger.error(
+                        f"Database trade query failed, using in-memory index: {e}"
+                    )
+
+            trades = self._index.query(
+                symbol=symbol,
+                start=start_date,
+                end=end_date,
+                trade_type=trade_type,
+                limit=limit,
+                before=before,
+            )
 
             logger.debug(f"Retrieved {len(trades)} trades with filters")
 
@@ -229,9 +333,15 @@ class TradeHistoryService:
         Returns:
             List of TradeHistoryEntry objects
         """
-        date_key = date.strftime("%Y-%m-%d")
-        trade_ids = self._trades_by_date.get(date_key, [])
-        return [self._trades[tid] for tid in trade_ids]
+        if not self.database_queries:
+            return self._index.day(date)
+
+        start_date = date.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_date = start_date + timedelta(days=1) - timedelta(microseconds=1)
+        trades = await self.get_trades(
+            start_date=start_date, end_date=end_date, limit=None
+        )
+        return trades[::-1]
 
     async def calculate_statistics(
         self,
@@ -242,6 +352,9 @@ class TradeHistoryService:
         """
         Calculate aggregated trade statistics
 
+        Served from daily rollups, so the cost grows with the number of days
+        in the period rather than the number of trades.
+
         Args:
             start_date: Start of period
             end_date: End of period
@@ -251,143 +364,22 @@ class TradeHistoryService:
             TradeStatistics object
         """
         try:
-            # Get trades in period
-            trades = await self.get_trades(
-                symbol=symbol,
-                start_date=start_date,
-                end_date=end_date,
-                limit=10000,  # Large limit for stats
-            )
-
-            # Filter only exit trades (those with realized P&L)
-            exit_trades = [t for t in trades if t.realized_pnl is not None]
-
-            # Calculate metrics
-            total_trades = len(exit_trades)
-
-            if total_trades == 0:
-                # Return empty stats
-                return TradeStatistics(
-                    total_trades=0,
-                    total_volume=Decimal("0"),
-                    win_rate=Decimal("0"),
-                    total_pnl=Decimal("0"),
-                    period_start=start_date,
-                    period_end=end_date,
-                )
-
-            # Volume
-            total_volume = sum(t.quantity * t.entry_price for t in trades) or Decimal(
-                "0"
-            )
-
-            # Win/loss
-            winning_trades = [
-                t
-                for t in exit_trades
-                if t.realized_pnl is not None and t.realized_pnl > 0
-            ]
-            losing_trades = [
-                t
-                for t in exit_trades
-                if t.realized_pnl is not None and t.realized_pnl < 0
-            ]
-
-            win_count = len(winning_trades)
-            loss_count = len(losing_trades)
-            win_rate = (
-                Decimal(win_count) / Decimal(total_trades) * Decimal("100")
-                if total_trades > 0
-                else Decimal("0")
-            )
-
-            # P&L
-            total_pnl = sum(
-                (t.realized_pnl for t in exit_trades if t.realized_pnl is not None),
-                Decimal("0"),
-            )
-
-            average_win = (
-                sum(
-                    (
-                        t.realized_pnl
-                        for t in winning_trades
-                        if t.realized_pnl is not None
-                    ),
-                    Decimal("0"),
-                )
-                / Decimal(win_count)
-                if win_count > 0
-                else Decimal("0")
-            )
-
-            average_loss = (
-                sum(
-                    (
-                        t.realized_pnl
-                        for t in losing_trades
-                        if t.realized_pnl is not None
-                    ),
-                    Decimal("0"),
-                )
-                / Decimal(loss_count)
-                if loss_count > 0
-                else Decimal("0")
-            )
-
-            largest_win = max(
-                (t.realized_pnl for t in winning_trades if t.realized_pnl is not None),
-                default=Decimal("0"),
-            )
-
-            largest_loss = min(
-                (t.realized_pnl for t in losing_trades if t.realized_pnl is not None),
-                default=Decimal("0"),
-            )
-
-            # Profit factor
-            gross_profit = sum(
-                (t.realized_pnl for t in winning_trades if t.realized_pnl is not None),
-                Decimal("0"),
-            )
-            gross_loss = abs(
-                sum(
-                    (
-                        t.realized_pnl
-                        for t in losing_trades
-                        if t.realized_pnl is not None
-                    ),
-                    Decimal("0"),
-                )
-            )
-            profit_factor = Decimal(
-                gross_profit / gross_loss if gross_loss > 0 else Decimal("0")
-            )
-
-            # Fees
-            total_fees = sum(t.fees for t in trades) or Decimal("0")
-
-            # Create statistics object
-            stats = TradeStatistics(
-                total_trades=total_trades,
-                total_volume=Decimal(total_volume),
-                winning_trades=win_count,
-                losing_trades=loss_count,
-                win_rate=win_rate,
-                total_pnl=Decimal(total_pnl),
-                average_win=average_win,
-                average_loss=average_loss,
-                largest_win=Decimal(largest_win) if largest_win else Decimal("0"),
-                largest_loss=Decimal(largest_loss) if largest_loss else Decimal("0"),
-                profit_factor=Decimal(profit_factor),
-                total_fees=Decimal(total_fees),
-                period_start=start_date,
-                period_end=end_date,
-            )
+            if self.database_queries:
+                try:
+                    rollup = await self._query_rollup(start_date, end_date, symbol)
+                except Exception as e:
+                    logger.error(
+                        f"Database statistics query failed, using in-memory index: {e}"
+                    )
+                    rollup = self._index.rollup(start_date, end_date, symbol)
+            else:
+                rollup = self._index.rollup(start_date, end_date, symbol)
+
+            stats = rollup.to_statistics(start_date, end_date)
 
             logger.info(
-                f"Statistics calculated: {total_trades} trades, "
-                f"Win rate: {win_rate:.1f}%, Total P&L: {total_pnl:+.2f}"
+                f"Statistics calculated: {stats.total_trades} trades, "
+                f"Win rate: {stats.win_rate:.1f}%, Total P&L: {stats.total_pnl:+.2f}"
             )
 
             return stats
@@ -422,7 +414,7 @@ class TradeHistoryService:
             trades = await self.get_trades(
                 start_date=start_date,
                 end_date=end_date,
-                limit=10000,
+                limit=None,
             )
 
             # Calculate statistics
@@ -478,9 +470,125 @@ class TradeHistoryService:
             "total_trades_logged": len(self._trades),
             "unique_symbols": len(self._trades_by_symbol),
             "trading_days": len(self._trades_by_date),
-            "storage_mode": "in-memory",  # TODO: Change to "database" when implemented
+            "storage_mode": "database" if self.database_queries else "in-memory",
         }
 
+    @property
+    def database_queries(self) -> bool:
+        """Whether queries are served from the database"""
+        return self.use_database and self.pool is not None
+
+    # ========================================================================
+    # Database queries
+    # ========================================================================
+
+    async def _query_pool(self) -> DatabasePool:
+        """Write queued trades so database reads include them, return the pool"""
+        if self.pool is None:
+            raise RuntimeError("Trade history database queries need a pool")
+        if self.write_behind is not None and not await self.write_behind.drain():
+            logger.warning(
+                "Write-behind flush failed; database reads may miss queued trades"
+            )
+        return self.pool
+
+    async def _query_trades(
+        self,
+        symbol: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        trade_type: Optional[TradeType],
+        limit: Optional[int],
+        before: Optional[TradeCursor],
+    ) -> List[TradeHistoryEntry]:
+        """Run a filtered, keyset-paginated query against the trades table"""
+        pool = await self._query_pool()
+
+        conditions: List[str] = []
+        args: List[Any] = []
+        for condition, value in (
+            ("symbol = ${}", symbol),
+            ("timestamp >= ${}", start_date),
+            ("timestamp <= ${}", end_date),
+            ("trade_type = ${}", trade_type.value if trade_type else None),
+        ):
+            if value is not None:
+                args.append(value)
+                conditions.append(condition.format(len(args)))
+        if before is not None:
+            args.extend(before)
+            conditions.append(
+                f"(timestamp, trade_id) < (${len(args) - 1}, ${len(args)})"
+            )
+
+        query = _SELECT_TRADES_SQL
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp DESC, trade_id DESC"
+        if limit is not None:
+            args.append(limit)
+            query += f" LIMIT ${len(args)}"
+
+        rows = await pool.fetch(query, *args)
+        return [self._row_to_trade(row) for row in rows]
+
+    async def _query_rollup(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        symbol: Optional[str],
+    ) -> TradeRollup:
+        """
+        Aggregate a period from the database
+
+        Whole days come from the trade_stats_daily continuous aggregate;
+        the partial days at either end are aggregated from raw trades.
+        """
+        pool = await self._query_pool()
+
+        first_day = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        if first_day < start_date:
+            first_day += timedelta(days=1)
+        last_day = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        if last_day < first_day:
+            last_day = first_day  # No whole day inside the period
+
+        rollup = TradeRollup()
+        row = await pool.fetchrow(
+            _RAW_ROLLUP_SQL, start_date, end_date, symbol, first_day, last_day
+        )
+        if row is not None:
+            rollup = TradeRollup.from_row(row)
+        if last_day > first_day:
+            row = await pool.fetchrow(_DAILY_ROLLUP_SQL, first_day, last_day, symbol)
+            if row is not None:
+                rollup.merge(TradeRollup.from_row(row))
+        return rollup
+
+    @staticmethod
+    def _row_to_trade(row: Mapping[str, Any]) -> TradeHistoryEntry:
+        """Convert a trades table row to a TradeHistoryEntry"""
+        return TradeHistoryEntry(
+            id=row["trade_id"],
+            trade_type=TradeType(row["trade_type"]),
+            status=TradeStatus.FILLED,
+            symbol=row["symbol"],
+            exchange=row["exchange"],
+            order_id=row["order_id"] or "",
+            side=row["side"],
+            quantity=row["quantity"],
+            entry_price=row["entry_price"],
+            exit_price=row["exit_price"],
+            fees=row["fees_paid"] or Decimal("0"),
+            realized_pnl=row["realized_pnl"],
+            unrealized_pnl=row["unrealized_pnl"],
+            timestamp=row["timestamp"],
+            signal_confidence=row["signal_confidence"],
+            signal_reasoning=row["signal_reasoning"],
+            execution_latency_ms=row["execution_latency_ms"],
+            leverage=row["leverage"],
+        )
+
 
 # Export
 __all__ = ["TradeHistoryService"]
@@ -0,0 +1,337 @@
+"""
+Trade Index
+
+In-memory storage engine for trade history. TradeHistoryService uses it as
+the primary store when no database pool is configured, and as the fallback
+when a database query fails.
+
+Trades are kept in time-sorted key lists, (timestamp, trade_id), globally,
+per symbol and per day, so range queries bisect to their window instead of
+scanning every trade. Statistics come from per-day rollups maintained on
+insert: fully covered days are merged from rollups and only the partial
+days at the edges of a period are scanned.
+
+The (timestamp, trade_id) key is the same ordering the trades hypertable is
+paged with, so a TradeCursor works against either backend.
+
+Author: Trading System Implementation Team
+Date: 2025-11-20
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from decimal import Decimal
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .models import TradeHistoryEntry, TradeStatistics, TradeType
+
+# Keyset pagination cursor: (timestamp, trade_id) of the last trade returned
+TradeCursor = Tuple[datetime, str]
+
+ZERO = Decimal("0")
+
+_timestamp = itemgetter(0)
+
+_COUNTS = ("trade_count", "exit_count", "win_count", "loss_count")
+
+
+def day_key(timestamp: datetime) -> str:
+    """Day bucket key ('YYYY-MM-DD') for a timestamp"""
+    return timestamp.strftime("%Y-%m-%d")
+
+
+class TradeRollup:
+    """
+    Additive trade aggregates for a period
+
+    Matches the columns of the trade_stats_daily continuous aggregate, so
+    database rows and in-memory trades merge into the same rollup.
+    """
+
+    __slots__ = (
+        "trade_count",
+        "volume",
+        "fees",
+        "exit_count",
+        "win_count",
+        "loss_count",
+        "gross_profit",
+        "gross_loss",
+        "largest_win",
+        "largest_loss",
+    )
+
+    def __init__(self):
+        self.trade_count = 0
+        self.volume = ZERO
+        self.fees = ZERO
+        self.exit_count = 0
+        self.win_count = 0
+        self.loss_count = 0
+        self.gross_profit = ZERO
+        self.gross_loss = ZERO  # Sum of losing P&L (negative)
+        self.largest_win = ZERO
+        self.largest_loss = ZERO
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "TradeRollup":
+        """Build a rollup from an aggregate query row (NULLs read as zero)"""
+        rollup = cls()
+        for field in cls.__slots__:
+            value = row[field]
+            if value is not None:
+                setattr(rollup, field, int(value) if field in _COUNTS else value)
+        return rollup
+
+    def add(self, trade: TradeHistoryEntry) -> None:
+        """Add one trade"""
+        self.trade_count += 1
+        self.volume += trade.quantity * trade.entry_price
+        self.fees += trade.fees
+
+        pnl = trade.realized_pnl
+        if pnl is None:
+            return
+        self.exit_count += 1
+        if pnl > 0:
+            self.win_count += 1
+            self.gross_profit += pnl
+            self.largest_win = max(self.largest_win, pnl)
+        elif pnl < 0:
+            self.loss_count += 1
+            self.gross_loss += pnl
+            self.largest_loss = min(self.largest_loss, pnl)
+
+    def merge(self, other: "TradeRollup") -> None:
+        """Add another rollup"""
+        self.trade_count += other.trade_count
+        self.volume += other.volume
+        self.fees += other.fees
+        self.exit_count += other.exit_count
+        self.win_count += other.win_count
+        self.loss_count += other.loss_count
+        self.gross_profit += other.gross_profit
+        self.gross_loss += other.gross_loss
+        self.largest_win = max(self.largest_win, other.largest_win)
+        self.largest_loss = min(self.largest_loss, other.largest_loss)
+
+    def to_statistics(self, start: datetime, end: datetime) -> TradeStatistics:
+        """
+        Convert to TradeStatistics
+
+        total_trades counts exits (trades with realized P&L); volume and
+        fees cover every trade in the period.
+        """
+        if self.exit_count == 0:
+            return TradeStatistics(
+                total_trades=0,
+                total_volume=ZERO,
+                win_rate=ZERO,
+                total_pnl=ZERO,
+                period_start=start,
+                period_end=end,
+            )
+
+        gross_loss = abs(self.gross_loss)
+        return TradeStatistics(
+            total_trades=self.exit_count,
+            total_volume=Decimal(self.volume),
+            winning_trades=self.win_count,
+            losing_trades=self.loss_count,
+            win_rate=Decimal(self.win_count) / Decimal(self.exit_count) * 100,
+            total_pnl=Decimal(self.gross_profit + self.gross_loss),
+            average_win=(
+                self.gross_profit / self.win_count if self.win_count else ZERO
+            ),
+            average_loss=(
+                self.gross_loss / self.loss_count if self.loss_count else ZERO
+            ),
+            largest_win=Decimal(self.largest_win),
+            largest_loss=Decimal(self.largest_loss),
+            profit_factor=(
+                Decimal(self.gross_profit / gross_loss) if gross_loss > 0 else ZERO
+            ),
+            total_fees=Decimal(self.fees),
+            period_start=start,
+            period_end=end,
+        )
+
+
+class _Bucket:
+    """Time-sorted trade keys with the matching trade IDs"""
+
+    __slots__ = ("keys", "ids")
+
+    def __init__(self, ids: List[str]):
+        self.keys: List[TradeCursor] = []
+        self.ids = ids
+
+    def insert(self, key: TradeCursor) -> None:
+        # Trades are logged in time order, so this is almost always an append
+        if not self.keys or key >= self.keys[-1]:
+            self.keys.append(key)
+            self.ids.append(key[1])
+        else:
+            position = bisect_right(self.keys, key)
+            self.keys.insert(position, key)
+            self.ids.insert(position, key[1])
+
+    def window(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        before: Optional[TradeCursor] = None,
+    ) -> Tuple[int, int]:
+        """Index range of keys with start <= timestamp <= end and key < before"""
+        low = 0 if start is None else bisect_left(self.keys, start, key=_timestamp)
+        high = (
+            len(self.keys)
+            if end is None
+            else bisect_right(self.keys, end, key=_timestamp)
+        )
+        if before is not None:
+            high = min(high, bisect_left(self.keys, before))
+        return low, high
+
+
+class TradeIndex:
+    """
+    Time-indexed in-memory trade store
+
+    Attributes:
+        trades: Trades by ID
+        by_date: Trade IDs per day ('YYYY-MM-DD'), oldest first
+        by_symbol: Trade IDs per symbol, oldest first
+    """
+
+    def __init__(self):
+        self.trades: Dict[str, TradeHistoryEntry] = {}
+        self.by_date: Dict[str, List[str]] = {}
+        self.by_symbol: Dict[str, List[str]] = {}
+
+        self._all = _Bucket([])
+        self._date_buckets: Dict[str, _Bucket] = {}
+        self._symbol_buckets: Dict[str, _Bucket] = {}
+        self._days: List[str] = []  # Sorted day keys
+
+        # day -> rollup, and day -> symbol -> rollup
+        self._day_rollups: Dict[str, TradeRollup] = {}
+        self._symbol_rollups: Dict[str, Dict[str, TradeRollup]] = {}
+
+    def __len__(self) -> int:
+        return len(self.trades)
+
+    def add(self, trade: TradeHistoryEntry) -> None:
+        """Index a trade and add it to its day's rollups"""
+        key = (trade.timestamp, trade.id)
+        date = day_key(trade.timestamp)
+        self.trades[trade.id] = trade
+
+        self._all.insert(key)
+        if date not in self._date_buckets:
+            self._date_buckets[date] = _Bucket(self.by_date.setdefault(date, []))
+            if not self._days or date > self._days[-1]:
+                self._days.append(date)
+            else:
+                self._days.insert(bisect_left(self._days, date), date)
+        self._date_buckets[date].insert(key)
+        if trade.symbol not in self._symbol_buckets:
+            self._symbol_buckets[trade.symbol] = _Bucket(
+                self.by_symbol.setdefault(trade.symbol, [])
+            )
+        self._symbol_buckets[trade.symbol].insert(key)
+
+        self._day_rollups.setdefault(date, TradeRollup()).add(trade)
+        self._symbol_rollups.setdefault(date, {}).setdefault(
+            trade.symbol, TradeRollup()
+        ).add(trade)
+
+    def query(
+        self,
+        symbol: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        trade_type: Optional[TradeType] = None,
+        limit: Optional[int] = None,
+        before: Optional[TradeCursor] = None,
+    ) -> List[TradeHistoryEntry]:
+        """
+        Trades matching the filters, newest first
+
+        Args:
+            symbol: Filter by symbol
+            start: Earliest timestamp (inclusive)
+            end: Latest timestamp (inclusive)
+            trade_type: Filter by trade type
+            limit: Maximum results (None for all)
+            before: Only trades ordered before this cursor
+
+        Returns:
+            List of TradeHistoryEntry objects
+        """
+        if symbol is None:
+            bucket = self._all
+        else:
+            bucket = self._symbol_buckets.get(symbol)
+            if bucket is None:
+                return []
+
+        results: List[TradeHistoryEntry] = []
+        for trade in self._scan(bucket, start, end, before, reverse=True):
+            if trade_type is not None and trade.trade_type != trade_type:
+                continue
+            results.append(trade)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def day(self, timestamp: datetime) -> List[TradeHistoryEntry]:
+        """Trades on the day of timestamp, oldest first"""
+        return [self.trades[tid] for tid in self.by_date.get(day_key(timestamp), [])]
+
+    def rollup(
+        self,
+        start: datetime,
+        end: datetime,
+        symbol: Optional[str] = None,
+    ) -> TradeRollup:
+        """
+        Aggregate trades with start <= timestamp <= end
+
+        Days entirely inside the period are merged from their rollups; only
+        the partial first and last day are scanned trade by trade.
+        """
+        result = TradeRollup()
+        low = bisect_left(self._days, day_key(start))
+        high = bisect_right(self._days, day_key(end))
+        for date in self._days[low:high]:
+            day_start = datetime.fromisoformat(date)
+            if day_start >= start and day_start + timedelta(days=1) <= end:
+                if symbol is None:
+                    result.merge(self._day_rollups[date])
+                elif symbol in self._symbol_rollups[date]:
+                    result.merge(self._symbol_rollups[date][symbol])
+                continue
+
+            for trade in self._scan(self._date_buckets[date], start, end):
+                if symbol is None or trade.symbol == symbol:
+                    result.add(trade)
+        return result
+
+    def _scan(
+        self,
+        bucket: _Bucket,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        before: Optional[TradeCursor] = None,
+        reverse: bool = False,
+    ) -> Iterator[TradeHistoryEntry]:
+        low, high = bucket.window(start, end, before)
+        positions = range(high - 1, low - 1, -1) if reverse else range(low, high)
+        for position in positions:
+            yield self.trades[bucket.ids[position]]
+
+
+# Export
+__all__ = ["TradeIndex", "TradeRollup", "TradeCursor", "day_key"]
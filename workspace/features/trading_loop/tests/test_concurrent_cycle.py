@@ -0,0 +1,264 @@
+"""
+Concurrent Trading Cycle Tests
+
+Tests for the bounded-concurrency cycle mode of the trading engine.
+
+Author: Trading Loop Implementation Team
+Date: 2025-11-08
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from workspace.features.trading_loop.trading_engine import (
+    TradingDecision,
+    TradingEngine,
+    TradingSignal,
+)
+
+SYMBOLS = [f"SYM{i}USDT" for i in range(10)]
+
+
+def _signal(symbol: str, decision: TradingDecision) -> TradingSignal:
+    return TradingSignal(
+        symbol=symbol,
+        decision=decision,
+        confidence=Decimal("0.8"),
+        size_pct=Decimal("0.1"),
+    )
+
+
+def _snapshot(symbol: str):
+    snapshot = Mock()
+    snapshot.symbol = symbol
+    snapshot.has_all_indicators = True
+    snapshot.ohlcv.close = Decimal("100")
+    return snapshot
+
+
+@pytest.fixture
+def market_data_service():
+    """Market data service with 50ms snapshot latency"""
+    service = AsyncMock()
+
+    async def get_snapshot(symbol):
+        await asyncio.sleep(0.05)
+        return _snapshot(symbol)
+
+    service.get_snapshot = AsyncMock(side_effect=get_snapshot)
+    return service
+
+
+@pytest.fixture
+def trade_executor():
+    """Trade executor with 50ms order latency that records call order"""
+    executor = AsyncMock()
+    executor.calls = []
+    executor.get_account_balance = AsyncMock(return_value=Decimal("2500"))
+
+    async def execute_signal(signal, **kwargs):
+        executor.calls.append((signal.symbol, "start"))
+        await asyncio.sleep(0.05)
+        executor.calls.append((signal.symbol, "end"))
+        return Mock(success=True, order=None, latency_ms=50)
+
+    executor.execute_signal = AsyncMock(side_effect=execute_signal)
+    return executor
+
+
+def _engine(market_data_service, trade_executor, **kwargs) -> TradingEngine:
+    return TradingEngine(
+        market_data_service=market_data_service,
+        trade_executor=trade_executor,
+        symbols=SYMBOLS,
+        concurrent=True,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_snapshots_fetched_concurrently(market_data_service, trade_executor):
+    engine = _engine(market_data_service, trade_executor, max_concurrency=10)
+
+    start = time.perf_counter()
+    snapshots = await engine._fetch_market_data_snapshots()
+    elapsed = time.perf_counter() - start
+
+    assert list(snapshots) == SYMBOLS
+    assert elapsed < 0.3  # serial would take 0.5s
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(market_data_service, trade_executor):
+    in_flight = 0
+    peak = 0
+
+    async def get_snapshot(symbol):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _snapshot(symbol)
+
+    market_data_service.get_snapshot = AsyncMock(side_effect=get_snapshot)
+    engine = _engine(market_data_service, trade_executor, max_concurrency=3)
+
+    await engine._fetch_market_data_snapshots()
+
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_symbol_timeout_isolated(market_data_service, trade_executor):
+    async def get_snapshot(symbol):
+        await asyncio.sleep(1.0 if symbol == "SYM3USDT" else 0.01)
+        return _snapshot(symbol)
+
+    market_data_service.get_snapshot = AsyncMock(side_effect=get_snapshot)
+    engine = _engine(market_data_service, trade_executor, symbol_timeout_seconds=0.1)
+
+    snapshots = await engine._fetch_market_data_snapshots()
+
+    assert "SYM3USDT" not in snapshots
+    assert len(snapshots) == len(SYMBOLS) - 1
+
+
+@pytest.mark.asyncio
+async def test_balance_fetched_once_per_cycle(market_data_service, trade_executor):
+    engine = _engine(market_data_service, trade_executor)
+    signals = {s: _signal(s, TradingDecision.BUY) for s in SYMBOLS}
+
+    stats = await engine._execute_trades(signals)
+
+    assert stats["orders_placed"] == len(SYMBOLS)
+    assert trade_executor.get_account_balance.await_count == 1
+    for call in trade_executor.execute_signal.await_args_list:
+        assert call.kwargs["account_balance_chf"] == Decimal("2500")
+
+
+@pytest.mark.asyncio
+async def test_shared_margin_group_is_serial_close_first(
+    market_data_service, trade_executor
+):
+    engine = _engine(
+        market_data_service,
+        trade_executor,
+        margin_groups={"SYM0USDT": "cross", "SYM1USDT": "cross"},
+    )
+    signals = {
+        "SYM0USDT": _signal("SYM0USDT", TradingDecision.BUY),
+        "SYM1USDT": _signal("SYM1USDT", TradingDecision.CLOSE),
+        "SYM2USDT": _signal("SYM2USDT", TradingDecision.SELL),
+        "SYM3USDT": _signal("SYM3USDT", TradingDecision.HOLD),
+    }
+
+    await engine._execute_trades(signals)
+
+    grouped = [c for c in trade_executor.calls if c[0] in ("SYM0USDT", "SYM1USDT")]
+    assert grouped == [
+        ("SYM1USDT", "start"),
+        ("SYM1USDT", "end"),
+        ("SYM0USDT", "start"),
+        ("SYM0USDT", "end"),
+    ]
+    # The independent symbol overlaps with the group
+    calls = trade_executor.calls
+    assert calls.index(("SYM2USDT", "start")) < calls.index(("SYM1USDT", "end"))
+    assert trade_executor.execute_signal.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_execution_timeout_counts_failure(market_data_service, trade_executor):
+    async def execute_signal(signal, **kwargs):
+        await asyncio.sleep(1.0 if signal.symbol == "SYM0USDT" else 0)
+        return Mock(success=True, order=None, latency_ms=1)
+
+    trade_executor.execute_signal = AsyncMock(side_effect=execute_signal)
+    engine = _engine(market_data_service, trade_executor, symbol_timeout_seconds=0.1)
+    signals = {s: _signal(s, TradingDecision.BUY) for s in SYMBOLS[:3]}
+
+    stats = await engine._execute_trades(signals)
+
+    assert stats == {"orders_placed": 2, "orders_filled": 0, "orders_failed": 1}
+
+
+@pytest.mark.asyncio
+async def test_balance_failure_fails_all_signals(market_data_service, trade_executor):
+    trade_executor.get_account_balance = AsyncMock(side_effect=Exception("down"))
+    engine = _engine(market_data_service, trade_executor)
+    signals = {s: _signal(s, TradingDecision.BUY) for s in SYMBOLS[:4]}
+
+    stats = await engine._execute_trades(signals)
+
+    assert stats["orders_failed"] == 4
+    assert trade_executor.execute_signal.await_count == 0
+
+
+@pytest.mark.asyncio
+async def test_cycle_reports_stage_timings(market_data_service, trade_executor):
+    decision_engine = AsyncMock()
+    decision_engine.generate_signals = AsyncMock(
+        return_value={s: _signal(s, TradingDecision.BUY) for s in SYMBOLS}
+    )
+    engine = _engine(market_data_service, trade_executor)
+    engine.decision_engine = decision_engine
+
+    result = await engine.execute_trading_cycle(cycle_number=1)
+
+    assert result.success is True
+    assert result.orders_placed == len(SYMBOLS)
+    assert set(result.stage_timings) == {"market_data", "signals", "execution"}
+    assert result.stage_timings["execution"] < 0.4  # serial would take 0.5s
+    assert result.to_dict()["stage_timings"] == result.stage_timings
+
+
+def test_invalid_max_concurrency(market_data_service, trade_executor):
+    with pytest.raises(ValueError):
+        _engine(market_data_service, trade_executor, max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_streamed_signals_execute_before_generation_ends(
+    market_data_service, trade_executor
+):
+    events = []
+
+    async def generate_signals(snapshots, on_signal=None):
+        signals = {
+            "SYM0USDT": _signal("SYM0USDT", TradingDecision.BUY),
+            "SYM1USDT": _signal("SYM1USDT", TradingDecision.CLOSE),
+            "SYM2USDT": _signal("SYM2USDT", TradingDecision.HOLD),
+        }
+        for signal in signals.values():
+            await on_signal(signal)
+        await asyncio.sleep(0.1)  # rest of the completion still streaming
+        events.append("generation_done")
+        return signals
+
+    decision_engine = Mock()
+    decision_engine.streaming = True
+    decision_engine.generate_signals = generate_signals
+
+    async def execute_signal(signal, **kwargs):
+        events.append(signal.symbol)
+        return Mock(success=True, order=None, latency_ms=1)
+
+    trade_executor.execute_signal = AsyncMock(side_effect=execute_signal)
+    engine = _engine(
+        market_data_service, trade_executor, margin_groups={"SYM1USDT": "cross"}
+    )
+    engine.decision_engine = decision_engine
+
+    result = await engine.execute_trading_cycle(cycle_number=1)
+
+    assert result.success is True
+    assert result.orders_placed == 2
+    # Independent symbol ran early; margin-grouped symbol waited for the batch
+    assert events == ["SYM0USDT", "generation_done", "SYM1USDT"]
+    assert "first_dispatch" in result.stage_timings
+    assert result.stage_timings["first_dispatch"] < result.stage_timings["signals"]
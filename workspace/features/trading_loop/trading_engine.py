@@ -3,25 +3,40 @@ Trading Engine
 
 Coordinates market data, decision engine, and trade execution for each trading cycle.
 
+In concurrent mode, per-symbol snapshot fetches and order executions run as
+bounded asyncio task groups with per-symbol timeouts; symbols that share
+margin are executed in order within their group.
+
+With a streaming decision engine, signals for symbols outside margin groups
+are executed as soon as they are parsed, while the completion is still
+streaming; the rest are executed once all signals are known.
+
 Author: Trading Loop Implementation Team
 Date: 2025-10-28
 """
 
+import asyncio
 import logging
+import time
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar, Union
 
 # Import components
 from workspace.features.market_data import MarketDataService, MarketDataSnapshot
 from workspace.features.paper_trading import PaperTradingExecutor
 from workspace.features.position_manager import PositionManager
+from workspace.features.risk_manager import RiskManager
 from workspace.features.trade_executor import TradeExecutor
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class TradingDecision(str, Enum):
     """Trading decision from decision engine"""
@@ -126,6 +141,7 @@ class TradingCycleResult:
 
     # Performance
     duration_seconds: float = 0.0
+    stage_timings: Dict[str, float] = field(default_factory=dict)  # stage -> seconds
     errors: List[str] = field(default_factory=list)
 
     # Metadata
@@ -148,6 +164,7 @@ class TradingCycleResult:
             "orders_filled": self.orders_filled,
             "orders_failed": self.orders_failed,
             "duration_seconds": self.duration_seconds,
+            "stage_timings": self.stage_timings,
             "errors_count": len(self.errors),
             "success": self.success,
         }
@@ -164,7 +181,7 @@ class TradingEngine:
     4. Update positions and risk management
 
     Features:
-    - Multi-symbol coordination
+    - Multi-symbol coordination (serial or bounded-concurrent)
     - Error handling and recovery
     - Performance tracking
     - Decision engine integration (LLM)
@@ -175,6 +192,12 @@ class TradingEngine:
         trade_executor: Trade execution service
         position_manager: Position tracking
         symbols: List of trading pairs to manage
+        concurrent: Run per-symbol work concurrently
+        max_concurrency: Maximum in-flight per-symbol tasks
+        symbol_timeout_seconds: Timeout per symbol task (concurrent mode)
+        margin_groups: Symbol -> margin group; symbols in the same group
+            execute sequentially (CLOSE first) in concurrent mode
+        risk_manager: Validates each signal before execution (optional)
 
     Example:
         ```python
@@ -203,6 +226,11 @@ class TradingEngine:
         paper_trading_initial_balance: Decimal = Decimal("10000"),
         api_key: Optional[str] = None,
         api_secret: Optional[str] = None,
+        concurrent: bool = False,
+        max_concurrency: int = 8,
+        symbol_timeout_seconds: float = 30.0,
+        margin_groups: Optional[Dict[str, str]] = None,
+        risk_manager: Optional[RiskManager] = None,
     ):
         """
         Initialize Trading Engine
@@ -217,12 +245,30 @@ class TradingEngine:
             paper_trading_initial_balance: Initial balance for paper trading (default: 10000 USDT)
             api_key: Bybit API key (required for paper trading)
             api_secret: Bybit API secret (required for paper trading)
+            concurrent: Fetch snapshots and execute signals concurrently
+                (default: False, serial)
+            max_concurrency: Maximum concurrent per-symbol tasks (default: 8)
+            symbol_timeout_seconds: Per-symbol timeout in concurrent mode
+                (default: 30s)
+            margin_groups: Mapping of symbol to margin group name. Symbols in
+                the same group share margin and are executed one at a time,
+                CLOSE signals first; ungrouped symbols are independent.
+            risk_manager: Risk manager passed to the trade executor to
+                validate each signal (default: None, no pre-trade checks)
         """
         self.market_data_service = market_data_service
         self.symbols = symbols or []
         self.decision_engine = decision_engine
         self.paper_trading = paper_trading
 
+        # Concurrency
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+        self.concurrent = concurrent
+        self.max_concurrency = max_concurrency
+        self.symbol_timeout_seconds = symbol_timeout_seconds
+        self.margin_groups = margin_groups or {}
+
         # Initialize trade executor based on mode
         if paper_trading:
             if not api_key or not api_secret:
@@ -245,6 +291,9 @@ class TradingEngine:
         # Position manager (optional)
         self.position_manager = position_manager
 
+        # Pre-trade signal validation (optional)
+        self.risk_manager = risk_manager
+
         # State
         self.cycle_count = 0
         self.total_orders = 0
@@ -283,17 +332,28 @@ class TradingEngine:
         try:
             # Step 1: Fetch market data snapshots
             logger.info("Step 1: Fetching market data snapshots")
+            stage_start = time.perf_counter()
             result.snapshots = await self._fetch_market_data_snapshots()
+            result.stage_timings["market_data"] = time.perf_counter() - stage_start
             logger.info(f"Fetched {len(result.snapshots)} snapshots")
 
-            # Step 2: Generate trading signals
-            logger.info("Step 2: Generating trading signals")
-            result.signals = await self._generate_trading_signals(result.snapshots)
-            logger.info(f"Generated {len(result.signals)} signals")
-
-            # Step 3: Execute trades
-            logger.info("Step 3: Executing trades")
-            execution_results = await self._execute_trades(result.signals)
+            if self._streams_signals():
+                # Steps 2+3 overlap: trades start while signals stream in
+                logger.info("Step 2+3: Streaming signals with early execution")
+                execution_results = await self._stream_and_execute(result)
+            else:
+                # Step 2: Generate trading signals
+                logger.info("Step 2: Generating trading signals")
+                stage_start = time.perf_counter()
+                result.signals = await self._generate_trading_signals(result.snapshots)
+                result.stage_timings["signals"] = time.perf_counter() - stage_start
+                logger.info(f"Generated {len(result.signals)} signals")
+
+                # Step 3: Execute trades
+                logger.info("Step 3: Executing trades")
+                stage_start = time.perf_counter()
+                execution_results = await self._execute_trades(result.signals)
+                result.stage_timings["execution"] = time.perf_counter() - stage_start
             result.orders_placed = execution_results["orders_placed"]
             result.orders_filled = execution_results["orders_filled"]
             result.orders_failed = execution_results["orders_failed"]
@@ -331,22 +391,29 @@ class TradingEngine:
 
         Note: Symbols without valid snapshots are excluded from result
         """
+        if self.concurrent:
+            results = await self._run_per_symbol(
+                {
+                    symbol: partial(self._fetch_snapshot, symbol)
+                    for symbol in self.symbols
+                },
+                timeout=self.symbol_timeout_seconds,
+            )
+            snapshots = {}
+            for symbol, outcome in results.items():
+                if isinstance(outcome, BaseException):
+                    logger.error(f"Error fetching snapshot for {symbol}: {outcome!r}")
+                elif outcome is not None:
+                    snapshots[symbol] = outcome
+            return snapshots
+
         snapshots = {}
 
         for symbol in self.symbols:
             try:
-                snapshot = await self.market_data_service.get_snapshot(symbol)
-
-                if snapshot is None:
-                    logger.warning(f"No snapshot available for {symbol}")
-                    continue
-
-                if not snapshot.has_all_indicators:
-                    logger.warning(f"Incomplete indicators for {symbol}")
-                    continue
-
-                snapshots[symbol] = snapshot
-                logger.debug(f"Snapshot fetched: {symbol} @ {snapshot.ohlcv.close}")
+                snapshot = await self._fetch_snapshot(symbol)
+                if snapshot is not None:
+                    snapshots[symbol] = snapshot
 
             except Exception as e:
                 logger.error(
@@ -355,6 +422,56 @@ class TradingEngine:
 
         return snapshots
 
+    async def _fetch_snapshot(self, symbol: str) -> Optional[MarketDataSnapshot]:
+        """Fetch one snapshot, or None if missing or incomplete"""
+        snapshot = await self.market_data_service.get_snapshot(symbol)
+
+        if snapshot is None:
+            logger.warning(f"No snapshot available for {symbol}")
+            return None
+
+        if not snapshot.has_all_indicators:
+            logger.warning(f"Incomplete indicators for {symbol}")
+            return None
+
+        logger.debug(f"Snapshot fetched: {symbol} @ {snapshot.ohlcv.close}")
+        return snapshot
+
+    async def _run_per_symbol(
+        self,
+        jobs: Dict[str, Callable[[], Awaitable[T]]],
+        timeout: Optional[float],
+    ) -> Dict[str, Union[T, BaseException]]:
+        """
+        Run one job per key in a bounded task group
+
+        A failing or timed-out job yields its exception instead of
+        cancelling its siblings.
+
+        Args:
+            jobs: Mapping of key (symbol or margin group) to job factory
+            timeout: Per-job timeout in seconds (None for no timeout)
+
+        Returns:
+            Mapping of key to result or exception, in the order of jobs
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        outcomes: Dict[str, Union[T, BaseException]] = {}
+
+        async def run(key: str, job: Callable[[], Awaitable[T]]):
+            async with semaphore:
+                try:
+                    async with asyncio.timeout(timeout):
+                        outcomes[key] = await job()
+                except Exception as e:
+                    outcomes[key] = e
+
+        async with asyncio.TaskGroup() as group:
+            for key, job in jobs.items():
+                group.create_task(run(key, job))
+
+        return {key: outcomes[key] for key in jobs}
+
     async def _generate_trading_signals(
         self,
         snapshots: Dict[str, MarketDataSnapshot],
@@ -394,6 +511,111 @@ class TradingEngine:
 
         return signals
 
+    def _streams_signals(self) -> bool:
+        """Whether the decision engine dispatches signals while streaming"""
+        return getattr(self.decision_engine, "streaming", False) is True
+
+    async def _stream_and_execute(self, result: TradingCycleResult) -> Dict[str, int]:
+        """
+        Generate signals from a streaming decision engine, executing each
+        independent signal as soon as it arrives
+
+        Signals for symbols in a margin group (which need CLOSE-first
+        ordering) and signals that were not streamed (cache hits, HOLD
+        fallbacks) are executed through _execute_trades once generation
+        completes. Records "signals", "first_dispatch" and "execution"
+        stage timings on the result.
+
+        Args:
+            result: Cycle result holding the snapshots; receives the signals
+
+        Returns:
+            Execution statistics (see _execute_trades)
+        """
+        stats = {
+            "orders_placed": 0,
+            "orders_filled": 0,
+            "orders_failed": 0,
+        }
+        semaphore = asyncio.Semaphore(self.max_concurrency if self.concurrent else 1)
+        dispatched: Dict[str, TradingSignal] = {}
+        balance: Optional[asyncio.Future] = None
+        error: Optional[Exception] = None
+        stage_start = time.perf_counter()
+        decision_engine = self.decision_engine
+        if decision_engine is None:
+            raise RuntimeError("Streaming execution needs a decision engine")
+
+        async def execute(signal: TradingSignal, balance: asyncio.Future):
+            async with semaphore:
+                try:
+                    async with asyncio.timeout(self.symbol_timeout_seconds):
+                        # One balance snapshot shared by all streamed signals
+                        account_balance_chf = await asyncio.shield(balance)
+                        await self._execute_signal(
+                            signal.symbol, signal, stats, account_balance_chf
+                        )
+                except TimeoutError:
+                    stats["orders_failed"] += 1
+                    logger.error(
+                        f"Execution for {signal.symbol} timed out after "
+                        f"{self.symbol_timeout_seconds}s (order state unknown)"
+                    )
+                except Exception as e:
+                    stats["orders_failed"] += 1
+                    logger.error(
+                        f"Error executing signal for {signal.symbol}: {e}",
+                        exc_info=True,
+                    )
+
+        async with asyncio.TaskGroup() as group:
+
+            async def on_signal(signal: TradingSignal):
+                nonlocal balance
+                if (
+                    signal.decision == TradingDecision.HOLD
+                    or signal.symbol in self.margin_groups
+                ):
+                    return
+                if balance is None:
+                    balance = asyncio.ensure_future(
+                        self.trade_executor.get_account_balance()
+                    )
+                    result.stage_timings["first_dispatch"] = (
+                        time.perf_counter() - stage_start
+                    )
+                dispatched[signal.symbol] = signal
+                group.create_task(execute(signal, balance))
+
+            # Errors are raised only after in-flight orders have finished
+            try:
+                result.signals = await decision_engine.generate_signals(
+                    result.snapshots, on_signal=on_signal
+                )
+            except Exception as e:
+                error = e
+            result.stage_timings["signals"] = time.perf_counter() - stage_start
+
+            if error is None:
+                logger.info(
+                    f"Generated {len(result.signals)} signals "
+                    f"({len(dispatched)} dispatched while streaming)"
+                )
+                remaining = {
+                    symbol: signal
+                    for symbol, signal in result.signals.items()
+                    if symbol not in dispatched
+                }
+                for key, value in (await self._execute_trades(remaining)).items():
+                    stats[key] += value
+
+        if balance is not None and not balance.done():
+            balance.cancel()
+        result.stage_timings["execution"] = time.perf_counter() - stage_start
+        if error is not None:
+            raise error
+        return stats
+
     async def _execute_trades(
         self,
         signals: Dict[str, TradingSignal],
@@ -416,6 +638,10 @@ class TradingEngine:
             "orders_failed": 0,
         }
 
+        if self.concurrent:
+            await self._execute_trades_concurrently(signals, stats)
+            return stats
+
         for symbol, signal in signals.items():
             try:
                 # Skip HOLD signals
@@ -432,11 +658,78 @@ class TradingEngine:
 
         return stats
 
+    async def _execute_trades_concurrently(
+        self,
+        signals: Dict[str, TradingSignal],
+        stats: Dict[str, int],
+    ):
+        """
+        Execute signals as concurrent margin groups
+
+        The account balance is fetched once and shared by every signal of the
+        cycle. Signals in the same margin group run sequentially, CLOSE
+        first so freed margin is available to new entries; groups run
+        concurrently, bounded by max_concurrency.
+
+        Args:
+            signals: Trading signals for each symbol
+            stats: Statistics dictionary to update
+        """
+        groups: Dict[str, List[TradingSignal]] = defaultdict(list)
+        for symbol, signal in signals.items():
+            if signal.decision == TradingDecision.HOLD:
+                logger.debug(f"Skipping {symbol} (HOLD signal)")
+                continue
+            groups[self.margin_groups.get(symbol, symbol)].append(signal)
+
+        if not groups:
+            return
+
+        try:
+            async with asyncio.timeout(self.symbol_timeout_seconds):
+                account_balance_chf = await self.trade_executor.get_account_balance()
+        except Exception as e:
+            pending = sum(len(group) for group in groups.values())
+            logger.error(f"Balance snapshot failed, skipping {pending} signals: {e!r}")
+            stats["orders_failed"] += pending
+            return
+
+        async def run_group(group: List[TradingSignal]):
+            # Stable sort: CLOSE signals first, otherwise signal order
+            ordered = sorted(
+                group, key=lambda signal: signal.decision != TradingDecision.CLOSE
+            )
+            for signal in ordered:
+                try:
+                    async with asyncio.timeout(self.symbol_timeout_seconds):
+                        await self._execute_signal(
+                            signal.symbol, signal, stats, account_balance_chf
+                        )
+                except TimeoutError:
+                    stats["orders_failed"] += 1
+                    logger.error(
+                        f"Execution for {signal.symbol} timed out after "
+                        f"{self.symbol_timeout_seconds}s (order state unknown)"
+                    )
+                except Exception as e:
+                    stats["orders_failed"] += 1
+                    logger.error(
+                        f"Error executing signal for {signal.symbol}: {e}",
+                        exc_info=True,
+                    )
+
+        await self._run_per_symbol(
+            {name: partial(run_group, group) for name, group in groups.items()},
+            # Each signal in a group already has its own timeout
+            timeout=None,
+        )
+
     async def _execute_signal(
         self,
         symbol: str,
         signal: TradingSignal,
         stats: Dict[str, int],
+        account_balance_chf: Optional[Decimal] = None,
     ):
         """
         Execute a single trading signal
@@ -445,6 +738,7 @@ class TradingEngine:
             symbol: Trading pair
             signal: Trading signal
             stats: Statistics dictionary to update
+            account_balance_chf: Cycle balance snapshot (fetched if None)
         """
         logger.info(
             f"Signal: {symbol} | {signal.decision.value.upper()} | "
@@ -456,7 +750,8 @@ class TradingEngine:
 
         try:
             # Get account balance from exchange (real-time with 60s caching)
-            account_balance_chf = await self.trade_executor.get_account_balance()
+            if account_balance_chf is None:
+                account_balance_chf = await self.trade_executor.get_account_balance()
             # TODO: In production, fetch real-time CHF/USD rate from forex API
             chf_to_usd_rate = Decimal("1.10")
 
@@ -465,7 +760,7 @@ class TradingEngine:
                 signal=signal,
                 account_balance_chf=account_balance_chf,
                 chf_to_usd_rate=chf_to_usd_rate,
-                risk_manager=None,  # TODO: Add risk manager integration
+                risk_manager=self.risk_manager,
             )
 
             # Update stats based on result
@@ -476,9 +771,11 @@ class TradingEngine:
                     f"(latency: {result.latency_ms}ms)"
                 )
                 if result.order:
+                    # Order holds a plain value unless status was set after init
+                    status = getattr(result.order.status, "value", result.order.status)
                     logger.debug(
                         f"Order ID: {result.order.exchange_order_id}, "
-                        f"Status: {result.order.status.value}"
+                        f"Status: {status}"
                     )
             else:
                 stats["orders_failed"] += 1
@@ -20,7 +20,7 @@ Usage:
 
 import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import redis.asyncio as redis
 
@@ -156,6 +156,42 @@ class RedisManager:
             logger.error(f"Redis GET error for key '{key}': {e}")
             return None
 
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        Get value from Redis together with its remaining lifetime
+
+        GET and PTTL are sent in one pipeline (a single round trip).
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (deserialized value or None, seconds left or None if the key
+            has no expiry)
+        """
+        if not self.is_initialized or self.client is None:
+            raise RuntimeError("Redis not initialized. Call initialize() first.")
+
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                value, pttl = await pipe.execute()
+            if value is None:
+                return None, None
+
+            ttl = pttl / 1000 if pttl is not None and pttl >= 0 else None
+            try:
+                return json.loads(value), ttl
+            except json.JSONDecodeError:
+                logger.warning(f"Key '{key}' contains non-JSON data")
+                raw = value.decode("utf-8") if isinstance(value, bytes) else value
+                return raw, ttl
+
+        except Exception as e:
+            logger.error(f"Redis GET error for key '{key}': {e}")
+            return None, None
+
     async def set(
         self,
         key: str,
@@ -265,6 +301,107 @@ class RedisManager:
             logger.error(f"Redis CLEAR error for pattern '{pattern}': {e}")
             return 0
 
+    async def set_nx(self, key: str, value: Any, ttl_seconds: float) -> bool:
+        """
+        Set value only if the key does not exist (lock acquisition)
+
+        Args:
+            key: Cache key
+            value: Value to store (will be JSON serialized)
+            ttl_seconds: Time-to-live in seconds
+
+        Returns:
+            True if the key was set, False if it already existed
+
+        Raises:
+            Exception: If the Redis command fails (callers must not mistake
+                an outage for a lock held by someone else)
+        """
+        if not self.is_initialized or self.client is None:
+            raise RuntimeError("Redis not initialized. Call initialize() first.")
+
+        try:
+            result = await self.client.set(
+                key,
+                json.dumps(value, default=str),
+                nx=True,
+                px=max(1, int(ttl_seconds * 1000)),
+            )
+            return bool(result)
+
+        except Exception as e:
+            logger.error(f"Redis SET NX error for key '{key}': {e}")
+            raise
+
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        """
+        Delete key only if it still holds value (lock release)
+
+        Args:
+            key: Cache key
+            value: Expected value (compared in serialized form)
+
+        Returns:
+            True if the key was deleted
+        """
+        if not self.is_initialized or self.client is None:
+            raise RuntimeError("Redis not initialized. Call initialize() first.")
+
+        script = (
+            "if redis.call('get', KEYS[1]) == ARGV[1] then "
+            "return redis.call('del', KEYS[1]) else return 0 end"
+        )
+        try:
+            result = await self.client.eval(
+                script, 1, key, json.dumps(value, default=str)
+            )
+            return bool(result)
+
+        except Exception as e:
+            logger.error(f"Redis compare-and-delete error for key '{key}': {e}")
+            return False
+
+    async def publish(self, channel: str, message: Any) -> int:
+        """
+        Publish a message on a pub/sub channel
+
+        Args:
+            channel: Channel name
+            message: Message (will be JSON serialized)
+
+        Returns:
+            Number of subscribers that received the message
+        """
+        if not self.is_initialized or self.client is None:
+            raise RuntimeError("Redis not initialized. Call initialize() first.")
+
+        try:
+            return int(
+                await self.client.publish(channel, json.dumps(message, default=str))
+            )
+
+        except Exception as e:
+            logger.error(f"Redis PUBLISH error for channel '{channel}': {e}")
+            return 0
+
+    async def subscribe(self, *channels: str) -> Any:
+        """
+        Subscribe to pub/sub channels
+
+        Args:
+            *channels: Channel names
+
+        Returns:
+            PubSub object; iterate pubsub.listen() for messages and call
+            pubsub.aclose() when done
+        """
+        if not self.is_initialized or self.client is None:
+            raise RuntimeError("Redis not initialized. Call initialize() first.")
+
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(*channels)
+        return pubsub
+
     async def get_stats(self) -> Dict[str, Any]:
         """
         Get Redis statistics
@@ -0,0 +1,68 @@
+"""
+Migration 003: Market Data Bulk Ingestion
+
+Extends the market_data hypertable so every symbol and timeframe can be
+loaded in batches: adds timeframe, quote_volume and trades_count columns and
+a unique (symbol, timeframe, timestamp) index, the conflict target of the
+set-based upsert run by OHLCVIngestor after COPYing into a staging table.
+
+Created: 2025-11-11
+Sprint: Market Data Bulk Ingestion
+"""
+
+import asyncpg
+
+
+async def upgrade(conn: asyncpg.Connection) -> None:
+    """
+    Apply migration: Add timeframe columns and upsert key to market_data.
+
+    Args:
+        conn: Database connection
+    """
+    await conn.execute(
+        """
+        -- Existing rows were written for the primary 3m timeframe
+        ALTER TABLE market_data
+            ADD COLUMN IF NOT EXISTS timeframe VARCHAR(5) NOT NULL DEFAULT '3m',
+            ADD COLUMN IF NOT EXISTS quote_volume NUMERIC(30, 8),
+            ADD COLUMN IF NOT EXISTS trades_count INTEGER;
+
+        -- Upsert target (includes the hypertable partitioning column)
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_market_data_symbol_timeframe_timestamp
+            ON market_data(symbol, timeframe, timestamp DESC);
+
+        -- Comment on columns
+        COMMENT ON COLUMN market_data.timeframe IS
+            'Candle timeframe (1m, 3m, 5m, 15m, 30m, 1h, 4h, 1d)';
+        COMMENT ON COLUMN market_data.quote_volume IS
+            'Traded volume in quote currency (turnover)';
+        COMMENT ON COLUMN market_data.trades_count IS
+            'Number of trades in the candle (NULL if not reported)';
+    """
+    )
+
+    print("✅ Migration 003 applied: market_data bulk ingestion columns added")
+
+
+async def downgrade(conn: asyncpg.Connection) -> None:
+    """
+    Rollback migration: Drop timeframe columns and upsert key.
+
+    Args:
+        conn: Database connection
+    """
+    await conn.execute(
+        """
+        -- Drop index first
+        DROP INDEX IF EXISTS idx_market_data_symbol_timeframe_timestamp;
+
+        -- Drop columns
+        ALTER TABLE market_data
+            DROP COLUMN IF EXISTS trades_count,
+            DROP COLUMN IF EXISTS quote_volume,
+            DROP COLUMN IF EXISTS timeframe;
+    """
+    )
+
+    print("✅ Migration 003 rolled back: market_data bulk ingestion columns dropped")
@@ -0,0 +1,110 @@
+"""
+Migration 004: Trade History Query Indexes and Daily Rollups
+
+Adds composite indexes matching TradeHistoryService's keyset-paginated
+queries (ORDER BY timestamp DESC, trade_id DESC, optionally filtered by
+symbol or trade type) and the trade_stats_daily continuous aggregate that
+calculate_statistics() reads whole days from.
+
+Continuous aggregates cannot be created inside a transaction block, so the
+view and its refresh policy are created with separate statements.
+
+Created: 2025-11-20
+Sprint: Trade History Query Engine
+"""
+
+import asyncpg
+
+
+async def upgrade(conn: asyncpg.Connection) -> None:
+    """
+    Apply migration: Add trade query indexes and the daily stats aggregate.
+
+    Args:
+        conn: Database connection
+    """
+    await conn.execute(
+        """
+        -- Keyset pagination: (timestamp, trade_id) < ($cursor_ts, $cursor_id)
+        CREATE INDEX IF NOT EXISTS idx_trades_timestamp_trade_id
+            ON trades (timestamp DESC, trade_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_trades_symbol_timestamp_trade_id
+            ON trades (symbol, timestamp DESC, trade_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_trades_trade_type_timestamp
+            ON trades (trade_type, timestamp DESC, trade_id DESC);
+
+        -- Superseded by the composite indexes above
+        DROP INDEX IF EXISTS idx_trades_symbol;
+        DROP INDEX IF EXISTS idx_trades_trade_type;
+        DROP INDEX IF EXISTS idx_trades_symbol_timestamp;
+    """
+    )
+
+    await conn.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS trade_stats_daily
+        WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+        SELECT time_bucket(INTERVAL '1 day', timestamp) AS day,
+               symbol,
+               COUNT(*) AS trade_count,
+               SUM(quantity * entry_price) AS volume,
+               SUM(fees_paid) AS fees,
+               COUNT(realized_pnl) AS exit_count,
+               COUNT(*) FILTER (WHERE realized_pnl > 0) AS win_count,
+               COUNT(*) FILTER (WHERE realized_pnl < 0) AS loss_count,
+               SUM(realized_pnl) FILTER (WHERE realized_pnl > 0) AS gross_profit,
+               SUM(realized_pnl) FILTER (WHERE realized_pnl < 0) AS gross_loss,
+               MAX(realized_pnl) FILTER (WHERE realized_pnl > 0) AS largest_win,
+               MIN(realized_pnl) FILTER (WHERE realized_pnl < 0) AS largest_loss
+        FROM trades
+        GROUP BY day, symbol
+        WITH NO DATA
+    """
+    )
+
+    # Real-time aggregation covers the not yet materialized tail
+    await conn.execute(
+        """
+        SELECT add_continuous_aggregate_policy(
+            'trade_stats_daily',
+            start_offset => INTERVAL '3 days',
+            end_offset => INTERVAL '1 hour',
+            schedule_interval => INTERVAL '30 minutes',
+            if_not_exists => TRUE
+        )
+    """
+    )
+
+    await conn.execute(
+        "CALL refresh_continuous_aggregate('trade_stats_daily', NULL, NULL)"
+    )
+
+    print("✅ Migration 004 applied: trade history indexes and daily rollups added")
+
+
+async def downgrade(conn: asyncpg.Connection) -> None:
+    """
+    Rollback migration: Drop the daily stats aggregate and trade indexes.
+
+    Args:
+        conn: Database connection
+    """
+    await conn.execute("DROP MATERIALIZED VIEW IF EXISTS trade_stats_daily")
+
+    await conn.execute(
+        """
+        -- Restore the original single-column indexes
+        CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades (symbol);
+        CREATE INDEX IF NOT EXISTS idx_trades_trade_type ON trades (trade_type);
+        CREATE INDEX IF NOT EXISTS idx_trades_symbol_timestamp
+            ON trades (symbol, timestamp DESC);
+
+        DROP INDEX IF EXISTS idx_trades_trade_type_timestamp;
+        DROP INDEX IF EXISTS idx_trades_symbol_timestamp_trade_id;
+        DROP INDEX IF EXISTS idx_trades_timestamp_trade_id;
+    """
+    )
+
+    print(
+        "✅ Migration 004 rolled back: trade history indexes and daily rollups dropped"
+    )
@@ -0,0 +1,570 @@
+"""
+Write-Behind Persistence Queue
+
+Takes database writes (orders, fills, trade history, reconciliation results)
+off the order-placement hot path. Writes are recorded in memory immediately
+and flushed to PostgreSQL in batches by a background task: consecutive
+writes of the same statement go out as one executemany call, and each flush
+runs in a single transaction.
+
+If a flush fails or exceeds its timeout (database down or slow), the batch
+is appended to a local append-only spill file (JSON lines, fsynced) instead
+of being held in memory. Spilled records are replayed, in order, before any
+newer records on the next flush.
+
+Records the database rejects for their content (constraint violations, bad
+data) are isolated by bisecting the failed batch and moved to a dead-letter
+file, so one bad row never blocks the records behind it. Connection,
+timeout and other transient errors keep the batch for a later retry.
+
+Usage:
+    from workspace.shared.database.write_behind import WriteBehindQueue
+
+    queue = WriteBehindQueue(spill_path="data/write_behind.jsonl")
+    await queue.start()
+
+    queue.enqueue("UPDATE orders SET status = $1 WHERE id = $2", "filled", order_id)
+
+    # Flush remaining writes on shutdown
+    await queue.close()
+
+Author: Trade Executor Implementation Team
+Date: 2025-11-10
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import asyncpg
+
+from .connection import DatabasePool, get_pool
+
+logger = logging.getLogger(__name__)
+
+# (statement, args, enqueued_at)
+_Record = Tuple[str, Tuple[Any, ...], float]
+
+# SQLSTATE classes worth retrying: connection exception (08), transaction
+# rollback (40), insufficient resources (53), operator intervention (57) and
+# system error (58). Any other database error is tied to the record itself.
+_TRANSIENT_SQLSTATE_CLASSES = ("08", "40", "53", "57", "58")
+
+
+def _encode(value: Any) -> Any:
+    """
+    Encode a query argument as a JSON-safe value (tagged for round-trip)
+
+    Types without a tag are written as their str() by the JSON encoder; the
+    database then rejects them on replay and they are dead-lettered.
+    """
+    if isinstance(value, Decimal):
+        return {"$d": str(value)}
+    if isinstance(value, datetime):
+        return {"$t": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, dt_time):
+        return {"$time": value.isoformat()}
+    if isinstance(value, timedelta):
+        return {"$td": value.total_seconds()}
+    if isinstance(value, UUID):
+        return {"$u": str(value)}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"$b": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, dict):
+        return {"$o": json.loads(json.dumps(value, default=str))}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Inverse of _encode"""
+    if isinstance(value, dict):
+        if "$d" in value:
+            return Decimal(value["$d"])
+        if "$t" in value:
+            return datetime.fromisoformat(value["$t"])
+        if "$date" in value:
+            return date.fromisoformat(value["$date"])
+        if "$time" in value:
+            return dt_time.fromisoformat(value["$time"])
+        if "$td" in value:
+            return timedelta(seconds=value["$td"])
+        if "$u" in value:
+            return UUID(value["$u"])
+        if "$b" in value:
+            return base64.b64decode(value["$b"])
+        if "$o" in value:
+            return value["$o"]
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def _spill_line(
+    statement: str, args: Tuple[Any, ...], enqueued_at: float
+) -> Dict[str, Any]:
+    return {"sql": statement, "args": [_encode(arg) for arg in args], "ts": enqueued_at}
+
+
+def _serialize(records: Iterable[_Record]) -> str:
+    """Spill file lines for records (built in full before any file is opened)"""
+    return "".join(
+        json.dumps(_spill_line(statement, args, enqueued_at), default=str) + "\n"
+        for statement, args, enqueued_at in records
+    )
+
+
+def _append_fsync(path: str, payload: str) -> None:
+    """Append payload to path and fsync (blocking; run in a worker thread)"""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _is_permanent(error: BaseException) -> bool:
+    """Whether a write error is caused by the records (retrying cannot help)"""
+    if isinstance(error, asyncpg.PostgresError):
+        sqlstate = getattr(error, "sqlstate", None) or ""
+        return sqlstate[:2] not in _TRANSIENT_SQLSTATE_CLASSES
+    # Client-side argument encoding errors
+    return isinstance(error, (TypeError, ValueError, OverflowError))
+
+
+class WriteBehindQueue:
+    """
+    Batched, spill-to-disk write queue for PostgreSQL
+
+    Attributes:
+        batch_size: Maximum records written per flush
+        flush_interval: Seconds between background flushes
+        flush_timeout: Seconds before a flush is abandoned and spilled
+        max_queue_size: In-memory records kept before spilling the oldest
+        spill_path: Append-only spill file (None disables spilling)
+        dead_letter_path: File for records the database rejected
+    """
+
+    def __init__(
+        self,
+        pool: Optional[DatabasePool] = None,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        flush_timeout: float = 5.0,
+        max_queue_size: int = 50_000,
+        spill_path: Optional[str] = None,
+        metrics_service: Optional[Any] = None,
+        dead_letter_path: Optional[str] = None,
+    ):
+        """
+        Initialize write-behind queue
+
+        Args:
+            pool: Database pool (default: global pool from get_pool())
+            batch_size: Maximum records per flush (default: 500)
+            flush_interval: Background flush interval in seconds (default: 0.5)
+            flush_timeout: Flush timeout in seconds (default: 5.0)
+            max_queue_size: Records held in memory before the oldest are
+                spilled (or dropped without a spill file) (default: 50000)
+            spill_path: Append-only spill file for records that could not be
+                written (default: None, failed batches are re-queued)
+            metrics_service: Optional MetricsService for queue-depth metrics
+            dead_letter_path: Append-only file for records the database
+                rejected (default: spill_path + ".dead"; without either,
+                rejected records are logged and discarded)
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+
+        self._pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_timeout = flush_timeout
+        self.max_queue_size = max_queue_size
+        self.spill_path = spill_path
+        self.dead_letter_path = dead_letter_path or (
+            f"{spill_path}.dead" if spill_path else None
+        )
+        self.metrics_service = metrics_service
+
+        self._queue: Deque[_Record] = deque()
+        # Oldest records pushed out of a full queue, spilled by the flusher
+        self._overflow: List[_Record] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+        # Statistics
+        self.flushed_total = 0
+        self.flush_failures_total = 0
+        self.dropped_total = 0
+        self.dead_lettered_total = 0
+        self.last_flush_ms = 0.0
+        self._spilled_records = self._count_spilled()
+
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+
+    async def start(self) -> None:
+        """Start the background flush task"""
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info(
+            f"Write-behind queue started (batch: {self.batch_size}, "
+            f"interval: {self.flush_interval}s, spill: {self.spill_path})"
+        )
+
+    async def close(self) -> None:
+        """Stop the flush task and flush (or spill) everything pending"""
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while self._queue or self._overflow or self._spilled_records:
+            if not await self.flush():
+                break
+
+        if (self._queue or self._overflow) and self.spill_path:
+            async with self._flush_lock:
+                await self._spill(self._take_overflow() + self._drain(len(self._queue)))
+        if self._queue:
+            logger.error(
+                f"Write-behind queue closed with {len(self._queue)} unwritten records"
+            )
+        logger.info("Write-behind queue closed")
+
+    # ========================================================================
+    # Enqueue / Flush
+    # ========================================================================
+
+    def enqueue(self, statement: str, *args: Any) -> None:
+        """
+        Record a write for background flushing (never touches the database)
+
+        Args:
+            statement: Parameterized SQL statement
+            *args: Statement arguments
+        """
+        self._queue.append((statement, args, time.time()))
+
+        if len(self._queue) > self.max_queue_size:
+            overflow = self._drain(len(self._queue) - self.max_queue_size)
+            if self.spill_path:
+                # Spilled by the flusher, off the caller's path
+                self._overflow.extend(overflow)
+                self._wakeup.set()
+            else:
+                self.dropped_total += len(overflow)
+                logger.error(
+                    f"Write-behind queue full, dropped {len(overflow)} records"
+                )
+
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        self._report()
+
+    async def flush(self) -> bool:
+        """
+        Write spilled records, then one batch of queued records
+
+        Records are kept in enqueue order across the spill file: overflow
+        from a full queue and failed batches are appended to it only after
+        everything older.
+
+        Returns:
+            True if everything attempted was written, False if the database
+            write failed (the batch was spilled or re-queued)
+        """
+        async with self._flush_lock:
+            # Overflow is newer than the spill file, older than the queue
+            await self._spill(self._take_overflow())
+
+            if self._spilled_records and not await self._replay_spill():
+                # Keep ordering: newer records go behind the spilled ones
+                if self.spill_path and self._queue:
+                    await self._spill(
+                        self._take_overflow() + self._drain(self.batch_size)
+                    )
+                return False
+
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return True
+
+            try:
+                consumed, error = await self._write_isolating(batch)
+                if error is None:
+                    return True
+                self.flush_failures_total += 1
+                logger.warning(
+                    f"Write-behind flush of {len(batch) - consumed} records "
+                    f"failed: {error}"
+                )
+                if self.spill_path:
+                    # Overflow queued meanwhile is newer than the failed batch
+                    await self._spill(batch[consumed:] + self._take_overflow())
+                else:
+                    self._queue.extendleft(reversed(batch[consumed:]))
+                return False
+            finally:
+                self._report()
+
+    async def drain(self) -> bool:
+        """
+        Flush until every record queued before the call is written
+
+        Records enqueued while draining may remain queued, so a steady
+        stream of writes cannot stall the caller.
+
+        Returns:
+            True if the pending records were written, False as soon as a
+            flush fails (the failed records stay spilled or queued)
+        """
+        rounds = -(-self.queue_depth // self.batch_size) + 1
+        for _ in range(rounds):
+            if not (self._queue or self._overflow or self._spilled_records):
+                break
+            if not await self.flush():
+                return False
+        return True
+
+    async def _flush_loop(self) -> None:
+        """Flush on a timer, or as soon as a full batch is queued"""
+        while self._running:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                while self._queue or self._overflow or self._spilled_records:
+                    if not await self.flush():
+                        break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in write-behind flush loop: {e}", exc_info=True)
+
+    async def _write(self, batch: List[_Record]) -> None:
+        """Write a batch in one transaction, one executemany per statement run"""
+        start = time.perf_counter()
+        pool = self._pool or await get_pool()
+
+        async with asyncio.timeout(self.flush_timeout):
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    run_start = 0
+                    for i in range(1, len(batch) + 1):
+                        if i == len(batch) or batch[i][0] != batch[run_start][0]:
+                            await conn.executemany(
+                                batch[run_start][0],
+                                [record[1] for record in batch[run_start:i]],
+                            )
+                            run_start = i
+
+        self.flushed_total += len(batch)
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+        logger.debug(
+            f"Write-behind flushed {len(batch)} records in {self.last_flush_ms:.1f}ms"
+        )
+
+    async def _write_isolating(
+        self, batch: List[_Record]
+    ) -> Tuple[int, Optional[Exception]]:
+        """
+        Write a batch in order, bisecting around records the database rejects
+
+        A permanent error splits the failed part in halves until the
+        offending record is isolated and dead-lettered; the other records
+        are still written, in order. A transient error stops the write.
+
+        Returns:
+            (records written or dead-lettered, transient error or None)
+        """
+        consumed = 0
+        pending = [batch]  # Stack of contiguous parts, next part last
+        while pending:
+            part = pending.pop()
+            try:
+                await self._write(part)
+            except Exception as e:
+                if not _is_permanent(e):
+                    return consumed, e
+                if len(part) == 1:
+                    self._dead_letter(part[0], e)
+                else:
+                    middle = len(part) // 2
+                    pending.append(part[middle:])
+                    pending.append(part[:middle])
+                    continue
+            consumed += len(part)
+        return consumed, None
+
+    def _drain(self, count: int) -> List[_Record]:
+        return [self._queue.popleft() for _ in range(min(count, len(self._queue)))]
+
+    def _take_overflow(self) -> List[_Record]:
+        overflow, self._overflow = self._overflow, []
+        return overflow
+
+    # ========================================================================
+    # Spill File
+    # ========================================================================
+
+    async def _spill(self, records: List[_Record]) -> None:
+        """Append records to the spill file, fsyncing in a worker thread"""
+        if not records or self.spill_path is None:
+            return
+        payload = _serialize(records)
+        await asyncio.get_running_loop().run_in_executor(
+            None, _append_fsync, self.spill_path, payload
+        )
+        self._spilled_records += len(records)
+        logger.warning(f"Spilled {len(records)} records to {self.spill_path}")
+
+    def _load_spill(self) -> List[_Record]:
+        if self.spill_path is None or not os.path.exists(self.spill_path):
+            return []
+        records = []
+        corrupt = []
+        with open(self.spill_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                    args = tuple(_decode(arg) for arg in data["args"])
+                    records.append((data["sql"], args, data["ts"]))
+                except (ValueError, KeyError, TypeError) as e:
+                    # e.g. a line torn by a crash mid-write
+                    corrupt.append((line.rstrip("\n"), e))
+        for line, error in corrupt:
+            self._write_dead_letter({"raw": line}, error)
+        if corrupt:
+            self._rewrite_spill(records)
+        return records
+
+    def _count_spilled(self) -> int:
+        if self.spill_path is None or not os.path.exists(self.spill_path):
+            return 0
+        with open(self.spill_path, encoding="utf-8") as f:
+            return sum(1 for line in f if line.strip())
+
+    async def _replay_spill(self) -> bool:
+        """Write spilled records in batches, rewriting the file with the rest"""
+        records = self._load_spill()
+        written = 0
+        while written < len(records):
+            consumed, error = await self._write_isolating(
+                records[written : written + self.batch_size]
+            )
+            written += consumed
+            if error is not None:
+                self.flush_failures_total += 1
+                logger.warning(f"Write-behind spill replay failed: {error}")
+                break
+
+        if written:
+            self._rewrite_spill(records[written:])
+            logger.info(f"Replayed {written} spilled records")
+        return written == len(records)
+
+    def _rewrite_spill(self, records: List[_Record]) -> None:
+        """Atomically replace the spill file with the unwritten records"""
+        if self.spill_path is None:
+            return
+        self._spilled_records = len(records)
+        if not records:
+            os.remove(self.spill_path)
+            return
+        payload = _serialize(records)
+        tmp_path = f"{self.spill_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.spill_path)
+
+    # ========================================================================
+    # Dead Letters
+    # ========================================================================
+
+    def _dead_letter(self, record: _Record, error: Exception) -> None:
+        """Set aside a record the database rejected"""
+        statement, args, enqueued_at = record
+        self._write_dead_letter(_spill_line(statement, args, enqueued_at), error)
+
+    def _write_dead_letter(self, entry: Dict[str, Any], error: Exception) -> None:
+        self.dead_lettered_total += 1
+        logger.error(
+            f"Write-behind record rejected ({type(error).__name__}: {error}): "
+            f"{entry.get('sql', entry.get('raw'))}"
+        )
+        if self.dead_letter_path is None:
+            return
+        entry = {**entry, "error": f"{type(error).__name__}: {error}"}
+        payload = json.dumps(entry, default=str) + "\n"
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    # ========================================================================
+    # Metrics
+    # ========================================================================
+
+    @property
+    def queue_depth(self) -> int:
+        """Records waiting in memory"""
+        return len(self._queue) + len(self._overflow)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics"""
+        oldest = self._overflow[0][2] if self._overflow else None
+        if oldest is None and self._queue:
+            oldest = self._queue[0][2]
+        return {
+            "queue_depth": self.queue_depth,
+            "spilled_records": self._spilled_records,
+            "flushed_total": self.flushed_total,
+            "flush_failures_total": self.flush_failures_total,
+            "dropped_total": self.dropped_total,
+            "dead_lettered_total": self.dead_lettered_total,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "oldest_record_age_seconds": (
+                round(time.time() - oldest, 3) if oldest is not None else 0.0
+            ),
+        }
+
+    def _report(self) -> None:
+        if self.metrics_service is not None:
+            self.metrics_service.update_write_behind_metrics(
+                queue_depth=self.queue_depth,
+                spilled_records=self._spilled_records,
+                flushed_total=self.flushed_total,
+                flush_failures_total=self.flush_failures_total,
+            )
+
+
+# Export
+__all__ = ["WriteBehindQueue"]
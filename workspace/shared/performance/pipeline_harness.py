@@ -0,0 +1,1198 @@
+"""
+End-to-End Pipeline Load Harness.
+
+LoadTester.simulate_trading_cycle only sleeps, so it cannot show where the
+real pipeline spends its time. This harness drives the real components -
+MarketDataService, LLMDecisionEngine, RiskManager, TradeExecutor (or
+PaperTradingExecutor) and TradingEngine - against local stand-ins for the
+three external services:
+
+- FakeBybitWebSocket: a local WebSocket server replaying recorded or
+  synthetic Bybit public frames into the real BybitWebSocketClient
+- FakeOpenRouter: an httpx transport answering chat completions (plain or
+  SSE streaming) with one signal per symbol found in the prompt
+- FakeExchange: a ccxt-style exchange filling orders at the replayed price
+
+Each stand-in has a configurable latency. Every cycle records the engine's
+stage timings plus the time spent in the LLM, risk and exchange calls,
+event loop lag and (with tracemalloc) peak traced memory; run_scaling()
+repeats the run for growing symbol counts.
+
+PipelineLoadHarness.run_cycle has the LoadTester cycle signature, so the
+harness can also be driven by LoadTester.run_load_test(custom_cycle_fn=...).
+
+Usage:
+    python -m workspace.shared.performance.pipeline_harness --symbols 4 16 64
+
+Author: Implementation Specialist
+Date: 2025-11-21
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import random
+import re
+import time
+import tracemalloc
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+from websockets.asyncio.server import ServerConnection, serve
+
+from workspace.features.caching import CacheService
+from workspace.features.decision_engine import LLMDecisionEngine
+from workspace.features.market_data import MarketDataService, Timeframe
+from workspace.features.market_data.websocket_client import BybitWebSocketClient
+from workspace.features.monitoring.metrics import MetricsService
+from workspace.features.paper_trading import PaperTradingExecutor
+from workspace.features.risk_manager import RiskManager, RiskValidation
+from workspace.features.trade_executor import TradeExecutor
+from workspace.features.trading_loop import TradingEngine
+from workspace.shared.database.write_behind import WriteBehindQueue
+from workspace.shared.performance.load_testing import CycleResult
+
+logger = logging.getLogger(__name__)
+
+BASE_SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "ADAUSDT", "DOGEUSDT"]
+
+# Perpetual symbols as they appear in prompts ("BTC/USDT:USDT")
+_PROMPT_SYMBOL = re.compile(r"\b([A-Z0-9]+/USDT:USDT)\b")
+
+# Time spent in stand-in calls by the cycle running in the current context
+_cycle_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "pipeline_cycle_stages", default=None
+)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """
+    Add time spent in a stage to the current cycle (no-op outside a cycle).
+
+    Concurrent calls within a cycle add up, so stage totals are cumulative
+    time rather than wall-clock time.
+
+    Args:
+        stage: Stage name
+        seconds: Time spent
+    """
+    stages = _cycle_stages.get()
+    if stages is not None:
+        stages[stage] = stages.get(stage, 0.0) + seconds
+
+
+class _TimedRiskManager(RiskManager):
+    """RiskManager that records signal validation as the "risk" stage."""
+
+    async def validate_signal(
+        self, signal: Any, current_price: Optional[Decimal] = None
+    ) -> RiskValidation:
+        start = time.perf_counter()
+        try:
+            return await super().validate_signal(signal, current_price)
+        finally:
+            record_stage("risk", time.perf_counter() - start)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile with linear interpolation (0.0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = (pct / 100) * (len(ordered) - 1)
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    weight = index - lower
+    return ordered[lower] * (1 - weight) + ordered[upper] * weight
+
+
+def make_symbols(count: int) -> List[str]:
+    """
+    Raw Bybit symbols for a scaling run.
+
+    The six traded symbols come first; larger counts are padded with
+    synthetic symbols (SYN000USDT, ...).
+
+    Args:
+        count: Number of symbols
+
+    Returns:
+        List of raw symbols (e.g. 'BTCUSDT')
+    """
+    synthetic = [f"SYN{i:03d}USDT" for i in range(max(0, count - len(BASE_SYMBOLS)))]
+    return (BASE_SYMBOLS + synthetic)[:count]
+
+
+def _format_symbol(symbol: str) -> str:
+    """Raw Bybit symbol -> perpetual symbol ('BTCUSDT' -> 'BTC/USDT:USDT')."""
+    return f"{symbol[:-4]}/USDT:USDT" if symbol.endswith("USDT") else symbol
+
+
+# ============================================================================
+# Market data frames
+# ============================================================================
+
+
+def synthetic_frames(
+    symbols: List[str],
+    interval_minutes: int = 3,
+    start_ms: int = 1762000000000,
+    seed: int = 11,
+) -> Iterator[List[str]]:
+    """
+    Endless synthetic Bybit stream, one step per bar.
+
+    Each step holds, per symbol, a ticker snapshot followed by the confirmed
+    kline of the next bar (a random walk), in Bybit's wire format.
+
+    Args:
+        symbols: Raw symbols (e.g. ['BTCUSDT', 'ETHUSDT'])
+        interval_minutes: Kline interval (must match the service timeframe)
+        start_ms: Start time of the first bar
+        seed: Random seed
+
+    Yields:
+        List of raw JSON frames per bar
+    """
+    rng = random.Random(seed)
+    prices = {symbol: rng.uniform(0.1, 90000.0) for symbol in symbols}
+    interval_ms = interval_minutes * 60_000
+    for bar in itertools.count():
+        bar_start = start_ms + bar * interval_ms
+        ts = bar_start + interval_ms
+        step = []
+        for symbol in symbols:
+            open_price = prices[symbol]
+            close_price = open_price * (1 + rng.gauss(0, 0.002))
+            high = max(open_price, close_price) * (1 + abs(rng.gauss(0, 0.001)))
+            low = min(open_price, close_price) * (1 - abs(rng.gauss(0, 0.001)))
+            prices[symbol] = close_price
+            last = f"{close_price:.4f}"
+            step.append(
+                json.dumps(
+                    {
+                        "topic": f"tickers.{symbol}",
+                        "type": "snapshot",
+                        "data": {
+                            "symbol": symbol,
+                            "lastPrice": last,
+                            "bid1Price": f"{close_price * 0.9999:.4f}",
+                            "ask1Price": f"{close_price * 1.0001:.4f}",
+                            "highPrice24h": f"{high:.4f}",
+                            "lowPrice24h": f"{low:.4f}",
+                            "volume24h": "1234.567",
+                            "turnover24h": "111111111.11",
+                            "price24hPcnt": "0.0111",
+                        },
+                        "ts": ts,
+                    }
+                )
+            )
+            step.append(
+                json.dumps(
+                    {
+                        "topic": f"kline.{interval_minutes}.{symbol}",
+                        "type": "snapshot",
+                        "data": [
+                            {
+                                "start": bar_start,
+                                "end": bar_start + interval_ms - 1,
+                                "interval": str(interval_minutes),
+                                "open": f"{open_price:.4f}",
+                                "close": last,
+                                "high": f"{high:.4f}",
+                                "low": f"{low:.4f}",
+                                "volume": f"{rng.uniform(1, 100):.3f}",
+                                "turnover": "1111111.11",
+                                "confirm": True,
+                            }
+                        ],
+                        "ts": ts,
+                    }
+                )
+            )
+        yield step
+
+
+def load_frames(path: str, frames_per_step: int) -> List[List[str]]:
+    """
+    Read frames recorded with BybitWebSocketClient(record_path=...).
+
+    Args:
+        path: Recording (one raw frame per line)
+        frames_per_step: Frames replayed per harness step
+
+    Returns:
+        Recorded frames in steps of frames_per_step
+    """
+    with open(path, encoding="utf-8") as f:
+        frames = [line.rstrip("\n") for line in f if line.strip()]
+    return [
+        frames[i : i + frames_per_step] for i in range(0, len(frames), frames_per_step)
+    ]
+
+
+# ============================================================================
+# Stand-ins
+# ============================================================================
+
+
+class FakeBybitWebSocket:
+    """
+    Local Bybit public WebSocket replaying frames step by step.
+
+    Subscribing clients receive the warm-up steps immediately; every
+    advance() then broadcasts the next step to all connected clients.
+    Delivery runs in a background task, so frames are processed while the
+    trading cycle runs, as they would be live.
+    """
+
+    def __init__(
+        self,
+        steps: Iterable[List[str]],
+        warmup_steps: int = 0,
+        latency_seconds: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize fake WebSocket server.
+
+        Args:
+            steps: Frame steps to replay (may be an endless iterator)
+            warmup_steps: Steps sent to each client right after it subscribes
+            latency_seconds: Delay before each advanced step is delivered
+            host: Bind address
+            port: Bind port (0 picks a free port)
+        """
+        self._steps = iter(steps)
+        self.warmup = list(itertools.islice(self._steps, warmup_steps))
+        self.latency_seconds = latency_seconds
+        self.host = host
+        self.port = port
+        self.url: Optional[str] = None
+
+        self.frames_sent = 0
+        self._clients: set = set()
+        self._server: Any = None
+        self._outbox: asyncio.Queue = asyncio.Queue()
+        self._sender: Optional[asyncio.Task] = None
+
+    async def start(self) -> str:
+        """
+        Start serving.
+
+        Returns:
+            WebSocket URL to point BybitWebSocketClient.url at
+        """
+        self._server = await serve(self._handle, self.host, self.port)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"ws://{self.host}:{port}"
+        self._sender = asyncio.create_task(self._send_loop())
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop the sender and close all connections."""
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def advance(self, steps: int = 1) -> int:
+        """
+        Queue the next steps for delivery.
+
+        Args:
+            steps: Number of steps
+
+        Returns:
+            Number of steps queued (fewer once a recording is exhausted)
+        """
+        queued = 0
+        for step in itertools.islice(self._steps, steps):
+            self._outbox.put_nowait(step)
+            queued += 1
+        return queued
+
+    async def _send_loop(self) -> None:
+        while True:
+            step = await self._outbox.get()
+            if self.latency_seconds:
+                await asyncio.sleep(self.latency_seconds)
+            for websocket in list(self._clients):
+                await self._send(websocket, step)
+
+    async def _send(self, websocket: ServerConnection, frames: List[str]) -> None:
+        try:
+            for frame in frames:
+                await websocket.send(frame)
+                self.frames_sent += 1
+        except Exception as e:
+            logger.debug(f"Fake WebSocket send failed: {e}")
+            self._clients.discard(websocket)
+
+    async def _handle(self, websocket: ServerConnection) -> None:
+        try:
+            async for message in websocket:
+                request = json.loads(message)
+                if request.get("op") == "ping":
+                    await websocket.send(json.dumps({"op": "pong", "success": True}))
+                elif request.get("op") == "subscribe":
+                    await websocket.send(
+                        json.dumps({"op": "subscribe", "success": True, "ret_msg": ""})
+                    )
+                    for step in self.warmup:
+                        await self._send(websocket, step)
+                    self._clients.add(websocket)
+        finally:
+            self._clients.discard(websocket)
+
+
+class _EventStream(httpx.AsyncByteStream):
+    """SSE body delivering chunks with a delay between them."""
+
+    def __init__(self, events: List[bytes], delay: float, started: float):
+        self.events = events
+        self.delay = delay
+        self.started = started
+
+    async def __aiter__(self):
+        try:
+            for event in self.events:
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                yield event
+        finally:
+            record_stage("llm_http", time.perf_counter() - self.started)
+
+
+class FakeOpenRouter(httpx.AsyncBaseTransport):
+    """
+    httpx transport standing in for the OpenRouter chat completions API.
+
+    Every perpetual symbol in the prompt gets one JSON signal; decisions are
+    drawn at random (BUY, SELL or HOLD) with a fixed seed. Streaming requests
+    get SSE events, one per signal.
+    """
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.0,
+        chunk_latency_seconds: float = 0.0,
+        buy_ratio: float = 0.2,
+        sell_ratio: float = 0.1,
+        seed: int = 7,
+    ):
+        """
+        Initialize fake OpenRouter.
+
+        Args:
+            latency_seconds: Time to first byte
+            chunk_latency_seconds: Delay per signal (generation time)
+            buy_ratio: Fraction of BUY decisions
+            sell_ratio: Fraction of SELL decisions (the rest are HOLD)
+            seed: Random seed
+        """
+        self.latency_seconds = latency_seconds
+        self.chunk_latency_seconds = chunk_latency_seconds
+        self.buy_ratio = buy_ratio
+        self.sell_ratio = sell_ratio
+        self.rng = random.Random(seed)
+        self.requests = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        self.requests += 1
+        payload = json.loads(await request.aread())
+        prompt = "\n".join(self._message_text(m) for m in payload["messages"])
+        blocks = [
+            "```json\n" + json.dumps(self._signal(symbol)) + "\n```\n"
+            for symbol in dict.fromkeys(_PROMPT_SYMBOL.findall(prompt))
+        ]
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": sum(len(b) for b in blocks) // 4,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+        if payload.get("stream"):
+            events = [
+                self._event({"choices": [{"delta": {"content": block}}]})
+                for block in blocks
+            ]
+            events.append(self._event({"choices": [], "usage": usage}))
+            events.append(b"data: [DONE]\n\n")
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                stream=_EventStream(events, self.chunk_latency_seconds, started),
+            )
+
+        if self.chunk_latency_seconds:
+            await asyncio.sleep(self.chunk_latency_seconds * len(blocks))
+        record_stage("llm_http", time.perf_counter() - started)
+        return httpx.Response(
+            200,
+            json={
+                "choices": [{"message": {"content": "".join(blocks)}}],
+                "usage": usage,
+            },
+        )
+
+    @staticmethod
+    def _message_text(message: Dict[str, Any]) -> str:
+        content = message.get("content", "")
+        if isinstance(content, list):  # Content parts (cacheable prefix)
+            return "\n".join(part.get("text", "") for part in content)
+        return str(content)
+
+    @staticmethod
+    def _event(data: Dict[str, Any]) -> bytes:
+        return f"data: {json.dumps(data)}\n\n".encode()
+
+    def _signal(self, symbol: str) -> Dict[str, Any]:
+        draw = self.rng.random()
+        if draw < self.buy_ratio:
+            decision = "BUY"
+        elif draw < self.buy_ratio + self.sell_ratio:
+            decision = "SELL"
+        else:
+            decision = "HOLD"
+        trade = decision != "HOLD"
+        return {
+            "symbol": symbol,
+            "decision": decision,
+            "confidence": round(self.rng.uniform(0.65, 0.9), 2),
+            "size_pct": 0.05 if trade else 0.0,
+            "stop_loss_pct": 0.02 if trade else None,
+            "take_profit_pct": 0.04 if trade else None,
+            "reasoning": "Synthetic load test decision",
+        }
+
+
+class FakeExchange:
+    """
+    In-process ccxt-style exchange.
+
+    Implements the subset TradeExecutor uses. Market orders fill in full at
+    the latest replayed price; stop orders rest as open. Every request
+    sleeps for the configured latency and is counted in calls.
+    """
+
+    def __init__(
+        self,
+        balance_usdt: float = 10000.0,
+        latency_seconds: float = 0.0,
+        fee_rate: float = 0.00055,
+    ):
+        """
+        Initialize fake exchange.
+
+        Args:
+            balance_usdt: Reported USDT balance
+            latency_seconds: Round-trip time per request
+            fee_rate: Taker fee rate charged on fills
+        """
+        self.balance_usdt = balance_usdt
+        self.latency_seconds = latency_seconds
+        self.fee_rate = fee_rate
+
+        self.has = {"createOrders": True, "cancelOrders": True}
+        self.markets: Dict[str, Dict[str, Any]] = {}
+        self.prices: Dict[str, float] = {}
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.calls: Counter = Counter()
+        self._order_ids = itertools.count(1)
+
+    def set_price(self, symbol: str, price: float) -> None:
+        """Set the price orders for symbol fill at."""
+        self.prices[symbol] = price
+
+    async def _request(self, method: str) -> None:
+        self.calls[method] += 1
+        start = time.perf_counter()
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        record_stage("exchange", time.perf_counter() - start)
+
+    async def load_markets(self) -> Dict[str, Dict[str, Any]]:
+        await self._request("load_markets")
+        self.markets = {symbol: {"symbol": symbol} for symbol in self.prices}
+        return self.markets
+
+    async def fetch_balance(self) -> Dict[str, Any]:
+        await self._request("fetch_balance")
+        return {
+            "USDT": {"free": self.balance_usdt, "used": 0.0, "total": self.balance_usdt}
+        }
+
+    async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        await self._request("fetch_ticker")
+        price = self.prices.get(symbol, 100.0)
+        return {
+            "symbol": symbol,
+            "last": price,
+            "bid": price,
+            "ask": price,
+            "timestamp": int(time.time() * 1000),
+        }
+
+    async def create_order(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        await self._request("create_order")
+        return self._place(symbol, type, side, amount, price, params)
+
+    async def create_orders(
+        self, orders: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        await self._request("create_orders")
+        return [self._place(**order) for order in orders]
+
+    async def cancel_order(
+        self, id: str, symbol: Optional[str] = None, params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        await self._request("cancel_order")
+        return self._cancel(id)
+
+    async def cancel_orders(
+        self,
+        ids: List[str],
+        symbol: Optional[str] = None,
+        params: Optional[Dict] = None,
+    ) -> List[Dict[str, Any]]:
+        await self._request("cancel_orders")
+        return [self._cancel(order_id) for order_id in ids]
+
+    async def fetch_order(
+        self, id: str, symbol: Optional[str] = None, params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        await self._request("fetch_order")
+        return self.orders[id]
+
+    async def close(self) -> None:
+        pass
+
+    def _place(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        order_id = str(next(self._order_ids))
+        fill_price = self.prices.get(symbol, 100.0)
+        filled = type == "market"
+        order = {
+            "id": order_id,
+            "symbol": symbol,
+            "type": type,
+            "side": side,
+            "amount": amount,
+            "price": price,
+            "status": "closed" if filled else "open",
+            "filled": amount if filled else 0.0,
+            "average": fill_price if filled else None,
+            "fee": {
+                "cost": amount * fill_price * self.fee_rate if filled else 0.0,
+                "currency": "USDT",
+            },
+            "info": params or {},
+        }
+        self.orders[order_id] = order
+        return order
+
+    def _cancel(self, order_id: str) -> Dict[str, Any]:
+        order = self.orders.get(order_id, {"id": order_id})
+        order["status"] = "canceled"
+        return order
+
+
+class EventLoopLagMonitor:
+    """
+    Measures event loop lag by how late a periodic sleep wakes up.
+
+    Samples are milliseconds of lateness; a loop blocked by CPU-bound work
+    (indicator updates, prompt building, JSON parsing) shows up here.
+    """
+
+    def __init__(self, interval_seconds: float = 0.01):
+        """
+        Initialize lag monitor.
+
+        Args:
+            interval_seconds: Sampling interval
+        """
+        self.interval_seconds = interval_seconds
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def since(self, mark: int) -> List[float]:
+        """Samples taken after len(samples) was mark."""
+        return self.samples[mark:]
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(self.interval_seconds)
+            lag = loop.time() - before - self.interval_seconds
+            self.samples.append(max(0.0, lag) * 1000)
+
+
+# ============================================================================
+# Harness
+# ============================================================================
+
+
+@dataclass
+class PipelineHarnessConfig:
+    """Configuration for a pipeline load run."""
+
+    symbols: List[str] = field(default_factory=lambda: make_symbols(4))  # Raw
+    warmup_bars: int = 60  # Indicators need 50 candles
+    warmup_timeout_seconds: float = 30.0
+
+    # Stand-in latencies
+    ws_latency_seconds: float = 0.0
+    llm_latency_seconds: float = 0.5
+    llm_chunk_latency_seconds: float = 0.0
+    exchange_latency_seconds: float = 0.05
+
+    # Pipeline
+    stream: bool = False
+    concurrent: bool = True
+    max_concurrency: int = 8
+    paper_trading: bool = False
+    buy_ratio: float = 0.2
+    sell_ratio: float = 0.1
+
+    # Replay frames recorded with BybitWebSocketClient(record_path=...)
+    # instead of the synthetic stream (default: 2 frames per symbol per step)
+    frames_path: Optional[str] = None
+    frames_per_step: Optional[int] = None
+
+    # Profiling
+    trace_allocations: bool = True
+    top_allocations: int = 10
+    lag_interval_seconds: float = 0.01
+
+    seed: int = 7
+
+
+@dataclass
+class PipelineLoadReport:
+    """Results of a pipeline load run for one symbol count."""
+
+    symbol_count: int
+    cycle_results: List[CycleResult]
+    loop_lag_ms: List[float]
+    peak_memory_mb: float = 0.0
+    top_allocations: List[str] = field(default_factory=list)
+    exchange_calls: Dict[str, int] = field(default_factory=dict)
+    llm_requests: int = 0
+    frames_sent: int = 0
+
+    @property
+    def success_rate(self) -> float:
+        """Fraction of successful cycles."""
+        if not self.cycle_results:
+            return 0.0
+        successful = sum(1 for r in self.cycle_results if r.success)
+        return successful / len(self.cycle_results)
+
+    def latency_percentile(self, pct: float) -> float:
+        """Cycle latency percentile in milliseconds."""
+        return percentile([r.latency_ms for r in self.cycle_results], pct)
+
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean and p95 per stage in milliseconds."""
+        samples: Dict[str, List[float]] = {}
+        for result in self.cycle_results:
+            for stage, value in result.stages.items():
+                samples.setdefault(stage, []).append(value)
+        return {
+            stage: {
+                "mean": sum(values) / len(values),
+                "p95": percentile(values, 95),
+            }
+            for stage, values in samples.items()
+        }
+
+
+class PipelineLoadHarness:
+    """
+    Runs real trading cycles against local exchange, WebSocket and LLM
+    stand-ins.
+
+    Example:
+        ```python
+        config = PipelineHarnessConfig(symbols=make_symbols(16))
+        async with PipelineLoadHarness(config) as harness:
+            report = await harness.run(cycles=50)
+        print(format_report([report]))
+        ```
+    """
+
+    def __init__(self, config: Optional[PipelineHarnessConfig] = None):
+        """
+        Initialize harness (components are built by start()).
+
+        Args:
+            config: Harness configuration
+        """
+        self.config = config or PipelineHarnessConfig()
+        self.symbols = [_format_symbol(s) for s in self.config.symbols]
+
+        self.exchange = FakeExchange(
+            latency_seconds=self.config.exchange_latency_seconds
+        )
+        self.llm = FakeOpenRouter(
+            latency_seconds=self.config.llm_latency_seconds,
+            chunk_latency_seconds=self.config.llm_chunk_latency_seconds,
+            buy_ratio=self.config.buy_ratio,
+            sell_ratio=self.config.sell_ratio,
+            seed=self.config.seed,
+        )
+        self.lag_monitor = EventLoopLagMonitor(self.config.lag_interval_seconds)
+
+        self.feed: Optional[FakeBybitWebSocket] = None
+        self.market_data: Optional[MarketDataService] = None
+        self.decision_engine: Optional[LLMDecisionEngine] = None
+        self.risk_manager: Optional[RiskManager] = None
+        self.executor: Optional[TradeExecutor] = None
+        self.write_behind: Optional[WriteBehindQueue] = None
+        self.engine: Optional[TradingEngine] = None
+
+        self._ws_task: Optional[asyncio.Task] = None
+        self._started_tracemalloc = False
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._peak_bytes = 0
+
+    async def __aenter__(self) -> "PipelineLoadHarness":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """
+        Build the pipeline, connect it to the stand-ins and wait until every
+        symbol has a market data snapshot.
+
+        Raises:
+            TimeoutError: If snapshots are not ready within the warm-up timeout
+        """
+        config = self.config
+
+        # Market data: real client and service, local replay server
+        if config.frames_path:
+            steps: Iterable[List[str]] = load_frames(
+                config.frames_path,
+                config.frames_per_step or 2 * len(config.symbols),
+            )
+        else:
+            steps = synthetic_frames(config.symbols, seed=config.seed)
+        self.feed = FakeBybitWebSocket(
+            steps,
+            warmup_steps=config.warmup_bars,
+            latency_seconds=config.ws_latency_seconds,
+        )
+        url = await self.feed.start()
+
+        self.market_data = MarketDataService(
+            symbols=config.symbols,
+            timeframe=Timeframe.M3,
+            cache_service=CacheService(use_redis=False),
+        )
+        self.market_data.add_ticker_listener(self._on_ticker)
+        client = BybitWebSocketClient(
+            symbols=config.symbols,
+            timeframes=[self.market_data.timeframe],
+            on_ticker_frame=self.market_data._handle_ticker_frame,
+            on_kline_frame=self.market_data._handle_kline_frame,
+        )
+        client.url = url
+        self.market_data.ws_client = client
+        self.market_data.running = True
+        self._ws_task = asyncio.create_task(client.connect())
+
+        # Decisions: real engine, local OpenRouter, no response cache
+        self.decision_engine = LLMDecisionEngine(
+            api_key="load-test",
+            cache_service=CacheService(use_redis=False, enabled=False),
+            stream=config.stream,
+        )
+        await self.decision_engine.client.aclose()
+        self.decision_engine.client = httpx.AsyncClient(
+            transport=self.llm, timeout=self.decision_engine.config.timeout
+        )
+
+        # Risk and execution: database writes stay queued in memory
+        self.risk_manager = _TimedRiskManager()
+        self.write_behind = WriteBehindQueue()
+        executor_kwargs: Dict[str, Any] = dict(
+            api_key="load-test",
+            api_secret="load-test",
+            exchange=self.exchange,
+            metrics_service=MetricsService(),
+            write_behind=self.write_behind,
+        )
+        if config.paper_trading:
+            self.executor = PaperTradingExecutor(**executor_kwargs)
+        else:
+            self.executor = TradeExecutor(**executor_kwargs)
+
+        self.engine = TradingEngine(
+            market_data_service=self.market_data,
+            trade_executor=self.executor,
+            symbols=self.symbols,
+            decision_engine=self.decision_engine,
+            concurrent=config.concurrent,
+            max_concurrency=config.max_concurrency,
+            risk_manager=self.risk_manager,
+        )
+
+        await self._wait_for_snapshots()
+        self.lag_monitor.start()
+
+        if config.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._baseline = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+
+        logger.info(
+            f"Pipeline harness ready: {len(self.symbols)} symbols, "
+            f"{self.feed.frames_sent} warm-up frames"
+        )
+
+    async def stop(self) -> None:
+        """Disconnect the pipeline and stop the stand-ins."""
+        await self.lag_monitor.stop()
+        if self.market_data is not None and self.market_data.ws_client is not None:
+            self.market_data.running = False
+            await self.market_data.ws_client.disconnect()
+        if self._ws_task is not None:
+            self._ws_task.cancel()
+            try:
+                await self._ws_task
+            except asyncio.CancelledError:
+                pass
+        if self.feed is not None:
+            await self.feed.stop()
+        if self.decision_engine is not None:
+            await self.decision_engine.close()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    async def run_cycle(self, cycle_id: int, worker_id: int = 0) -> CycleResult:
+        """
+        Advance the market by one bar and run one real trading cycle.
+
+        Stages (milliseconds): the engine's stage timings (market_data,
+        signals, execution, first_dispatch), cumulative time in the
+        stand-ins and risk checks (llm_http, exchange, risk) and the worst
+        event loop lag seen during the cycle (loop_lag_max).
+
+        Args:
+            cycle_id: Cycle number
+            worker_id: LoadTester worker running the cycle
+
+        Returns:
+            CycleResult
+
+        Raises:
+            RuntimeError: If the harness has not been started
+        """
+        if self.feed is None or self.engine is None:
+            raise RuntimeError("Pipeline harness not started; call start() first")
+        self.feed.advance()
+        stages: Dict[str, float] = {}
+        token = _cycle_stages.set(stages)
+        lag_mark = len(self.lag_monitor.samples)
+        start = time.perf_counter()
+        try:
+            result = await self.engine.execute_trading_cycle(cycle_id)
+            error_message = "; ".join(result.errors) or None
+            success = result.success
+            engine_stages = result.stage_timings
+        except Exception as e:
+            error_message = str(e)
+            success = False
+            engine_stages = {}
+        finally:
+            _cycle_stages.reset(token)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        timings = {stage: seconds * 1000 for stage, seconds in engine_stages.items()}
+        timings.update({stage: seconds * 1000 for stage, seconds in stages.items()})
+        timings["loop_lag_max"] = max(self.lag_monitor.since(lag_mark), default=0.0)
+
+        if tracemalloc.is_tracing():
+            self._peak_bytes = max(self._peak_bytes, tracemalloc.get_traced_memory()[1])
+
+        return CycleResult(
+            cycle_id=cycle_id,
+            worker_id=worker_id,
+            timestamp=datetime.now(),
+            success=success,
+            latency_ms=latency_ms,
+            error_message=error_message,
+            stages=timings,
+        )
+
+    async def run(self, cycles: int) -> PipelineLoadReport:
+        """
+        Run cycles back to back.
+
+        Args:
+            cycles: Number of cycles
+
+        Returns:
+            PipelineLoadReport
+        """
+        lag_mark = len(self.lag_monitor.samples)
+        results = [await self.run_cycle(i) for i in range(cycles)]
+        return self.report(results, self.lag_monitor.since(lag_mark))
+
+    def report(
+        self, results: List[CycleResult], loop_lag_ms: Optional[List[float]] = None
+    ) -> PipelineLoadReport:
+        """
+        Build a report from cycle results (e.g. from LoadTester).
+
+        Args:
+            results: Cycle results
+            loop_lag_ms: Lag samples for the run (default: all samples)
+
+        Returns:
+            PipelineLoadReport
+        """
+        top: List[str] = []
+        if self._baseline is not None and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+                )
+            )
+            for stat in snapshot.compare_to(self._baseline, "lineno")[
+                : self.config.top_allocations
+            ]:
+                frame = stat.traceback[0]
+                top.append(
+                    f"{frame.filename}:{frame.lineno} "
+                    f"{stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+d} blocks)"
+                )
+
+        return PipelineLoadReport(
+            symbol_count=len(self.symbols),
+            cycle_results=results,
+            loop_lag_ms=list(
+                self.lag_monitor.samples if loop_lag_ms is None else loop_lag_ms
+            ),
+            peak_memory_mb=self._peak_bytes / 1024 / 1024,
+            top_allocations=top,
+            exchange_calls=dict(self.exchange.calls),
+            llm_requests=self.llm.requests,
+            frames_sent=self.feed.frames_sent if self.feed is not None else 0,
+        )
+
+    async def _wait_for_snapshots(self) -> None:
+        assert self.market_data is not None
+        snapshots = self.market_data.latest_snapshots
+        deadline = time.monotonic() + self.config.warmup_timeout_seconds
+        while not all(s in snapshots for s in self.symbols):
+            if time.monotonic() > deadline:
+                missing = [s for s in self.symbols if s not in snapshots]
+                raise TimeoutError(f"No market data snapshot for {missing}")
+            await asyncio.sleep(0.05)
+
+    def _on_ticker(self, frame) -> None:
+        self.exchange.set_price(frame.symbol, float(frame.last))
+
+
+async def run_scaling(
+    symbol_counts: List[int],
+    cycles: int = 20,
+    config: Optional[PipelineHarnessConfig] = None,
+) -> List[PipelineLoadReport]:
+    """
+    Run the pipeline once per symbol count.
+
+    Args:
+        symbol_counts: Symbol counts to run (e.g. [4, 16, 64])
+        cycles: Cycles per run
+        config: Base configuration (symbols are replaced per run)
+
+    Returns:
+        One PipelineLoadReport per symbol count
+    """
+    base = config or PipelineHarnessConfig()
+    reports = []
+    for count in symbol_counts:
+        logger.info(f"Pipeline load run: {count} symbols, {cycles} cycles")
+        async with PipelineLoadHarness(
+            replace(base, symbols=make_symbols(count))
+        ) as harness:
+            reports.append(await harness.run(cycles))
+    return reports
+
+
+def format_report(reports: List[PipelineLoadReport]) -> str:
+    """
+    Format pipeline load reports as a scaling table.
+
+    Args:
+        reports: Reports, one per symbol count
+
+    Returns:
+        Formatted report as string
+    """
+    lines = []
+    lines.append("=" * 80)
+    lines.append("PIPELINE LOAD REPORT")
+    lines.append("=" * 80)
+    lines.append(
+        f"{'Symbols':>8} {'Cycles':>7} {'Success':>8} {'P50 ms':>9} "
+        f"{'P95 ms':>9} {'P99 ms':>9} {'Lag p99':>8} {'Lag max':>8} {'Peak MB':>8}"
+    )
+    for report in reports:
+        lines.append(
+            f"{report.symbol_count:>8} {len(report.cycle_results):>7} "
+            f"{report.success_rate * 100:>7.1f}% "
+            f"{report.latency_percentile(50):>9.1f} "
+            f"{report.latency_percentile(95):>9.1f} "
+            f"{report.latency_percentile(99):>9.1f} "
+            f"{percentile(report.loop_lag_ms, 99):>8.1f} "
+            f"{max(report.loop_lag_ms, default=0.0):>8.1f} "
+            f"{report.peak_memory_mb:>8.1f}"
+        )
+    lines.append("")
+
+    stages = sorted({stage for r in reports for stage in r.stage_summary()})
+    lines.append("STAGE LATENCY (mean / p95 ms)")
+    lines.append("-" * 80)
+    for stage in stages:
+        cells = []
+        for report in reports:
+            summary = report.stage_summary().get(stage)
+            cells.append(
+                f"{summary['mean']:.1f}/{summary['p95']:.1f}" if summary else "-"
+            )
+        lines.append(f"{stage:<16}" + "".join(f"{cell:>16}" for cell in cells))
+    lines.append(
+        f"{'(symbols)':<16}" + "".join(f"{r.symbol_count:>16}" for r in reports)
+    )
+    lines.append("")
+
+    for report in reports:
+        lines.append(f"CALLS ({report.symbol_count} symbols)")
+        lines.append("-" * 80)
+        lines.append(f"LLM requests: {report.llm_requests}")
+        lines.append(f"Frames replayed: {report.frames_sent}")
+        for method, count in sorted(report.exchange_calls.items()):
+            lines.append(f"Exchange {method}: {count}")
+        if report.top_allocations:
+            lines.append("Top allocations since warm-up:")
+            lines.extend(f"  {line}" for line in report.top_allocations)
+        lines.append("")
+
+    lines.append("=" * 80)
+    return "\n".join(lines)
+
+
+async def main():
+    """Command-line interface for the pipeline load harness."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="End-to-end pipeline load test")
+    parser.add_argument(
+        "--symbols", type=int, nargs="+", default=[4, 16], help="Symbol counts"
+    )
+    parser.add_argument("--cycles", type=int, default=20, help="Cycles per run")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-chunk-latency", type=float, default=0.0)
+    parser.add_argument("--exchange-latency", type=float, default=0.05)
+    parser.add_argument("--ws-latency", type=float, default=0.0)
+    parser.add_argument("--stream", action="store_true", help="Stream completions")
+    parser.add_argument("--serial", action="store_true", help="Serial execution")
+    parser.add_argument("--paper", action="store_true", help="PaperTradingExecutor")
+    parser.add_argument("--frames", help="Recorded frames to replay")
+    parser.add_argument(
+        "--no-tracemalloc", action="store_true", help="Skip allocation tracing"
+    )
+    parser.add_argument("--output", help="Output file for report")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    config = PipelineHarnessConfig(
+        llm_latency_seconds=args.llm_latency,
+        llm_chunk_latency_seconds=args.llm_chunk_latency,
+        exchange_latency_seconds=args.exchange_latency,
+        ws_latency_seconds=args.ws_latency,
+        stream=args.stream,
+        concurrent=not args.serial,
+        paper_trading=args.paper,
+        frames_path=args.frames,
+        trace_allocations=not args.no_tracemalloc,
+    )
+    reports = await run_scaling(args.symbols, cycles=args.cycles, config=config)
+    report = format_report(reports)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+        print(f"Report written to {args.output}")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
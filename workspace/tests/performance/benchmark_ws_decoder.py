@@ -0,0 +1,138 @@
+"""
+Performance Benchmarks for WebSocket Frame Decoding
+
+Replays Bybit public frames through the legacy path (json + a Pydantic
+Ticker/OHLCV per frame) and the fast path (fastest installed JSON backend +
+__slots__ frames, models only for confirmed klines).
+
+Frames can be recorded from a live connection with
+BybitWebSocketClient(record_path="frames.jsonl") and replayed with:
+
+    python -m workspace.tests.performance.benchmark_ws_decoder frames.jsonl
+
+Without a recording, a synthetic stream in Bybit's wire format is used.
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-06
+"""
+
+import json
+import logging
+import random
+import sys
+import time
+from typing import List, Optional
+
+from workspace.features.market_data.ws_decoder import BybitFrameDecoder
+
+_SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "ADAUSDT", "DOGEUSDT"]
+
+
+def _synthetic_frames(count: int = 50_000) -> List[str]:
+    """Ticker snapshots/deltas and kline updates in Bybit's wire format"""
+    rng = random.Random(11)
+    prices = {symbol: rng.uniform(0.1, 90000.0) for symbol in _SYMBOLS}
+    start_ms = 1762000000000
+    frames = []
+    for i in range(count):
+        symbol = _SYMBOLS[i % len(_SYMBOLS)]
+        prices[symbol] *= 1 + rng.gauss(0, 0.0005)
+        price = f"{prices[symbol]:.4f}"
+        ts = start_ms + i * 50
+        if i % 3:
+            msg_type = "snapshot" if i < len(_SYMBOLS) else "delta"
+            data = {"symbol": symbol, "lastPrice": price, "bid1Price": price}
+            if msg_type == "snapshot":
+                data.update(
+                    {
+                        "ask1Price": price,
+                        "highPrice24h": price,
+                        "lowPrice24h": price,
+                        "volume24h": "1234.567",
+                        "turnover24h": "111111111.11",
+                        "price24hPcnt": "0.0111",
+                    }
+                )
+            frame = {
+                "topic": f"tickers.{symbol}",
+                "type": msg_type,
+                "data": data,
+                "ts": ts,
+            }
+        else:
+            bar_start = ts - ts % 180_000
+            frame = {
+                "topic": f"kline.3.{symbol}",
+                "type": "snapshot",
+                "data": [
+                    {
+                        "start": bar_start,
+                        "end": bar_start + 179_999,
+                        "interval": "3",
+                        "open": price,
+                        "close": price,
+                        "high": price,
+                        "low": price,
+                        "volume": "12.345",
+                        "turnover": "1111111.11",
+                        "confirm": ts + 50 - bar_start >= 180_000,
+                    }
+                ],
+                "ts": ts,
+            }
+        frames.append(json.dumps(frame))
+    return frames
+
+
+def _load_frames(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line for line in f if line.strip()]
+
+
+def _replay(frames: List[str], decoder: BybitFrameDecoder, build_models: bool) -> int:
+    models = 0
+    for raw in frames:
+        data = decoder.loads(raw)
+        topic = data.get("topic", "")
+        if topic.startswith("tickers."):
+            ticker = decoder.parse_ticker(data)
+            if build_models:
+                ticker.to_model()
+                models += 1
+        elif topic.startswith("kline."):
+            for kline in decoder.parse_klines(data):
+                if build_models or kline.confirm:
+                    kline.to_model()
+                    models += 1
+    return models
+
+
+def benchmark_replay(path: Optional[str] = None):
+    """Benchmark decoding recorded (or synthetic) Bybit frames"""
+    frames = _load_frames(path) if path else _synthetic_frames()
+
+    legacy = BybitFrameDecoder("json")
+    start = time.perf_counter()
+    legacy_models = _replay(frames, legacy, build_models=True)
+    legacy_s = time.perf_counter() - start
+
+    fast = BybitFrameDecoder()
+    start = time.perf_counter()
+    fast_models = _replay(frames, fast, build_models=False)
+    fast_s = time.perf_counter() - start
+
+    print(
+        f"Replay ({len(frames)} frames, {'recorded' if path else 'synthetic'}): "
+        f"legacy json+Pydantic {len(frames) / legacy_s:,.0f} msg/s "
+        f"({legacy_models} models), fast path [{fast.backend}] "
+        f"{len(frames) / fast_s:,.0f} msg/s ({fast_models} models), "
+        f"{legacy_s / fast_s:.1f}x"
+    )
+    assert fast_s < legacy_s, "Fast path slower than legacy decoding"
+
+    return legacy_s, fast_s
+
+
+if __name__ == "__main__":
+    logging.disable(logging.WARNING)
+    benchmark_replay(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,275 @@
+"""
+Unit Tests for the Market Data Replay Engine and Backtester
+
+Checks replay resampling against pandas, chunk-size independence, stream
+interleaving, database keyset paging and the backtester's fill, stop-loss
+and accounting model.
+
+Author: Testing Team
+Date: 2025-11-22
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from workspace.features.backtesting import (
+    PYARROW_AVAILABLE,
+    BacktestConfig,
+    Backtester,
+    CSVCandleSource,
+    DatabaseCandleSource,
+    MarketReplay,
+    ParquetCandleSource,
+    interleave,
+)
+from workspace.features.market_data import Timeframe
+from workspace.features.strategy import BaseStrategy, StrategySignal, StrategyType
+from workspace.features.trading_loop import TradingDecision
+
+SYMBOL = "BTC/USDT:USDT"
+START_MS = 1_700_000_040_000  # 2 minutes into a 3m bar
+
+
+def candle_frame(count: int = 600, seed: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, count))
+    return pd.DataFrame(
+        {
+            "timestamp": START_MS + np.arange(count) * 60_000,
+            "open": np.r_[close[0], close[:-1]],
+            "high": close + rng.uniform(0, 1, count),
+            "low": close - rng.uniform(0, 1, count),
+            "close": close,
+            "volume": rng.uniform(1, 5, count),
+        }
+    )
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "btc_1m.csv"
+    candle_frame().to_csv(path, index=False)
+    return path
+
+
+def bar_tuples(snapshots):
+    return [
+        (
+            s.symbol,
+            s.ohlcv.timestamp,
+            float(s.ohlcv.open),
+            float(s.ohlcv.high),
+            float(s.ohlcv.low),
+            float(s.ohlcv.close),
+            float(s.ohlcv.volume),
+        )
+        for s in snapshots
+    ]
+
+
+class ScriptedStrategy(BaseStrategy):
+    """Emits preset decisions by bar open time"""
+
+    def __init__(self, script, stop_loss_pct=None):
+        super().__init__()
+        self.script = script
+        self.stop_loss_pct = stop_loss_pct
+        self.snapshots = []
+
+    def analyze(self, snapshot):
+        self.snapshots.append(snapshot)
+        decision = self.script.get(snapshot.ohlcv.timestamp, TradingDecision.HOLD)
+        return StrategySignal(
+            symbol=snapshot.symbol,
+            decision=decision,
+            confidence=Decimal("1"),
+            size_pct=Decimal("0.5"),
+            stop_loss_pct=self.stop_loss_pct,
+        )
+
+    def get_name(self):
+        return "scripted"
+
+    def get_type(self):
+        return StrategyType.CUSTOM
+
+
+# ============================================================================
+# Replay
+# ============================================================================
+
+
+def test_replay_matches_pandas_resample(csv_path):
+    replay = MarketReplay(Timeframe.M3)
+    snapshots = list(replay.replay(CSVCandleSource(csv_path, SYMBOL, chunk_size=97)))
+
+    frame = candle_frame()
+    frame.index = pd.to_datetime(frame["timestamp"], unit="ms")
+    expected = frame.resample("3min").agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    )
+    expected = expected.iloc[:-1]  # Trailing partial bar is not closed
+
+    bars = bar_tuples(snapshots)
+    assert [bar[1] for bar in bars] == list(expected.index.to_pydatetime())
+    np.testing.assert_allclose(
+        [bar[2:] for bar in bars], expected.to_numpy(), rtol=1e-12
+    )
+    assert replay.candles == 600 and replay.bars == len(expected)
+
+    last = snapshots[-1]
+    assert last.timestamp == last.ohlcv.timestamp + timedelta(minutes=3)
+    assert last.ticker.last == last.ohlcv.close
+    assert last.rsi is not None and last.bollinger is not None
+    assert float(last.ticker.volume_24h) == pytest.approx(expected["volume"].sum())
+    assert float(last.ticker.high_24h) == pytest.approx(expected["high"].max())
+
+
+def test_replay_is_chunk_size_independent(csv_path):
+    def run(chunk_size):
+        replay = MarketReplay(Timeframe.M5)
+        snapshots = list(
+            replay.replay(CSVCandleSource(csv_path, SYMBOL, chunk_size=chunk_size))
+        )
+        return bar_tuples(snapshots), [s.rsi.value for s in snapshots if s.rsi]
+
+    assert run(1) == run(7) == run(10_000)
+
+
+def test_interleave_orders_symbols_by_bar_time(tmp_path):
+    first = tmp_path / "a.csv"
+    second = tmp_path / "b.csv"
+    candle_frame(300).to_csv(first, index=False)
+    iso = candle_frame(300)
+    iso["timestamp"] = pd.to_datetime(iso["timestamp"], unit="ms").dt.strftime(
+        "%Y-%m-%dT%H:%M:%SZ"
+    )
+    iso.to_csv(second, index=False)
+
+    snapshots = list(
+        MarketReplay(Timeframe.M3).replay(
+            interleave(
+                [
+                    CSVCandleSource(first, "A", chunk_size=70),
+                    CSVCandleSource(second, "B", chunk_size=33),
+                ]
+            )
+        )
+    )
+
+    keys = [(s.ohlcv.timestamp, s.symbol) for s in snapshots]
+    assert keys == sorted(keys)
+    bars = bar_tuples(snapshots)
+    assert [bar[1:] for bar in bars if bar[0] == "A"] == [
+        bar[1:] for bar in bars if bar[0] == "B"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_database_source_pages_by_keyset():
+    def row(minute, symbol):
+        return {
+            "symbol": symbol,
+            "timestamp": minute * 60_000_000,
+            "open": Decimal("1"),
+            "high": Decimal("2"),
+            "low": Decimal("0.5"),
+            "close": Decimal("1.5"),
+            "volume": Decimal("10"),
+        }
+
+    conn = MagicMock()
+    conn.fetch = AsyncMock(side_effect=[[row(0, "A"), row(0, "B")], [row(1, "A")]])
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    source = DatabaseCandleSource(pool, ["A", "B"], page_size=2)
+    batches = [batch async for batch in source]
+
+    assert [list(batch.symbol) for batch in batches] == [["A", "B"], ["A"]]
+    query, *args = conn.fetch.call_args_list[1].args
+    assert "(timestamp, symbol) > ($3, $4)" in query
+    assert "ORDER BY timestamp, symbol" in query
+    assert args[:4] == [["A", "B"], "1m", 0, "B"]
+    assert batches[1].close.tolist() == [1.5]
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+def test_parquet_source_matches_csv(tmp_path, csv_path):
+    path = tmp_path / "btc_1m.parquet"
+    candle_frame().to_parquet(path)
+
+    def bars(source):
+        return bar_tuples(MarketReplay(Timeframe.M3).replay(source))
+
+    assert bars(ParquetCandleSource(path, SYMBOL, chunk_size=50)) == bars(
+        CSVCandleSource(csv_path, SYMBOL)
+    )
+
+
+# ============================================================================
+# Backtester
+# ============================================================================
+
+
+def test_signal_fills_at_next_open_with_slippage(csv_path):
+    config = BacktestConfig(slippage_pct=Decimal("0.001"), taker_fee_pct=Decimal("0"))
+    probe = ScriptedStrategy({})
+    Backtester(probe, config).run(CSVCandleSource(csv_path, SYMBOL))
+    bars = probe.snapshots
+    entry_bar, exit_bar = bars[10], bars[20]
+
+    strategy = ScriptedStrategy(
+        {
+            bars[9].ohlcv.timestamp: TradingDecision.BUY,
+            bars[19].ohlcv.timestamp: TradingDecision.CLOSE,
+        }
+    )
+    backtester = Backtester(strategy, config)
+    result = backtester.run(CSVCandleSource(csv_path, SYMBOL))
+
+    (trade,) = result.trades
+    assert trade.entry_time == entry_bar.ohlcv.timestamp
+    assert trade.entry_price == entry_bar.ohlcv.open * Decimal("1.001")
+    assert trade.exit_price == exit_bar.ohlcv.open * Decimal("0.999")
+    assert trade.exit_reason == "signal"
+    assert trade.pnl == pytest.approx(
+        (trade.exit_price - trade.entry_price) * trade.quantity, abs=1e-6
+    )
+    assert result.final_equity == backtester.portfolio.balance
+    assert result.final_equity == pytest.approx(result.initial_balance + trade.pnl)
+    # Virtual portfolio records simulated, not wall-clock, times
+    closed = backtester.portfolio.closed_positions[0]
+    assert closed["opened_at"] == entry_bar.ohlcv.timestamp
+    assert closed["holding_period"] == 10 * 180
+
+
+def test_stop_loss_and_end_of_data_exits(csv_path):
+    probe = ScriptedStrategy({})
+    Backtester(probe).run(CSVCandleSource(csv_path, SYMBOL))
+    bars = probe.snapshots
+
+    strategy = ScriptedStrategy(
+        {bar.ohlcv.timestamp: TradingDecision.SELL for bar in bars},
+        stop_loss_pct=Decimal("0.005"),
+    )
+    result = Backtester(strategy, BacktestConfig(allow_short=True)).run(
+        CSVCandleSource(csv_path, SYMBOL)
+    )
+
+    assert result.trades
+    assert all(trade.side == "short" for trade in result.trades)
+    reasons = {trade.exit_reason for trade in result.trades}
+    assert reasons <= {"stop_loss", "end_of_data"} and "stop_loss" in reasons
+    for trade in result.trades:
+        if trade.exit_reason == "stop_loss":
+            assert trade.exit_price >= trade.entry_price * Decimal("1.005")
+    assert result.equity_curve[-1] == (result.end, result.final_equity)
+    assert result.metrics.total_trades == len(result.trades)
+    assert result.bars == len(bars)
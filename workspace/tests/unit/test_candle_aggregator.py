@@ -0,0 +1,263 @@
+"""
+Tests for CandleAggregator
+
+Tests cover:
+- Higher-timeframe bars match a direct bucket aggregation of 1m candles
+- Open-bar revisions replace (not double count) their contribution
+- Bar-close signalling, stale candles and invalid timeframes
+- MarketDataService aggregation mode and CorrelationAnalyzer 1d closes
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-07
+"""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List
+from unittest.mock import AsyncMock
+
+import pytest
+
+from workspace.features.market_data.candle_aggregator import (
+    TIMEFRAME_SECONDS,
+    CandleAggregator,
+)
+from workspace.features.market_data.market_data_service import MarketDataService
+from workspace.features.market_data.models import OHLCV, Timeframe
+from workspace.features.market_data.ws_decoder import KlineFrame
+from workspace.features.risk_manager import CorrelationAnalyzer
+
+SYMBOL = "BTC/USDT:USDT"
+T0 = datetime(2025, 11, 1)
+
+
+def _minute(index: int, close: Decimal, volume: str = "2") -> OHLCV:
+    return OHLCV(
+        symbol=SYMBOL,
+        timeframe=Timeframe.M1,
+        timestamp=T0 + timedelta(minutes=index),
+        open=close - Decimal("1"),
+        high=close + Decimal("3"),
+        low=close - Decimal("4"),
+        close=close,
+        volume=Decimal(volume),
+        quote_volume=close * Decimal(volume),
+    )
+
+
+def _expected(minutes, timeframe: str):
+    """Direct (non-incremental) bucket aggregation"""
+    size = timedelta(seconds=TIMEFRAME_SECONDS[timeframe])
+    buckets: Dict[datetime, List[OHLCV]] = {}
+    for candle in minutes:
+        start = T0 + ((candle.timestamp - T0) // size) * size
+        buckets.setdefault(start, []).append(candle)
+    return [
+        (
+            start,
+            group[0].open,
+            max(c.high for c in group),
+            min(c.low for c in group),
+            group[-1].close,
+            sum(c.volume for c in group),
+            sum(c.quote_volume or Decimal(0) for c in group),
+        )
+        for start, group in sorted(buckets.items())
+    ]
+
+
+def _rows(buffer):
+    return [
+        (c.timestamp, c.open, c.high, c.low, c.close, c.volume, c.quote_volume)
+        for c in buffer
+    ]
+
+
+@pytest.fixture
+def minutes():
+    """Fixture: 240 one-minute candles on a seeded random walk"""
+    rng = random.Random(3)
+    price = Decimal("90000")
+    candles = []
+    for i in range(240):
+        price += Decimal(rng.randint(-50, 50))
+        candles.append(_minute(i, price, volume=str(rng.randint(1, 9))))
+    return candles
+
+
+class TestAggregation:
+    def test_matches_direct_aggregation(self, minutes):
+        timeframes = [Timeframe.M3, Timeframe.M5, Timeframe.M15, Timeframe.H1]
+        aggregator = CandleAggregator(SYMBOL, timeframes, capacity=100)
+        for candle in minutes:
+            aggregator.update(candle)
+
+        for timeframe in timeframes:
+            assert _rows(aggregator.buffers[timeframe.value]) == _expected(
+                minutes, timeframe.value
+            )
+
+    def test_revisions_do_not_double_count(self, minutes):
+        aggregator = CandleAggregator(SYMBOL, [Timeframe.M5, Timeframe.H1])
+        for candle in minutes[:60]:
+            for bump in ("7", "-9"):
+                aggregator.update(
+                    candle.model_copy(
+                        update={
+                            "close": candle.close + Decimal(bump),
+                            "volume": candle.volume * 3,
+                        }
+                    )
+                )
+            aggregator.update(candle)
+
+        assert _rows(aggregator.buffers["5m"]) == _expected(minutes[:60], "5m")
+        assert _rows(aggregator.buffers["1h"]) == _expected(minutes[:60], "1h")
+
+    def test_missing_quote_volume_and_trades(self):
+        aggregator = CandleAggregator(SYMBOL, [Timeframe.M3])
+        first = _minute(0, Decimal("10"))
+        second = _minute(1, Decimal("11"))
+        aggregator.update(first.model_copy(update={"quote_volume": None}))
+        aggregator.update(second.model_copy(update={"trades_count": 4}))
+
+        bar = aggregator.latest(Timeframe.M3)
+        assert bar.quote_volume == Decimal("11") * Decimal("2")
+        assert bar.trades_count == 4
+
+
+class TestBarLifecycle:
+    def _frame(self, index: int, close: str, confirm: bool) -> KlineFrame:
+        start = (T0 - datetime(1970, 1, 1)) // timedelta(milliseconds=1)
+        start += index * 60_000
+        frame = KlineFrame(
+            symbol=SYMBOL,
+            timeframe="1m",
+            start=start,
+            end=start + 59_999,
+            open=close,
+            high=close,
+            low=close,
+            close=close,
+            volume="1",
+            turnover="1",
+            confirm=confirm,
+        )
+        # Bar times are UTC whatever the host timezone
+        assert frame.timestamp == T0 + timedelta(minutes=index)
+        return frame
+
+    def test_confirmed_last_minute_closes_bucket(self):
+        aggregator = CandleAggregator(SYMBOL, [Timeframe.M3, Timeframe.M15])
+        closed = []
+        for i in range(3):
+            bars = aggregator.update(self._frame(i, str(100 + i), confirm=True))
+            closed.append({bar.timeframe: bar.closed for bar in bars})
+
+        assert closed == [
+            {"3m": False, "15m": False},
+            {"3m": False, "15m": False},
+            {"3m": True, "15m": False},
+        ]
+        assert aggregator.latest(Timeframe.M3).close == Decimal("102")
+        assert aggregator.latest(Timeframe.M3).volume == Decimal("3")
+
+    def test_newer_candle_closes_unconfirmed_bucket(self, minutes):
+        aggregator = CandleAggregator(SYMBOL, [Timeframe.M3, Timeframe.M15])
+        closed = []
+        for candle in minutes[:31]:
+            closed += [bar for bar in aggregator.update(candle) if bar.closed]
+
+        assert [(bar.timeframe, bar.candle.timestamp) for bar in closed] == [
+            ("3m", T0 + timedelta(minutes=m)) for m in range(0, 15, 3)
+        ] + [("15m", T0), ("3m", T0 + timedelta(minutes=15))] + [
+            ("3m", T0 + timedelta(minutes=m)) for m in range(18, 30, 3)
+        ] + [
+            ("15m", T0 + timedelta(minutes=15))
+        ]
+        assert closed[-1].candle.close == minutes[29].close
+        assert closed[-1].candle.volume == sum(c.volume for c in minutes[15:30])
+
+    def test_confirmed_bucket_not_closed_twice(self):
+        aggregator = CandleAggregator(SYMBOL, [Timeframe.M3])
+        for i in range(3):
+            aggregator.update(self._frame(i, "100", confirm=True))
+
+        bars = aggregator.update(self._frame(3, "101", confirm=False))
+        assert [(bar.candle.timestamp, bar.closed) for bar in bars] == [
+            (T0 + timedelta(minutes=3), False)
+        ]
+
+    def test_update_after_confirm_ignored(self):
+        aggregator = CandleAggregator(SYMBOL, [Timeframe.M3])
+        aggregator.update(self._frame(0, "100", confirm=True))
+
+        assert aggregator.update(self._frame(0, "999", confirm=False)) == []
+        assert aggregator.latest(Timeframe.M3).close == Decimal("100")
+
+    def test_out_of_order_ignored(self, minutes):
+        aggregator = CandleAggregator(SYMBOL, [Timeframe.M3])
+        aggregator.update(minutes[5])
+
+        assert aggregator.update(minutes[2]) == []
+        assert len(aggregator.buffers["3m"]) == 1
+
+    def test_invalid_timeframe(self):
+        with pytest.raises(ValueError):
+            CandleAggregator(SYMBOL, [Timeframe.M1])
+        with pytest.raises(ValueError):
+            CandleAggregator(SYMBOL, [Timeframe.M5], base_timeframe=Timeframe.M3)
+
+
+class TestServiceAggregation:
+    @pytest.fixture
+    def service(self):
+        service = MarketDataService(
+            symbols=["BTCUSDT"],
+            timeframe=Timeframe.M3,
+            aggregate_timeframes=[Timeframe.H1, Timeframe.D1],
+        )
+        service.cache = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_primary_timeframe_built_from_minutes(self, service, minutes):
+        for candle in minutes:
+            await service._handle_kline_update(candle)
+
+        assert service.aggregators[SYMBOL].timeframes == ["3m", "1h", "1d"]
+        assert _rows(service.ohlcv_data[SYMBOL]) == _expected(minutes, "3m")[-100:]
+        engine = service.indicator_engines[(SYMBOL, "3m")]
+        assert engine.latest_candle.close == minutes[-1].close
+        assert engine.bar_count == 80
+
+    @pytest.mark.asyncio
+    async def test_get_ohlcv_rows(self, service, minutes):
+        for candle in minutes:
+            await service._handle_kline_update(candle)
+
+        rows = await service.get_ohlcv("BTCUSDT", timeframe="1h", limit=2)
+        expected = _expected(minutes, "1h")[-2:]
+        assert [row[4] for row in rows] == [float(e[4]) for e in expected]
+        epoch = datetime(1970, 1, 1)
+        assert rows[0][0] == (expected[0][0] - epoch) // timedelta(milliseconds=1)
+        assert await service.get_ohlcv("BTCUSDT", timeframe="15m") == []
+
+    @pytest.mark.asyncio
+    async def test_correlation_analyzer_reads_daily_closes(self, service):
+        for day in range(3):
+            for minute in (0, 1439):
+                index = day * 1440 + minute
+                await service._handle_kline_update(
+                    _minute(index, Decimal(90000 + day * 100 + minute))
+                )
+
+        analyzer = CorrelationAnalyzer(market_data_service=service)
+        history = await analyzer.fetch_price_history(["BTCUSDT"], days=30)
+
+        assert history["BTCUSDT"].prices == [
+            Decimal("91439.0"),
+            Decimal("91539.0"),
+            Decimal("91639.0"),
+        ]
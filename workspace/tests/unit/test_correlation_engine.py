@@ -0,0 +1,184 @@
+"""
+Unit Tests for the Incremental Correlation Engine
+
+Tests rolling-sum and EWMA updates against full recomputation, bar
+collection from closed daily bars, and CorrelationAnalyzer integration.
+
+Author: Testing Team
+Date: 2025-11-19
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+
+from workspace.features.risk_manager import CorrelationAnalyzer, CorrelationEngine
+from workspace.features.risk_manager.correlation_engine import (
+    correlation_from_returns,
+    pairwise_correlation,
+)
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "ADAUSDT"]
+
+
+@pytest.fixture
+def returns():
+    """Correlated daily returns, (120 periods, 4 symbols)"""
+    rng = np.random.default_rng(11)
+    market = rng.normal(0, 0.02, size=(120, 1))
+    noise = rng.normal(0, 0.01, size=(120, 4))
+    return market * np.array([1.0, 0.9, 0.5, -0.3]) + noise
+
+
+def seeded_engine(returns, seed_rows=40, window=30):
+    engine = CorrelationEngine(window=window)
+    engine.load_returns({s: returns[:seed_rows, i] for i, s in enumerate(SYMBOLS)})
+    return engine
+
+
+def test_rolling_matrix_tracks_window(returns):
+    engine = seeded_engine(returns)
+    for row in returns[40:]:
+        engine.add_returns(dict(zip(SYMBOLS, row)))
+
+    expected = correlation_from_returns(returns[-30:])
+    assert engine.count == 30
+    assert np.allclose(engine.matrix(), expected)
+    assert engine.correlation("BTCUSDT", "ADAUSDT") == pytest.approx(expected[0, 3])
+    assert np.allclose(
+        engine.matrix(["SOLUSDT", "BTCUSDT"]), expected[[2, 0]][:, [2, 0]]
+    )
+
+
+def test_ewma_matches_full_recursion(returns):
+    engine = seeded_engine(returns, seed_rows=30, window=30)
+    for row in returns[30:60]:
+        engine.add_returns(dict(zip(SYMBOLS, row)))
+
+    covariance = np.zeros((4, 4))
+    for row in returns[:60]:
+        covariance = 0.94 * covariance + 0.06 * np.outer(row, row)
+
+    assert np.allclose(engine.covariance("ewma"), covariance)
+    assert engine.matrix(method="ewma")[0, 1] > 0.5
+
+
+def test_update_close_commits_complete_bars():
+    engine = CorrelationEngine(window=5)
+    engine.load_prices({s: [100.0, 100.0] for s in SYMBOLS})
+    day = datetime(2025, 11, 19)
+
+    for symbol in SYMBOLS[:3]:
+        engine.update_close(symbol, day, 110.0)
+    assert engine.count == 1  # waiting for ADAUSDT
+
+    engine.update_close("ADAUSDT", day, 90.0)
+    assert engine.count == 2
+    assert engine._buffer[1].tolist() == pytest.approx([0.1, 0.1, 0.1, -0.1])
+
+    # A later bar commits the incomplete one; missing symbols keep their close
+    engine.update_close("BTCUSDT", day + timedelta(days=1), 121.0)
+    engine.update_close("BTCUSDT", day + timedelta(days=2), 121.0)
+    assert engine.count == 3
+    assert engine._buffer[2].tolist() == pytest.approx([0.1, 0.0, 0.0, 0.0])
+
+
+def test_on_bar_feeds_closed_daily_bars():
+    engine = CorrelationEngine(window=5)
+    engine.load_prices({"BTCUSDT": [100.0, 100.0]})
+    service = Mock()
+    engine.attach(service)
+    service.add_bar_listener.assert_called_once_with(engine.on_bar)
+
+    candle = SimpleNamespace(
+        symbol="BTC/USDT:USDT", timestamp=datetime(2025, 11, 19), close=Decimal("105")
+    )
+    engine.on_bar(SimpleNamespace(timeframe="1h", closed=True, candle=candle))
+    engine.on_bar(SimpleNamespace(timeframe="1d", closed=False, candle=candle))
+    assert engine.count == 1
+
+    engine.on_bar(SimpleNamespace(timeframe="1d", closed=True, candle=candle))
+    assert engine.count == 2
+    assert engine._buffer[1, 0] == pytest.approx(0.05)
+
+
+@pytest.mark.asyncio
+async def test_analyzer_matrix_matches_pairwise_correlation(returns):
+    prices = 100 * np.cumprod(1 + returns, axis=0)
+    service = AsyncMock()
+    service.get_ohlcv = AsyncMock(
+        side_effect=lambda symbol, **kwargs: [
+            [i * 86_400_000, p, p, p, p, 1.0]
+            for i, p in enumerate(prices[:, SYMBOLS.index(symbol)])
+        ]
+    )
+    analyzer = CorrelationAnalyzer(market_data_service=service)
+
+    matrix = await analyzer.calculate_portfolio_correlation(SYMBOLS)
+
+    series = {
+        s: analyzer.calculate_returns(prices[:, i]) for i, s in enumerate(SYMBOLS)
+    }
+    for a in SYMBOLS:
+        for b in SYMBOLS:
+            if a != b:
+                expected = analyzer.calculate_correlation(series[a], series[b])
+                assert matrix.matrix[a][b] == pytest.approx(expected)
+
+
+def test_pairwise_correlation_uses_each_pairs_overlap(returns):
+    series = [returns[:, 0], returns[:, 1], returns[-20:, 2], returns[-1:, 3]]
+
+    matrix = pairwise_correlation(series)
+
+    full = correlation_from_returns(returns)
+    recent = correlation_from_returns(returns[-20:])
+    assert matrix[0, 1] == pytest.approx(full[0, 1])
+    assert matrix[0, 2] == pytest.approx(recent[0, 2])
+    assert matrix[2, 1] == pytest.approx(recent[2, 1])
+    assert matrix[3, 0] == 0.0 and matrix[3, 3] == 1.0
+    np.testing.assert_allclose(matrix, matrix.T)
+
+
+@pytest.mark.asyncio
+async def test_analyzer_short_history_keeps_other_pairs(returns):
+    prices = 100 * np.cumprod(1 + returns, axis=0)
+    listed = {"SOLUSDT": 25}  # Listed recently, 25 daily closes
+    service = AsyncMock()
+    service.get_ohlcv = AsyncMock(
+        side_effect=lambda symbol, **kwargs: [
+            [i * 86_400_000, p, p, p, p, 1.0]
+            for i, p in enumerate(prices[:, SYMBOLS.index(symbol)])
+        ][-listed.get(symbol, len(prices)) :]
+    )
+    analyzer = CorrelationAnalyzer(market_data_service=service)
+
+    matrix = await analyzer.calculate_portfolio_correlation(SYMBOLS)
+
+    full = correlation_from_returns(returns[1:])
+    recent = correlation_from_returns(returns[-24:])
+    assert matrix.matrix["BTCUSDT"]["ETHUSDT"] == pytest.approx(full[0, 1])
+    assert matrix.matrix["SOLUSDT"]["ADAUSDT"] == pytest.approx(recent[2, 3])
+
+
+@pytest.mark.asyncio
+async def test_analyzer_uses_engine_without_fetching(returns):
+    engine = seeded_engine(returns)
+    service = AsyncMock()
+    analyzer = CorrelationAnalyzer(
+        market_data_service=service, max_correlation_threshold=0.7, engine=engine
+    )
+
+    matrix = await analyzer.calculate_portfolio_correlation(["BTCUSDT", "ETHUSDT"])
+    pairs = analyzer.check_signal_correlation("BTCUSDT", ["ETHUSDT", "ADAUSDT"])
+
+    service.get_ohlcv.assert_not_awaited()
+    assert matrix.matrix["BTCUSDT"]["ETHUSDT"] == pytest.approx(
+        engine.correlation("BTCUSDT", "ETHUSDT")
+    )
+    assert [p.symbol2 for p in pairs] == ["ETHUSDT"]
+    assert analyzer.check_signal_correlation("DOGEUSDT", ["BTCUSDT"]) == []
@@ -0,0 +1,396 @@
+"""
+Unit tests for LLM request control
+
+Tests token-bucket rate limiting with a priority lane, single-flight
+request coalescing (in-process and through Redis), and their use in
+LLMDecisionEngine.
+
+Author: Decision Engine Implementation Team
+Date: 2025-11-15
+"""
+
+import asyncio
+import json
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from workspace.features.decision_engine import (
+    LLMDecisionEngine,
+    LLMRateLimiter,
+    RequestCoalescer,
+    TokenBucket,
+)
+from workspace.features.decision_engine import request_control
+from workspace.features.market_data import MarketDataSnapshot, OHLCV, Ticker, Timeframe
+
+
+class FakePubSub:
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+        self.closed = False
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedis:
+    """In-memory stand-in for RedisManager (shared by 'processes')"""
+
+    def __init__(self):
+        self.storage = {}
+        self.channels = {}
+
+    async def set_nx(self, key, value, ttl_seconds):
+        if key in self.storage:
+            return False
+        self.storage[key] = json.dumps(value)
+        return True
+
+    async def delete_if_equals(self, key, value):
+        if self.storage.get(key) == json.dumps(value):
+            del self.storage[key]
+            return True
+        return False
+
+    async def get(self, key):
+        value = self.storage.get(key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key, value, ttl_seconds=None):
+        self.storage[key] = json.dumps(value)
+        return True
+
+    async def publish(self, channel, message):
+        queues = self.channels.get(channel, [])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "data": json.dumps(message)})
+        return len(queues)
+
+    async def subscribe(self, *channels):
+        queue = asyncio.Queue()
+        for channel in channels:
+            self.channels.setdefault(channel, []).append(queue)
+        return FakePubSub(queue)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+
+    async def get_redis():
+        return redis
+
+    monkeypatch.setattr(request_control, "get_redis", get_redis)
+    monkeypatch.setattr(request_control, "REDIS_AVAILABLE", True)
+    return redis
+
+
+def create_snapshot(symbol: str, price: float) -> MarketDataSnapshot:
+    """Helper to create a minimal snapshot"""
+    now = datetime.utcnow()
+    return MarketDataSnapshot(
+        symbol=symbol,
+        timeframe=Timeframe.M3,
+        timestamp=now,
+        ohlcv=OHLCV(
+            symbol=symbol,
+            timeframe=Timeframe.M3,
+            timestamp=now,
+            open=Decimal(str(price)),
+            high=Decimal(str(price + 5)),
+            low=Decimal(str(price - 5)),
+            close=Decimal(str(price)),
+            volume=Decimal("100"),
+            quote_volume=Decimal(str(price * 100)),
+        ),
+        ticker=Ticker(
+            symbol=symbol,
+            timestamp=now,
+            bid=Decimal(str(price - 1)),
+            ask=Decimal(str(price + 1)),
+            last=Decimal(str(price)),
+            high_24h=Decimal(str(price + 500)),
+            low_24h=Decimal(str(price - 500)),
+            volume_24h=Decimal("1000"),
+            quote_volume_24h=Decimal(str(price * 1000)),
+            change_24h=Decimal("0"),
+            change_24h_pct=Decimal("0"),
+        ),
+    )
+
+
+RESPONSE = (
+    '```json\n{"symbol": "BTCUSDT", "decision": "buy", "confidence": 0.8, '
+    '"size_pct": 0.1, "reasoning": "test"}\n```'
+)
+USAGE = {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
+
+
+class TestTokenBucket:
+    @pytest.mark.asyncio
+    async def test_acquire_within_capacity_is_immediate(self):
+        bucket = TokenBucket(rate_per_second=1.0, capacity=3)
+
+        for _ in range(3):
+            assert await bucket.acquire() == 0.0
+
+        assert bucket.available < 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_refill(self):
+        bucket = TokenBucket(rate_per_second=50.0, capacity=1)
+        await bucket.acquire()
+
+        waited = await bucket.acquire()
+
+        assert waited > 0
+
+    @pytest.mark.asyncio
+    async def test_priority_lane_served_first(self):
+        bucket = TokenBucket(rate_per_second=20.0, capacity=1)
+        await bucket.acquire()
+        order = []
+
+        async def take(name, priority):
+            await bucket.acquire(priority=priority)
+            order.append(name)
+
+        normal = [asyncio.create_task(take(f"n{i}", False)) for i in range(2)]
+        await asyncio.sleep(0)
+        urgent = asyncio.create_task(take("close", True))
+        await asyncio.gather(*normal, urgent)
+
+        assert order[0] == "close"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        bucket = TokenBucket(rate_per_second=1.0, capacity=1)
+        await bucket.acquire()
+
+        task = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0)
+        assert bucket.waiting == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert bucket.waiting == 0
+
+    def test_backoff_drains_bucket(self):
+        bucket = TokenBucket(rate_per_second=2.0, capacity=10)
+
+        bucket.backoff(5)
+
+        assert bucket.available <= -9.9
+
+
+class TestLLMRateLimiter:
+    @pytest.mark.asyncio
+    async def test_acquire_counts_priority(self):
+        limiter = LLMRateLimiter(requests_per_minute=600, tokens_per_minute=100_000)
+
+        await limiter.acquire(estimated_tokens=2000)
+        await limiter.acquire(estimated_tokens=2000, priority=True)
+
+        stats = limiter.get_stats()
+        assert stats["acquired"] == 2
+        assert stats["priority_acquired"] == 1
+
+    def test_backoff_pauses_both_buckets(self):
+        limiter = LLMRateLimiter(requests_per_minute=60, tokens_per_minute=60_000)
+
+        limiter.backoff(30)
+
+        assert limiter.requests.available < 0
+        assert limiter.tokens.available < 0
+        assert limiter.get_stats()["backoffs"] == 1
+
+
+class TestRequestCoalescer:
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self):
+        coalescer = RequestCoalescer()
+        call = AsyncMock(return_value="result")
+
+        async def slow_call():
+            await asyncio.sleep(0.01)
+            return await call()
+
+        results = await asyncio.gather(
+            *(coalescer.run("key", slow_call) for _ in range(3))
+        )
+
+        assert call.await_count == 1
+        assert [r[0] for r in results] == ["result"] * 3
+        assert sorted(r[1] for r in results) == [False, True, True]
+        assert coalescer.stats["coalesced_local"] == 2
+
+    @pytest.mark.asyncio
+    async def test_different_keys_do_not_coalesce(self):
+        coalescer = RequestCoalescer()
+        call = AsyncMock(return_value="result")
+
+        await asyncio.gather(coalescer.run("a", call), coalescer.run("b", call))
+
+        assert call.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared_and_not_cached(self):
+        coalescer = RequestCoalescer()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        results = await asyncio.gather(
+            coalescer.run("key", failing),
+            coalescer.run("key", failing),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert await coalescer.run("key", AsyncMock(return_value=1)) == (1, False)
+
+    @pytest.mark.asyncio
+    async def test_distributed_follower_receives_leader_result(self, fake_redis):
+        leader = RequestCoalescer(distributed=True)
+        follower = RequestCoalescer(distributed=True)
+        released = asyncio.Event()
+        follower_call = AsyncMock(return_value=["other", {}])
+
+        async def leader_call():
+            await released.wait()
+            return ["text", {"prompt_tokens": 1}]
+
+        leader_task = asyncio.create_task(leader.run("key", leader_call))
+        await asyncio.sleep(0)
+        follower_task = asyncio.create_task(follower.run("key", follower_call))
+        await asyncio.sleep(0.01)
+        released.set()
+
+        assert await leader_task == (["text", {"prompt_tokens": 1}], False)
+        assert await follower_task == (["text", {"prompt_tokens": 1}], True)
+        follower_call.assert_not_awaited()
+        assert "llm:inflight:lock:key" not in fake_redis.storage
+
+    @pytest.mark.asyncio
+    async def test_distributed_follower_falls_back_on_leader_error(self, fake_redis):
+        leader = RequestCoalescer(distributed=True)
+        follower = RequestCoalescer(distributed=True)
+        released = asyncio.Event()
+
+        async def leader_call():
+            await released.wait()
+            raise ValueError("upstream failed")
+
+        leader_task = asyncio.create_task(leader.run("key", leader_call))
+        await asyncio.sleep(0)
+        follower_task = asyncio.create_task(
+            follower.run("key", AsyncMock(return_value="own"))
+        )
+        await asyncio.sleep(0.01)
+        released.set()
+
+        with pytest.raises(ValueError):
+            await leader_task
+        assert await follower_task == ("own", False)
+        assert follower.stats["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_distributed_leader_announces_before_release(self, fake_redis):
+        coalescer = RequestCoalescer(distributed=True)
+        late_calls = []
+        release = fake_redis.delete_if_equals
+
+        async def delete_if_equals(key, value):
+            # A caller arriving just before the lock is released
+            late = RequestCoalescer(distributed=True)
+            late_calls.append(await late.run("key", AsyncMock(return_value="dup")))
+            return await release(key, value)
+
+        fake_redis.delete_if_equals = delete_if_equals
+
+        assert await coalescer.run("key", AsyncMock(return_value="one")) == (
+            "one",
+            False,
+        )
+        assert late_calls == [("one", True)]
+
+    @pytest.mark.asyncio
+    async def test_distributed_redis_error_falls_back_immediately(self, fake_redis):
+        async def set_nx(key, value, ttl_seconds):
+            raise ConnectionError("redis down")
+
+        fake_redis.set_nx = set_nx
+        coalescer = RequestCoalescer(distributed=True, lock_ttl_seconds=30)
+
+        async with asyncio.timeout(1):
+            assert await coalescer.run("key", AsyncMock(return_value=1)) == (1, False)
+        assert coalescer.stats["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_coalesces_concurrent_cycles():
+    engine = LLMDecisionEngine(api_key="test-key", coalescer=RequestCoalescer())
+
+    async def call_llm(prompt):
+        await asyncio.sleep(0.01)
+        return RESPONSE, USAGE
+
+    engine._call_llm = AsyncMock(side_effect=call_llm)
+    snapshots = {"BTCUSDT": create_snapshot("BTCUSDT", 50000.0)}
+
+    first, second = await asyncio.gather(
+        engine.generate_signals(snapshots, use_cache=False),
+        engine.generate_signals(snapshots, use_cache=False),
+    )
+
+    assert engine._call_llm.await_count == 1
+    assert first["BTCUSDT"].decision == second["BTCUSDT"].decision
+    assert sorted([first["BTCUSDT"].from_cache, second["BTCUSDT"].from_cache]) == [
+        False,
+        True,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_engine_uses_priority_lane_for_open_positions():
+    limiter = LLMRateLimiter(requests_per_minute=600)
+    limiter.acquire = AsyncMock()
+    engine = LLMDecisionEngine(api_key="test-key", rate_limiter=limiter)
+    engine._call_llm = AsyncMock(return_value=(RESPONSE, USAGE))
+    snapshots = {"BTCUSDT": create_snapshot("BTCUSDT", 50000.0)}
+
+    await engine.generate_signals(snapshots, use_cache=False)
+    await engine.generate_signals(
+        snapshots, use_cache=False, current_positions={"BTCUSDT": {"side": "long"}}
+    )
+
+    priorities = [call.kwargs["priority"] for call in limiter.acquire.await_args_list]
+    assert priorities == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_engine_backs_off_on_429():
+    limiter = LLMRateLimiter(requests_per_minute=600)
+    engine = LLMDecisionEngine(api_key="test-key", rate_limiter=limiter)
+    engine.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(429, headers={"Retry-After": "20"})
+        )
+    )
+    snapshots = {"BTCUSDT": create_snapshot("BTCUSDT", 50000.0)}
+
+    signals = await engine.generate_signals(snapshots, use_cache=False)
+
+    assert "Fallback" in signals["BTCUSDT"].reasoning
+    assert limiter.get_stats()["backoffs"] == 1
+    assert limiter.requests.available < 0
@@ -31,6 +31,9 @@ from workspace.features.market_data.models import (
     Ticker,
     Timeframe,
 )
+from workspace.features.market_data.streaming_indicators import (
+    StreamingIndicatorEngine,
+)
 
 
 # =============================================================================
@@ -408,10 +411,8 @@ class TestMarketDataSnapshots:
         market_data_service.latest_tickers[sample_ticker.symbol] = sample_ticker
 
         # Create indicator mock
-        with patch(
-            "workspace.features.market_data.market_data_service.IndicatorCalculator"
-        ) as mock_calc:
-            mock_calc.calculate_all_indicators.return_value = {
+        with patch.object(StreamingIndicatorEngine, "indicators") as mock_indicators:
+            mock_indicators.return_value = {
                 "rsi": None,
                 "macd": None,
                 "ema_fast": None,
@@ -553,18 +554,20 @@ class TestOHLCVHistoryRetrieval:
         cached_candles = [
             {
                 "symbol": candle.symbol,
-                "timeframe": candle.timeframe
-                if isinstance(candle.timeframe, str)
-                else candle.timeframe.value,
+                "timeframe": (
+                    candle.timeframe
+                    if isinstance(candle.timeframe, str)
+                    else candle.timeframe.value
+                ),
                 "timestamp": candle.timestamp.isoformat(),
                 "open": str(candle.open),
                 "high": str(candle.high),
                 "low": str(candle.low),
                 "close": str(candle.close),
                 "volume": str(candle.volume),
-                "quote_volume": str(candle.quote_volume)
-                if candle.quote_volume
-                else "0",
+                "quote_volume": (
+                    str(candle.quote_volume) if candle.quote_volume else "0"
+                ),
                 "trades_count": candle.trades_count or 0,
             }
             for candle in sample_ohlcv_history[:5]
@@ -678,11 +681,12 @@ class TestErrorHandling:
         # Add only a few candles
         market_data_service.ohlcv_data[symbol] = [sample_ohlcv]
 
-        with patch(
-            "workspace.features.market_data.market_data_service.IndicatorCalculator"
-        ):
+        with patch.object(market_data_service, "_get_indicator_engine") as get_engine:
             await market_data_service._update_indicators(symbol)
-            # Should return early due to insufficient data
+
+        # Returns early due to insufficient data
+        get_engine.assert_not_called()
+        assert symbol not in market_data_service.latest_snapshots
 
 
 # =============================================================================
@@ -705,10 +709,8 @@ class TestMarketDataServiceIntegration:
         market_data_service.latest_tickers[symbol] = sample_ticker
 
         # Mock indicators
-        with patch(
-            "workspace.features.market_data.market_data_service.IndicatorCalculator"
-        ) as mock_calc:
-            mock_calc.calculate_all_indicators.return_value = {
+        with patch.object(StreamingIndicatorEngine, "indicators") as mock_indicators:
+            mock_indicators.return_value = {
                 "rsi": None,
                 "macd": None,
                 "ema_fast": None,
@@ -254,6 +254,28 @@ class TestOrderRecording:
         metrics_service.record_order(filled=True)
         assert metrics_service.metrics.orders_filled_total == 1
 
+    def test_record_order_execution(self, metrics_service):
+        """Test recording executed and failed orders with latency"""
+        metrics_service.record_order_execution(
+            symbol="BTC/USDT:USDT",
+            side="buy",
+            order_type="market",
+            success=True,
+            latency_ms=12.0,
+        )
+        metrics_service.record_order_execution(
+            symbol="BTC/USDT:USDT",
+            side="buy",
+            order_type="market",
+            success=False,
+            latency_ms=3.0,
+        )
+
+        assert metrics_service.metrics.orders_placed_total == 2
+        assert metrics_service.metrics.orders_filled_total == 1
+        assert metrics_service.metrics.orders_rejected_total == 1
+        assert metrics_service.metrics.execution_latency_avg_ms == Decimal("12.0")
+
 
 # =============================================================================
 # Performance Metrics Tests
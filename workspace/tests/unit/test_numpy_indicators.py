@@ -0,0 +1,160 @@
+"""
+Tests for NumpyIndicatorCalculator
+
+Tests cover:
+- Raw float results against the Decimal IndicatorCalculator
+- 2-D (symbols x bars) matrix input
+- Insufficient data handling (NaN / None)
+- Decimal-parity mode via IndicatorCalculator.calculate_all_indicators_batch
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-04
+"""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from workspace.features.market_data.indicators import IndicatorCalculator
+from workspace.features.market_data.models import OHLCV, Timeframe
+from workspace.features.market_data.numpy_indicators import NumpyIndicatorCalculator
+
+
+def _make_candles(symbol: str, count: int, start_price: float, seed: int):
+    rng = random.Random(seed)
+    price = start_price
+    candles = []
+    for i in range(count):
+        price *= 1 + rng.gauss(0, 0.004)
+        close = Decimal(f"{price:.4f}")
+        candles.append(
+            OHLCV(
+                symbol=symbol,
+                timeframe=Timeframe.M3,
+                timestamp=datetime(2025, 11, 1) + timedelta(minutes=3 * i),
+                open=close,
+                high=close,
+                low=close,
+                close=close,
+                volume=Decimal("1"),
+            )
+        )
+    return candles
+
+
+@pytest.fixture
+def candles_by_symbol():
+    """Fixture: mixed-length histories for several symbols"""
+    return {
+        "BTC/USDT:USDT": _make_candles("BTC/USDT:USDT", 100, 90000.0, 1),
+        "ETH/USDT:USDT": _make_candles("ETH/USDT:USDT", 100, 3200.0, 2),
+        "SOL/USDT:USDT": _make_candles("SOL/USDT:USDT", 60, 180.0, 3),
+        "DOGE/USDT:USDT": _make_candles("DOGE/USDT:USDT", 25, 0.15, 4),
+    }
+
+
+class TestRawArrays:
+    """Float results against the Decimal calculator"""
+
+    def test_single_series(self, candles_by_symbol):
+        candles = candles_by_symbol["BTC/USDT:USDT"]
+        closes = NumpyIndicatorCalculator.closes_to_array(candles)
+
+        rsi = NumpyIndicatorCalculator.calculate_rsi(closes)
+        ema = NumpyIndicatorCalculator.calculate_ema(closes, 12)
+        line, signal, hist = NumpyIndicatorCalculator.calculate_macd(closes)
+        upper, middle, lower = NumpyIndicatorCalculator.calculate_bollinger_bands(
+            closes
+        )
+
+        assert rsi.shape == (1,)
+        assert rsi[0] == pytest.approx(
+            float(IndicatorCalculator.calculate_rsi(candles).value), abs=0.01
+        )
+        assert ema[0] == pytest.approx(
+            float(IndicatorCalculator.calculate_ema(candles, 12).value), rel=1e-12
+        )
+        macd = IndicatorCalculator.calculate_macd(candles)
+        assert line[0] == pytest.approx(float(macd.macd_line), abs=1e-7)
+        assert signal[0] == pytest.approx(float(macd.signal_line), abs=1e-7)
+        assert hist[0] == pytest.approx(float(macd.histogram), abs=1e-7)
+        bb = IndicatorCalculator.calculate_bollinger_bands(candles)
+        assert upper[0] == pytest.approx(float(bb.upper_band), abs=1e-7)
+        assert middle[0] == pytest.approx(float(bb.middle_band), abs=1e-7)
+        assert lower[0] == pytest.approx(float(bb.lower_band), abs=1e-7)
+
+    def test_matrix_rows_match_single_series(self, candles_by_symbol):
+        btc = NumpyIndicatorCalculator.closes_to_array(
+            candles_by_symbol["BTC/USDT:USDT"]
+        )
+        eth = NumpyIndicatorCalculator.closes_to_array(
+            candles_by_symbol["ETH/USDT:USDT"]
+        )
+        matrix = np.vstack([btc, eth])
+
+        result = NumpyIndicatorCalculator.calculate_all(matrix)
+
+        assert result["rsi"].shape == (2,)
+        assert result["rsi"][1] == NumpyIndicatorCalculator.calculate_rsi(eth)[0]
+        assert (
+            result["ema_slow"][0] == NumpyIndicatorCalculator.calculate_ema(btc, 26)[0]
+        )
+
+    def test_insufficient_data_is_nan(self):
+        closes = np.array([1.0, 2.0, 3.0])
+
+        assert np.isnan(NumpyIndicatorCalculator.calculate_rsi(closes)[0])
+        assert np.isnan(NumpyIndicatorCalculator.calculate_ema(closes, 12)[0])
+        assert np.isnan(NumpyIndicatorCalculator.calculate_macd(closes)[0][0])
+        assert np.isnan(
+            NumpyIndicatorCalculator.calculate_bollinger_bands(closes)[1][0]
+        )
+
+    def test_flat_series_rsi_is_100(self):
+        closes = np.full(30, 100.0)
+        assert NumpyIndicatorCalculator.calculate_rsi(closes)[0] == 100.0
+
+    def test_rejects_3d_input(self):
+        with pytest.raises(ValueError):
+            NumpyIndicatorCalculator.calculate_rsi(np.zeros((2, 2, 2)))
+
+
+class TestParityMode:
+    """Model output must match the Decimal path"""
+
+    def test_batch_matches_decimal_backend(self, candles_by_symbol):
+        numpy_results = IndicatorCalculator.calculate_all_indicators_batch(
+            candles_by_symbol
+        )
+        decimal_results = IndicatorCalculator.calculate_all_indicators_batch(
+            candles_by_symbol, backend="decimal"
+        )
+
+        assert numpy_results.keys() == decimal_results.keys()
+        for symbol, indicators in decimal_results.items():
+            for name, expected in indicators.items():
+                actual = numpy_results[symbol][name]
+                if expected is None:
+                    assert actual is None, f"{symbol} {name}"
+                else:
+                    assert (
+                        actual.model_dump() == expected.model_dump()
+                    ), f"{symbol} {name}"
+
+    def test_short_history_yields_none(self, candles_by_symbol):
+        results = NumpyIndicatorCalculator.calculate_all_indicators(
+            {"DOGE/USDT:USDT": candles_by_symbol["DOGE/USDT:USDT"], "X": []}
+        )
+
+        assert results["DOGE/USDT:USDT"]["macd"] is None
+        assert results["DOGE/USDT:USDT"]["rsi"] is not None
+        assert results["X"]["rsi"] is None
+
+    def test_unknown_backend(self, candles_by_symbol):
+        with pytest.raises(ValueError):
+            IndicatorCalculator.calculate_all_indicators_batch(
+                candles_by_symbol, backend="gpu"
+            )
@@ -0,0 +1,205 @@
+"""
+Tests for OHLCVRingBuffer and OHLCVStore
+
+Tests cover:
+- Append, in-place open-bar update and eviction at capacity
+- Zero-copy read-only column views across the wrap point
+- Round-trip of Decimal prices, optional fields and timezones
+- OHLCVStore list assignment and MarketDataService integration
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-05
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Optional
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from workspace.features.market_data.market_data_service import MarketDataService
+from workspace.features.market_data.models import OHLCV, Timeframe
+from workspace.features.market_data.ohlcv_buffer import OHLCVRingBuffer, OHLCVStore
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+def _candle(index: int, close: Optional[str] = None, **overrides: Any) -> OHLCV:
+    price = Decimal(close) if close else Decimal("90000.12345678") + index
+    fields: Dict[str, Any] = dict(
+        symbol=SYMBOL,
+        timeframe=Timeframe.M3,
+        timestamp=datetime(2025, 11, 1) + timedelta(minutes=3 * index),
+        open=price,
+        high=price + Decimal("100"),
+        low=price - Decimal("50"),
+        close=price,
+        volume=Decimal("1.5"),
+    )
+    fields.update(overrides)
+    return OHLCV(**fields)
+
+
+class TestRingBufferWrites:
+    def test_append_and_materialize(self):
+        buffer = OHLCVRingBuffer(SYMBOL, "3m", capacity=5)
+        candles = [_candle(i) for i in range(3)]
+        buffer.extend(candles)
+
+        assert len(buffer) == 3
+        assert buffer == candles
+        assert buffer[0] == candles[0]
+        assert buffer[-1] == candles[-1]
+
+    def test_eviction_at_capacity(self):
+        buffer = OHLCVRingBuffer(SYMBOL, "3m", capacity=5)
+        candles = [_candle(i) for i in range(12)]
+        buffer.extend(candles)
+
+        assert len(buffer) == 5
+        assert buffer.to_ohlcv() == candles[-5:]
+        assert buffer[1:3] == candles[-4:-2]
+
+    def test_upsert_updates_open_bar_in_place(self):
+        buffer = OHLCVRingBuffer(SYMBOL, "3m", capacity=5)
+        assert buffer.upsert(_candle(0)) is True
+        assert buffer.upsert(_candle(0, close="91000")) is False
+
+        assert len(buffer) == 1
+        assert buffer.last_close == Decimal("91000")
+
+    def test_upsert_ignores_older_candle(self):
+        buffer = OHLCVRingBuffer(SYMBOL, "3m", capacity=5)
+        buffer.extend([_candle(0), _candle(1)])
+
+        assert buffer.upsert(_candle(0, close="1")) is False
+        assert buffer.to_ohlcv() == [_candle(0), _candle(1)]
+
+    def test_update_last_on_empty_raises(self):
+        with pytest.raises(IndexError):
+            OHLCVRingBuffer(SYMBOL, "3m").update_last(_candle(0))
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            OHLCVRingBuffer(SYMBOL, "3m", capacity=0)
+
+    def test_clear(self):
+        buffer = OHLCVRingBuffer(SYMBOL, "3m", capacity=3)
+        buffer.extend(_candle(i) for i in range(5))
+        buffer.clear()
+
+        assert len(buffer) == 0
+        assert buffer == []
+        assert buffer.last() is None
+        buffer.append(_candle(9))
+        assert buffer.to_ohlcv() == [_candle(9)]
+
+
+class TestRingBufferViews:
+    def test_column_view_is_zero_copy_and_read_only(self):
+        buffer = OHLCVRingBuffer(SYMBOL, "3m", capacity=4)
+        buffer.extend(_candle(i, close=str(i + 1)) for i in range(7))
+
+        closes = buffer.closes()
+        assert closes.tolist() == [4.0, 5.0, 6.0, 7.0]
+        assert np.shares_memory(closes, buffer.closes(2))
+        with pytest.raises(ValueError):
+            closes[0] = 0.0
+
+    def test_window_views(self):
+        buffer = OHLCVRingBuffer(SYMBOL, "3m", capacity=4)
+        buffer.extend(_candle(i, close=str(i + 1)) for i in range(6))
+
+        window = buffer.window(3)
+        assert set(window) == {
+            "timestamp",
+            "open",
+            "high",
+            "low",
+            "close",
+            "volume",
+            "quote_volume",
+            "trades_count",
+        }
+        assert window["close"].tolist() == [4.0, 5.0, 6.0]
+        assert np.all(np.diff(window["timestamp"]) == 180_000_000)
+
+    def test_unknown_column(self):
+        with pytest.raises(KeyError):
+            OHLCVRingBuffer(SYMBOL, "3m").column("vwap")
+
+    def test_memory_is_fixed(self):
+        buffer = OHLCVRingBuffer(SYMBOL, "3m", capacity=100)
+        before = buffer.nbytes
+        buffer.extend(_candle(i) for i in range(500))
+        assert buffer.nbytes == before
+
+
+class TestRingBufferRoundTrip:
+    def test_optional_fields(self):
+        candle = _candle(0, quote_volume=Decimal("135700.5"), trades_count=42)
+        buffer = OHLCVRingBuffer(SYMBOL, "3m")
+        buffer.extend([_candle(1, timestamp=candle.timestamp - timedelta(1)), candle])
+
+        assert buffer[0].quote_volume is None
+        assert buffer[0].trades_count is None
+        assert buffer[1].quote_volume == Decimal("135700.5")
+        assert buffer[1].trades_count == 42
+
+    def test_timezone_aware_timestamps(self):
+        aware = datetime(2025, 11, 1, 12, 0, tzinfo=timezone.utc)
+        buffer = OHLCVRingBuffer(SYMBOL, "3m")
+        buffer.append(_candle(0, timestamp=aware))
+
+        assert buffer.last_timestamp == aware
+        assert buffer[0].timestamp.tzinfo is not None
+
+    def test_records_hold_python_scalars(self):
+        buffer = OHLCVRingBuffer(SYMBOL, "3m")
+        buffer.append(_candle(0))
+
+        record = buffer.to_records()[0]
+        assert record["close"] == Decimal("90000.12345678")
+        assert isinstance(record["timestamp"], datetime)
+        assert record["timeframe"] == "3m"
+
+
+class TestOHLCVStore:
+    def test_list_assignment_converts(self):
+        store = OHLCVStore(timeframe="3m", capacity=3)
+        store[SYMBOL] = [_candle(i) for i in range(5)]
+
+        assert isinstance(store[SYMBOL], OHLCVRingBuffer)
+        assert store[SYMBOL] == [_candle(i) for i in range(2, 5)]
+
+    @pytest.mark.asyncio
+    async def test_service_reads_from_buffer(self):
+        service = MarketDataService(
+            symbols=["BTCUSDT"], timeframe=Timeframe.M3, lookback_periods=10
+        )
+        service.cache = AsyncMock()
+        service.cache.get = AsyncMock(return_value=None)
+
+        for i in range(15):
+            await service._handle_kline_update(_candle(i))
+        await service._handle_kline_update(_candle(14, close="95000"))
+
+        arrays = service.get_ohlcv_arrays("BTCUSDT", limit=3)
+        assert arrays["close"][-1] == 95000.0
+        assert len(service.ohlcv_data[SYMBOL]) == 10
+
+        history = await service.get_ohlcv_history("BTCUSDT", limit=3)
+        assert [c.timestamp for c in history] == [
+            _candle(i).timestamp for i in range(12, 15)
+        ]
+        assert history[-1].close == Decimal("95000")
+
+        cached = service.cache.set.call_args[0][1]
+        assert cached[-1]["close"] == "95000.0"
+        assert cached[-1]["timestamp"] == _candle(14).timestamp.isoformat()
+
+    def test_unknown_symbol_arrays(self):
+        service = MarketDataService(symbols=["BTCUSDT"])
+        assert service.get_ohlcv_arrays("XRPUSDT") == {}
@@ -0,0 +1,276 @@
+"""
+Tests for OHLCVIngestor
+
+Tests cover:
+- COPY into a staging table followed by one set-based upsert per batch
+- Open-bar revisions staged once, when the next bar starts
+- Failed flushes keep candles staged
+- Gap detection and REST backfill (live bars take precedence), bounded
+  gap tracking
+- MarketDataService persisting every timeframe of an aggregated stream
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-11
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from workspace.features.market_data.market_data_service import MarketDataService
+from workspace.features.market_data.models import OHLCV, Timeframe
+from workspace.features.market_data.ohlcv_ingestor import (
+    MARKET_DATA_COLUMNS,
+    OHLCVIngestor,
+)
+
+SYMBOL = "BTC/USDT:USDT"
+T0 = datetime(2025, 11, 1)
+T0_MICROS = (T0 - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+
+
+def _candle(index: int, close: str = "100", timeframe=Timeframe.M1) -> OHLCV:
+    minutes = {Timeframe.M1: 1, Timeframe.M3: 3}[timeframe]
+    price = Decimal(close)
+    return OHLCV(
+        symbol=SYMBOL,
+        timeframe=timeframe,
+        timestamp=T0 + timedelta(minutes=index * minutes),
+        open=price,
+        high=price + 1,
+        low=price - 1,
+        close=price,
+        volume=Decimal("2"),
+        quote_volume=price * 2,
+    )
+
+
+class FakePool:
+    """Pool stand-in recording COPY batches per committed transaction"""
+
+    def __init__(self):
+        self.batches = []
+        self.statements = []
+        self.fail = False
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    @asynccontextmanager
+    async def transaction(self):
+        self._pending = []
+        yield
+        self.batches.extend(self._pending)
+
+    async def execute(self, statement):
+        if self.fail:
+            raise ConnectionError("database down")
+        self.statements.append(statement.split()[0:3])
+
+    async def copy_records_to_table(self, table, records, columns):
+        assert columns == MARKET_DATA_COLUMNS
+        self._pending.append((table, list(records)))
+
+    @property
+    def rows(self):
+        return [row for _, rows in self.batches for row in rows]
+
+
+@pytest.fixture
+def pool():
+    return FakePool()
+
+
+@pytest.mark.asyncio
+async def test_flush_copies_then_upserts(pool):
+    ingestor = OHLCVIngestor(pool=pool)
+    ingestor.add(_candle(0))
+    ingestor.add(_candle(1, timeframe=Timeframe.M3))
+
+    assert await ingestor.flush() is True
+
+    assert pool.statements == [
+        ["CREATE", "TEMP", "TABLE"],
+        ["INSERT", "INTO", "market_data"],
+    ]
+    assert [table for table, _ in pool.batches] == ["market_data_staging"]
+    first, second = pool.rows
+    assert first[:3] == (SYMBOL, "1m", T0_MICROS)
+    assert first[3:] == (
+        Decimal("100"),
+        Decimal("101"),
+        Decimal("99"),
+        Decimal("100"),
+        Decimal("2"),
+        Decimal("200"),
+        None,
+    )
+    assert second[1:3] == ("3m", T0_MICROS + 180_000_000)
+    assert ingestor.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_batches_split_by_batch_size(pool):
+    ingestor = OHLCVIngestor(pool=pool, batch_size=2)
+    for i in range(5):
+        ingestor.add(_candle(i))
+
+    while ingestor.pending:
+        assert await ingestor.flush() is True
+
+    assert [len(rows) for _, rows in pool.batches] == [2, 2, 1]
+
+
+def test_open_bar_staged_once_when_next_bar_starts():
+    ingestor = OHLCVIngestor()
+    for close in ("100", "105", "103"):
+        ingestor.update(_candle(0, close))
+    assert ingestor.pending == 0
+
+    ingestor.update(_candle(1, "104"))
+
+    assert ingestor.pending == 1
+    assert list(ingestor._pending.values())[0][6] == Decimal("103")
+
+    # Confirmed bars are staged immediately, older updates are ignored
+    ingestor.update(_candle(1, "106"), confirmed=True)
+    ingestor.update(_candle(0, "1"))
+    assert [row[6] for row in ingestor._pending.values()] == [
+        Decimal("103"),
+        Decimal("106"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_candles_staged(pool):
+    pool.fail = True
+    ingestor = OHLCVIngestor(pool=pool)
+    ingestor.add(_candle(0))
+
+    assert await ingestor.flush() is False
+    assert ingestor.pending == 1
+    assert ingestor.get_stats()["flush_failures_total"] == 1
+
+    pool.fail = False
+    assert await ingestor.flush() is True
+    assert len(pool.rows) == 1
+
+
+@pytest.mark.asyncio
+async def test_gap_backfilled_from_exchange():
+    exchange = AsyncMock()
+    minute_ms = 60_000
+    t0_ms = T0_MICROS // 1000
+    exchange.fetch_ohlcv = AsyncMock(
+        return_value=[[t0_ms + i * minute_ms, 1, 2, 0.5, 1.5, 10] for i in range(1, 5)]
+    )
+    ingestor = OHLCVIngestor(exchange=exchange)
+    ingestor.add(_candle(0))
+    ingestor.add(_candle(2))  # live bar inside the gap window
+    ingestor.add(_candle(4))
+
+    assert ingestor.get_stats()["gaps_detected"] == 2
+    assert await ingestor.backfill() == 2
+
+    rows = sorted(ingestor._pending.values(), key=lambda row: row[2])
+    assert [(row[2] - T0_MICROS) // 60_000_000 for row in rows] == [0, 1, 2, 3, 4]
+    assert rows[1][6] == Decimal("1.5")
+    assert rows[2][6] == Decimal("100")  # live bar kept
+    first_call = exchange.fetch_ohlcv.await_args_list[0]
+    assert first_call.args == (SYMBOL, "1m", t0_ms + minute_ms, 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_backfill_is_retried():
+    exchange = AsyncMock()
+    exchange.fetch_ohlcv = AsyncMock(side_effect=[Exception("rate limit"), []])
+    ingestor = OHLCVIngestor(exchange=exchange)
+    ingestor.mark_persisted(SYMBOL, "1m", T0)
+    ingestor.add(_candle(10))  # first live bar after a restart
+
+    assert await ingestor.backfill() == 0
+    assert ingestor.get_stats()["gaps_pending"] == 1
+    await ingestor.backfill()
+    assert ingestor.get_stats()["gaps_pending"] == 0
+    assert exchange.fetch_ohlcv.await_args.args[3] == 9
+
+
+def test_gaps_not_kept_without_exchange():
+    ingestor = OHLCVIngestor()
+    for i in range(0, 20, 2):
+        ingestor.add(_candle(i))
+
+    stats = ingestor.get_stats()
+    assert stats["gaps_detected"] == 9
+    assert stats["gaps_pending"] == 0
+
+
+def test_pending_gaps_capped():
+    ingestor = OHLCVIngestor(exchange=AsyncMock(), max_gaps=3)
+    for i in range(0, 20, 2):
+        ingestor.add(_candle(i))
+
+    assert ingestor.get_stats()["gaps_pending"] == 3
+    assert ingestor._gaps[0][2] == T0_MICROS + 13 * 60_000_000
+
+
+@pytest.mark.asyncio
+async def test_service_passes_rest_client_to_ingestor():
+    exchange = AsyncMock()
+    service = MarketDataService(symbols=["BTCUSDT"], exchange=exchange)
+    assert service.ingestor.exchange is exchange
+
+    # Without one, start() hands the ingestor a public Bybit REST client
+    default = MarketDataService(symbols=["BTCUSDT"])
+    client = default._get_exchange()
+    try:
+        assert client.id == "bybit"
+        assert default._get_exchange() is client
+        assert default._owns_exchange is True
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_background_loop_flushes_full_batch(pool):
+    ingestor = OHLCVIngestor(pool=pool, batch_size=3, flush_interval=10)
+    await ingestor.start()
+    for i in range(3):
+        ingestor.add(_candle(i))
+
+    await asyncio.sleep(0.05)
+    assert len(pool.rows) == 3
+
+    ingestor.add(_candle(3))
+    await ingestor.close()
+    assert len(pool.rows) == 4
+
+
+@pytest.mark.asyncio
+async def test_service_persists_every_timeframe(pool):
+    service = MarketDataService(
+        symbols=["BTCUSDT"],
+        timeframe=Timeframe.M3,
+        aggregate_timeframes=[Timeframe.H1],
+        ingestor=OHLCVIngestor(pool=pool),
+    )
+    service.cache = AsyncMock()
+    for i in range(120):
+        await service._handle_kline_update(_candle(i, str(90000 + i)))
+
+    await service.ingestor.flush()
+
+    counts = {}
+    for row in pool.rows:
+        counts[row[1]] = counts.get(row[1], 0) + 1
+    # The newest bar of each timeframe is still open
+    assert counts == {"1m": 119, "3m": 39, "1h": 1}
+    hourly = [row for row in pool.rows if row[1] == "1h"][0]
+    assert hourly[3] == Decimal("90000")
+    assert hourly[6] == Decimal("90059")
+    assert hourly[7] == Decimal("120")
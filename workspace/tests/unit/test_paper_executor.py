@@ -13,7 +13,9 @@ from decimal import Decimal
 from unittest.mock import Mock, AsyncMock, patch
 
 from workspace.features.paper_trading.paper_executor import PaperTradingExecutor
+from workspace.features.trading_loop import TradingDecision, TradingSignal
 from workspace.features.trade_executor.models import (
+    Order,
     OrderType,
     OrderSide,
     OrderStatus,
@@ -576,3 +578,51 @@ class TestPaperTradingExecutor:
             not hasattr(mock_exchange, "create_market_order")
             or not mock_exchange.create_market_order.called
         )
+
+    @pytest.mark.asyncio
+    async def test_signal_with_stop_loss_stays_virtual(self, mock_exchange):
+        """Entry plus stop-loss from a signal is simulated, never sent"""
+        executor = PaperTradingExecutor(
+            initial_balance=Decimal("10000"),
+            enable_slippage=False,
+            enable_partial_fills=False,
+            api_key="paper",
+            api_secret="paper",
+            exchange=mock_exchange,
+            position_service=Mock(),
+            trade_history_service=AsyncMock(),
+            metrics_service=Mock(),
+        )
+        executor._simulate_latency = AsyncMock()
+        signal = TradingSignal(
+            symbol="BTC/USDT:USDT",
+            decision=TradingDecision.BUY,
+            confidence=Decimal("0.8"),
+            size_pct=Decimal("0.1"),
+            stop_loss_pct=Decimal("0.02"),
+        )
+
+        result = await executor.execute_signal(
+            signal=signal, account_balance_chf=Decimal("2500")
+        )
+
+        assert result.success is True
+        assert result.order.metadata["paper_trading"] is True
+        assert not mock_exchange.create_orders.called
+        assert not mock_exchange.create_order.called
+        position = executor.virtual_portfolio.positions["BTC/USDT:USDT"]
+        assert position["quantity"] == result.order.filled_quantity
+
+        stop = Order(
+            symbol="BTC/USDT:USDT",
+            type=OrderType.STOP_MARKET,
+            side=OrderSide.SELL,
+            quantity=position["quantity"],
+            stop_price=Decimal("49000"),
+            reduce_only=True,
+        )
+        (placed,) = await executor.create_orders_batch([stop])
+        assert placed.order.status == OrderStatus.OPEN
+        (cancelled,) = await executor.cancel_orders_batch([placed.order])
+        assert cancelled.order.status == OrderStatus.CANCELED
+        assert not mock_exchange.cancel_orders.called
@@ -0,0 +1,171 @@
+"""
+Unit Tests for the Parallel Parameter Optimizer
+
+Covers search-space generation, parameter routing, the shared-memory candle
+store and grid / walk-forward runs on a real process pool, checked against
+in-process backtests.
+
+Author: Testing Team
+Date: 2025-11-23
+"""
+
+import math
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from workspace.features.backtesting import (
+    BacktestConfig,
+    Backtester,
+    CSVCandleSource,
+    MarketReplay,
+    ParameterOptimizer,
+    SharedCandleStore,
+    grid_configs,
+    random_configs,
+)
+from workspace.features.backtesting.optimizer import split_params
+from workspace.features.market_data import Timeframe
+from workspace.features.strategy import MeanReversionStrategy
+
+SYMBOLS = ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """Two symbols, three days of 1m candles, one file"""
+    rng = np.random.default_rng(5)
+    count = 3 * 24 * 60
+    frames = []
+    for offset, symbol in enumerate(SYMBOLS):
+        close = 100 * (offset + 1) * np.exp(np.cumsum(rng.normal(0, 0.002, count)))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": 1_700_006_400_000 + np.arange(count) * 60_000,
+                    "symbol": symbol,
+                    "open": np.r_[close[0], close[:-1]],
+                    "high": close * 1.001,
+                    "low": close * 0.999,
+                    "close": close,
+                    "volume": rng.uniform(1, 5, count),
+                }
+            )
+        )
+    path = tmp_path / "candles.csv"
+    pd.concat(frames).sort_values("timestamp", kind="stable").to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def store(csv_path):
+    with SharedCandleStore.from_batches(
+        CSVCandleSource(csv_path, chunk_size=1000)
+    ) as store:
+        yield store
+
+
+def test_search_spaces():
+    grid = grid_configs({"rsi_oversold": [25, 30], "use_macd": [True, False]})
+    assert grid == [
+        {"rsi_oversold": 25, "use_macd": True},
+        {"rsi_oversold": 25, "use_macd": False},
+        {"rsi_oversold": 30, "use_macd": True},
+        {"rsi_oversold": 30, "use_macd": False},
+    ]
+
+    space = {"rsi_period": (7, 21), "stop_loss_pct": (0.01, 0.03), "use_macd": [1, 0]}
+    samples = random_configs(space, 50, seed=3)
+    assert samples == random_configs(space, 50, seed=3)
+    assert all(isinstance(s["rsi_period"], int) for s in samples)
+    assert all(7 <= s["rsi_period"] <= 21 for s in samples)
+    assert all(0.01 <= s["stop_loss_pct"] <= 0.03 for s in samples)
+    assert {s["use_macd"] for s in samples} == {0, 1}
+
+
+def test_split_params_routes_by_name():
+    strategy_config, config = split_params(
+        {
+            "rsi_period": 9.0,
+            "bb_std_dev": 2.5,
+            "min_confidence": 0.7,
+            "rsi_oversold": 25,
+        },
+        BacktestConfig(),
+    )
+    assert config.indicator_config == {"rsi_period": 9, "bb_std_dev": Decimal("2.5")}
+    assert config.min_confidence == Decimal("0.7")
+    assert strategy_config["rsi_oversold"] == 25
+
+
+def test_shared_store_replays_like_source(store, csv_path):
+    attached = SharedCandleStore.attach(store.spec)
+    try:
+        assert len(attached) == 2 * 3 * 24 * 60
+        assert sorted(attached.symbols) == sorted(SYMBOLS)
+
+        def bars(batches):
+            return [
+                (s.symbol, s.ohlcv.timestamp, s.ohlcv.close, s.rsi and s.rsi.value)
+                for s in MarketReplay(Timeframe.M3).replay(batches)
+            ]
+
+        assert bars(attached.batches(chunk_size=777)) == bars(CSVCandleSource(csv_path))
+
+        window = list(attached.batches(store.start + timedelta(days=1), store.end, 500))
+        timestamps = np.concatenate([batch.timestamp for batch in window])
+        assert len(timestamps) == 2 * (2 * 24 * 60 - 1)
+    finally:
+        attached.close()
+
+
+def test_grid_search_matches_in_process_backtests(store):
+    space = {"rsi_oversold": [25, 35], "rsi_overbought": [65, 75]}
+    start = store.start + timedelta(days=1)
+
+    with ParameterOptimizer(
+        MeanReversionStrategy, store, max_workers=2, min_trades=1
+    ) as optimizer:
+        results = optimizer.grid_search(space, start=start, warmup=timedelta(hours=3))
+
+    assert len(results) == 4
+    scores = [r.score for r in results]
+    assert scores == sorted(scores, reverse=True)
+
+    best = results[0]
+    config = BacktestConfig(trade_start=start)
+    expected = Backtester(MeanReversionStrategy(config=best.params), config).run(
+        store.batches(start - timedelta(hours=3))
+    )
+    assert best.start == start
+    assert best.trades == len(expected.trades)
+    assert best.final_equity == expected.final_equity
+    if best.trades:
+        assert best.score == pytest.approx(expected.metrics.sharpe_ratio)
+    else:
+        assert best.score == -math.inf
+
+
+def test_walk_forward_windows(store):
+    with ParameterOptimizer(
+        MeanReversionStrategy, store, max_workers=2, min_trades=0
+    ) as optimizer:
+        result = optimizer.walk_forward(
+            grid_configs({"rsi_oversold": [25, 35]}),
+            train_period=timedelta(days=1),
+            test_period=timedelta(hours=12),
+        )
+
+    assert len(result.windows) == 3
+    assert result.trials == 6
+    for window in result.windows:
+        assert window.train_end - window.train_start == timedelta(days=1)
+        assert window.test.start == window.train_end
+        assert window.test.end == window.test_end
+        assert window.test.params == window.best.params
+    steps = [w.train_start for w in result.windows]
+    assert steps[1] - steps[0] == timedelta(hours=12)
+    assert math.isfinite(result.out_of_sample_return_pct)
@@ -8,6 +8,8 @@ Coverage target: >60%
 Test patterns: Test statistical calculations for accuracy, verify metrics computation
 """
 
+import statistics
+
 import pytest
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -694,3 +696,70 @@ class TestPaperTradingPerformanceTracker:
         assert first_win_rate != second_win_rate
         assert first_win_rate == 1  # 1/1 = 100%
         assert second_win_rate == Decimal("0.5")  # 1/2 = 50%
+
+
+class TestIncrementalMetrics:
+    """Streaming accumulators and bounded trade log"""
+
+    @staticmethod
+    def make_trades(count):
+        base = datetime(2025, 11, 1, 12, 0, 0)
+        pnls = [Decimal((i * 37) % 23 - 10) for i in range(count)]
+        return [
+            {
+                "symbol": ["BTC/USDT:USDT", "ETH/USDT:USDT"][i % 2],
+                "side": "buy",
+                "quantity": Decimal("0.1"),
+                "price": Decimal("50000"),
+                "fees": Decimal("0.5"),
+                "pnl": pnl,
+                "timestamp": base + timedelta(hours=5 * i),
+            }
+            for i, pnl in enumerate(pnls)
+        ]
+
+    def test_metrics_match_full_recalculation(self):
+        trades = self.make_trades(200)
+        tracker = PaperTradingPerformanceTracker()
+        for trade in trades:
+            tracker.record_trade(trade)
+
+        pnls = [t["pnl"] for t in trades]
+        wins = [p for p in pnls if p > 0]
+        losses = [p for p in pnls if p < 0]
+        equity, peak, max_dd = Decimal("0"), Decimal("0"), Decimal("0")
+        for pnl in pnls:
+            equity += pnl
+            peak = max(peak, equity)
+            max_dd = max(max_dd, peak - equity)
+        daily = [float(p) for p in tracker.daily_pnl.values()]
+        sharpe = statistics.mean(daily) / statistics.stdev(daily) * 365**0.5
+
+        assert tracker.metrics["avg_win"] == sum(wins) / len(wins)
+        assert tracker.metrics["avg_loss"] == sum(losses) / len(losses)
+        assert tracker.metrics["profit_factor"] == sum(wins) / abs(sum(losses))
+        assert tracker.metrics["max_drawdown"] == max_dd
+        assert float(tracker.metrics["sharpe_ratio"]) == pytest.approx(sharpe)
+        assert tracker.get_symbol_performance()["ETH/USDT:USDT"]["trades"] == 100
+
+    def test_bounded_log_spills_to_disk(self, tmp_path):
+        trades = self.make_trades(50)
+        spill_path = tmp_path / "trades.jsonl"
+        tracker = PaperTradingPerformanceTracker(
+            max_trades=20, spill_path=str(spill_path)
+        )
+        for trade in trades:
+            tracker.record_trade(trade)
+
+        assert len(tracker.trades) <= 20
+        assert tracker.spilled_trades + len(tracker.trades) == 50
+        assert tracker.metrics["total_trades"] == 50
+        assert list(tracker.iter_trades()) == trades
+
+        csv_path = tmp_path / "trades.csv"
+        tracker.export_trades_csv(str(csv_path))
+        assert len(csv_path.read_text().splitlines()) == 51
+
+        tracker.reset()
+        assert not spill_path.exists()
+        assert list(tracker.iter_trades()) == []
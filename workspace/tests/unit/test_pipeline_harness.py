@@ -0,0 +1,95 @@
+"""
+Unit Tests for the End-to-End Pipeline Load Harness
+
+Runs real trading cycles against the local WebSocket, OpenRouter and
+exchange stand-ins and checks per-stage timings, stand-in traffic and the
+scaling report.
+
+Author: Testing Team
+Date: 2025-11-21
+"""
+
+import httpx
+import pytest
+
+from workspace.shared.performance.pipeline_harness import (
+    FakeOpenRouter,
+    PipelineHarnessConfig,
+    PipelineLoadHarness,
+    format_report,
+    make_symbols,
+)
+
+
+def small_config(**overrides) -> PipelineHarnessConfig:
+    config = PipelineHarnessConfig(
+        symbols=make_symbols(3),
+        llm_latency_seconds=0.005,
+        exchange_latency_seconds=0.001,
+        buy_ratio=1.0,
+        lag_interval_seconds=0.005,
+    )
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+
+def test_make_symbols_pads_with_synthetic_symbols():
+    assert make_symbols(2) == ["BTCUSDT", "ETHUSDT"]
+    symbols = make_symbols(8)
+    assert symbols[6:] == ["SYN000USDT", "SYN001USDT"]
+
+
+@pytest.mark.asyncio
+async def test_fake_openrouter_signals_every_prompt_symbol():
+    llm = FakeOpenRouter(buy_ratio=1.0)
+    async with httpx.AsyncClient(transport=llm) as client:
+        response = await client.post(
+            "https://openrouter.ai/api/v1/chat/completions",
+            json={
+                "messages": [
+                    {"role": "system", "content": [{"type": "text", "text": "x"}]},
+                    {"role": "user", "content": "## BTC/USDT:USDT\n## SOL/USDT:USDT"},
+                ]
+            },
+        )
+
+    content = response.json()["choices"][0]["message"]["content"]
+    assert content.count("```json") == 2
+    assert '"decision": "BUY"' in content
+    assert llm.requests == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [False, True])
+async def test_cycles_run_real_pipeline(stream):
+    async with PipelineLoadHarness(small_config(stream=stream)) as harness:
+        report = await harness.run(cycles=2)
+
+    assert report.symbol_count == 3
+    assert report.success_rate == 1.0
+    for result in report.cycle_results:
+        assert {"market_data", "signals", "execution", "llm_http", "risk"} <= set(
+            result.stages
+        )
+        assert result.stages["exchange"] > 0
+    # Every BUY sends its entry, then its stop-loss once the entry filled
+    assert report.exchange_calls["create_orders"] == 12
+    assert report.llm_requests == 2
+    assert report.peak_memory_mb > 0
+
+    text = format_report([report])
+    assert "PIPELINE LOAD REPORT" in text
+    assert "llm_http" in text
+
+
+@pytest.mark.asyncio
+async def test_paper_trading_sends_no_orders():
+    async with PipelineLoadHarness(small_config(paper_trading=True)) as harness:
+        report = await harness.run(cycles=2)
+
+    assert report.success_rate == 1.0
+    assert len(harness.executor.virtual_portfolio.positions) == 3
+    assert report.exchange_calls.get("create_orders", 0) == 0
+    assert report.exchange_calls.get("create_order", 0) == 0
+    assert report.llm_requests == 2
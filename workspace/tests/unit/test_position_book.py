@@ -0,0 +1,254 @@
+"""
+Unit Tests for Position Book
+
+Covers:
+- Per-symbol index and running aggregates
+- Removal of closed positions
+- Reload diff and write-through during reload
+- PositionService reads served from the book
+- RiskManager exposure from the book
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from workspace.features.position_manager import PositionBook, PositionService
+from workspace.features.position_manager.models import PositionWithPnL
+from workspace.features.risk_manager import RiskManager
+from workspace.shared.database.models import Position
+
+START = datetime(2025, 11, 18, 12, 0, 0)
+
+
+def make_position(
+    symbol="BTCUSDT",
+    side="LONG",
+    quantity="0.01",
+    entry_price="50000",
+    current_price="51000",
+    status="OPEN",
+    minutes=0,
+    position_id=None,
+) -> PositionWithPnL:
+    """Build an open position created `minutes` after START"""
+    entry = Decimal(entry_price)
+    stop_loss = entry * Decimal("0.95") if side == "LONG" else entry * Decimal("1.05")
+    created_at = START + timedelta(minutes=minutes)
+    return PositionWithPnL.from_position(
+        Position(
+            id=position_id or uuid4(),
+            symbol=symbol,
+            side=side,
+            quantity=Decimal(quantity),
+            entry_price=entry,
+            current_price=Decimal(current_price),
+            leverage=10,
+            stop_loss=stop_loss,
+            take_profit=None,
+            status=status,
+            pnl_chf=None,
+            created_at=created_at,
+            updated_at=created_at,
+            closed_at=None,
+        )
+    )
+
+
+def position_row(position: PositionWithPnL) -> dict:
+    """Database row for a position"""
+    return {
+        field: getattr(position, field)
+        for field in (
+            "id",
+            "symbol",
+            "side",
+            "quantity",
+            "entry_price",
+            "current_price",
+            "leverage",
+            "stop_loss",
+            "take_profit",
+            "status",
+            "pnl_chf",
+            "created_at",
+            "updated_at",
+            "closed_at",
+        )
+    }
+
+
+@pytest.fixture
+def mock_pool():
+    """Create mock database pool"""
+    pool = MagicMock()
+    conn = MagicMock()
+    transaction = MagicMock()
+
+    conn.__aenter__ = AsyncMock(return_value=conn)
+    conn.__aexit__ = AsyncMock(return_value=None)
+    transaction.__aenter__ = AsyncMock(return_value=transaction)
+    transaction.__aexit__ = AsyncMock(return_value=None)
+
+    conn.transaction = MagicMock(return_value=transaction)
+    pool.acquire = MagicMock(return_value=conn)
+    pool.fetchrow = AsyncMock()
+    pool.fetch = AsyncMock()
+
+    return pool
+
+
+# ============================================================================
+# PositionBook
+# ============================================================================
+
+
+def test_aggregates_follow_upserts():
+    book = PositionBook()
+    btc = make_position()
+    eth = make_position(symbol="ETHUSDT", entry_price="3000", current_price="2900")
+    book.upsert(btc)
+    book.upsert(eth)
+
+    assert book.count() == 2
+    assert book.count("BTCUSDT") == 1
+    assert book.total_exposure_chf == (
+        btc.position_value_chf + eth.position_value_chf
+    ).quantize(Decimal("0.00000001"))
+    assert book.total_unrealized_pnl_chf == (
+        btc.unrealized_pnl_chf + eth.unrealized_pnl_chf
+    ).quantize(Decimal("0.00000001"))
+
+    # A price update replaces the position's contribution
+    moved = make_position(position_id=btc.id, current_price="52000")
+    book.upsert(moved)
+
+    assert book.total_exposure_chf == (
+        moved.position_value_chf + eth.position_value_chf
+    ).quantize(Decimal("0.00000001"))
+
+
+def test_closed_position_leaves_book():
+    book = PositionBook()
+    btc = make_position()
+    book.upsert(btc)
+
+    book.upsert(make_position(position_id=btc.id, status="CLOSED"))
+
+    assert len(book) == 0
+    assert book.symbols() == []
+    assert book.total_exposure_chf == Decimal("0")
+    assert book.total_margin_chf == Decimal("0")
+
+
+def test_positions_newest_first_per_symbol():
+    book = PositionBook()
+    first = make_position(minutes=0)
+    second = make_position(symbol="ETHUSDT", minutes=1)
+    third = make_position(minutes=2)
+    for position in (first, second, third):
+        book.upsert(position)
+
+    assert book.positions() == [third, second, first]
+    assert book.positions("BTCUSDT") == [third, first]
+    assert book.positions("SOLUSDT") == []
+
+
+def test_load_reports_diff_and_keeps_touched_positions():
+    book = PositionBook()
+    kept = make_position(minutes=0)
+    removed = make_position(minutes=1)
+    book.load([kept, removed])
+
+    book.start_reload()
+    written = make_position(symbol="ETHUSDT", minutes=2)
+    book.upsert(written)  # committed after the reload query ran
+    added = make_position(symbol="SOLUSDT", entry_price="150", minutes=3)
+    changed = make_position(position_id=kept.id, current_price="49000")
+    diff = book.load([changed, added])
+
+    assert diff == {"added": 1, "removed": 1, "changed": 1}
+    assert book.positions() == [added, written, changed]
+    assert book.loaded and book.age_seconds() is not None
+
+
+# ============================================================================
+# PositionService and RiskManager integration
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_service_reads_are_served_from_book(mock_pool):
+    btc = make_position()
+    mock_pool.fetch.return_value = [position_row(btc)]
+    service = PositionService(pool=mock_pool, position_book=PositionBook())
+
+    positions = await service.get_active_positions()
+    await service.get_active_positions("BTCUSDT")
+    exposure = await service.get_total_exposure()
+    found = await service.get_position_by_id(btc.id)
+
+    assert [p.id for p in positions] == [btc.id]
+    assert exposure == btc.position_value_chf.quantize(Decimal("0.00000001"))
+    assert found.id == btc.id
+    mock_pool.fetch.assert_awaited_once()
+    mock_pool.fetchrow.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_writes_through_to_book(mock_pool):
+    btc = make_position()
+    book = PositionBook()
+    book.load([btc])
+    service = PositionService(pool=mock_pool, position_book=book)
+
+    row = position_row(btc)
+    row["current_price"] = Decimal("53000")
+    conn = await mock_pool.acquire().__aenter__()
+    conn.fetchrow = AsyncMock(return_value=row)
+
+    await service.update_position_price(btc.id, Decimal("53000"))
+
+    assert book.get(btc.id).current_price == Decimal("53000")
+    assert book.total_unrealized_pnl_chf > btc.unrealized_pnl_chf
+    mock_pool.fetch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stale_book_is_reloaded(mock_pool):
+    book = PositionBook()
+    book.load([])
+    book.loaded_at -= 120
+    mock_pool.fetch.return_value = [position_row(make_position())]
+    service = PositionService(
+        pool=mock_pool, position_book=book, book_max_age_seconds=60
+    )
+
+    positions = await service.get_active_positions()
+
+    assert len(positions) == 1
+    assert book.age_seconds() < 60
+
+
+@pytest.mark.asyncio
+async def test_risk_manager_uses_book_exposure():
+    book = PositionBook()
+    btc = make_position(quantity="0.01", current_price="50000")
+    book.load([btc])
+    tracker = MagicMock()
+    tracker.get_open_positions = AsyncMock()
+    manager = RiskManager(
+        starting_balance_chf=Decimal("2000"),
+        position_tracker=tracker,
+        position_book=book,
+    )
+
+    exposure = await manager._calculate_total_exposure()
+
+    # 0.01 * 50000 USD * 0.85 = 425 CHF of 2000 CHF
+    assert exposure == Decimal("0.2125")
+    assert await manager._get_open_positions() == [btc]
+    tracker.get_open_positions.assert_not_awaited()
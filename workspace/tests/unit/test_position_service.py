@@ -659,9 +659,9 @@ async def test_get_statistics(position_service, mock_pool, sample_position_data)
 @pytest.mark.asyncio
 async def test_bulk_update_prices(position_service, mock_pool, sample_position_data):
     """Test bulk price updates"""
-    mock_pool.fetch = AsyncMock(return_value=[sample_position_data])
+    sample_position_data["current_price"] = Decimal("46000.0")
     conn = await mock_pool.acquire().__aenter__()
-    conn.fetchrow = AsyncMock(return_value=sample_position_data)
+    conn.fetch = AsyncMock(return_value=[sample_position_data])
 
     price_updates = {
         "BTCUSDT": Decimal("46000.0"),
@@ -673,6 +673,43 @@ async def test_bulk_update_prices(position_service, mock_pool, sample_position_d
     assert len(updated) > 0
 
 
+@pytest.mark.asyncio
+async def test_update_prices_single_statement(
+    position_service, mock_pool, sample_position_data
+):
+    """Test all positions are marked to market with one UPDATE"""
+    rows = []
+    for price in ("46000.0", "44500.0", "45000.5"):
+        row = dict(sample_position_data, id=uuid4(), current_price=Decimal(price))
+        rows.append(row)
+    conn = await mock_pool.acquire().__aenter__()
+    conn.fetch = AsyncMock(return_value=rows)
+    conn.fetchrow = AsyncMock()
+    batches = []
+    position_service.add_price_update_listener(batches.append)
+
+    updated = await position_service.update_prices(
+        {"BTCUSDT": Decimal("46000.123456789"), "ETHUSDT": Decimal("2500")}
+    )
+
+    conn.fetch.assert_awaited_once()
+    conn.fetchrow.assert_not_awaited()
+    query, symbols, prices = conn.fetch.await_args.args[:3]
+    assert "unnest" in query and "RETURNING" in query
+    assert symbols == ["BTCUSDT", "ETHUSDT"]
+    assert prices == [Decimal("46000.12345679"), Decimal("2500.00000000")]
+    assert len(updated) == 3
+    assert updated[rows[1]["id"]].unrealized_pnl_chf < 0
+    assert batches == [updated]
+
+
+@pytest.mark.asyncio
+async def test_update_prices_empty(position_service, mock_pool):
+    """Test empty price update skips the database"""
+    assert await position_service.update_prices({}) == {}
+    mock_pool.acquire.assert_not_called()
+
+
 # ============================================================================
 # Error Handling Tests
 # ============================================================================
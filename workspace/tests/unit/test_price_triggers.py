@@ -0,0 +1,308 @@
+"""
+Unit tests for the event-driven price trigger engine
+
+Tests the sorted per-symbol trigger index, ticker-stream wiring through
+MarketDataService, and event-driven layer 2/3 stop-loss protection in
+both StopLossManagers.
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-18
+"""
+
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+
+from workspace.features.market_data import (
+    MarketDataService,
+    PriceTriggerEngine,
+    TickerFrame,
+    TriggerDirection,
+)
+from workspace.features.risk_manager import ProtectionLayer
+from workspace.features.risk_manager import StopLossManager as RiskStopLossManager
+from workspace.features.trade_executor import StopLossLayer, StopLossManager
+
+BTC = "BTC/USDT:USDT"
+
+
+def recorder():
+    """Async trigger callback recording (trigger, price) calls"""
+    calls = []
+
+    async def callback(trigger, price):
+        calls.append((trigger, price))
+
+    return callback, calls
+
+
+class TestPriceTriggerEngine:
+    @pytest.mark.asyncio
+    async def test_below_trigger_fires_at_or_below_level(self):
+        engine = PriceTriggerEngine()
+        callback, calls = recorder()
+        engine.add_trigger(BTC, Decimal("49000"), TriggerDirection.BELOW, callback)
+
+        assert engine.update_price(BTC, 49500.0) == []
+        fired = engine.update_price(BTC, 49000.0)
+        await engine.drain()
+
+        assert len(fired) == 1
+        assert calls[0][1] == 49000.0
+        assert engine.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_above_trigger_fires_at_or_above_level(self):
+        engine = PriceTriggerEngine()
+        callback, calls = recorder()
+        engine.add_trigger(BTC, 51000, TriggerDirection.ABOVE, callback)
+
+        engine.update_price(BTC, 50999.0)
+        engine.update_price(BTC, 51500.0)
+        await engine.drain()
+
+        assert [price for _, price in calls] == [51500.0]
+
+    @pytest.mark.asyncio
+    async def test_tick_fires_only_crossed_levels(self):
+        engine = PriceTriggerEngine()
+        callback, calls = recorder()
+        for level in (48000, 49000, 50000, 47000):
+            engine.add_trigger(BTC, level, TriggerDirection.BELOW, callback)
+        for level in (52000, 53000):
+            engine.add_trigger(BTC, level, TriggerDirection.ABOVE, callback)
+
+        engine.update_price(BTC, 48500.0)
+        await engine.drain()
+
+        assert sorted(t.level for t, _ in calls) == [49000.0, 50000.0]
+        assert engine.pending(BTC) == 4
+
+    @pytest.mark.asyncio
+    async def test_triggers_are_per_symbol(self):
+        engine = PriceTriggerEngine()
+        callback, calls = recorder()
+        engine.add_trigger("ETHUSDT", 3000, TriggerDirection.BELOW, callback)
+
+        engine.update_price(BTC, 100.0)
+        engine.update_price("ETH/USDT:USDT", 2990.0)
+        await engine.drain()
+
+        assert [t.symbol for t, _ in calls] == ["ETH/USDT:USDT"]
+
+    @pytest.mark.asyncio
+    async def test_add_fires_immediately_when_already_crossed(self):
+        engine = PriceTriggerEngine()
+        callback, calls = recorder()
+        engine.update_price(BTC, 48000.0)
+
+        engine.add_trigger(BTC, 49000, TriggerDirection.BELOW, callback)
+        await engine.drain()
+
+        assert len(calls) == 1
+        assert engine.pending() == 0
+
+    def test_crossed_trigger_added_outside_loop_stays_armed(self):
+        engine = PriceTriggerEngine()
+        callback, _ = recorder()
+        engine.update_price(BTC, 48000.0)
+
+        engine.add_trigger(BTC, 49000, TriggerDirection.BELOW, callback)
+
+        assert engine.pending() == 1
+
+    @pytest.mark.asyncio
+    async def test_remove_key_disarms_group(self):
+        engine = PriceTriggerEngine()
+        callback, calls = recorder()
+        engine.add_trigger(BTC, 49000, TriggerDirection.BELOW, callback, key="pos-1")
+        engine.add_trigger(BTC, 42000, TriggerDirection.BELOW, callback, key="pos-1")
+        engine.add_trigger(BTC, 48000, TriggerDirection.BELOW, callback, key="pos-2")
+
+        assert engine.remove_key("pos-1") == 2
+        engine.update_price(BTC, 40000.0)
+        await engine.drain()
+
+        assert [t.key for t, _ in calls] == ["pos-2"]
+
+    def test_zero_price_is_ignored(self):
+        engine = PriceTriggerEngine()
+        callback, _ = recorder()
+        engine.add_trigger(BTC, 49000, TriggerDirection.BELOW, callback)
+
+        assert engine.update_price(BTC, 0.0) == []
+        assert engine.pending() == 1
+        assert engine.last_price(BTC) is None
+
+    @pytest.mark.asyncio
+    async def test_callback_errors_are_counted(self):
+        engine = PriceTriggerEngine()
+
+        async def failing(trigger, price):
+            raise RuntimeError("boom")
+
+        engine.add_trigger(BTC, 49000, TriggerDirection.BELOW, failing)
+        engine.update_price(BTC, 48000.0)
+        await engine.drain()
+
+        assert engine.get_stats()["callback_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_attached_engine_receives_market_data_ticks(self):
+        service = MarketDataService(symbols=["BTCUSDT"], cache_service=Mock())
+        engine = PriceTriggerEngine()
+        engine.attach(service)
+        callback, calls = recorder()
+        engine.add_trigger(BTC, 49000, TriggerDirection.BELOW, callback)
+
+        frame = TickerFrame(BTC)
+        frame.last = "48900.5"
+        await service._handle_ticker_frame(frame)
+        await engine.drain()
+
+        assert calls[0][1] == 48900.5
+        engine.detach()
+        assert service.ticker_listeners == []
+
+
+class TestTradeExecutorStopLossTriggers:
+    def create_manager(self, engine, status="open"):
+        position = SimpleNamespace(
+            id=uuid4(),
+            symbol=BTC,
+            side="long",
+            quantity=Decimal("0.01"),
+            entry_price=Decimal("50000"),
+            status=status,
+        )
+        position_service = Mock()
+        position_service.get_position_by_id = AsyncMock(return_value=position)
+        executor = Mock()
+        executor.exchange.fetch_ticker = AsyncMock()
+        executor.close_position = AsyncMock(
+            return_value=SimpleNamespace(success=True, order=None, error_message=None)
+        )
+        manager = StopLossManager(
+            executor=executor,
+            position_service=position_service,
+            trigger_engine=engine,
+        )
+        manager._place_layer1_stop = AsyncMock(return_value=None)
+        manager._store_protection = AsyncMock()
+        manager._update_protection = AsyncMock()
+        return manager, position
+
+    @pytest.mark.asyncio
+    async def test_layer2_closes_on_tick_without_polling(self):
+        engine = PriceTriggerEngine()
+        manager, position = self.create_manager(engine)
+
+        protection = await manager.start_protection(str(position.id), Decimal("49000"))
+        assert manager.monitoring_tasks == {}
+        assert engine.pending(BTC) == 2
+
+        engine.update_price(BTC, 48950.0)
+        await engine.drain()
+
+        manager.executor.close_position.assert_awaited_once()
+        assert protection.triggered_layer == StopLossLayer.APPLICATION
+        assert engine.pending() == 0
+        manager.executor.exchange.fetch_ticker.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_layer3_fires_at_emergency_loss(self):
+        engine = PriceTriggerEngine()
+        manager, position = self.create_manager(engine)
+
+        protection = await manager.start_protection(str(position.id), Decimal("30000"))
+        engine.update_price(BTC, 42000.0)
+        await engine.drain()
+
+        reasons = [
+            call.kwargs["reason"]
+            for call in manager.executor.close_position.await_args_list
+        ]
+        assert reasons == ["layer3_emergency_liquidation"]
+        assert protection.triggered_layer == StopLossLayer.EMERGENCY
+
+    @pytest.mark.asyncio
+    async def test_gap_through_both_layers_closes_once(self):
+        engine = PriceTriggerEngine()
+        manager, position = self.create_manager(engine)
+        closed = SimpleNamespace(success=True, order=None, error_message=None)
+
+        async def close_position(**kwargs):
+            await asyncio.sleep(0)  # Let the other layer's callback run
+            return closed
+
+        manager.executor.close_position.side_effect = close_position
+        manager._send_emergency_alert = AsyncMock()
+
+        await manager.start_protection(str(position.id), Decimal("49000"))
+        engine.update_price(BTC, 40000.0)
+        await engine.drain()
+
+        manager.executor.close_position.assert_awaited_once()
+        reason = manager.executor.close_position.await_args.kwargs["reason"]
+        emergency = reason == "layer3_emergency_liquidation"
+        assert manager._send_emergency_alert.await_count == int(emergency)
+        assert engine.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_closed_position_disarms_without_order(self):
+        engine = PriceTriggerEngine()
+        manager, position = self.create_manager(engine)
+        await manager.start_protection(str(position.id), Decimal("49000"))
+        position.status = "closed"
+
+        engine.update_price(BTC, 48000.0)
+        await engine.drain()
+
+        manager.executor.close_position.assert_not_awaited()
+        assert engine.pending() == 0
+
+
+class TestRiskManagerStopLossTriggers:
+    @pytest.mark.asyncio
+    async def test_app_trigger_closes_position(self):
+        engine = PriceTriggerEngine()
+        executor = Mock()
+        executor.close_position = AsyncMock()
+        manager = RiskStopLossManager(trade_executor=executor, trigger_engine=engine)
+
+        protection = await manager.start_protection(
+            position_id="pos-1",
+            symbol=BTC,
+            entry_price=Decimal("50000"),
+            stop_loss_pct=Decimal("0.02"),
+        )
+        assert protection.app_monitor_active and protection.emergency_monitor_active
+        assert manager.monitor_tasks == {}
+
+        engine.update_price(BTC, 48900.0)
+        await engine.drain()
+
+        executor.close_position.assert_awaited_once()
+        assert protection.triggered_layer == ProtectionLayer.APP_MONITOR
+        assert not protection.app_monitor_active
+
+    @pytest.mark.asyncio
+    async def test_stop_protection_disarms_triggers(self):
+        engine = PriceTriggerEngine()
+        manager = RiskStopLossManager(trade_executor=Mock(), trigger_engine=engine)
+        await manager.start_protection(
+            position_id="pos-1",
+            symbol=BTC,
+            entry_price=Decimal("50000"),
+            stop_loss_pct=Decimal("0.02"),
+            side="short",
+        )
+        assert engine.pending(BTC) == 2
+
+        await manager.stop_protection("pos-1")
+
+        assert engine.pending() == 0
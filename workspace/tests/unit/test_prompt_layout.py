@@ -0,0 +1,271 @@
+"""
+Unit tests for the compact prompt layout and tokenizers
+
+Tests the byte-stable static prefix, tabular market data encoding, token
+reporting, and how LLMDecisionEngine sends the prefix for caching.
+
+Author: Decision Engine Implementation Team
+Date: 2025-11-16
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict
+
+from workspace.features.decision_engine import tokenizer as tokenizer_module
+from workspace.features.decision_engine import (
+    CharRatioTokenizer,
+    LLMDecisionEngine,
+    PromptBuilder,
+    PromptLayout,
+    WhitespaceTokenizer,
+)
+from workspace.features.market_data import (
+    EMA,
+    MACD,
+    OHLCV,
+    RSI,
+    BollingerBands,
+    MarketDataSnapshot,
+    Ticker,
+    Timeframe,
+)
+
+CAPITAL = Decimal("2626.96")
+MAX_POSITION = Decimal("525.39")
+
+
+def create_snapshot(
+    symbol: str, price: float, with_indicators: bool = True
+) -> MarketDataSnapshot:
+    """Helper to create a snapshot, optionally with all indicators"""
+    now = datetime.utcnow()
+    indicators: Dict[str, Any] = {}
+    if with_indicators:
+        indicators = {
+            "rsi": RSI(
+                symbol=symbol,
+                timeframe=Timeframe.M3,
+                timestamp=now,
+                value=Decimal("55.5"),
+            ),
+            "macd": MACD(
+                symbol=symbol,
+                timeframe=Timeframe.M3,
+                timestamp=now,
+                macd_line=Decimal("12.5"),
+                signal_line=Decimal("10"),
+                histogram=Decimal("2.5"),
+            ),
+            "ema_fast": EMA(
+                symbol=symbol,
+                timeframe=Timeframe.M3,
+                timestamp=now,
+                value=Decimal(str(price + 10)),
+                period=12,
+            ),
+            "ema_slow": EMA(
+                symbol=symbol,
+                timeframe=Timeframe.M3,
+                timestamp=now,
+                value=Decimal(str(price - 10)),
+                period=26,
+            ),
+            "bollinger": BollingerBands(
+                symbol=symbol,
+                timeframe=Timeframe.M3,
+                timestamp=now,
+                upper_band=Decimal(str(price + 100)),
+                middle_band=Decimal(str(price)),
+                lower_band=Decimal(str(price - 100)),
+                bandwidth=Decimal("0.004"),
+            ),
+        }
+    return MarketDataSnapshot(
+        symbol=symbol,
+        timeframe=Timeframe.M3,
+        timestamp=now,
+        ohlcv=OHLCV(
+            symbol=symbol,
+            timeframe=Timeframe.M3,
+            timestamp=now,
+            open=Decimal(str(price - 20)),
+            high=Decimal(str(price + 30)),
+            low=Decimal(str(price - 30)),
+            close=Decimal(str(price)),
+            volume=Decimal("100"),
+            quote_volume=Decimal(str(price * 100)),
+        ),
+        ticker=Ticker(
+            symbol=symbol,
+            timestamp=now,
+            bid=Decimal(str(price - 1)),
+            ask=Decimal(str(price + 1)),
+            last=Decimal(str(price)),
+            high_24h=Decimal(str(price + 500)),
+            low_24h=Decimal(str(price - 500)),
+            volume_24h=Decimal("1000"),
+            quote_volume_24h=Decimal("512000000"),
+            change_24h=Decimal("150"),
+            change_24h_pct=Decimal("1.25"),
+        ),
+        **indicators,
+    )
+
+
+def universe(count: int, offset: float = 0.0) -> dict:
+    return {
+        f"SYM{i}USDT": create_snapshot(f"SYM{i}USDT", 1000.0 + i * 10 + offset)
+        for i in range(count)
+    }
+
+
+def test_verbose_is_default_and_has_no_prefix():
+    builder = PromptBuilder()
+
+    assert builder.layout == PromptLayout.VERBOSE
+    assert builder.static_prefix == ""
+
+
+def test_compact_prompt_starts_with_stable_prefix():
+    builder = PromptBuilder(layout="compact")
+
+    first = builder.build_trading_prompt(universe(3), CAPITAL, MAX_POSITION)
+    second = builder.build_trading_prompt(
+        universe(5, offset=7.5),
+        Decimal("1000"),
+        Decimal("200"),
+        current_positions={"SYM1USDT": {"side": "long", "size": 0.5}},
+        risk_context={"daily_loss": "CHF -10"},
+    )
+
+    prefix = builder.static_prefix
+    assert prefix
+    assert first.startswith(prefix)
+    assert second.startswith(prefix)
+    # Nothing cycle-dependent leaks into the prefix
+    assert "Analysis Time" not in prefix
+    assert "SYM" not in prefix
+
+
+def test_compact_market_table_rows():
+    builder = PromptBuilder(layout="compact")
+    snapshots = {
+        "BTCUSDT": create_snapshot("BTCUSDT", 50200.0),
+        "ETHUSDT": create_snapshot("ETHUSDT", 3000.0, with_indicators=False),
+    }
+
+    prompt = builder.build_trading_prompt(snapshots, CAPITAL, MAX_POSITION)
+    rows = {
+        line.split("|")[0]: line.split("|")
+        for line in prompt.splitlines()
+        if line.startswith(("BTCUSDT|", "ETHUSDT|"))
+    }
+
+    assert "# Market Data (2 assets)" in prompt
+    assert rows["BTCUSDT"][1] == "50200"
+    assert rows["BTCUSDT"][2] == "+1.25"
+    assert rows["BTCUSDT"][5] == "512.0M"
+    assert rows["BTCUSDT"][11] == "55.5"
+    assert rows["ETHUSDT"][11:] == ["-"] * 10
+    assert len(rows["BTCUSDT"]) == len(rows["ETHUSDT"]) == 21
+
+
+def test_compact_context_sections():
+    builder = PromptBuilder(layout="compact")
+
+    prompt = builder.build_trading_prompt(
+        universe(1),
+        CAPITAL,
+        MAX_POSITION,
+        current_positions={
+            "SYM0USDT": {
+                "side": "short",
+                "size": 0.01,
+                "entry_price": Decimal("1005"),
+                "pnl": Decimal("-3.5"),
+            }
+        },
+        risk_context={"open_positions": "1/6"},
+    )
+
+    assert "capital_chf=2626.96 max_position_chf=525.39" in prompt
+    assert "risk: open_positions=1/6" in prompt
+    assert "SYM0USDT|short|0.01|1005|-3.5|-" in prompt
+
+
+def test_compact_uses_under_60_percent_of_verbose_tokens():
+    tokenizer = CharRatioTokenizer()
+    verbose = PromptBuilder(tokenizer=tokenizer)
+    compact = PromptBuilder(layout="compact", tokenizer=tokenizer)
+    snapshots = universe(20)
+
+    verbose.build_trading_prompt(snapshots, CAPITAL, MAX_POSITION)
+    compact.build_trading_prompt(snapshots, CAPITAL, MAX_POSITION)
+
+    assert compact.last_stats.total_tokens < 0.6 * verbose.last_stats.total_tokens
+
+
+def test_last_stats_use_configured_tokenizer():
+    class CountingTokenizer:
+        def __init__(self):
+            self.calls = 0
+
+        def count(self, text):
+            self.calls += 1
+            return 7
+
+    tokenizer = CountingTokenizer()
+    builder = PromptBuilder(layout="compact", tokenizer=tokenizer)
+
+    builder.build_trading_prompt(universe(2), CAPITAL, MAX_POSITION)
+
+    stats = builder.last_stats
+    assert stats.total_tokens == 7
+    assert stats.prefix_tokens == 7
+    assert stats.symbols == 2
+    assert stats.layout == PromptLayout.COMPACT
+    assert builder.count_tokens("anything") == 7
+
+
+def test_whitespace_tokenizer_matches_word_count():
+    assert WhitespaceTokenizer().count("a b  c\nd") == 4
+
+
+def test_default_tokenizer_falls_back_to_chars(monkeypatch):
+    def unavailable(self, text):
+        raise OSError("encoding download failed")
+
+    monkeypatch.setattr(tokenizer_module, "_DEFAULT_TOKENIZER", None)
+    monkeypatch.setattr(tokenizer_module.TiktokenTokenizer, "count", unavailable)
+
+    builder = PromptBuilder(layout="compact")
+
+    assert isinstance(builder.tokenizer, CharRatioTokenizer)
+    row = "SYM0USDT|1000.00|1005.00|995.00|100.00|n/a|n/a"
+    assert builder.count_tokens(row) > WhitespaceTokenizer().count(row)
+
+
+def test_engine_marks_static_prefix_as_cache_breakpoint():
+    engine = LLMDecisionEngine(
+        model="anthropic/claude-3.5-sonnet",
+        prompt_builder=PromptBuilder(layout="compact"),
+    )
+    prompt = engine.prompt_builder.build_trading_prompt(
+        universe(2), CAPITAL, MAX_POSITION
+    )
+
+    messages = engine._build_messages(prompt)
+
+    prefix_part, body_part = messages[0]["content"]
+    assert prefix_part["text"] == engine.prompt_builder.static_prefix
+    assert prefix_part["cache_control"] == {"type": "ephemeral"}
+    assert prefix_part["text"] + body_part["text"] == prompt
+
+
+def test_engine_sends_plain_prompt_for_verbose_layout():
+    engine = LLMDecisionEngine()
+
+    messages = engine._build_messages("prompt text")
+
+    assert messages == [{"role": "user", "content": "prompt text"}]
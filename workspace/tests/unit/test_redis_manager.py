@@ -8,7 +8,7 @@ Date: 2025-10-30
 """
 
 import asyncio
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 import pytest_asyncio
@@ -284,6 +284,25 @@ async def test_redis_get_nonexistent_key(redis_manager):
     assert value is None
 
 
+@pytest.mark.asyncio
+async def test_redis_get_with_ttl_single_pipeline(redis_manager):
+    """Test value and remaining TTL come back from one pipeline"""
+    await redis_manager.initialize()
+    pipe = MagicMock()
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    pipe.execute = AsyncMock(
+        side_effect=[[b'{"data": "value"}', 1500], [b"1", -1], [None, -2]]
+    )
+    redis_manager.client.pipeline = MagicMock(return_value=pipe)
+
+    assert await redis_manager.get_with_ttl("k") == ({"data": "value"}, 1.5)
+    assert await redis_manager.get_with_ttl("k") == (1, None)  # No expiry
+    assert await redis_manager.get_with_ttl("k") == (None, None)
+    redis_manager.client.pipeline.assert_called_with(transaction=False)
+    pipe.pttl.assert_called_with("k")
+
+
 @pytest.mark.asyncio
 async def test_redis_set_get_complex_data(redis_manager):
     """Test set/get with complex nested data"""
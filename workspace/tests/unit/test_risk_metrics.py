@@ -16,6 +16,7 @@ Sprint: 3, Stream B
 from datetime import datetime
 from decimal import Decimal
 
+import numpy as np
 import pytest
 
 from workspace.features.risk_manager import RiskMetrics, RiskMetricsCalculator
@@ -372,5 +373,85 @@ def test_calculate_all_metrics_empty_data(calculator):
     assert metrics.total_trades == 0
 
 
+# ============================================================================
+# Vectorized Metrics Tests
+# ============================================================================
+
+
+@pytest.fixture
+def return_matrix():
+    """Daily returns for 8 strategies over 250 days"""
+    rng = np.random.default_rng(7)
+    return rng.normal(0.001, 0.02, size=(8, 250))
+
+
+def test_batch_metrics_match_scalar_methods(calculator, return_matrix):
+    """Test batch metrics equal the per-metric methods for each series"""
+    batch = calculator.calculate_batch_metrics(returns=return_matrix)
+
+    for i, row in enumerate(return_matrix):
+        returns = row.tolist()
+        equity = [Decimal("1")]
+        for r in returns:
+            equity.append(equity[-1] * (1 + Decimal(str(r))))
+        max_dd, max_dd_pct = calculator.calculate_max_drawdown(equity)
+
+        assert batch["sharpe_ratio"][i] == pytest.approx(
+            calculator.calculate_sharpe_ratio(returns)
+        )
+        assert batch["sortino_ratio"][i] == pytest.approx(
+            calculator.calculate_sortino_ratio(returns)
+        )
+        assert batch["value_at_risk_95"][i] == pytest.approx(
+            calculator.calculate_var(returns, 0.95)
+        )
+        assert batch["conditional_var_95"][i] == pytest.approx(
+            calculator.calculate_cvar(returns, 0.95)
+        )
+        assert batch["downside_deviation"][i] == pytest.approx(
+            calculator.calculate_downside_deviation(returns)
+        )
+        assert batch["max_drawdown_pct"][i] == pytest.approx(max_dd_pct)
+        assert batch["max_drawdown"][i] == pytest.approx(float(max_dd))
+
+
+def test_batch_metrics_from_equity(calculator, sample_equity_curve):
+    """Test metrics derived from an equity curve"""
+    batch = calculator.calculate_batch_metrics(
+        equity=[float(v) for v in sample_equity_curve]
+    )
+    max_dd, max_dd_pct = calculator.calculate_max_drawdown(sample_equity_curve)
+
+    assert batch["max_drawdown"] == pytest.approx(float(max_dd))
+    assert batch["max_drawdown_pct"] == pytest.approx(max_dd_pct)
+    assert batch["total_return_pct"] == pytest.approx(0.074)
+    assert int(batch["winning_trades"]) == 6
+    assert int(batch["losing_trades"]) == 4
+    assert batch["parametric_cvar_95"] < batch["parametric_var_95"]
+
+
+def test_batch_metrics_short_series(calculator):
+    """Test series shorter than two periods score zero"""
+    batch = calculator.calculate_batch_metrics(returns=np.zeros((3, 1)))
+
+    assert batch["sharpe_ratio"].shape == (3,)
+    assert not batch["sharpe_ratio"].any()
+
+
+def test_rolling_metrics(calculator, return_matrix):
+    """Test rolling windows equal batch metrics of each slice"""
+    rolling = calculator.calculate_rolling_metrics(return_matrix, window=30)
+
+    assert rolling["sharpe_ratio"].shape == (8, 221)
+    window = calculator.calculate_batch_metrics(returns=return_matrix[:, 100:130])
+    assert rolling["sharpe_ratio"][:, 100] == pytest.approx(window["sharpe_ratio"])
+    assert rolling["max_drawdown_pct"][:, 100] == pytest.approx(
+        window["max_drawdown_pct"]
+    )
+
+    with pytest.raises(ValueError):
+        calculator.calculate_rolling_metrics(return_matrix, window=300)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,286 @@
+"""
+Unit tests for the per-symbol semantic decision cache
+
+Tests nearest-neighbour lookup, tolerances, TTL, and partial prompting
+in LLMDecisionEngine when only some symbols hit.
+
+Author: Decision Engine Implementation Team
+Date: 2025-11-14
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from workspace.features.decision_engine import (
+    LLMDecisionEngine,
+    SemanticDecisionCache,
+)
+from workspace.features.market_data import MarketDataSnapshot, OHLCV, Ticker, Timeframe
+from workspace.features.market_data.models import MACD, RSI
+from workspace.features.trading_loop import TradingDecision
+
+
+def create_snapshot(
+    symbol: str, price: float, rsi: float = 55.0, macd: float = 1.0
+) -> MarketDataSnapshot:
+    """Helper to create a snapshot with RSI and MACD"""
+    now = datetime.utcnow()
+    return MarketDataSnapshot(
+        symbol=symbol,
+        timeframe=Timeframe.M3,
+        timestamp=now,
+        ohlcv=OHLCV(
+            symbol=symbol,
+            timeframe=Timeframe.M3,
+            timestamp=now,
+            open=Decimal(str(price)),
+            high=Decimal(str(price + 5)),
+            low=Decimal(str(price - 5)),
+            close=Decimal(str(price)),
+            volume=Decimal("100"),
+            quote_volume=Decimal(str(price * 100)),
+        ),
+        ticker=Ticker(
+            symbol=symbol,
+            timestamp=now,
+            bid=Decimal(str(price - 1)),
+            ask=Decimal(str(price + 1)),
+            last=Decimal(str(price)),
+            high_24h=Decimal(str(price + 500)),
+            low_24h=Decimal(str(price - 500)),
+            volume_24h=Decimal("1000"),
+            quote_volume_24h=Decimal(str(price * 1000)),
+            change_24h=Decimal("0"),
+            change_24h_pct=Decimal("0"),
+        ),
+        rsi=RSI(
+            symbol=symbol,
+            timeframe=Timeframe.M3,
+            timestamp=now,
+            value=Decimal(str(rsi)),
+        ),
+        macd=MACD(
+            symbol=symbol,
+            timeframe=Timeframe.M3,
+            timestamp=now,
+            macd_line=Decimal(str(macd)),
+            signal_line=Decimal(str(macd)),
+            histogram=Decimal("0"),
+        ),
+    )
+
+
+def llm_response(*decisions: tuple[str, str]) -> str:
+    """Build a response with one JSON block per (symbol, decision)"""
+    return "\n".join(
+        f'```json\n{{"symbol": "{symbol}", "decision": "{decision}", '
+        f'"confidence": 0.8, "size_pct": 0.1, "reasoning": "test"}}\n```'
+        for symbol, decision in decisions
+    )
+
+
+USAGE = {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
+
+
+class TestSemanticDecisionCache:
+    def test_hit_within_tolerance(self):
+        cache = SemanticDecisionCache()
+        cache.store("BTCUSDT", create_snapshot("BTCUSDT", 50000.0), {"d": "buy"})
+
+        # 0.1% move and 1 RSI point are inside the default tolerances
+        payload = cache.lookup("BTCUSDT", create_snapshot("BTCUSDT", 50050.0, rsi=56.0))
+
+        assert payload == {"d": "buy"}
+        assert cache.get_stats()["hits"] == 1
+
+    def test_miss_when_price_moves(self):
+        cache = SemanticDecisionCache(price_tolerance_pct=0.002)
+        cache.store("BTCUSDT", create_snapshot("BTCUSDT", 50000.0), {"d": "buy"})
+
+        assert cache.lookup("BTCUSDT", create_snapshot("BTCUSDT", 50500.0)) is None
+
+    def test_miss_when_rsi_moves(self):
+        cache = SemanticDecisionCache(rsi_tolerance=2.5)
+        cache.store("BTCUSDT", create_snapshot("BTCUSDT", 50000.0), {"d": "buy"})
+
+        assert (
+            cache.lookup("BTCUSDT", create_snapshot("BTCUSDT", 50000.0, rsi=60.0))
+            is None
+        )
+
+    def test_returns_nearest_entry(self):
+        cache = SemanticDecisionCache(price_tolerance_pct=0.01)
+        cache.store("BTCUSDT", create_snapshot("BTCUSDT", 50000.0), {"d": "far"})
+        cache.store("BTCUSDT", create_snapshot("BTCUSDT", 50300.0), {"d": "near"})
+
+        payload = cache.lookup("BTCUSDT", create_snapshot("BTCUSDT", 50250.0))
+
+        assert payload == {"d": "near"}
+
+    def test_context_and_symbol_must_match(self):
+        cache = SemanticDecisionCache()
+        snapshot = create_snapshot("BTCUSDT", 50000.0)
+        cache.store("BTCUSDT", snapshot, {"d": "buy"}, context="m|")
+
+        assert cache.lookup("BTCUSDT", snapshot, context="m|long") is None
+        assert cache.lookup("ETHUSDT", snapshot, context="m|") is None
+        assert cache.lookup("BTCUSDT", snapshot, context="m|") is not None
+
+    def test_missing_indicator_only_matches_missing(self):
+        cache = SemanticDecisionCache()
+        full = create_snapshot("BTCUSDT", 50000.0)
+        partial = full.model_copy(update={"rsi": None})
+        cache.store("BTCUSDT", full, {"d": "buy"})
+
+        assert cache.lookup("BTCUSDT", partial) is None
+
+        cache.store("BTCUSDT", partial, {"d": "hold"})
+        assert cache.lookup("BTCUSDT", partial) == {"d": "hold"}
+
+    def test_entries_expire(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(
+            "workspace.features.decision_engine.decision_cache.time.time",
+            lambda: clock[0],
+        )
+        cache = SemanticDecisionCache(ttl_seconds=60)
+        snapshot = create_snapshot("BTCUSDT", 50000.0)
+        cache.store("BTCUSDT", snapshot, {"d": "buy"})
+
+        clock[0] += 61
+
+        assert cache.lookup("BTCUSDT", snapshot) is None
+        stats = cache.get_stats()
+        assert stats["expired"] == 1
+        assert stats["entries"] == 0
+
+    def test_bucket_is_bounded(self):
+        cache = SemanticDecisionCache(max_entries_per_symbol=2)
+        for i in range(4):
+            cache.store(
+                "BTCUSDT", create_snapshot("BTCUSDT", 50000.0 + i * 1000), {"i": i}
+            )
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["evicted"] == 2
+        assert cache.lookup("BTCUSDT", create_snapshot("BTCUSDT", 50000.0)) is None
+
+    def test_invalidate_symbol(self):
+        cache = SemanticDecisionCache()
+        cache.store("BTCUSDT", create_snapshot("BTCUSDT", 50000.0), {"d": "buy"})
+        cache.store("ETHUSDT", create_snapshot("ETHUSDT", 3000.0), {"d": "sell"})
+
+        assert cache.invalidate("BTCUSDT") == 1
+        assert cache.get_stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_prompts_only_for_missed_symbols():
+    engine = LLMDecisionEngine(
+        api_key="test-key", decision_cache=SemanticDecisionCache()
+    )
+    engine._call_llm = AsyncMock(
+        return_value=(llm_response(("BTCUSDT", "buy"), ("ETHUSDT", "sell")), USAGE)
+    )
+
+    first = await engine.generate_signals(
+        {
+            "BTCUSDT": create_snapshot("BTCUSDT", 50000.0),
+            "ETHUSDT": create_snapshot("ETHUSDT", 3000.0),
+        }
+    )
+    assert first["BTCUSDT"].decision == TradingDecision.BUY
+    assert first["BTCUSDT"].from_cache is False
+
+    # BTC is quiet, ETH moved 2%
+    engine._call_llm = AsyncMock(return_value=(llm_response(("ETHUSDT", "buy")), USAGE))
+    second = await engine.generate_signals(
+        {
+            "BTCUSDT": create_snapshot("BTCUSDT", 50010.0),
+            "ETHUSDT": create_snapshot("ETHUSDT", 3060.0),
+        }
+    )
+
+    prompt = engine._call_llm.call_args.args[0]
+    assert "## ETHUSDT" in prompt
+    assert "## BTCUSDT" not in prompt
+    assert second["BTCUSDT"].decision == TradingDecision.BUY
+    assert second["BTCUSDT"].from_cache is True
+    assert second["ETHUSDT"].decision == TradingDecision.BUY
+    assert second["ETHUSDT"].from_cache is False
+
+
+@pytest.mark.asyncio
+async def test_engine_skips_llm_when_all_symbols_hit():
+    engine = LLMDecisionEngine(
+        api_key="test-key", decision_cache=SemanticDecisionCache()
+    )
+    engine._call_llm = AsyncMock(return_value=(llm_response(("BTCUSDT", "buy")), USAGE))
+    snapshots = {"BTCUSDT": create_snapshot("BTCUSDT", 50000.0)}
+
+    await engine.generate_signals(snapshots)
+    signals = await engine.generate_signals(snapshots)
+
+    assert engine._call_llm.call_count == 1
+    assert signals["BTCUSDT"].from_cache is True
+
+
+@pytest.mark.asyncio
+async def test_engine_does_not_cache_filled_in_holds():
+    engine = LLMDecisionEngine(
+        api_key="test-key", decision_cache=SemanticDecisionCache()
+    )
+    # LLM skips ETHUSDT, which gets a filler HOLD
+    engine._call_llm = AsyncMock(return_value=(llm_response(("BTCUSDT", "buy")), USAGE))
+    snapshots = {
+        "BTCUSDT": create_snapshot("BTCUSDT", 50000.0),
+        "ETHUSDT": create_snapshot("ETHUSDT", 3000.0),
+    }
+
+    first = await engine.generate_signals(snapshots)
+    assert first["ETHUSDT"].decision == TradingDecision.HOLD
+
+    await engine.generate_signals(snapshots)
+
+    assert engine._call_llm.call_count == 2
+    assert "## ETHUSDT" in engine._call_llm.call_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_engine_cache_depends_on_position_side():
+    engine = LLMDecisionEngine(
+        api_key="test-key", decision_cache=SemanticDecisionCache()
+    )
+    engine._call_llm = AsyncMock(return_value=(llm_response(("BTCUSDT", "buy")), USAGE))
+    snapshots = {"BTCUSDT": create_snapshot("BTCUSDT", 50000.0)}
+
+    await engine.generate_signals(snapshots)
+    await engine.generate_signals(
+        snapshots, current_positions={"BTCUSDT": {"side": "long"}}
+    )
+
+    assert engine._call_llm.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_engine_error_keeps_cached_signals():
+    engine = LLMDecisionEngine(
+        api_key="test-key", decision_cache=SemanticDecisionCache()
+    )
+    engine._call_llm = AsyncMock(return_value=(llm_response(("BTCUSDT", "buy")), USAGE))
+    await engine.generate_signals({"BTCUSDT": create_snapshot("BTCUSDT", 50000.0)})
+
+    engine._call_llm = AsyncMock(side_effect=Exception("API down"))
+    signals = await engine.generate_signals(
+        {
+            "BTCUSDT": create_snapshot("BTCUSDT", 50000.0),
+            "ETHUSDT": create_snapshot("ETHUSDT", 3000.0),
+        }
+    )
+
+    assert signals["BTCUSDT"].decision == TradingDecision.BUY
+    assert signals["ETHUSDT"].decision == TradingDecision.HOLD
@@ -0,0 +1,236 @@
+"""
+Unit tests for sharded multi-prompt decisions
+
+Tests how LLMDecisionEngine splits large symbol universes into shards by
+token budget and symbol limit, prompts them with bounded concurrency, and
+degrades only a failed shard's symbols to HOLD.
+
+Author: Decision Engine Implementation Team
+Date: 2025-11-17
+"""
+
+import asyncio
+import re
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from workspace.features.decision_engine import LLMDecisionEngine, PromptBuilder
+from workspace.features.market_data import MarketDataSnapshot, OHLCV, Ticker, Timeframe
+from workspace.features.trading_loop import TradingDecision
+
+USAGE = {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
+
+
+def create_snapshot(symbol: str, price: float) -> MarketDataSnapshot:
+    """Helper to create a minimal snapshot"""
+    now = datetime.utcnow()
+    return MarketDataSnapshot(
+        symbol=symbol,
+        timeframe=Timeframe.M3,
+        timestamp=now,
+        ohlcv=OHLCV(
+            symbol=symbol,
+            timeframe=Timeframe.M3,
+            timestamp=now,
+            open=Decimal(str(price)),
+            high=Decimal(str(price + 5)),
+            low=Decimal(str(price - 5)),
+            close=Decimal(str(price)),
+            volume=Decimal("100"),
+            quote_volume=Decimal(str(price * 100)),
+        ),
+        ticker=Ticker(
+            symbol=symbol,
+            timestamp=now,
+            bid=Decimal(str(price - 1)),
+            ask=Decimal(str(price + 1)),
+            last=Decimal(str(price)),
+            high_24h=Decimal(str(price + 500)),
+            low_24h=Decimal(str(price - 500)),
+            volume_24h=Decimal("1000"),
+            quote_volume_24h=Decimal(str(price * 1000)),
+            change_24h=Decimal("0"),
+            change_24h_pct=Decimal("0"),
+        ),
+    )
+
+
+def universe(count: int) -> dict:
+    return {
+        f"SYM{i}USDT": create_snapshot(f"SYM{i}USDT", 1000.0 + i * 10)
+        for i in range(count)
+    }
+
+
+def prompted_symbols(prompt: str) -> list:
+    """Symbols in a compact prompt's market table"""
+    return re.findall(r"^(SYM\d+USDT)\|", prompt, flags=re.MULTILINE)
+
+
+def buy_response(prompt: str) -> str:
+    """A BUY decision for every symbol in the prompt"""
+    return "\n".join(
+        f'```json\n{{"symbol": "{symbol}", "decision": "buy", '
+        f'"confidence": 0.8, "size_pct": 0.1, "reasoning": "test"}}\n```'
+        for symbol in prompted_symbols(prompt)
+    )
+
+
+def create_engine(**kwargs) -> LLMDecisionEngine:
+    return LLMDecisionEngine(
+        api_key="test-key",
+        prompt_builder=PromptBuilder(layout="compact"),
+        **kwargs,
+    )
+
+
+def test_no_sharding_by_default():
+    engine = create_engine()
+
+    shards = engine._shard_snapshots(
+        universe(50), Decimal("2626.96"), Decimal("525.39"), None, None
+    )
+
+    assert len(shards) == 1
+    assert len(shards[0]) == 50
+
+
+def test_shards_respect_symbol_limit():
+    engine = create_engine(shard_max_symbols=8)
+
+    shards = engine._shard_snapshots(
+        universe(20), Decimal("2626.96"), Decimal("525.39"), None, None
+    )
+
+    assert [len(shard) for shard in shards] == [8, 8, 4]
+    assert [s for shard in shards for s in shard] == list(universe(20))
+
+
+def test_shards_respect_token_budget():
+    engine = create_engine()
+    builder = engine.prompt_builder
+    snapshots = universe(30)
+    overhead = builder.count_tokens(
+        builder.build_trading_prompt({}, Decimal("2626.96"), Decimal("525.39"))
+    )
+    row = builder.symbol_tokens("SYM0USDT", snapshots["SYM0USDT"])
+    engine.config.shard_token_budget = overhead + 5 * row + row // 2
+
+    shards = engine._shard_snapshots(
+        snapshots, Decimal("2626.96"), Decimal("525.39"), None, None
+    )
+
+    assert len(shards) > 1
+    for shard in shards:
+        prompt = builder.build_trading_prompt(
+            shard, Decimal("2626.96"), Decimal("525.39")
+        )
+        # Row sizes vary slightly with the price digits
+        assert builder.count_tokens(prompt) <= engine.config.shard_token_budget + 5
+
+
+def test_default_tokenizer_budget_splits_universe():
+    # Compact rows are dense; a word count would fit all 100 into one shard
+    engine = create_engine(shard_token_budget=2000)
+    builder = engine.prompt_builder
+
+    shards = engine._shard_snapshots(
+        universe(100), Decimal("2626.96"), Decimal("525.39"), None, None
+    )
+
+    assert len(shards) >= 2
+    for shard in shards:
+        prompt = builder.build_trading_prompt(
+            shard, Decimal("2626.96"), Decimal("525.39")
+        )
+        # Per-row estimates are rounded, so allow a small overshoot
+        assert builder.count_tokens(prompt) <= 2000 * 1.01
+
+
+@pytest.mark.asyncio
+async def test_shards_run_concurrently_within_limit():
+    engine = create_engine(shard_max_symbols=5, max_concurrent_shards=3)
+    in_flight = 0
+    peak = 0
+
+    async def call_llm(prompt):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return buy_response(prompt), USAGE
+
+    engine._call_llm = AsyncMock(side_effect=call_llm)
+
+    signals = await engine.generate_signals(universe(40), use_cache=False)
+
+    assert engine._call_llm.await_count == 8
+    assert peak == 3
+    assert len(signals) == 40
+    assert all(s.decision == TradingDecision.BUY for s in signals.values())
+
+
+@pytest.mark.asyncio
+async def test_failed_shard_degrades_only_its_symbols():
+    engine = create_engine(shard_max_symbols=5)
+
+    async def call_llm(prompt):
+        if "SYM5USDT" in prompted_symbols(prompt):
+            raise TimeoutError("shard timed out")
+        return buy_response(prompt), USAGE
+
+    engine._call_llm = AsyncMock(side_effect=call_llm)
+
+    signals = await engine.generate_signals(universe(15), use_cache=False)
+
+    failed = {f"SYM{i}USDT" for i in range(5, 10)}
+    assert len(signals) == 15
+    for symbol, signal in signals.items():
+        expected = TradingDecision.HOLD if symbol in failed else TradingDecision.BUY
+        assert signal.decision == expected
+
+
+@pytest.mark.asyncio
+async def test_shard_sees_only_its_positions():
+    engine = create_engine(shard_max_symbols=2)
+    engine._call_llm = AsyncMock(
+        side_effect=lambda prompt: (buy_response(prompt), USAGE)
+    )
+    positions = {
+        "SYM0USDT": {"side": "long", "size": 0.1},
+        "SYM3USDT": {"side": "short", "size": 0.2},
+    }
+
+    await engine.generate_signals(
+        universe(4), use_cache=False, current_positions=positions
+    )
+
+    prompts = [call.args[0] for call in engine._call_llm.await_args_list]
+    first = next(p for p in prompts if "SYM0USDT|" in p)
+    second = next(p for p in prompts if "SYM2USDT|" in p)
+    assert "SYM0USDT|long" in first and "SYM3USDT|short" not in first
+    assert "SYM3USDT|short" in second and "SYM0USDT|long" not in second
+
+
+@pytest.mark.asyncio
+async def test_partial_failure_is_not_cached():
+    engine = create_engine(shard_max_symbols=2)
+    engine.cache.get = AsyncMock(return_value=None)
+    engine.cache.set = AsyncMock()
+
+    async def call_llm(prompt):
+        if "SYM0USDT" in prompted_symbols(prompt):
+            raise TimeoutError("shard timed out")
+        return buy_response(prompt), USAGE
+
+    engine._call_llm = AsyncMock(side_effect=call_llm)
+
+    signals = await engine.generate_signals(universe(4))
+
+    assert signals["SYM0USDT"].decision == TradingDecision.HOLD
+    assert signals["SYM2USDT"].decision == TradingDecision.BUY
+    engine.cache.set.assert_not_awaited()
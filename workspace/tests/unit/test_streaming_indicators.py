@@ -0,0 +1,220 @@
+"""
+Tests for StreamingIndicatorEngine
+
+Tests cover:
+- Parity with IndicatorCalculator.calculate_all_indicators at every bar
+- Provisional bar revision and rollback
+- Explicit bar close and stale/out-of-order candles
+- MarketDataService integration
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-03
+"""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from workspace.features.market_data.indicators import IndicatorCalculator
+from workspace.features.market_data.market_data_service import MarketDataService
+from workspace.features.market_data.models import OHLCV, Ticker, Timeframe
+from workspace.features.market_data.ohlcv_buffer import OHLCVRingBuffer
+from workspace.features.market_data.streaming_indicators import (
+    StreamingIndicatorEngine,
+)
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+def _candle(index: int, close: Decimal) -> OHLCV:
+    return OHLCV(
+        symbol=SYMBOL,
+        timeframe=Timeframe.M3,
+        timestamp=datetime(2025, 11, 1) + timedelta(minutes=3 * index),
+        open=close,
+        high=close + Decimal("10"),
+        low=close - Decimal("10"),
+        close=close,
+        volume=Decimal("1.5"),
+    )
+
+
+def _dump(indicators: dict) -> dict:
+    return {k: v.model_dump() if v is not None else None for k, v in indicators.items()}
+
+
+@pytest.fixture
+def random_walk_candles():
+    """Fixture: 80 candles following a seeded random walk"""
+    rng = random.Random(42)
+    price = 90000.0
+    candles = []
+    for i in range(80):
+        price *= 1 + rng.gauss(0, 0.004)
+        candles.append(_candle(i, Decimal(f"{price:.2f}")))
+    return candles
+
+
+class TestStreamingParity:
+    """The engine must match the batch calculator on the same history"""
+
+    def test_matches_batch_at_every_bar(self, random_walk_candles):
+        engine = StreamingIndicatorEngine(SYMBOL, Timeframe.M3.value)
+
+        for i, candle in enumerate(random_walk_candles):
+            engine.update(candle)
+            expected = IndicatorCalculator.calculate_all_indicators(
+                random_walk_candles[: i + 1]
+            )
+            assert _dump(engine.indicators()) == _dump(expected)
+
+    def test_matches_batch_after_close_bar(self, random_walk_candles):
+        engine = StreamingIndicatorEngine(SYMBOL, Timeframe.M3.value)
+        engine.load(random_walk_candles)
+        engine.close_bar()
+
+        expected = IndicatorCalculator.calculate_all_indicators(random_walk_candles)
+        assert _dump(engine.indicators()) == _dump(expected)
+
+    def test_custom_periods(self, random_walk_candles):
+        engine = StreamingIndicatorEngine(
+            SYMBOL,
+            Timeframe.M3.value,
+            rsi_period=7,
+            macd_fast=5,
+            macd_slow=10,
+            macd_signal=4,
+            bb_period=10,
+            bb_std_dev=Decimal("2.5"),
+        )
+        engine.load(random_walk_candles)
+
+        expected = IndicatorCalculator.calculate_all_indicators(
+            random_walk_candles,
+            rsi_period=7,
+            macd_fast=5,
+            macd_slow=10,
+            macd_signal=4,
+            bb_period=10,
+            bb_std_dev=Decimal("2.5"),
+        )
+        result = engine.indicators()
+        assert result["rsi"].value == expected["rsi"].value
+        assert result["macd"].model_dump() == expected["macd"].model_dump()
+        assert result["bollinger"].model_dump() == expected["bollinger"].model_dump()
+
+    def test_load_buffer_matches_load(self, random_walk_candles):
+        buffer = OHLCVRingBuffer(SYMBOL, Timeframe.M3.value, capacity=100)
+        buffer.extend(random_walk_candles)
+
+        from_buffer = StreamingIndicatorEngine(SYMBOL, Timeframe.M3.value)
+        from_buffer.load_buffer(buffer)
+        from_models = StreamingIndicatorEngine(SYMBOL, Timeframe.M3.value)
+        from_models.load(random_walk_candles)
+
+        assert _dump(from_buffer.indicators()) == _dump(from_models.indicators())
+        assert from_buffer.bar_count == len(random_walk_candles)
+
+    def test_warmup_returns_none(self, random_walk_candles):
+        engine = StreamingIndicatorEngine(SYMBOL, Timeframe.M3.value)
+        engine.load(random_walk_candles[:10])
+
+        result = engine.indicators()
+        assert all(value is None for value in result.values())
+        assert engine.bar_count == 10
+
+    def test_empty_engine(self):
+        engine = StreamingIndicatorEngine(SYMBOL, Timeframe.M3.value)
+        assert engine.latest_candle is None
+        assert engine.indicators()["rsi"] is None
+
+
+class TestProvisionalBar:
+    """Open-bar revisions must not leak into committed state"""
+
+    def test_revisions_roll_back(self, random_walk_candles):
+        engine = StreamingIndicatorEngine(SYMBOL, Timeframe.M3.value)
+        engine.load(random_walk_candles[:-1])
+
+        last = random_walk_candles[-1]
+        for bump in ("500", "-750", "25"):
+            engine.update(last.model_copy(update={"close": last.close + Decimal(bump)}))
+            engine.indicators()
+        engine.update(last)
+
+        expected = IndicatorCalculator.calculate_all_indicators(random_walk_candles)
+        assert _dump(engine.indicators()) == _dump(expected)
+        assert engine.bar_count == len(random_walk_candles)
+
+    def test_out_of_order_candle_ignored(self, random_walk_candles):
+        engine = StreamingIndicatorEngine(SYMBOL, Timeframe.M3.value)
+        engine.load(random_walk_candles)
+        before = _dump(engine.indicators())
+
+        engine.update(random_walk_candles[10])
+
+        assert _dump(engine.indicators()) == before
+        assert engine.latest_candle is random_walk_candles[-1]
+
+    def test_closed_bar_not_revised(self, random_walk_candles):
+        engine = StreamingIndicatorEngine(SYMBOL, Timeframe.M3.value)
+        engine.load(random_walk_candles)
+        engine.close_bar()
+        before = _dump(engine.indicators())
+
+        last = random_walk_candles[-1]
+        engine.update(last.model_copy(update={"close": last.close * 2}))
+
+        assert _dump(engine.indicators()) == before
+
+    def test_indicators_cached_until_update(self, random_walk_candles):
+        engine = StreamingIndicatorEngine(SYMBOL, Timeframe.M3.value)
+        engine.load(random_walk_candles)
+
+        assert engine.indicators() is engine.indicators()
+
+
+class TestServiceIntegration:
+    """MarketDataService feeds and reads the engine"""
+
+    @pytest.mark.asyncio
+    async def test_kline_updates_feed_engine(self, random_walk_candles):
+        service = MarketDataService(symbols=["BTCUSDT"], timeframe=Timeframe.M3)
+        service.cache = AsyncMock()
+
+        for candle in random_walk_candles:
+            await service._handle_kline_update(candle)
+
+        engine = service.indicator_engines[(SYMBOL, Timeframe.M3.value)]
+        assert engine.latest_candle is random_walk_candles[-1]
+        assert engine.bar_count == len(random_walk_candles)
+
+    @pytest.mark.asyncio
+    async def test_update_indicators_reseeds_from_store(self, random_walk_candles):
+        service = MarketDataService(symbols=["BTCUSDT"], timeframe=Timeframe.M3)
+        service.cache = AsyncMock()
+        service.ohlcv_data[SYMBOL] = random_walk_candles
+        service.latest_tickers[SYMBOL] = Ticker(
+            symbol=SYMBOL,
+            timestamp=datetime.utcnow(),
+            bid=Decimal("89999.50"),
+            ask=Decimal("90000.50"),
+            last=Decimal("90000.00"),
+            high_24h=Decimal("91000.00"),
+            low_24h=Decimal("89000.00"),
+            volume_24h=Decimal("1234.567"),
+            quote_volume_24h=Decimal("111111111.11"),
+            change_24h=Decimal("1000.00"),
+            change_24h_pct=Decimal("1.11"),
+        )
+
+        await service._update_indicators(SYMBOL)
+
+        expected = IndicatorCalculator.calculate_all_indicators(random_walk_candles)
+        snapshot = await service.get_snapshot(SYMBOL)
+        assert snapshot.rsi == expected["rsi"]
+        assert snapshot.macd == expected["macd"]
+        assert snapshot.bollinger == expected["bollinger"]
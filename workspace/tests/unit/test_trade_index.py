@@ -0,0 +1,231 @@
+"""
+Unit Tests for the Trade History Storage Engine
+
+Tests TradeIndex range queries, keyset pagination and rollup statistics
+against brute-force filtering, and TradeHistoryService's database query
+path (keyset SQL, continuous aggregate rollups, in-memory fallback).
+
+Author: Testing Team
+Date: 2025-11-20
+"""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from workspace.features.trade_history import (
+    TradeHistoryEntry,
+    TradeHistoryService,
+    TradeIndex,
+    TradeRollup,
+    TradeStatus,
+    TradeType,
+)
+
+START = datetime(2025, 11, 1)
+SYMBOLS = ["BTC/USDT:USDT", "ETH/USDT:USDT", "SOL/USDT:USDT"]
+
+
+def make_trade(i: int, rng: random.Random) -> TradeHistoryEntry:
+    """Random trade within 10 days of START; every third trade is an exit"""
+    exit_trade = i % 3 == 0
+    return TradeHistoryEntry(
+        id=f"trade_{i:06d}",
+        trade_type=TradeType.EXIT_LONG if exit_trade else TradeType.ENTRY_LONG,
+        status=TradeStatus.FILLED,
+        symbol=rng.choice(SYMBOLS),
+        order_id=f"order_{i}",
+        side="sell" if exit_trade else "buy",
+        quantity=Decimal(rng.randint(1, 100)) / 100,
+        entry_price=Decimal(rng.randint(1000, 60000)),
+        fees=Decimal(rng.randint(0, 50)) / 10,
+        realized_pnl=Decimal(rng.randint(-500, 500)) if exit_trade else None,
+        timestamp=START + timedelta(minutes=rng.randint(0, 10 * 24 * 60)),
+    )
+
+
+@pytest.fixture
+def trades():
+    rng = random.Random(7)
+    return [make_trade(i, rng) for i in range(600)]
+
+
+@pytest.fixture
+def index(trades):
+    index = TradeIndex()
+    for trade in trades:  # Out of time order
+        index.add(trade)
+    return index
+
+
+def newest_first(trades):
+    return sorted(trades, key=lambda t: (t.timestamp, t.id), reverse=True)
+
+
+def trade_row(trade: TradeHistoryEntry) -> dict:
+    """trades table row for a trade"""
+    return {
+        "trade_id": trade.id,
+        "timestamp": trade.timestamp,
+        "symbol": trade.symbol,
+        "trade_type": trade.trade_type.value,
+        "side": trade.side,
+        "entry_price": trade.entry_price,
+        "exit_price": trade.exit_price,
+        "quantity": trade.quantity,
+        "fees_paid": trade.fees,
+        "realized_pnl": trade.realized_pnl,
+        "unrealized_pnl": None,
+        "signal_confidence": None,
+        "signal_reasoning": None,
+        "leverage": None,
+        "execution_latency_ms": None,
+        "exchange": "bybit",
+        "order_id": trade.order_id,
+    }
+
+
+# ============================================================================
+# TradeIndex
+# ============================================================================
+
+
+def test_query_matches_brute_force(index, trades):
+    start = START + timedelta(days=2, hours=5)
+    end = START + timedelta(days=6, hours=17)
+
+    result = index.query(
+        symbol="ETH/USDT:USDT",
+        start=start,
+        end=end,
+        trade_type=TradeType.EXIT_LONG,
+    )
+
+    expected = newest_first(
+        t
+        for t in trades
+        if t.symbol == "ETH/USDT:USDT"
+        and start <= t.timestamp <= end
+        and t.trade_type == TradeType.EXIT_LONG
+    )
+    assert result == expected
+    assert index.query(limit=5) == newest_first(trades)[:5]
+    assert index.query(symbol="DOGE/USDT:USDT") == []
+
+
+def test_keyset_pages_cover_history_once(index, trades):
+    pages = []
+    before = None
+    while True:
+        page = index.query(symbol="BTC/USDT:USDT", limit=50, before=before)
+        if not page:
+            break
+        pages.extend(page)
+        before = (page[-1].timestamp, page[-1].id)
+
+    assert pages == newest_first(t for t in trades if t.symbol == "BTC/USDT:USDT")
+
+
+@pytest.mark.parametrize("symbol", [None, "SOL/USDT:USDT"])
+def test_rollup_matches_brute_force(index, trades, symbol):
+    start = START + timedelta(days=1, hours=13)  # Partial first day
+    end = START + timedelta(days=8, hours=2)  # Partial last day
+
+    rollup = index.rollup(start, end, symbol)
+
+    expected = TradeRollup()
+    for trade in trades:
+        if start <= trade.timestamp <= end and symbol in (None, trade.symbol):
+            expected.add(trade)
+    assert {f: getattr(rollup, f) for f in TradeRollup.__slots__} == {
+        f: getattr(expected, f) for f in TradeRollup.__slots__
+    }
+
+    stats = rollup.to_statistics(start, end)
+    assert stats.total_trades == expected.exit_count
+    assert stats.total_pnl == expected.gross_profit + expected.gross_loss
+
+
+# ============================================================================
+# TradeHistoryService database queries
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_database_query_uses_keyset_sql(trades):
+    pool = MagicMock()
+    pool.fetch = AsyncMock(return_value=[trade_row(t) for t in trades[:2]])
+    service = TradeHistoryService(pool=pool)
+    cursor = (START, "trade_000100")
+
+    result = await service.get_trades(symbol="BTC/USDT:USDT", limit=2, before=cursor)
+
+    query, *args = pool.fetch.call_args.args
+    assert "(timestamp, trade_id) < ($2, $3)" in query
+    assert query.endswith("ORDER BY timestamp DESC, trade_id DESC LIMIT $4")
+    assert args == ["BTC/USDT:USDT", START, "trade_000100", 2]
+    assert [t.id for t in result] == [t.id for t in trades[:2]]
+    assert service.get_stats()["storage_mode"] == "database"
+
+
+@pytest.mark.asyncio
+async def test_database_statistics_merge_aggregate_and_edges():
+    edge = {field: None for field in TradeRollup.__slots__}
+    edge.update(
+        trade_count=2,
+        volume=Decimal("1000"),
+        exit_count=1,
+        loss_count=1,
+        gross_loss=Decimal("-50"),
+        largest_loss=Decimal("-50"),
+    )
+    whole_days = dict(edge)
+    whole_days.update(
+        trade_count=Decimal("4"),
+        exit_count=Decimal("2"),
+        win_count=Decimal("2"),
+        loss_count=Decimal("0"),
+        gross_profit=Decimal("300"),
+        gross_loss=None,
+        largest_win=Decimal("200"),
+        largest_loss=None,
+    )
+    pool = MagicMock()
+    pool.fetchrow = AsyncMock(side_effect=[edge, whole_days])
+    service = TradeHistoryService(pool=pool)
+
+    stats = await service.calculate_statistics(
+        START + timedelta(hours=6), START + timedelta(days=3, hours=6)
+    )
+
+    raw_args = pool.fetchrow.call_args_list[0].args[1:]
+    daily_args = pool.fetchrow.call_args_list[1].args[1:]
+    assert raw_args[3:] == (START + timedelta(days=1), START + timedelta(days=3))
+    assert daily_args == (START + timedelta(days=1), START + timedelta(days=3), None)
+    assert stats.total_trades == 3
+    assert stats.winning_trades == 2
+    assert stats.total_pnl == Decimal("250")
+    assert stats.profit_factor == Decimal("6")
+
+
+@pytest.mark.asyncio
+async def test_database_failure_falls_back_to_index():
+    pool = MagicMock()
+    pool.execute = AsyncMock()
+    pool.fetch = AsyncMock(side_effect=ConnectionError("database down"))
+    service = TradeHistoryService(pool=pool)
+
+    trade = await service.log_trade(
+        trade_type=TradeType.ENTRY_LONG,
+        symbol="BTC/USDT:USDT",
+        order_id="order_1",
+        side="buy",
+        quantity=Decimal("0.1"),
+        price=Decimal("50000"),
+    )
+
+    pool.execute.assert_awaited_once()
+    assert await service.get_trades() == [trade]
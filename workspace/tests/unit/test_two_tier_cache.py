@@ -0,0 +1,259 @@
+"""
+Tests for the two-tier (L1 in-process + L2 Redis) CacheService
+
+Tests cover:
+- Hot reads served from L1 without touching Redis
+- L1 fill on L2 hit, LRU eviction and TTL bounds
+- Pub/sub invalidation keeping several processes coherent
+- Per-tier statistics
+
+Author: Trading System Implementation Team
+Date: 2025-11-12
+"""
+
+import asyncio
+import fnmatch
+import json
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from workspace.features.caching import CacheService
+
+
+class FakePubSub:
+    def __init__(self, broker):
+        self.broker = broker
+        self.queue = asyncio.Queue()
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        self.broker.subscribers.remove(self)
+
+
+class FakeRedis:
+    """Shared RedisManager stand-in: JSON round trip plus pub/sub fan-out"""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.subscribers = []
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        value = self.data.get(key)
+        return json.loads(value) if value is not None else None
+
+    async def get_with_ttl(self, key):
+        value = await self.get(key)
+        expires = self.expires.get(key)
+        ttl = None if expires is None else expires - time.monotonic()
+        return value, (ttl if value is not None else None)
+
+    async def set(self, key, value, ttl_seconds=None):
+        self.data[key] = json.dumps(value, default=str)
+        if ttl_seconds is not None:
+            self.expires[key] = time.monotonic() + ttl_seconds
+        return True
+
+    async def delete(self, key):
+        return self.data.pop(key, None) is not None
+
+    async def clear(self, pattern="*"):
+        keys = [k for k in self.data if fnmatch.fnmatchcase(k, pattern)]
+        for key in keys:
+            del self.data[key]
+        return len(keys)
+
+    async def publish(self, channel, message):
+        payload = json.dumps(message).encode()
+        for pubsub in self.subscribers:
+            pubsub.queue.put_nowait({"type": "message", "data": payload})
+        return len(self.subscribers)
+
+    async def subscribe(self, *channels):
+        pubsub = FakePubSub(self)
+        self.subscribers.append(pubsub)
+        return pubsub
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+
+    async def get_redis():
+        return fake
+
+    with patch("workspace.features.caching.cache_service.get_redis", get_redis):
+        yield fake
+
+
+@pytest_asyncio.fixture
+async def caches(redis):
+    """Two CacheService instances standing in for two worker processes"""
+    first, second = CacheService(), CacheService()
+    yield first, second
+    await first.close()
+    await second.close()
+
+
+async def _settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_hot_reads_served_from_l1(redis, caches):
+    cache, _ = caches
+    await cache.set("market_data:ticker:BTC", {"last": Decimal("90000.5")})
+
+    for _ in range(100):
+        value = await cache.get("market_data:ticker:BTC")
+
+    # Same representation as a Redis round trip
+    assert value == {"last": "90000.5"}
+    assert redis.gets == 0
+    tiers = cache.get_stats()["tiers"]
+    assert tiers["l1"]["hits"] == 100
+    assert tiers["l2"]["hits"] == 0
+    assert cache.get_stats()["hits"] == 100
+
+
+@pytest.mark.asyncio
+async def test_l2_hit_fills_l1(redis, caches):
+    writer, reader = caches
+    await writer.set("llm:signals", {"BTC": "buy"})
+
+    assert await reader.get("llm:signals") == {"BTC": "buy"}
+    assert await reader.get("llm:signals") == {"BTC": "buy"}
+
+    assert redis.gets == 1
+    tiers = reader.get_stats()["tiers"]
+    assert (tiers["l1"]["hits"], tiers["l1"]["misses"]) == (1, 1)
+    assert tiers["l2"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_l1_copy_expires_with_redis_entry(redis, caches):
+    writer, reader = caches
+    await writer.set("llm:signals", {"BTC": "buy"}, ttl_seconds=0.05)
+
+    assert await reader.get("llm:signals") == {"BTC": "buy"}
+    time.sleep(0.06)
+    del redis.data["llm:signals"]  # Redis expired it; no invalidation is sent
+
+    assert await reader.get("llm:signals") is None
+    assert redis.gets == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_keeps_processes_coherent(redis, caches):
+    first, second = caches
+    await first.set("market_data:ticker:ETH", {"last": 3000})
+    assert await second.get("market_data:ticker:ETH") == {"last": 3000}
+    await _settle()
+
+    await first.set("market_data:ticker:ETH", {"last": 3100})
+    await _settle()
+
+    assert await second.get("market_data:ticker:ETH") == {"last": 3100}
+    assert second.get_stats()["tiers"]["l1"]["invalidations"] == 1
+    # A writer ignores its own invalidation messages
+    assert first.get_stats()["tiers"]["l1"]["invalidations"] == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_and_clear_propagate(redis, caches):
+    first, second = caches
+    for key in ("market:BTC", "market:ETH", "llm:1"):
+        await first.set(key, 1)
+        await second.get(key)
+    await _settle()
+
+    assert await first.delete("llm:1") is True
+    assert await first.clear("market:*") == 2
+    await _settle()
+
+    for key in ("market:BTC", "market:ETH", "llm:1"):
+        assert await second.get(key) is None
+    assert redis.data == {}
+
+
+@pytest.mark.asyncio
+async def test_clear_matches_glob_in_every_tier(redis, caches):
+    first, second = caches
+    keys = ("market:BTC:ticker", "market:ETH:ohlcv", "market:ETH:ticker", "llm:1")
+    for key in keys:
+        await first.set(key, 1)
+        await second.get(key)
+
+    # Entries written to the memory fallback while Redis was unreachable
+    async def redis_down(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    redis.set, healthy_set = redis_down, redis.set
+    await first.set("market:SOL:ticker", 1)
+    await first.set("llm:2", 1)
+    redis.set = healthy_set
+    await _settle()
+
+    assert await first.clear("market:*:ticker") == 2
+    await _settle()
+
+    assert sorted(redis.data) == ["llm:1", "market:ETH:ohlcv"]
+    assert sorted(first._cache) == ["llm:2"]
+    for cache in caches:
+        assert await cache.get("market:ETH:ohlcv") == 1
+        assert await cache.get("market:BTC:ticker") is None
+        assert await cache.get("market:ETH:ticker") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_clear_matches_glob():
+    cache = CacheService(use_redis=False)
+    for key in ("a1b", "a-b", "ab", "a1c", "xa1b"):
+        await cache.set(key, 1)
+
+    assert await cache.clear("a*b") == 3
+    assert sorted(cache._cache) == ["a1c", "xa1b"]
+
+    # No glob characters: cleared as a key prefix
+    assert await cache.clear("xa") == 1
+    assert sorted(cache._cache) == ["a1c"]
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_ttl_bound(redis):
+    cache = CacheService(l1_max_entries=2, l1_ttl_seconds=0.05)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")  # a is now most recently used
+    await cache.set("c", 3)
+
+    l1 = cache.get_stats()["tiers"]["l1"]
+    assert (l1["size"], l1["evictions"]) == (2, 1)
+    assert await cache.get("b") == 2  # evicted from L1, served by Redis
+    assert redis.gets == 1
+
+    time.sleep(0.06)
+    assert await cache.get("c") == 3
+    assert cache.get_stats()["tiers"]["l1"]["expirations"] >= 1
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_mode_has_no_l1():
+    cache = CacheService(use_redis=False)
+    await cache.set("k", {"v": 1})
+
+    assert await cache.get("k") == {"v": 1}
+    stats = cache.get_stats()
+    assert stats["backend"] == "memory"
+    assert stats["tiers"] == {"l1": None, "l2": None}
@@ -0,0 +1,350 @@
+"""
+Tests for the write-behind persistence queue
+
+Tests cover:
+- Batched executemany flushes that preserve statement order
+- Spill file on database failure/timeout and ordered replay
+- Dead-lettering of records the database rejects, and spill encoding
+- Queue-depth metrics and TradeExecutor/TradeHistoryService integration
+
+Author: Trade Executor Implementation Team
+Date: 2025-11-10
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import asyncpg
+import pytest
+
+from workspace.features.monitoring.metrics import MetricsService
+from workspace.features.trade_executor.executor_service import (
+    TradeExecutor,
+    _order_update_args,
+)
+from workspace.features.trade_executor.models import (
+    Order,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+)
+from workspace.features.trade_history import TradeHistoryService, TradeType
+from workspace.shared.database.write_behind import WriteBehindQueue
+
+INSERT = "INSERT INTO t (a, b) VALUES ($1, $2)"
+UPDATE = "UPDATE t SET b = $1 WHERE a = $2"
+
+
+class FakePool:
+    """Pool stand-in recording executemany calls per committed transaction"""
+
+    def __init__(self):
+        self.committed = []
+        self.fail = False
+        self.delay = 0.0
+        self.reject = set()  # First-column values violating a constraint
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    @asynccontextmanager
+    async def transaction(self):
+        pending = []
+        self._pending = pending
+        yield
+        self.committed.extend(pending)
+
+    async def executemany(self, statement, args):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("database down")
+        args = list(args)
+        if any(row[0] in self.reject for row in args):
+            raise asyncpg.exceptions.UniqueViolationError("duplicate key")
+        self._pending.append((statement, list(args)))
+
+    @property
+    def rows(self):
+        return [(sql, row) for sql, rows in self.committed for row in rows]
+
+
+@pytest.fixture
+def pool():
+    return FakePool()
+
+
+@pytest.mark.asyncio
+async def test_flush_groups_runs_in_order(pool):
+    queue = WriteBehindQueue(pool=pool, batch_size=10)
+    queue.enqueue(INSERT, 1, "a")
+    queue.enqueue(INSERT, 2, "b")
+    queue.enqueue(UPDATE, "c", 1)
+    queue.enqueue(INSERT, 3, "d")
+
+    assert await queue.flush() is True
+
+    assert [(sql, len(rows)) for sql, rows in pool.committed] == [
+        (INSERT, 2),
+        (UPDATE, 1),
+        (INSERT, 1),
+    ]
+    assert queue.queue_depth == 0
+    assert queue.get_stats()["flushed_total"] == 4
+
+
+@pytest.mark.asyncio
+async def test_failure_requeues_without_spill_file(pool):
+    pool.fail = True
+    queue = WriteBehindQueue(pool=pool)
+    queue.enqueue(INSERT, 1, "a")
+
+    assert await queue.flush() is False
+    assert queue.queue_depth == 1
+
+    pool.fail = False
+    assert await queue.flush() is True
+    assert pool.rows == [(INSERT, (1, "a"))]
+
+
+@pytest.mark.asyncio
+async def test_drain_writes_every_batch(pool):
+    queue = WriteBehindQueue(pool=pool, batch_size=2)
+    for i in range(5):
+        queue.enqueue(INSERT, i, "x")
+
+    assert await queue.drain() is True
+    assert [row[0] for _, row in pool.rows] == [0, 1, 2, 3, 4]
+    assert queue.queue_depth == 0
+
+    pool.fail = True
+    queue.enqueue(INSERT, 5, "x")
+    assert await queue.drain() is False
+    assert queue.queue_depth == 1
+
+
+@pytest.mark.asyncio
+async def test_spill_and_ordered_replay(pool, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    queue = WriteBehindQueue(pool=pool, spill_path=str(spill))
+    pool.fail = True
+    queue.enqueue(INSERT, 1, Decimal("1.50"))
+    queue.enqueue(INSERT, 2, datetime(2025, 11, 10, 12, 0))
+
+    assert await queue.flush() is False
+    assert queue.queue_depth == 0
+    assert len(spill.read_text().splitlines()) == 2
+
+    # Newer records stay behind the spilled ones
+    pool.fail = False
+    queue.enqueue(INSERT, 3, {"reason": "fill"})
+    await queue.close()
+
+    assert [row for _, row in pool.rows] == [
+        (1, Decimal("1.50")),
+        (2, datetime(2025, 11, 10, 12, 0)),
+        (3, {"reason": "fill"}),
+    ]
+    assert not spill.exists()
+    assert queue.get_stats()["spilled_records"] == 0
+
+
+@pytest.mark.asyncio
+async def test_spill_survives_restart(pool, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    pool.fail = True
+    first = WriteBehindQueue(pool=pool, spill_path=str(spill))
+    first.enqueue(INSERT, 1, "a")
+    await first.close()
+
+    pool.fail = False
+    second = WriteBehindQueue(pool=pool, spill_path=str(spill))
+    assert second.get_stats()["spilled_records"] == 1
+    assert await second.flush() is True
+    assert pool.rows == [(INSERT, (1, "a"))]
+
+
+@pytest.mark.asyncio
+async def test_slow_database_times_out_to_spill(pool, tmp_path):
+    pool.delay = 0.5
+    queue = WriteBehindQueue(
+        pool=pool, flush_timeout=0.05, spill_path=str(tmp_path / "spill.jsonl")
+    )
+    queue.enqueue(INSERT, 1, "a")
+
+    assert await queue.flush() is False
+    assert pool.committed == []
+    assert queue.get_stats()["spilled_records"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_record_dead_lettered_during_replay(pool, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    queue = WriteBehindQueue(pool=pool, batch_size=4, spill_path=str(spill))
+    pool.fail = True
+    for i in range(1, 8):
+        queue.enqueue(INSERT, i, "x")
+    assert await queue.flush() is False
+
+    pool.fail = False
+    pool.reject = {3}
+    queue.enqueue(INSERT, 8, "x")
+    await queue.close()
+
+    assert [row[0] for _, row in pool.rows] == [1, 2, 4, 5, 6, 7, 8]
+    (dead,) = [json.loads(line) for line in Path(f"{spill}.dead").open()]
+    assert dead["args"] == [3, "x"]
+    assert dead["error"].startswith("UniqueViolationError")
+    assert queue.get_stats()["dead_lettered_total"] == 1
+    assert not spill.exists()
+
+
+@pytest.mark.asyncio
+async def test_rejected_record_does_not_block_queue(pool):
+    pool.reject = {2}
+    queue = WriteBehindQueue(pool=pool)
+    for i in range(1, 4):
+        queue.enqueue(INSERT, i, "x")
+
+    assert await queue.flush() is True
+    assert [row[0] for _, row in pool.rows] == [1, 3]
+    assert queue.queue_depth == 0
+    assert queue.dead_lettered_total == 1
+
+
+@pytest.mark.asyncio
+async def test_spill_encodes_uuid_date_and_bytes(pool, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    queue = WriteBehindQueue(pool=pool, spill_path=str(spill))
+    order_id = uuid4()
+    pool.fail = True
+    queue.enqueue(INSERT, order_id, date(2025, 11, 10))
+    queue.enqueue(INSERT, b"\x00raw", [Decimal("1.5"), None])
+    queue.enqueue(INSERT, 3, Path("untagged"))
+    assert await queue.flush() is False
+    assert queue.get_stats()["spilled_records"] == 3
+
+    with spill.open("a") as f:
+        f.write('{"sql": "INSERT INTO t')  # Line torn mid-write
+
+    pool.fail = False
+    restarted = WriteBehindQueue(pool=pool, spill_path=str(spill))
+    assert await restarted.flush() is True
+    assert [row for _, row in pool.rows] == [
+        (order_id, date(2025, 11, 10)),
+        (b"\x00raw", [Decimal("1.5"), None]),
+        (3, "untagged"),
+    ]
+    assert restarted.dead_lettered_total == 1
+
+
+@pytest.mark.asyncio
+async def test_overflow_without_spill_drops_oldest(pool):
+    queue = WriteBehindQueue(pool=pool, max_queue_size=2)
+    for i in range(3):
+        queue.enqueue(INSERT, i, "x")
+
+    await queue.flush()
+    assert [row[0] for _, row in pool.rows] == [1, 2]
+    assert queue.get_stats()["dropped_total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_overflow_spilled_by_flusher_in_order(pool, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    queue = WriteBehindQueue(
+        pool=pool, batch_size=2, max_queue_size=2, spill_path=str(spill)
+    )
+    queue.enqueue(INSERT, 1, "x")
+    queue.enqueue(INSERT, 2, "x")
+
+    # Record 3 overflows while the flush of 1-2 is failing
+    pool.fail, pool.delay = True, 0.05
+    flush = asyncio.create_task(queue.flush())
+    await asyncio.sleep(0.01)
+    for i in (3, 4, 5):
+        queue.enqueue(INSERT, i, "x")
+    assert not spill.exists()  # Enqueue never touches the disk
+    assert await flush is False
+    assert queue.queue_depth == 2
+
+    pool.fail, pool.delay = False, 0.0
+    await queue.close()
+
+    assert [row[0] for _, row in pool.rows] == [1, 2, 3, 4, 5]
+    assert not spill.exists()
+
+
+@pytest.mark.asyncio
+async def test_background_loop_and_metrics(pool):
+    metrics = MetricsService()
+    queue = WriteBehindQueue(
+        pool=pool, batch_size=2, flush_interval=10, metrics_service=metrics
+    )
+    await queue.start()
+    queue.enqueue(INSERT, 1, "a")
+    assert metrics.metrics.write_behind_queue_depth == 1
+
+    queue.enqueue(INSERT, 2, "b")  # full batch wakes the flusher
+    await asyncio.sleep(0.05)
+    await queue.close()
+
+    assert len(pool.rows) == 2
+    assert metrics.metrics.write_behind_queue_depth == 0
+    assert metrics.metrics.write_behind_flushed_total == 2
+
+
+@pytest.mark.asyncio
+async def test_executor_and_trade_history_enqueue(pool):
+    queue = WriteBehindQueue(pool=pool)
+    exchange = Mock()
+    exchange.create_order = AsyncMock(
+        return_value={"id": "x1", "status": "closed", "filled": 0.001, "average": 1}
+    )
+    executor = TradeExecutor(
+        api_key="k",
+        api_secret="s",
+        exchange=exchange,
+        position_service=Mock(),
+        write_behind=queue,
+    )
+    history = TradeHistoryService(write_behind=queue)
+    executor.trade_history_service = history
+
+    result = await executor.create_market_order(
+        "BTC/USDT:USDT", OrderSide.BUY, Decimal("0.001")
+    )
+    assert result.success is True
+    await executor._update_order(result.order)
+    assert queue.queue_depth == 3
+
+    await queue.flush()
+    statements = [sql.split()[0:3] for sql, _ in pool.rows]
+    assert statements == [
+        ["INSERT", "INTO", "orders"],
+        ["INSERT", "INTO", "trades"],
+        ["UPDATE", "orders", "SET"],
+    ]
+    order_row = pool.rows[0][1]
+    assert order_row[3:5] == ("market", "buy")
+    trade_row = pool.rows[1][1]
+    assert trade_row[3] == TradeType.ENTRY_LONG.value
+
+
+def test_order_args_accept_enum_members():
+    order = Order(
+        symbol="BTC/USDT:USDT",
+        type=OrderType.LIMIT,
+        side=OrderSide.SELL,
+        quantity=Decimal("1"),
+        price=Decimal("2"),
+    )
+    order.status = OrderStatus.FILLED  # enum member assigned after init
+
+    assert _order_update_args(order)[3] == "filled"
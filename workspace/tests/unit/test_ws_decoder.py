@@ -0,0 +1,234 @@
+"""
+Tests for the Bybit WebSocket frame decoder
+
+Tests cover:
+- JSON backend selection and fallback
+- Ticker snapshot/delta merging and lazy Ticker construction
+- Kline frames as duck-typed candles for the buffer and indicator engine
+- Client fast-path callbacks, frame recording and MarketDataService wiring
+
+Author: Market Data Service Implementation Team
+Date: 2025-11-06
+"""
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from workspace.features.market_data import ws_decoder
+from workspace.features.market_data.market_data_service import MarketDataService
+from workspace.features.market_data.models import OHLCV, Ticker, Timeframe
+from workspace.features.market_data.ohlcv_buffer import OHLCVRingBuffer
+from workspace.features.market_data.websocket_client import BybitWebSocketClient
+from workspace.features.market_data.ws_decoder import (
+    BybitFrameDecoder,
+    KlineFrame,
+    resolve_json_loads,
+)
+
+START_MS = 1762000000000
+
+
+def _ticker_message(msg_type="snapshot", **fields):
+    data = {
+        "symbol": "BTCUSDT",
+        "lastPrice": "90000.00",
+        "bid1Price": "89999.50",
+        "ask1Price": "90000.50",
+        "highPrice24h": "91000.00",
+        "lowPrice24h": "89000.00",
+        "volume24h": "1234.567",
+        "turnover24h": "111111111.11",
+        "price24hPcnt": "0.0111",
+    }
+    if msg_type == "delta":
+        data = {"symbol": "BTCUSDT"}
+    data.update(fields)
+    return {"topic": "tickers.BTCUSDT", "type": msg_type, "data": data, "ts": START_MS}
+
+
+def _kline_message(index: int, close: str, confirm: bool = False):
+    start = START_MS + index * 180_000
+    return {
+        "topic": "kline.3.BTCUSDT",
+        "type": "snapshot",
+        "data": [
+            {
+                "start": start,
+                "end": start + 179_999,
+                "interval": "3",
+                "open": close,
+                "close": close,
+                "high": close,
+                "low": close,
+                "volume": "12.345",
+                "turnover": "1111111.11",
+                "confirm": confirm,
+            }
+        ],
+        "ts": start,
+    }
+
+
+class TestBackendSelection:
+    def test_default_prefers_fast_backend(self):
+        backend, loads = resolve_json_loads()
+        if ws_decoder.MSGSPEC_AVAILABLE:
+            assert backend == "msgspec"
+        elif ws_decoder.ORJSON_AVAILABLE:
+            assert backend == "orjson"
+        else:
+            assert backend == "json"
+        assert loads('{"op": "pong"}') == {"op": "pong"}
+
+    def test_json_fallback_when_optional_missing(self, monkeypatch):
+        monkeypatch.setattr(ws_decoder, "MSGSPEC_AVAILABLE", False)
+        monkeypatch.setattr(ws_decoder, "ORJSON_AVAILABLE", False)
+
+        assert BybitFrameDecoder().backend == "json"
+        with pytest.raises(ValueError):
+            BybitFrameDecoder("orjson")
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            BybitFrameDecoder("yaml")
+
+    def test_bytes_and_str_frames(self):
+        decoder = BybitFrameDecoder()
+        raw = json.dumps(_ticker_message())
+        assert decoder.loads(raw) == decoder.loads(raw.encode())
+
+
+class TestTickerFrames:
+    def test_snapshot_to_model(self):
+        frame = BybitFrameDecoder().parse_ticker(_ticker_message())
+
+        assert frame.symbol == "BTC/USDT:USDT"
+        assert frame.last_price == 90000.0
+        ticker = frame.to_model()
+        assert isinstance(ticker, Ticker)
+        assert ticker.quote_volume_24h == Decimal("111111111.11")
+        assert ticker.change_24h_pct == Decimal("1.1100")
+        assert frame.to_model() is ticker
+
+    def test_delta_merges_into_snapshot(self):
+        decoder = BybitFrameDecoder()
+        first = decoder.parse_ticker(_ticker_message())
+        delta = decoder.parse_ticker(_ticker_message("delta", lastPrice="90500.00"))
+
+        assert delta is not first
+        assert delta.last == "90500.00"
+        assert delta.bid == "89999.50"
+        assert first.last == "90000.00"
+
+    def test_delta_without_snapshot_uses_defaults(self):
+        frame = BybitFrameDecoder().parse_ticker(
+            _ticker_message("delta", lastPrice="90500.00")
+        )
+        assert frame.to_model().bid == Decimal("0")
+
+
+class TestKlineFrames:
+    def test_parse_and_to_model(self):
+        frames = BybitFrameDecoder().parse_klines(_kline_message(0, "90100.00", True))
+
+        assert len(frames) == 1
+        frame = frames[0]
+        assert frame.confirm is True
+        assert frame.timeframe == Timeframe.M3.value
+        assert frame.close == Decimal("90100.00")
+        candle = frame.to_model()
+        assert isinstance(candle, OHLCV)
+        assert candle.quote_volume == Decimal("1111111.11")
+        assert candle.timestamp == datetime.fromtimestamp(
+            START_MS / 1000, tz=timezone.utc
+        ).replace(tzinfo=None)
+
+    def test_frame_written_to_ring_buffer(self):
+        decoder = BybitFrameDecoder()
+        buffer = OHLCVRingBuffer("BTC/USDT:USDT", Timeframe.M3.value, capacity=5)
+        for i, close in enumerate(("1.5", "2.5", "3.5")):
+            buffer.upsert(decoder.parse_klines(_kline_message(i, close))[0])
+        buffer.upsert(decoder.parse_klines(_kline_message(2, "4.5"))[0])
+
+        assert buffer.closes().tolist() == [1.5, 2.5, 4.5]
+        assert buffer[-1].quote_volume == Decimal("1111111.11")
+        assert buffer[-1].trades_count is None
+
+
+class TestClientFastPath:
+    @pytest.mark.asyncio
+    async def test_frame_callbacks_skip_models(self, monkeypatch):
+        frames = []
+        client = BybitWebSocketClient(symbols=["BTCUSDT"], on_kline_frame=frames.append)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("model built without a model callback")
+
+        monkeypatch.setattr(KlineFrame, "to_model", fail)
+        await client._process_message(json.dumps(_kline_message(0, "90100.00")))
+
+        assert len(frames) == 1
+        assert frames[0].close_raw == "90100.00"
+
+    @pytest.mark.asyncio
+    async def test_malformed_frame_logged(self):
+        client = BybitWebSocketClient(symbols=["BTCUSDT"])
+        await client._process_message("{not json")
+
+    @pytest.mark.asyncio
+    async def test_record_frames(self, tmp_path):
+        path = tmp_path / "frames.jsonl"
+        client = BybitWebSocketClient(symbols=["BTCUSDT"], record_path=str(path))
+        client._record_file = open(path, "a", encoding="utf-8")
+
+        await client._process_message(json.dumps(_ticker_message()))
+        await client._process_message(json.dumps(_kline_message(0, "1")).encode())
+        await client.disconnect()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])["topic"] == "kline.3.BTCUSDT"
+
+
+class TestServiceFastPath:
+    @pytest.mark.asyncio
+    async def test_ticker_frame_materialized_on_read(self):
+        service = MarketDataService(symbols=["BTCUSDT"])
+        service.cache = AsyncMock()
+        frame = BybitFrameDecoder().parse_ticker(_ticker_message())
+
+        await service._handle_ticker_frame(frame)
+        assert "BTC/USDT:USDT" not in service.latest_tickers
+
+        ticker = await service.get_latest_ticker("BTCUSDT", use_cache=False)
+        assert ticker.last == Decimal("90000.00")
+        assert service.latest_tickers["BTC/USDT:USDT"] is ticker
+
+    @pytest.mark.asyncio
+    async def test_kline_frames_build_snapshot_on_demand(self):
+        service = MarketDataService(symbols=["BTCUSDT"], timeframe=Timeframe.M3)
+        service.cache = AsyncMock()
+        decoder = BybitFrameDecoder()
+        await service._handle_ticker_frame(decoder.parse_ticker(_ticker_message()))
+
+        for i in range(60):
+            close = f"{90000 + (i % 7) * 10}.00"
+            await service._handle_kline_frame(
+                decoder.parse_klines(_kline_message(i, close, confirm=True))[0]
+            )
+        assert "BTC/USDT:USDT" in service.latest_snapshots
+
+        # Open-bar revisions only mark the snapshot stale
+        await service._handle_kline_frame(
+            decoder.parse_klines(_kline_message(60, "95000.00"))[0]
+        )
+        assert "BTC/USDT:USDT" in service._stale_snapshots
+
+        snapshot = await service.get_snapshot("BTCUSDT")
+        assert snapshot.ohlcv.close == Decimal("95000.00")
+        assert isinstance(snapshot.ohlcv, OHLCV)
+        assert "BTC/USDT:USDT" not in service._stale_snapshots